@@ -6,19 +6,22 @@ This script analyzes performance test results and generates reports.
 """
 
 import argparse
-import json
 import logging
-import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 
 import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
 from jinja2 import Environment, FileSystemLoader
 
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.backend.tests.performance.utils.results_store import ResultsStore  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -50,22 +53,21 @@ class PerformanceAnalyzer:
         self.plots_dir.mkdir(parents=True, exist_ok=True)
 
     def load_results(self) -> List[Dict[str, Any]]:
-        """Load all test results from the results directory.
+        """Load the test results of the results directory from the results store.
+
+        New or changed report files in the results directory are ingested
+        first; files already in the store are not parsed again.
 
         Returns:
             List of test results
         """
-        results = []
-        for result_file in self.results_dir.glob("*_report.json"):
-            try:
-                with open(result_file, "r") as f:
-                    result = json.load(f)
-                    results.append(result)
-                logger.info(f"Loaded results from {result_file}")
-            except Exception as e:
-                logger.error(f"Failed to load {result_file}: {e}")
-
-        return results
+        with ResultsStore() as store:
+            added = store.ingest_path(self.results_dir, patterns=["*_report.json"])
+            if added:
+                logger.info(f"Ingested {added} new report(s) from {self.results_dir}")
+            # The store is shared with other result directories
+            runs = store.runs(format="report", source=self.results_dir)
+            return [run["document"] for run in runs]
 
     def analyze_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze test results and generate metrics.
@@ -269,7 +271,7 @@ def main():
         report_file = analyzer.generate_report()
 
         if report_file:
-            print(f"\n=== Report Generated ===")
+            print("\n=== Report Generated ===")
             print(f"View the report at: {Path(report_file).resolve()}")
         else:
             print("No report was generated.")
@@ -6,16 +6,20 @@ This script analyzes the results from performance tests and generates reports.
 """
 
 import argparse
-import json
 import logging
-import os
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict
 
 import matplotlib.pyplot as plt
 import pandas as pd
 
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.backend.tests.performance.utils.results_store import ResultsStore  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -39,7 +43,10 @@ class PerformanceAnalyzer:
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     def load_results(self, test_type: str) -> Dict[str, Any]:
-        """Load test results from JSON files.
+        """Load the latest results of a test type from the results store.
+
+        The ``<test_type>_results.json`` file is ingested first if it is new
+        or has changed since it was last read.
 
         Args:
             test_type: Type of test (load, stress, endurance, scalability)
@@ -47,13 +54,22 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary containing test results
         """
-        result_file = self.results_dir / f"{test_type}_results.json"
-        if not result_file.exists():
+        with ResultsStore() as store:
+            result_file = self.results_dir / f"{test_type}_results.json"
+            if result_file.exists():
+                store.ingest_file(result_file)
+            # The store is shared with other result directories
+            runs = store.runs(
+                scenario=test_type,
+                format="results",
+                limit=1,
+                source=self.results_dir,
+            )
+
+        if not runs:
             logger.warning(f"No results found for {test_type} test")
             return {}
-
-        with open(result_file, "r") as f:
-            return json.load(f)
+        return runs[-1]["document"]
 
     def load_metrics(self, test_type: str) -> pd.DataFrame:
         """Load metrics from CSV files.
@@ -195,14 +211,19 @@ class PerformanceAnalyzer:
         report_file = self.reports_dir / f"{test_type}_report_{self.timestamp}.html"
 
         # Simple HTML template
-        html = f"""
+        html = """
         <!DOCTYPE html>
         <html>
         <head>
-            <title>{test_type.capitalize()} Test Report</title>
+            <title>{title} Test Report</title>
             <style>
                 body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .summary {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
+                .summary {{
+                    background-color: #f5f5f5;
+                    padding: 15px;
+                    border-radius: 5px;
+                    margin-bottom: 20px;
+                }}
                 .metrics {{ display: flex; flex-wrap: wrap; gap: 20px; }}
                 .metric-card {{
                     background: white;
@@ -230,7 +251,7 @@ class PerformanceAnalyzer:
             </style>
         </head>
         <body>
-            <h1>{test_type.capitalize()} Test Report</h1>
+            <h1>{title} Test Report</h1>
             <p>Generated at: {timestamp}</p>
 
             <div class="summary">
@@ -241,7 +262,9 @@ class PerformanceAnalyzer:
                         <div class="metric-label">Total Requests</div>
                     </div>
                     <div class="metric-card">
-                        <div class="metric-value" style="color: {success_color};">{success_rate:.1f}%</div>
+                        <div class="metric-value" style="color: {success_color};">
+                            {success_rate:.1f}%
+                        </div>
                         <div class="metric-label">Success Rate</div>
                     </div>
                     <div class="metric-card">
@@ -271,6 +294,7 @@ class PerformanceAnalyzer:
         </html>
         """.format(
             test_type=test_type,
+            title=test_type.capitalize(),
             timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             total_requests=summary["total_requests"],
             success_rate=summary["success_rate"] * 100,
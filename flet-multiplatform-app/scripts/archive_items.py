@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""itemテーブルのパーティション保守スクリプト
+
+今後数か月分のパーティションを事前に作成し、保持期間を過ぎたパーティションを
+item_archive テーブルまたは gzip 圧縮した JSON Lines ファイルに移動します。
+cron などから定期的に実行することを想定しています（PostgreSQL専用）。
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from backend.core.db import engine  # noqa: E402
+from backend.db.partitioning import (  # noqa: E402
+    archive_partition,
+    ensure_partitions,
+    find_cold_partitions,
+    list_partitions,
+    planned_partitions,
+)
+from backend.models.item import Item  # noqa: E402
+
+# ロガーの設定
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """コマンドライン引数を解析する"""
+    parser = argparse.ArgumentParser(description="Maintain item table partitions.")
+    parser.add_argument(
+        "--older-than-months",
+        type=int,
+        default=12,
+        help="Archive partitions that ended more than N months ago",
+    )
+    parser.add_argument(
+        "--destination",
+        choices=("table", "file"),
+        default="table",
+        help="Move archived rows to item_archive or to compressed files",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("archives"),
+        help="Directory for archive files (--destination file)",
+    )
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=3,
+        help="Number of future monthly partitions to create",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only list partitions that would be created or archived",
+    )
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> int:
+    """パーティションの作成とアーカイブを行う"""
+    try:
+        return await _maintain_partitions(args)
+    finally:
+        await engine.dispose()
+
+
+async def _maintain_partitions(args: argparse.Namespace) -> int:
+    if engine.dialect.name != "postgresql":
+        logger.error("Partitioning requires PostgreSQL (got %s)", engine.dialect.name)
+        return 1
+
+    table = Item.__tablename__
+
+    async with engine.begin() as conn:
+        if args.dry_run:
+            # 作成は DEFAULT パーティションの行の移動を伴うため、一覧だけ表示する
+            existing = {p.name for p in await list_partitions(conn, table)}
+            for partition in planned_partitions(table, args.months_ahead):
+                if partition.name not in existing:
+                    logger.info("Would create %s", partition.name)
+        else:
+            created = await ensure_partitions(
+                conn, table, months_ahead=args.months_ahead
+            )
+            logger.info("Ensured partitions: %s", ", ".join(p.name for p in created))
+
+        cold = find_cold_partitions(
+            await list_partitions(conn, table), args.older_than_months
+        )
+
+    if not cold:
+        logger.info("No partitions to archive")
+        return 0
+
+    for partition in cold:
+        if args.dry_run:
+            logger.info("Would archive %s", partition.name)
+            continue
+
+        # パーティションごとにトランザクションを分け、失敗時の影響を限定する
+        async with engine.begin() as conn:
+            rows = await archive_partition(
+                conn,
+                table,
+                partition,
+                destination=args.destination,
+                output_dir=args.output_dir,
+            )
+        logger.info("Archived %s (%d rows)", partition.name, rows)
+
+    return 0
+
+
+def main() -> None:
+    """エントリーポイント"""
+    args = parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
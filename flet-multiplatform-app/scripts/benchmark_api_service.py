@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+API Service Benchmark
+
+Measures 1,000 sequential GET calls against a local keep-alive HTTP server using
+the old per-call connection approach (module-level ``requests.get``, or
+``httpx.get`` when requests is not installed) and the pooled APIService, both
+through its blocking wrapper and directly from async code.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import httpx
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.frontend.api.transport import close_transport_pool  # noqa: E402
+from src.services.api_service import APIService, AsyncAPIService  # noqa: E402
+
+try:
+    import requests
+except ImportError:  # pragma: no cover - requests is optional
+    requests = None
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Returns a small JSON body and keeps the connection open."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+    body = json.dumps({"id": 1, "title": "item"}).encode()
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark APIService.")
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--json", type=Path, help="Write results to a JSON file")
+    return parser.parse_args()
+
+
+def _summarize(name: str, latencies: List[float], total: float) -> Dict[str, float]:
+    latencies.sort()
+    return {
+        "name": name,
+        "total_s": total,
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def measure_sync(name: str, call: Callable[[], object], calls: int) -> Dict[str, float]:
+    """Time ``calls`` sequential invocations of a blocking call."""
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return _summarize(name, latencies, time.perf_counter() - started)
+
+
+async def measure_async(base_url: str, calls: int) -> Dict[str, float]:
+    """Time ``calls`` sequential awaits on AsyncAPIService."""
+    service = AsyncAPIService(base_url=base_url)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        await service.get("items/1")
+        latencies.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - started
+    await service.close()
+    await close_transport_pool()
+    return _summarize("AsyncAPIService", latencies, total)
+
+
+def main() -> None:
+    """Entry point."""
+    args = parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    url = f"{base_url}/items/1"
+
+    results = []
+    if requests is not None:
+        results.append(
+            measure_sync(
+                "requests.get (before)", lambda: requests.get(url).json(), args.calls
+            )
+        )
+    else:
+        results.append(
+            measure_sync(
+                "httpx.get (before)", lambda: httpx.get(url).json(), args.calls
+            )
+        )
+
+    service = APIService(base_url=base_url)
+    results.append(
+        measure_sync("APIService (after)", lambda: service.get("items/1"), args.calls)
+    )
+    service.close()
+
+    results.append(asyncio.run(measure_async(base_url, args.calls)))
+    server.shutdown()
+
+    print(f"{'client':<24}{'total s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for result in results:
+        print(
+            f"{result['name']:<24}{result['total_s']:>10.3f}{result['mean_ms']:>10.3f}"
+            f"{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}"
+        )
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({"calls": args.calls, "results": results}, indent=2)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Item Partitioning Benchmark
+
+Compares recent-page latency of the item listing query on a plain table and on a
+table partitioned by created_at month. Both tables are filled with generated rows
+spread evenly over the last few years. Requires PostgreSQL (DATABASE_URL).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from backend.db.partitioning import (  # noqa: E402
+    add_months,
+    create_month_partition,
+    month_start,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+PLAIN_TABLE = "bench_item_plain"
+PARTITIONED_TABLE = "bench_item_partitioned"
+
+COLUMNS = """
+    id bigint NOT NULL,
+    title varchar(100) NOT NULL,
+    description text,
+    owner_id integer NOT NULL,
+    created_at timestamp NOT NULL,
+    updated_at timestamp
+"""
+
+RECENT_PAGE_QUERY = (
+    "SELECT * FROM {table} "
+    "WHERE created_at >= :since "
+    "ORDER BY created_at DESC, id DESC "
+    "LIMIT :limit"
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark item table partitioning.")
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("DATABASE_URL"),
+        help="PostgreSQL URL (postgresql+asyncpg://...)",
+    )
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--months", type=int, default=36, help="Months of history")
+    parser.add_argument("--window-days", type=int, default=7, help="Recent window")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the benchmark tables afterwards"
+    )
+    parser.add_argument("--json", type=Path, help="Write results to a JSON file")
+    return parser.parse_args()
+
+
+async def create_tables(
+    conn: AsyncConnection, rows: int, months: int, now: datetime
+) -> None:
+    """Create and fill the plain and partitioned benchmark tables."""
+    await drop_tables(conn)
+
+    await conn.execute(text(f"CREATE TABLE {PLAIN_TABLE} ({COLUMNS})"))
+    await conn.execute(
+        text(
+            f"CREATE TABLE {PARTITIONED_TABLE} ({COLUMNS}) "
+            "PARTITION BY RANGE (created_at)"
+        )
+    )
+    first = add_months(month_start(now), -months)
+    for offset in range(months + 1):
+        await create_month_partition(conn, PARTITIONED_TABLE, add_months(first, offset))
+
+    history = (now - first).total_seconds()
+    for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+        started = time.perf_counter()
+        await conn.execute(
+            text(
+                f"INSERT INTO {table} "
+                "SELECT g, 'item ' || g, NULL, (g % 1000) + 1, "
+                "CAST(:first AS timestamp) + (g * :step) * interval '1 second', NULL "
+                "FROM generate_series(1, :rows) AS g"
+            ),
+            {"first": first, "step": history / rows, "rows": rows},
+        )
+        await conn.execute(text(f"CREATE INDEX ON {table} (created_at DESC, id DESC)"))
+        await conn.execute(text(f"ANALYZE {table}"))
+        elapsed = time.perf_counter() - started
+        logger.info("Filled %s with %d rows in %.1fs", table, rows, elapsed)
+
+
+async def drop_tables(conn: AsyncConnection) -> None:
+    """Drop the benchmark tables."""
+    for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+        await conn.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+
+
+async def measure(
+    conn: AsyncConnection,
+    table: str,
+    since: datetime,
+    page_size: int,
+    iterations: int,
+) -> Dict[str, Any]:
+    """Run the recent-page query repeatedly and collect latency statistics."""
+    query = text(RECENT_PAGE_QUERY.format(table=table))
+    params = {"since": since, "limit": page_size}
+
+    # Warm up the buffer cache before measuring
+    for _ in range(5):
+        await conn.execute(query, params)
+
+    latencies: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        (await conn.execute(query, params)).fetchall()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    plan = await conn.execute(
+        text("EXPLAIN (FORMAT JSON) " + RECENT_PAGE_QUERY.format(table=table)), params
+    )
+    scanned = _count_relations(plan.scalar()[0]["Plan"])
+
+    latencies.sort()
+    return {
+        "table": table,
+        "median_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "max_ms": latencies[-1],
+        "relations_scanned": scanned,
+    }
+
+
+def _count_relations(plan: Dict[str, Any]) -> int:
+    """Count the relations scanned by a JSON query plan."""
+    count = 1 if "Relation Name" in plan else 0
+    return count + sum(_count_relations(child) for child in plan.get("Plans", []))
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print a before/after comparison table."""
+    print(f"{'table':<26}{'median ms':>12}{'p95 ms':>12}{'max ms':>12}{'scanned':>10}")
+    for result in results:
+        print(
+            f"{result['table']:<26}"
+            f"{result['median_ms']:>12.3f}"
+            f"{result['p95_ms']:>12.3f}"
+            f"{result['max_ms']:>12.3f}"
+            f"{result['relations_scanned']:>10}"
+        )
+    before, after = results
+    if after["median_ms"]:
+        print(f"\nmedian speedup: {before['median_ms'] / after['median_ms']:.2f}x")
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the benchmark."""
+    if not args.database_url or not args.database_url.startswith("postgresql"):
+        logger.error("A PostgreSQL DATABASE_URL is required")
+        return 1
+
+    engine = create_async_engine(args.database_url)
+    now = datetime.utcnow()
+    try:
+        async with engine.begin() as conn:
+            await create_tables(conn, args.rows, args.months, now)
+
+        since = now - timedelta(days=args.window_days)
+        async with engine.connect() as conn:
+            results = [
+                await measure(conn, table, since, args.page_size, args.iterations)
+                for table in (PLAIN_TABLE, PARTITIONED_TABLE)
+            ]
+
+        print_results(results)
+        if args.json:
+            args.json.write_text(
+                json.dumps(
+                    {"rows": args.rows, "months": args.months, "results": results},
+                    indent=2,
+                )
+            )
+
+        if not args.keep:
+            async with engine.begin() as conn:
+                await drop_tables(conn)
+    finally:
+        await engine.dispose()
+    return 0
+
+
+def main() -> None:
+    """Entry point."""
+    sys.exit(asyncio.run(run(parse_args())))
+
+
+if __name__ == "__main__":
+    main()
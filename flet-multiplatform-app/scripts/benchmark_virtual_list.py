@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Virtual List Benchmark
+
+Renders a 100,000 item list on a headless Flet page twice: as a plain Column
+holding one row control per item (the naive approach) and as VirtualList.
+For each it reports Python heap usage (tracemalloc), the number of controls
+and bytes sent to the client on first render, and the bytes sent per scroll
+step.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+import flet as ft
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.components.common.virtual_list import (  # noqa: E402
+    VirtualList,
+    default_bind_row,
+    default_create_row,
+)
+from src.frontend.utils.headless import create_headless_page  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+ITEM_EXTENT = 72
+VIEWPORT_HEIGHT = 800
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark VirtualList.")
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--scroll-steps", type=int, default=100)
+    parser.add_argument("--json", type=Path, help="Write results to a JSON file")
+    return parser.parse_args()
+
+
+def make_items(count: int) -> List[Dict[str, Any]]:
+    """Build the item payloads returned by the fake API."""
+    return [
+        {"id": i, "title": f"Item {i}", "description": f"Description of item {i}"}
+        for i in range(count)
+    ]
+
+
+def _control_count(conn) -> int:
+    return sum(
+        len(command.commands)
+        for message in conn.messages
+        for command in message.commands
+        if command.name == "add"
+    )
+
+
+async def bench_naive(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One row control per item inside a scrolling Column."""
+    page, conn = create_headless_page()
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    rows = []
+    for item in items:
+        row = default_create_row()
+        default_bind_row(row, item)
+        rows.append(ft.Container(content=row, height=ITEM_EXTENT))
+    page.add(ft.Column(rows, scroll=ft.ScrollMode.AUTO, spacing=0))
+
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "name": "Column (before)",
+        "render_s": elapsed,
+        "heap_mb": current / 2**20,
+        "peak_heap_mb": peak / 2**20,
+        "controls_sent": _control_count(conn),
+        "initial_bytes": conn.total_bytes,
+        # Scrolling happens on the client; nothing is sent
+        "bytes_per_scroll": 0.0,
+        "messages_per_scroll": 0.0,
+    }
+
+
+async def bench_virtual(
+    items: List[Dict[str, Any]], page_size: int, scroll_steps: int
+) -> Dict[str, Any]:
+    """VirtualList fed page by page from an in-memory fake API."""
+    page, conn = create_headless_page()
+
+    async def fetch_page(offset: int, limit: int) -> List[Dict[str, Any]]:
+        return items[offset : offset + limit]
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    item_list = VirtualList(
+        fetch_page,
+        item_extent=ITEM_EXTENT,
+        viewport_height=VIEWPORT_HEIGHT,
+        page_size=page_size,
+        max_pages=10,
+        total=len(items),
+    )
+    page.add(item_list)
+    await item_list.load_visible()
+
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    initial_bytes = conn.total_bytes
+    controls_sent = _control_count(conn)
+
+    # Scroll by one viewport per step, as a fling through the list would
+    conn.reset()
+    for step in range(1, scroll_steps + 1):
+        item_list.scroll_to_offset(step * VIEWPORT_HEIGHT)
+        await item_list.load_visible()
+
+    return {
+        "name": "VirtualList (after)",
+        "render_s": elapsed,
+        "heap_mb": current / 2**20,
+        "peak_heap_mb": peak / 2**20,
+        "controls_sent": controls_sent,
+        "initial_bytes": initial_bytes,
+        "bytes_per_scroll": conn.total_bytes / scroll_steps,
+        "messages_per_scroll": len(conn.messages) / scroll_steps,
+    }
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Run both variants against the same data set."""
+    items = make_items(args.items)
+    logger.info(f"Rendering {args.items} items")
+    return [
+        await bench_naive(items),
+        await bench_virtual(items, args.page_size, args.scroll_steps),
+    ]
+
+
+def main() -> None:
+    """Entry point."""
+    args = parse_args()
+    results = asyncio.run(run(args))
+
+    print(
+        f"{'list':<22}{'render s':>10}{'heap MB':>10}{'peak MB':>10}"
+        f"{'controls':>10}{'initial KB':>12}{'B/scroll':>10}"
+    )
+    for result in results:
+        print(
+            f"{result['name']:<22}{result['render_s']:>10.2f}{result['heap_mb']:>10.1f}"
+            f"{result['peak_heap_mb']:>10.1f}{result['controls_sent']:>10}"
+            f"{result['initial_bytes'] / 1024:>12.1f}"
+            f"{result['bytes_per_scroll']:>10.0f}"
+        )
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({"items": args.items, "results": results}, indent=2)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,38 @@ Performance Regression Checker
 
 This script compares current performance metrics against baseline metrics
 to detect performance regressions.
+
+Each numeric metric is classified by direction (lower is better for
+latencies and error rates, higher is better for throughput; counters such
+as request totals are ignored), so improvements are never reported as
+regressions.
+
+Either side may be given as several metrics files, one per run. With at
+least ``MIN_RUNS`` runs per side a change only counts when it is
+statistically significant (one-sided Mann-Whitney U test) and the bootstrap
+confidence interval of the relative change excludes zero. In every case the
+change must also exceed the larger of ``--threshold`` and the metric's noise
+floor, estimated from the run-to-run variance in ``--history`` files (or in
+the baseline runs when no history is given).
 """
 
 import argparse
+import fnmatch
 import json
 import logging
 import os
+import statistics
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.backend.tests.performance.utils.stats import (  # noqa: E402
+    bootstrap_ci,
+    mann_whitney_u,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -20,22 +43,122 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Metric directions
+LOWER_IS_BETTER = "lower"
+HIGHER_IS_BETTER = "higher"
+IGNORE = "ignore"
+
+# Direction of each metric, matched against its dotted path; first match wins
+METRIC_RULES: List[Tuple[str, str]] = [
+    ("metadata.*", IGNORE),
+    ("time_series.*", IGNORE),
+    ("*concurrent_users*", IGNORE),
+    ("*total_requests", IGNORE),
+    ("*.requests", IGNORE),
+    ("*duration*", IGNORE),
+    ("*timestamp*", IGNORE),
+    ("*success_rate*", HIGHER_IS_BETTER),
+    ("*throughput*", HIGHER_IS_BETTER),
+    ("*requests_per_second*", HIGHER_IS_BETTER),
+    ("*rps*", HIGHER_IS_BETTER),
+    ("*error*", LOWER_IS_BETTER),
+    ("*failed*", LOWER_IS_BETTER),
+    ("*fail*", LOWER_IS_BETTER),
+    ("*response_time*", LOWER_IS_BETTER),
+    ("*latency*", LOWER_IS_BETTER),
+    ("*memory*", LOWER_IS_BETTER),
+    ("*cpu*", LOWER_IS_BETTER),
+]
+
+# Runs per side needed for significance testing
+MIN_RUNS = 3
+
+
+def metric_direction(metric: str, rules: List[Tuple[str, str]] = METRIC_RULES) -> str:
+    """Return whether lower or higher values of a metric are better."""
+    for pattern, direction in rules:
+        if fnmatch.fnmatch(metric, pattern):
+            return direction
+    return IGNORE
+
+
+def flatten_metrics(metrics: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Flatten nested metrics into ``{"dotted.path": value}`` for numeric values."""
+    flat = {}
+    for key, value in metrics.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = float(value)
+    return flat
+
+
+def expand_paths(paths: List[str]) -> List[Path]:
+    """Expand directories into the JSON files they contain."""
+    expanded = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            # Profiles are saved next to the results but hold no metrics
+            expanded.extend(
+                sorted(
+                    p
+                    for p in path.glob("*.json")
+                    if not p.name.endswith(".speedscope.json")
+                )
+            )
+        else:
+            expanded.append(path)
+    return expanded
+
 
 class PerformanceRegressionChecker:
     """Check for performance regressions by comparing against baseline metrics."""
 
-    def __init__(self, baseline_path: str, current_path: str, threshold: float = 0.1):
+    def __init__(
+        self,
+        baseline_path: Any,
+        current_path: Any,
+        threshold: float = 0.1,
+        history_paths: Optional[List[Any]] = None,
+        alpha: float = 0.05,
+        noise_multiplier: float = 3.0,
+        bootstrap_resamples: int = 2000,
+        seed: Optional[int] = 0,
+        rules: Optional[List[Tuple[str, str]]] = None,
+    ):
         """Initialize the performance regression checker.
 
         Args:
-            baseline_path: Path to the baseline metrics JSON file
-            current_path: Path to the current metrics JSON file
-            threshold: Percentage threshold (0-1) for considering a regression
+            baseline_path: Path (or list of paths, one per run) to baseline metrics
+            current_path: Path (or list of paths, one per run) to current metrics
+            threshold: Smallest relative change (0-1) considered meaningful
+            history_paths: Earlier runs used to estimate each metric's noise floor
+            alpha: Significance level for the tests and confidence intervals
+            noise_multiplier: Noise floor as a multiple of the historical
+                coefficient of variation
+            bootstrap_resamples: Resamples for the bootstrap confidence interval
+            seed: Seed for reproducible confidence intervals
+            rules: Metric direction rules (defaults to ``METRIC_RULES``)
         """
-        self.baseline_path = Path(baseline_path)
-        self.current_path = Path(current_path)
+        self.baseline_paths = self._as_paths(baseline_path)
+        self.current_paths = self._as_paths(current_path)
+        self.history_paths = self._as_paths(history_paths or [])
         self.threshold = threshold
-        self.regressions = []
+        self.alpha = alpha
+        self.noise_multiplier = noise_multiplier
+        self.bootstrap_resamples = bootstrap_resamples
+        self.seed = seed
+        self.rules = rules if rules is not None else METRIC_RULES
+        self.results: List[Dict[str, Any]] = []
+        self.regressions: List[Dict[str, Any]] = []
+        self.improvements: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def _as_paths(paths: Any) -> List[Path]:
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        return expand_paths([str(path) for path in paths])
 
     def load_metrics(self, file_path: Path) -> Dict[str, Any]:
         """Load metrics from a JSON file.
@@ -56,49 +179,147 @@ class PerformanceRegressionChecker:
             logger.error(f"Invalid JSON in metrics file {file_path}: {e}")
             sys.exit(1)
 
+    def load_runs(self, paths: List[Path]) -> List[Dict[str, float]]:
+        """Load and flatten the metrics of several runs."""
+        return [flatten_metrics(self.load_metrics(path)) for path in paths]
+
+    def noise_floor(
+        self, metric: str, history: List[Dict[str, float]], baseline: List[float]
+    ) -> Optional[float]:
+        """Estimate the relative change that run-to-run noise alone produces.
+
+        Uses the coefficient of variation across the history runs, falling
+        back to the baseline runs, times ``noise_multiplier``.
+        """
+        values = [run[metric] for run in history if metric in run]
+        if len(values) < MIN_RUNS:
+            values = baseline
+        if len(values) < 2:
+            return None
+        mean = statistics.mean(values)
+        if mean == 0:
+            return None
+        return self.noise_multiplier * statistics.stdev(values) / abs(mean)
+
+    def compare_metric(
+        self,
+        metric: str,
+        direction: str,
+        baseline: List[float],
+        current: List[float],
+        history: List[Dict[str, float]],
+    ) -> Dict[str, Any]:
+        """Compare one metric across runs and classify the change."""
+        base_median = statistics.median(baseline)
+        cur_median = statistics.median(current)
+        if base_median == 0:
+            change = 0.0 if cur_median == 0 else float("inf")
+        else:
+            change = (cur_median - base_median) / abs(base_median)
+        # Positive means worse, whichever direction the metric goes
+        sign = 1 if direction == LOWER_IS_BETTER else -1
+        worse_change = sign * change
+
+        noise = self.noise_floor(metric, history, baseline)
+        min_change = max(self.threshold, noise or 0.0)
+        result: Dict[str, Any] = {
+            "metric": metric,
+            "direction": direction,
+            "baseline": base_median,
+            "current": cur_median,
+            "baseline_runs": len(baseline),
+            "current_runs": len(current),
+            "change": change,
+            "diff_percent": change * 100,
+            "noise_floor": noise,
+            "min_change": min_change,
+            "p_value": None,
+            "ci": None,
+        }
+
+        significant_worse = significant_better = True
+        if len(baseline) >= MIN_RUNS and len(current) >= MIN_RUNS:
+            low, high = bootstrap_ci(
+                baseline,
+                current,
+                confidence=1 - self.alpha,
+                n_resamples=self.bootstrap_resamples,
+                seed=self.seed,
+            )
+            result["ci"] = [low, high]
+            if direction == LOWER_IS_BETTER:
+                _, p_worse = mann_whitney_u(baseline, current)
+                _, p_better = mann_whitney_u(current, baseline)
+                ci_worse, ci_better = low > 0, high < 0
+            else:
+                _, p_worse = mann_whitney_u(current, baseline)
+                _, p_better = mann_whitney_u(baseline, current)
+                ci_worse, ci_better = high < 0, low > 0
+            result["p_value"] = p_worse if worse_change >= 0 else p_better
+            significant_worse = p_worse < self.alpha and ci_worse
+            significant_better = p_better < self.alpha and ci_better
+
+        if worse_change > min_change and significant_worse:
+            result["verdict"] = "regression"
+        elif -worse_change > min_change and significant_better:
+            result["verdict"] = "improvement"
+        else:
+            result["verdict"] = "unchanged"
+        return result
+
     def check_regression(
-        self, baseline: Dict[str, Any], current: Dict[str, Any], prefix: str = ""
+        self,
+        baseline_runs: List[Dict[str, float]],
+        current_runs: List[Dict[str, float]],
+        history_runs: Optional[List[Dict[str, float]]] = None,
     ) -> None:
-        """Recursively check for regressions in nested metrics.
+        """Check every metric present in the baseline for regressions.
 
         Args:
-            baseline: Baseline metrics dictionary
-            current: Current metrics dictionary
-            prefix: Current path in the metrics hierarchy (for error messages)
+            baseline_runs: Flattened metrics of each baseline run
+            current_runs: Flattened metrics of each current run
+            history_runs: Flattened metrics of earlier runs for noise estimation
         """
-        for key, baseline_value in baseline.items():
-            current_value = current.get(key)
-
-            if current_value is None:
-                logger.warning(f"Key {prefix}{key} not found in current metrics")
+        history_runs = history_runs or []
+        metrics = sorted({metric for run in baseline_runs for metric in run})
+        for metric in metrics:
+            direction = metric_direction(metric, self.rules)
+            if direction == IGNORE:
                 continue
-
-            current_path = f"{prefix}{key}." if prefix else f"{key}."
-
-            # Recursively check nested dictionaries
-            if isinstance(baseline_value, dict) and isinstance(current_value, dict):
-                self.check_regression(baseline_value, current_value, current_path)
+            baseline = [run[metric] for run in baseline_runs if metric in run]
+            current = [run[metric] for run in current_runs if metric in run]
+            if not current:
+                logger.warning(f"Key {metric} not found in current metrics")
+                self.results.append(
+                    {"metric": metric, "direction": direction, "verdict": "missing"}
+                )
                 continue
 
-            # Compare numeric values
-            if isinstance(baseline_value, (int, float)) and isinstance(
-                current_value, (int, float)
-            ):
-                if baseline_value == 0:
-                    # Avoid division by zero
-                    diff_percent = float("inf")
-                else:
-                    diff_percent = abs(current_value - baseline_value) / baseline_value
-
-                if diff_percent > self.threshold:
-                    self.regressions.append(
-                        {
-                            "metric": prefix + key,
-                            "baseline": baseline_value,
-                            "current": current_value,
-                            "diff_percent": diff_percent * 100,
-                        }
-                    )
+            result = self.compare_metric(
+                metric, direction, baseline, current, history_runs
+            )
+            self.results.append(result)
+            if result["verdict"] == "regression":
+                self.regressions.append(result)
+            elif result["verdict"] == "improvement":
+                self.improvements.append(result)
+
+    def verdict(self) -> Dict[str, Any]:
+        """Return the machine-readable result of the check."""
+        return {
+            "verdict": "fail" if self.regressions else "pass",
+            "regressions": [r["metric"] for r in self.regressions],
+            "improvements": [r["metric"] for r in self.improvements],
+            "settings": {
+                "threshold": self.threshold,
+                "alpha": self.alpha,
+                "noise_multiplier": self.noise_multiplier,
+                "baseline_runs": [str(path) for path in self.baseline_paths],
+                "current_runs": [str(path) for path in self.current_paths],
+                "history_runs": len(self.history_paths),
+            },
+            "metrics": self.results,
+        }
 
     def generate_report(self) -> str:
         """Generate a human-readable report of performance regressions.
@@ -106,43 +327,74 @@ class PerformanceRegressionChecker:
         Returns:
             String containing the formatted report
         """
+        lines = []
         if not self.regressions:
-            return "✅ No performance regressions detected."
-
-        report = ["⚠️  Performance Regressions Detected ⚠️\n"]
-        report.append(f"{'Metric':<40} {'Baseline':>15} {'Current':>15} {'Diff %':>10}")
-        report.append("-" * 80)
-
-        for reg in sorted(
-            self.regressions, key=lambda x: x["diff_percent"], reverse=True
-        ):
-            report.append(
-                f"{reg['metric']:<40} "
-                f"{reg['baseline']:>15.2f} "
-                f"{reg['current']:>15.2f} "
-                f"{reg['diff_percent']:>9.1f}%"
+            lines.append("✅ No performance regressions detected.")
+        else:
+            lines.append("⚠️  Performance Regressions Detected ⚠️\n")
+            lines.extend(self._format_table(self.regressions))
+
+        if self.improvements:
+            lines.append("\n🚀 Performance Improvements\n")
+            lines.extend(self._format_table(self.improvements))
+        return "\n".join(lines)
+
+    def _format_table(self, results: List[Dict[str, Any]]) -> List[str]:
+        lines = [
+            f"{'Metric':<40} {'Baseline':>12} {'Current':>12} {'Diff %':>9} "
+            f"{'Min %':>7} {'p':>7}"
+        ]
+        lines.append("-" * 92)
+        for result in sorted(results, key=lambda r: abs(r["change"]), reverse=True):
+            p_value = "-" if result["p_value"] is None else f"{result['p_value']:.3f}"
+            lines.append(
+                f"{result['metric']:<40} "
+                f"{result['baseline']:>12.2f} "
+                f"{result['current']:>12.2f} "
+                f"{result['diff_percent']:>+8.1f}% "
+                f"{result['min_change'] * 100:>6.1f}% "
+                f"{p_value:>7}"
             )
+        return lines
 
-        return "\n".join(report)
-
-    def run(self) -> bool:
+    def run(self, output_json: Optional[Path] = None) -> bool:
         """Run the performance regression check.
 
+        Args:
+            output_json: Where to write the machine-readable verdict
+
         Returns:
             bool: True if no regressions found, False otherwise
         """
-        logger.info(f"Loading baseline metrics from {self.baseline_path}")
-        baseline_metrics = self.load_metrics(self.baseline_path)
+        logger.info(f"Loading baseline metrics from {len(self.baseline_paths)} run(s)")
+        baseline_runs = self.load_runs(self.baseline_paths)
 
-        logger.info(f"Loading current metrics from {self.current_path}")
-        current_metrics = self.load_metrics(self.current_path)
+        logger.info(f"Loading current metrics from {len(self.current_paths)} run(s)")
+        current_runs = self.load_runs(self.current_paths)
+
+        history_runs = self.load_runs(self.history_paths)
+        if history_runs:
+            logger.info(
+                f"Estimating noise floors from {len(history_runs)} historical run(s)"
+            )
+        if min(len(baseline_runs), len(current_runs)) < MIN_RUNS:
+            logger.warning(
+                f"Fewer than {MIN_RUNS} runs on a side; changes are judged against "
+                "the threshold and noise floor only"
+            )
 
         logger.info("Checking for performance regressions...")
-        self.check_regression(baseline_metrics, current_metrics)
+        self.check_regression(baseline_runs, current_runs, history_runs)
 
         report = self.generate_report()
         print("\n" + report + "\n")
 
+        if output_json is not None:
+            output_json.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_json, "w") as f:
+                json.dump(self.verdict(), f, indent=2)
+            logger.info(f"Verdict written to {output_json}")
+
         if self.regressions:
             logger.error(f"Detected {len(self.regressions)} performance regressions")
             return False
@@ -155,16 +407,58 @@ def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Check for performance regressions.")
     parser.add_argument(
-        "--baseline", required=True, help="Path to baseline metrics JSON file"
+        "--baseline",
+        required=True,
+        nargs="+",
+        help="Baseline metrics JSON file(s) or directory, one file per run",
     )
     parser.add_argument(
-        "--current", required=True, help="Path to current metrics JSON file"
+        "--current",
+        required=True,
+        nargs="+",
+        help="Current metrics JSON file(s) or directory, one file per run",
+    )
+    parser.add_argument(
+        "--history",
+        nargs="*",
+        default=[],
+        help="Earlier metrics JSON files or directories used to estimate noise",
     )
     parser.add_argument(
         "--threshold",
         type=float,
         default=0.1,
-        help="Threshold for considering a regression (0-1, default: 0.1 for 10%)",
+        help=(
+            "Smallest relative change considered a regression "
+            "(0-1, default: 0.1 for 10%%)"
+        ),
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="Significance level when several runs are given (default: 0.05)",
+    )
+    parser.add_argument(
+        "--noise-multiplier",
+        type=float,
+        default=3.0,
+        help="Noise floor as a multiple of the historical coefficient of variation",
+    )
+    parser.add_argument(
+        "--metric-rules",
+        type=Path,
+        default=None,
+        help=(
+            'JSON list of ["pattern", "lower|higher|ignore"] pairs '
+            "checked before the defaults"
+        ),
+    )
+    parser.add_argument(
+        "--output-json",
+        type=Path,
+        default=os.getenv("PERF_VERDICT_PATH"),
+        help="Write the verdict as JSON to this path",
     )
     return parser.parse_args()
 
@@ -173,11 +467,22 @@ def main() -> None:
     """Main function."""
     args = parse_args()
 
+    rules = METRIC_RULES
+    if args.metric_rules:
+        with open(args.metric_rules, "r") as f:
+            rules = [tuple(rule) for rule in json.load(f)] + METRIC_RULES
+
     checker = PerformanceRegressionChecker(
-        baseline_path=args.baseline, current_path=args.current, threshold=args.threshold
+        baseline_path=args.baseline,
+        current_path=args.current,
+        threshold=args.threshold,
+        history_paths=args.history,
+        alpha=args.alpha,
+        noise_multiplier=args.noise_multiplier,
+        rules=rules,
     )
 
-    success = checker.run()
+    success = checker.run(Path(args.output_json) if args.output_json else None)
     sys.exit(0 if success else 1)
 
 
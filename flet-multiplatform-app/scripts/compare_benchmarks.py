@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark Baselines
+
+Runs the backend microbenchmarks (``src/backend/tests/performance/
+test_microbenchmarks.py``) with pytest-benchmark, stores per-machine
+baselines, and compares a run against a baseline.
+
+The benchmarks are run ``--repeat`` times in separate processes. Rounds
+within one process share its memory layout, CPU frequency and neighbours,
+so they understate how much results move between runs; the comparison
+therefore tests the per-run medians. A benchmark counts as slower only when
+the difference is both statistically significant (one-sided Mann-Whitney U
+test, p < ``--alpha``) and larger than ``--min-change`` of the baseline
+median, so run-to-run noise does not fail the comparison and neither do
+trivially small but significant shifts. A few runs cannot reach ``--alpha``
+even when every current run is slower than every baseline run (3 against 3
+give p = 0.04 at best), so with too few runs for the given ``--alpha`` the
+per-round timings are tested instead. At the default alpha of 0.01 that
+takes five runs per side, the default ``--repeat``.
+
+Baselines are only valid for the machine id they were recorded on
+(``<system>-<implementation>-<python version>-<bits>``). The stored
+``Linux-CPython-3.13-64bit.json`` matches the Python the project requires;
+elsewhere (such as the Python 3.11 CI) ``run --compare`` finds no baseline
+until one is recorded there with ``run --save-baseline``.
+
+Usage:
+    # Record a baseline for this machine
+    python scripts/compare_benchmarks.py run --save-baseline
+
+    # Run and compare against this machine's baseline (exit code 1 on slowdowns)
+    python scripts/compare_benchmarks.py run --compare
+
+    # Compare two summaries (or raw pytest-benchmark JSON files)
+    python scripts/compare_benchmarks.py compare baseline.json current.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.backend.tests.performance.utils.stats import (  # noqa: E402
+    mann_whitney_u,
+    welch_t_test,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+BENCHMARK_MODULE = "backend/tests/performance/test_microbenchmarks.py"
+BASELINE_DIR = SRC_DIR / "backend" / "tests" / "performance" / "baselines"
+
+# Raw timings kept per benchmark (quantile-subsampled)
+MAX_SAMPLES = 200
+
+
+def machine_id() -> str:
+    """Identify the machine/interpreter, as baselines are only valid on the same one."""
+    return "-".join(
+        [
+            platform.system(),
+            platform.python_implementation(),
+            ".".join(platform.python_version_tuple()[:2]),
+            platform.architecture()[0],
+        ]
+    )
+
+
+def default_baseline_path() -> Path:
+    return BASELINE_DIR / f"{machine_id()}.json"
+
+
+def run_medians_can_be_significant(
+    baseline_runs: int, current_runs: int, alpha: float
+) -> bool:
+    """Whether per-run medians of these run counts can reach ``p < alpha``.
+
+    The smallest p-value is the one for complete separation of the two sides.
+    """
+    if baseline_runs < 2 or current_runs < 2:
+        return False
+    _, p_best = mann_whitney_u(
+        range(baseline_runs), range(baseline_runs, baseline_runs + current_runs)
+    )
+    return p_best < alpha
+
+
+def subsample(values: List[float], max_samples: int = MAX_SAMPLES) -> List[float]:
+    """Reduce timings to evenly spaced order statistics, keeping the distribution."""
+    ordered = sorted(values)
+    if len(ordered) <= max_samples:
+        return ordered
+    step = (len(ordered) - 1) / (max_samples - 1)
+    return [ordered[round(i * step)] for i in range(max_samples)]
+
+
+def run_benchmarks(
+    output_dir: Path, repeat: int = 5, keyword: Optional[str] = None
+) -> List[Path]:
+    """Run the microbenchmarks ``repeat`` times, one pytest process per run.
+
+    Returns:
+        Paths of the pytest-benchmark JSON files, one per run
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    env = {
+        **os.environ,
+        "TESTING": "True",
+        "PYTHONPATH": os.pathsep.join([str(PROJECT_ROOT), str(SRC_DIR)]),
+    }
+    paths = []
+    for run in range(repeat):
+        output = (output_dir / f"run_{run}.json").resolve()
+        cmd = [
+            sys.executable,
+            "-m",
+            "pytest",
+            BENCHMARK_MODULE,
+            "-q",
+            "-p",
+            "no:cacheprovider",
+            "-o",
+            "addopts=",
+            "--confcutdir=backend/tests/performance",
+            "--perf-test",
+            "--benchmark-only",
+            f"--benchmark-json={output}",
+        ]
+        if keyword:
+            cmd.extend(["-k", keyword])
+        logger.info(f"Running microbenchmarks ({run + 1}/{repeat})")
+        result = subprocess.run(cmd, cwd=SRC_DIR, env=env)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Microbenchmarks failed with exit code {result.returncode}"
+            )
+        paths.append(output)
+    return paths
+
+
+def summarize_runs(paths: List[Path]) -> Dict[str, Any]:
+    """Combine pytest-benchmark JSON files into a baseline summary."""
+    benchmarks: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        with open(path, "r") as f:
+            data = json.load(f)
+        for bench in data.get("benchmarks", []):
+            entry = benchmarks.setdefault(
+                bench["fullname"],
+                {"group": bench.get("group"), "run_medians": [], "data": []},
+            )
+            entry["run_medians"].append(bench["stats"]["median"])
+            entry["data"].extend(bench["stats"].get("data", []))
+
+    for entry in benchmarks.values():
+        entry["median"] = statistics.median(entry["run_medians"])
+        entry["data"] = subsample(entry["data"])
+
+    return {
+        "machine_id": machine_id(),
+        "created_at": datetime.now().isoformat(),
+        "runs": len(paths),
+        "benchmarks": benchmarks,
+    }
+
+
+def load_summary(path: Path) -> Dict[str, Any]:
+    """Load a summary written by this script or a raw pytest-benchmark JSON file."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    if isinstance(data.get("benchmarks"), list):
+        return summarize_runs([path])
+    return data
+
+
+def compare_benchmark(
+    name: str,
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    alpha: float,
+    min_change: float,
+) -> Dict[str, Any]:
+    """Compare one benchmark and classify it as slower, faster or unchanged."""
+    base_runs, cur_runs = baseline["run_medians"], current["run_medians"]
+    if run_medians_can_be_significant(len(base_runs), len(cur_runs), alpha):
+        base_samples, cur_samples = base_runs, cur_runs
+        test = "mann-whitney (run medians)"
+    elif baseline["data"] and current["data"]:
+        base_samples, cur_samples = baseline["data"], current["data"]
+        test = "mann-whitney (rounds)"
+    else:
+        base_samples = cur_samples = None
+        test = "welch (run medians)"
+
+    base_center, cur_center = baseline["median"], current["median"]
+    if base_samples is not None:
+        _, p_slower = mann_whitney_u(base_samples, cur_samples)
+        _, p_faster = mann_whitney_u(cur_samples, base_samples)
+    elif len(base_runs) >= 2 and len(cur_runs) >= 2:
+        _, p_slower = welch_t_test(
+            statistics.mean(base_runs),
+            statistics.stdev(base_runs),
+            len(base_runs),
+            statistics.mean(cur_runs),
+            statistics.stdev(cur_runs),
+            len(cur_runs),
+        )
+        p_faster = 1 - p_slower
+    else:
+        # A single median per side cannot show significance
+        p_slower = p_faster = 1.0
+
+    change = (cur_center - base_center) / base_center if base_center else 0.0
+    if p_slower < alpha and change > min_change:
+        verdict = "slower"
+    elif p_faster < alpha and change < -min_change:
+        verdict = "faster"
+    else:
+        verdict = "unchanged"
+
+    return {
+        "name": name,
+        "group": current.get("group"),
+        "baseline": base_center,
+        "current": cur_center,
+        "change": change,
+        "p_value": p_slower if change >= 0 else p_faster,
+        "test": test,
+        "verdict": verdict,
+    }
+
+
+def compare_summaries(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    alpha: float = 0.01,
+    min_change: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """Compare every benchmark present in both summaries."""
+    if baseline.get("machine_id") != current.get("machine_id"):
+        logger.warning(
+            f"Baseline was recorded on {baseline.get('machine_id')}, "
+            f"current run is {current.get('machine_id')}"
+        )
+    runs = (baseline.get("runs", 1), current.get("runs", 1))
+    if not run_medians_can_be_significant(*runs, alpha):
+        logger.warning(
+            f"{runs[0]} baseline and {runs[1]} current runs cannot reach "
+            f"p < {alpha}; testing per-round timings, which understates "
+            "run-to-run noise"
+        )
+    base, cur = baseline["benchmarks"], current["benchmarks"]
+    for name in sorted(set(base) - set(cur)):
+        logger.warning(f"Benchmark {name} not found in current results")
+    for name in sorted(set(cur) - set(base)):
+        logger.warning(f"Benchmark {name} has no baseline")
+
+    return [
+        compare_benchmark(name, base[name], cur[name], alpha, min_change)
+        for name in sorted(set(base) & set(cur))
+    ]
+
+
+def print_comparison(comparisons: List[Dict[str, Any]]) -> None:
+    """Print a comparison table."""
+    print(
+        f"\n{'Benchmark':<40} {'Baseline':>12} {'Current':>12} "
+        f"{'Change':>9} {'p':>8}  Verdict"
+    )
+    print("-" * 95)
+    for item in comparisons:
+        name = item["name"].rpartition("::")[2]
+        print(
+            f"{name:<40} {item['baseline'] * 1e6:>10.2f}us "
+            f"{item['current'] * 1e6:>10.2f}us "
+            f"{item['change']:>+8.1%} {item['p_value']:>8.4f}  {item['verdict']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run backend microbenchmarks and compare them against baselines"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the microbenchmarks")
+    run_parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=PROJECT_ROOT / "reports" / "benchmarks",
+        help="Directory for the per-run JSON files and the summary",
+    )
+    run_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of separate benchmark runs (default: 5)",
+    )
+    run_parser.add_argument("-k", dest="keyword", help="Only run matching benchmarks")
+    run_parser.add_argument(
+        "--save-baseline", action="store_true", help="Store the runs as the baseline"
+    )
+    run_parser.add_argument(
+        "--compare", action="store_true", help="Compare the runs against the baseline"
+    )
+    run_parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help=f"Baseline file (default: {BASELINE_DIR.name}/<machine id>.json)",
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare two summaries or pytest-benchmark JSON files"
+    )
+    compare_parser.add_argument("baseline_file", type=Path, help="Baseline JSON")
+    compare_parser.add_argument("current_file", type=Path, help="Current JSON")
+
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument(
+            "--alpha",
+            type=float,
+            default=0.01,
+            help="Significance level for the one-sided test (default: 0.01)",
+        )
+        subparser.add_argument(
+            "--min-change",
+            type=float,
+            default=0.05,
+            help="Smallest relative slowdown that fails the comparison (default: 0.05)",
+        )
+        subparser.add_argument(
+            "--json", type=Path, default=None, help="Write the comparison as JSON"
+        )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        baseline_path = args.baseline or default_baseline_path()
+        try:
+            paths = run_benchmarks(args.output_dir, args.repeat, args.keyword)
+        except RuntimeError as e:
+            logger.error(str(e))
+            return 1
+        current = summarize_runs(paths)
+        with open(args.output_dir / "summary.json", "w") as f:
+            json.dump(current, f, indent=2)
+        if args.save_baseline:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(baseline_path, "w") as f:
+                json.dump(current, f, indent=2)
+            logger.info(f"Baseline saved to {baseline_path}")
+        if not args.compare:
+            return 0
+    else:
+        baseline_path = args.baseline_file
+        current = load_summary(args.current_file)
+
+    if not baseline_path.exists():
+        available = sorted(path.stem for path in BASELINE_DIR.glob("*.json"))
+        logger.error(
+            f"Baseline not found: {baseline_path} "
+            "(record one with 'run --save-baseline'; stored baselines: "
+            f"{', '.join(available) or 'none'})"
+        )
+        return 1
+
+    comparisons = compare_summaries(
+        load_summary(baseline_path), current, args.alpha, args.min_change
+    )
+    print_comparison(comparisons)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(comparisons, f, indent=2)
+
+    slower = [item for item in comparisons if item["verdict"] == "slower"]
+    if slower:
+        logger.error(f"{len(slower)} benchmark(s) significantly slower than baseline")
+        return 1
+    logger.info("No significant slowdowns")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
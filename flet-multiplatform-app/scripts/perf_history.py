@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Performance History
+
+Ingests performance results into the local results store
+(``src/backend/tests/performance/utils/results_store.py``) and queries it:
+metric trends over time, a rolling baseline of recent runs, and the runs
+where a metric shifted to a new level.
+
+All result formats written by the test tooling are recognized (Locust JSON
+and summary CSV, ``*_report.json``, ``*_results.json`` and the pytest perf
+suite files). Ingesting is incremental, so it is cheap to run after every
+test run.
+
+Usage:
+    # Ingest everything under the results directories
+    python scripts/perf_history.py ingest results/ reports/performance/
+
+    # p95 latency of the load scenario over the last 20 runs
+    python scripts/perf_history.py trend response_time_ms.p95 --scenario load --limit 20
+
+    # Median and spread of the last 10 runs
+    python scripts/perf_history.py baseline response_time_ms.p95 --scenario load
+
+    # Runs where the metric changed level
+    python scripts/perf_history.py changepoints response_time_ms.p95 --scenario load
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.backend.tests.performance.utils.results_store import (  # noqa: E402
+    DEFAULT_DB_PATH,
+    ResultsStore,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _print(data: Any, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(data, indent=2, default=str))
+        return
+    for row in data if isinstance(data, list) else [data]:
+        print("  ".join(f"{key}={value}" for key, value in row.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Store and query performance result history"
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=DEFAULT_DB_PATH,
+        help=f"Database file (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser(
+        "ingest", help="Ingest result files or directories"
+    )
+    ingest_parser.add_argument(
+        "paths", nargs="+", type=Path, help="Files or directories"
+    )
+    ingest_parser.add_argument(
+        "--commit",
+        default=None,
+        help="Commit for runs that do not record one (default: none)",
+    )
+
+    for name, help_text in (
+        ("trend", "Show a metric over time"),
+        ("baseline", "Summarize a metric over recent runs"),
+        ("changepoints", "Find runs where a metric changed level"),
+    ):
+        query_parser = subparsers.add_parser(name, help=help_text)
+        query_parser.add_argument(
+            "metric", help="Metric name, e.g. response_time_ms.p95"
+        )
+        query_parser.add_argument(
+            "--scenario", default=None, help="Scenario or test name"
+        )
+        query_parser.add_argument(
+            "--endpoint", default="", help="Endpoint (default: whole-run metrics)"
+        )
+        if name == "trend":
+            query_parser.add_argument("--since", default=None, help="ISO start time")
+            query_parser.add_argument(
+                "--limit", type=int, default=None, help="Latest N runs"
+            )
+        elif name == "baseline":
+            query_parser.add_argument(
+                "--window", type=int, default=10, help="Number of runs (default: 10)"
+            )
+            query_parser.add_argument(
+                "--before", default=None, help="Only runs before this ISO time"
+            )
+        else:
+            query_parser.add_argument(
+                "--alpha",
+                type=float,
+                default=0.01,
+                help="Significance level (default: 0.01)",
+            )
+            query_parser.add_argument(
+                "--min-change",
+                type=float,
+                default=0.05,
+                help="Smallest relative change reported (default: 0.05)",
+            )
+            query_parser.add_argument(
+                "--min-size",
+                type=int,
+                default=3,
+                help="Fewest runs per segment (default: 3)",
+            )
+
+    subparsers.add_parser("scenarios", help="List stored scenarios")
+
+    args = parser.parse_args()
+
+    with ResultsStore(args.db) as store:
+        if args.command == "ingest":
+            added = 0
+            for path in args.paths:
+                if not path.exists():
+                    logger.warning(f"Skipping missing path: {path}")
+                    continue
+                added += store.ingest_path(path, commit=args.commit)
+            logger.info(f"Ingested {added} new run(s) into {args.db}")
+        elif args.command == "trend":
+            _print(
+                store.trend(
+                    args.metric, args.scenario, args.endpoint, args.since, args.limit
+                ),
+                args.json,
+            )
+        elif args.command == "baseline":
+            baseline = store.rolling_baseline(
+                args.metric, args.scenario, args.endpoint, args.window, args.before
+            )
+            if not args.json:
+                baseline = {
+                    key: value for key, value in baseline.items() if key != "values"
+                }
+            _print(baseline, args.json)
+        elif args.command == "changepoints":
+            changes = store.change_points(
+                args.metric,
+                args.scenario,
+                args.endpoint,
+                args.min_size,
+                args.alpha,
+                args.min_change,
+            )
+            if not changes and not args.json:
+                print("No change points found")
+            else:
+                _print(changes, args.json)
+        else:
+            _print([{"scenario": name} for name in store.scenarios()], args.json)
+
+
+if __name__ == "__main__":
+    main()
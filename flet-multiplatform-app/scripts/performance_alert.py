@@ -7,16 +7,24 @@ This script analyzes performance test results and sends alerts if performance de
 
 import json
 import logging
-import os
 import smtplib
+import sys
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 import requests
 
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.backend.tests.performance.utils.budgets import (  # noqa: E402
+    load_budgets,
+    locust_actuals,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -25,7 +33,7 @@ logger = logging.getLogger(__name__)
 
 
 class PerformanceAlert:
-    """Send alerts when performance degrades below thresholds."""
+    """Send alerts when performance exceeds its budgets."""
 
     def __init__(self, config_path: Optional[str] = None):
         """Initialize the alerting system.
@@ -35,7 +43,7 @@ class PerformanceAlert:
         """
         self.config = self._load_config(config_path)
         self.results_dir = Path(self.config.get("results_dir", "results"))
-        self.thresholds = self.config.get("thresholds", {})
+        self.budgets = load_budgets(self.config.get("budgets_path"))
 
     def _load_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
         """Load configuration from file or use defaults.
@@ -48,11 +56,8 @@ class PerformanceAlert:
         """
         default_config = {
             "results_dir": "results",
-            "thresholds": {
-                "response_time_p95": 1000,  # ms
-                "error_rate": 0.01,  # 1%
-                "throughput": 10,  # req/s
-            },
+            # Budgets file (tests/performance/config/budgets.json if unset)
+            "budgets_path": None,
             "alerting": {
                 "enabled": True,
                 "email": {
@@ -86,10 +91,10 @@ class PerformanceAlert:
         return default_config
 
     def analyze_test_results(self, test_name: str) -> Dict[str, Any]:
-        """Analyze test results and check against thresholds.
+        """Analyze test results and check them against the budgets.
 
         Args:
-            test_name: Name of the test to analyze
+            test_name: Name of the test to analyze, also its budgets scenario
 
         Returns:
             Dictionary with analysis results and alerts
@@ -110,47 +115,33 @@ class PerformanceAlert:
             if not stats:
                 return {"status": "error", "message": "No statistics found in results"}
 
-            # Check each endpoint against thresholds
-            alerts = []
+            # Check each endpoint against the budgets of the test's scenario
+            checks = []
             for endpoint in stats:
-                endpoint_name = endpoint.get("name", "unknown")
-                p95 = endpoint.get("response_time_percentile_95", 0)
-                error_rate = endpoint.get("fail_ratio", 0)
-                rps = endpoint.get("total_rps", 0)
-
-                # Check thresholds
-                if p95 > self.thresholds.get("response_time_p95", 1000):
-                    alerts.append(
-                        {
-                            "endpoint": endpoint_name,
-                            "metric": "response_time_p95",
-                            "value": p95,
-                            "threshold": self.thresholds["response_time_p95"],
-                            "message": f'Response time P95 ({p95}ms) exceeds threshold ({self.thresholds["response_time_p95"]}ms)',
-                        }
-                    )
-
-                if error_rate > self.thresholds.get("error_rate", 0.01):
-                    alerts.append(
-                        {
-                            "endpoint": endpoint_name,
-                            "metric": "error_rate",
-                            "value": error_rate * 100,  # Convert to percentage
-                            "threshold": self.thresholds["error_rate"] * 100,
-                            "message": f'Error rate ({error_rate*100:.2f}%) exceeds threshold ({self.thresholds["error_rate"]*100}%)',
-                        }
-                    )
-
-                if rps < self.thresholds.get("throughput", 10):
-                    alerts.append(
-                        {
-                            "endpoint": endpoint_name,
-                            "metric": "throughput",
-                            "value": rps,
-                            "threshold": self.thresholds["throughput"],
-                            "message": f'Throughput ({rps:.2f} req/s) below threshold ({self.thresholds["throughput"]} req/s)',
-                        }
+                # Throughput is budgeted for the whole run, not per endpoint
+                actual = {**locust_actuals(endpoint), "min_rps": None}
+                checks.extend(
+                    self.budgets.check(
+                        actual,
+                        test_name,
+                        endpoint.get("method"),
+                        endpoint.get("name", "unknown"),
                     )
+                )
+            total_rps = sum(e.get("total_rps", 0) for e in stats)
+            checks.extend(self.budgets.check({"min_rps": total_rps}, test_name))
+
+            alerts = [
+                {
+                    "endpoint": check.endpoint,
+                    "metric": check.metric,
+                    "value": check.actual,
+                    "threshold": check.budget,
+                    "message": f"Budget exceeded: {check.describe()}",
+                }
+                for check in checks
+                if not check.passed
+            ]
 
             return {
                 "status": "success",
@@ -167,7 +158,7 @@ class PerformanceAlert:
                             for e in stats
                         )
                         / max(1, sum(e.get("num_requests", 1) for e in stats)),
-                        "total_rps": sum(e.get("total_rps", 0) for e in stats),
+                        "total_rps": total_rps,
                     },
                 },
             }
@@ -244,14 +235,15 @@ class PerformanceAlert:
                 body += f"- {alert['message']}\n"
 
             # Add summary
+            summary = analysis_result["metrics"]["summary"]
             body += f"""
 
             Summary:
             --------
-            Total Requests: {analysis_result['metrics']['summary']['total_requests']}
-            Total Failures: {analysis_result['metrics']['summary']['total_failures']}
-            Avg Response Time: {analysis_result['metrics']['summary']['avg_response_time']:.2f} ms
-            Requests/sec: {analysis_result['metrics']['summary']['total_rps']:.2f}
+            Total Requests: {summary['total_requests']}
+            Total Failures: {summary['total_failures']}
+            Avg Response Time: {summary['avg_response_time']:.2f} ms
+            Requests/sec: {summary['total_rps']:.2f}
             """
 
             msg.attach(MIMEText(body, "plain"))
@@ -285,6 +277,7 @@ class PerformanceAlert:
         try:
             # Format message
             alert_count = len(analysis_result["alerts"])
+            summary = analysis_result["metrics"]["summary"]
             message = {
                 "channel": slack_config["channel"],
                 "username": "Performance Bot",
@@ -308,10 +301,11 @@ class PerformanceAlert:
                             {
                                 "title": "Summary",
                                 "value": (
-                                    f"• Total Requests: {analysis_result['metrics']['summary']['total_requests']}\n"
-                                    f"• Failures: {analysis_result['metrics']['summary']['total_failures']}\n"
-                                    f"• Avg Response: {analysis_result['metrics']['summary']['avg_response_time']:.2f} ms\n"
-                                    f"• RPS: {analysis_result['metrics']['summary']['total_rps']:.2f}"
+                                    f"• Total Requests: {summary['total_requests']}\n"
+                                    f"• Failures: {summary['total_failures']}\n"
+                                    "• Avg Response: "
+                                    f"{summary['avg_response_time']:.2f} ms\n"
+                                    f"• RPS: {summary['total_rps']:.2f}"
                                 ),
                                 "short": False,
                             },
@@ -354,9 +348,8 @@ def main():
     analysis = alert_system.analyze_test_results(args.test_name)
 
     if analysis["status"] != "success":
-        logger.error(
-            f"Failed to analyze test results: {analysis.get('message', 'Unknown error')}"
-        )
+        message = analysis.get("message", "Unknown error")
+        logger.error(f"Failed to analyze test results: {message}")
         return 1
 
     # Send alerts if needed
@@ -2,12 +2,9 @@
 
 import flet as ft
 from flet import (
-    AppBar,
     Column,
     Container,
     ElevatedButton,
-    Icon,
-    IconButton,
     NavigationRail,
     NavigationRailDestination,
     Page,
@@ -20,7 +17,12 @@ from flet import (
 )
 
 from .backend.schemas import UserResponse
+from .components.navigation.view_router import ViewRoute, ViewRouter
+from .components.screens.home_screen import create_home_view
+from .components.screens.profile_screen import create_profile_view
+from .components.screens.settings_screen import create_settings_view
 from .config import settings
+from .frontend.utils.update_scheduler import get_update_scheduler, schedule_update
 
 
 class LoginView(UserControl):
@@ -92,7 +94,13 @@ class LoginView(UserControl):
 
 
 class MainView(UserControl):
-    """メインビュー"""
+    """メインビュー
+
+    各画面は最初に選択されたときに構築し、以降は表示の切り替えだけで遷移します。
+    """
+
+    # ナビゲーションレールの並び順に対応する画面名
+    SCREENS = ("home", "profile", "settings")
 
     def __init__(self, page: Page, user: UserResponse):
         super().__init__()
@@ -123,29 +131,46 @@ class MainView(UserControl):
             ],
             on_change=self._rail_changed,
         )
+        self.router = ViewRouter(
+            [
+                ViewRoute(
+                    "home",
+                    lambda: create_home_view(page, on_navigate=self.navigate),
+                    title="ホーム",
+                    preload=["profile"],
+                ),
+                ViewRoute(
+                    "profile",
+                    lambda: create_profile_view(page, self.user),
+                    title="プロフィール",
+                    preload=["settings"],
+                ),
+                ViewRoute(
+                    "settings",
+                    lambda: create_settings_view(page),
+                    title="設定",
+                ),
+            ],
+        )
+        self.router.navigate(self.SCREENS[0])
         self.content = Container(
-            content=Text("ダッシュボード", size=30),
+            content=self.router,
             padding=20,
+            expand=True,
         )
 
+    def navigate(self, name: str):
+        """画面を切り替え、ナビゲーションレールの選択を合わせる"""
+        self.selected_index = self.SCREENS.index(name)
+        self.rail.selected_index = self.selected_index
+        with get_update_scheduler(self.page).batch():
+            self.router.navigate(name)
+            schedule_update(self.page, self.rail)
+
     def _rail_changed(self, e):
         """ナビゲーションの変更を処理する"""
         self.selected_index = e.control.selected_index
-        if self.selected_index == 0:
-            self.content.content = Text("ダッシュボード", size=30)
-        elif self.selected_index == 1:
-            self.content.content = Column(
-                controls=[
-                    Text("プロフィール", size=30),
-                    Text(f"ユーザー名: {self.user.username}"),
-                    Text(f"メールアドレス: {self.user.email}"),
-                    Text(f"氏名: {self.user.full_name}"),
-                ],
-                spacing=10,
-            )
-        elif self.selected_index == 2:
-            self.content.content = Text("設定", size=30)
-        self.update()
+        self.router.navigate(self.SCREENS[self.selected_index])
 
     def build(self):
         """ビューを構築する"""
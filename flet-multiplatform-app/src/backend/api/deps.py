@@ -1,16 +1,22 @@
 """APIの依存関係を提供するモジュール"""
 
-from typing import Annotated
+import hashlib
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Annotated, Any, AsyncGenerator, Iterable, Optional
 
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy import Select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.config import settings
-from backend.core.db import get_db
-from backend.core.security import (
-    create_access_token,
-    get_password_hash,
-    verify_password,
+from backend.core.db import AsyncSessionLocal, get_db
+from backend.core.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    IdempotencyContext,
+    IdempotencyStore,
+    InMemoryIdempotencyStore,
+    SQLIdempotencyStore,
 )
 
 # 依存関係のエイリアス
@@ -26,3 +32,147 @@ AsyncDbSession = Annotated[AsyncSession, Depends(get_db)]
 def get_async_db() -> AsyncSession:
     """非同期データベースセッションを取得する"""
     return get_db()
+
+
+@lru_cache
+def get_idempotency_store() -> IdempotencyStore:
+    """設定に応じた冪等性キーの保存先を取得する"""
+    if settings.IDEMPOTENCY_BACKEND == "sql":
+        return SQLIdempotencyStore(
+            AsyncSessionLocal, purge_interval=settings.IDEMPOTENCY_PURGE_INTERVAL
+        )
+    return InMemoryIdempotencyStore(max_entries=settings.IDEMPOTENCY_MAX_ENTRIES)
+
+
+async def get_idempotency(
+    request: Request,
+    store: Annotated[IdempotencyStore, Depends(get_idempotency_store)],
+    idempotency_key: Annotated[
+        Optional[str], Header(alias=IDEMPOTENCY_KEY_HEADER, max_length=255)
+    ] = None,
+) -> AsyncGenerator[IdempotencyContext, None]:
+    """リクエストの冪等性処理を行うコンテキストを取得する
+
+    エンドポイントがレスポンスを保存せずに終了した場合は予約を解除します。
+    """
+    context = IdempotencyContext(
+        store,
+        idempotency_key,
+        method=request.method,
+        path=request.url.path,
+        ttl=timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+        principal=request.headers.get("Authorization"),
+        lease=timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS),
+    )
+    try:
+        yield context
+    finally:
+        await context.abort()
+
+
+# 冪等性処理の依存関係
+Idempotency = Annotated[IdempotencyContext, Depends(get_idempotency)]
+
+
+def format_etag(version: int) -> str:
+    """バージョンからETagヘッダーの値を生成する"""
+    return f'"{version}"'
+
+
+async def get_if_match_version(
+    if_match: Annotated[Optional[str], Header(alias="If-Match")] = None,
+) -> Optional[int]:
+    """If-Matchヘッダーから更新対象のバージョンを取得する
+
+    ヘッダーがない場合や "*" の場合はNoneを返します。
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Matchヘッダーの形式が正しくありません",
+        )
+
+
+# If-Matchヘッダーで指定されたバージョン
+IfMatchVersion = Annotated[Optional[int], Depends(get_if_match_version)]
+
+# If-None-Matchヘッダーの値
+IfNoneMatch = Annotated[Optional[str], Header(alias="If-None-Match")]
+
+
+def after_sync_position(
+    stmt: Select,
+    model: Any,
+    updated_since: Optional[datetime],
+    after_id: Optional[int],
+) -> Select:
+    """差分同期用に (updated_at, id) の順で指定位置より後のレコードに絞り込む
+
+    OFFSETと違い、取得中に追加・更新されたレコードがあってもページの境界で
+    取りこぼしや重複が起きません。after_id を省略した場合は updated_since
+    と同じ更新日時のレコードも含めます。
+    """
+    if updated_since is not None:
+        stmt = stmt.where(
+            or_(
+                model.updated_at > updated_since,
+                and_(
+                    model.updated_at == updated_since,
+                    model.id > (after_id if after_id is not None else 0),
+                ),
+            )
+        )
+    return stmt.order_by(model.updated_at, model.id)
+
+
+# 利用者ごとに異なり、変更されうるレスポンスは毎回ETagで再検証させる
+CACHE_CONTROL = "private, no-cache"
+
+
+def format_list_etag(resources: Iterable[Any]) -> str:
+    """一覧レスポンスの弱いETagを生成する
+
+    各リソースのIDとバージョンから計算するため、追加・更新・削除の
+    いずれでも値が変わります。
+    """
+    digest = hashlib.sha256(
+        ",".join(f"{r.id}:{r.version}" for r in resources).encode()
+    ).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def cache_headers(response: Response, etag: str) -> None:
+    """レスポンスにETagとCache-Controlを設定する"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(if_none_match: Optional[str], etag: str) -> Optional[Response]:
+    """If-None-Matchが現在のETagと一致する場合に304レスポンスを返す
+
+    ETagは弱い比較（W/ を無視）で照合します。
+
+    Args:
+        if_none_match: If-None-Matchヘッダーの値
+        etag: リソースの現在のETag
+
+    Returns:
+        Optional[Response]: 一致する場合は304レスポンス、それ以外はNone
+    """
+    if if_none_match is None:
+        return None
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+        )
+    return None
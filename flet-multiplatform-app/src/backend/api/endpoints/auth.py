@@ -8,7 +8,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from backend.api.deps import AsyncDbSession
 from backend.core.config import settings
-from backend.core.security import create_access_token, verify_password
+from backend.core.security import create_access_token, verify_password_async
 from backend.models.user import User
 from backend.schemas.token import Token
 
@@ -23,12 +23,15 @@ async def login_access_token(
     """OAuth2互換のトークンログインエンドポイント。
 
     このエンドポイントは、ユーザー名（メールアドレス）とパスワードで認証し、
-    アクセストークンを返します。
+    アクセストークンを返します。発行したトークンを保存しないよう、
+    Idempotency-Keyには対応しません。
     """
     # TODO: 実際のユーザー認証ロジックを実装
     # これは仮の実装です
     user = await db.get(User, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="不正なユーザー名またはパスワードです",
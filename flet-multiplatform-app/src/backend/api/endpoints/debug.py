@@ -0,0 +1,39 @@
+"""デバッグ用のAPIエンドポイント"""
+
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from backend.core.config import settings
+from backend.core.profiling import query_profiler
+
+router = APIRouter()
+
+
+def _ensure_profiling_enabled() -> None:
+    """SQLプロファイリングが無効な場合は404を返す"""
+    if not settings.SQL_PROFILING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="SQLプロファイリングは無効です",
+        )
+
+
+@router.get("/sql-stats")
+async def read_sql_stats(
+    limit: int = Query(20, ge=1, le=1000),
+    order_by: str = Query("total_ms", pattern="^(total_ms|avg_ms|max_ms|count)$"),
+) -> Any:
+    """SQLステートメントの集計値の上位N件を取得する"""
+    _ensure_profiling_enabled()
+    return {
+        "slow_query_threshold_ms": query_profiler.slow_query_threshold_ms,
+        "statements": query_profiler.top(limit, order_by=order_by),
+    }
+
+
+@router.delete("/sql-stats", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_sql_stats() -> None:
+    """SQLステートメントの集計値をクリアする"""
+    _ensure_profiling_enabled()
+    query_profiler.reset()
@@ -1,11 +1,24 @@
 """アイテム関連のAPIエンドポイント"""
 
-from typing import Any, List
-
-from fastapi import APIRouter, Depends, HTTPException, status
-
-from backend.api.deps import AsyncDbSession
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, HTTPException, Response, status
+from sqlalchemy import select, update
+
+from backend.api.deps import (
+    AsyncDbSession,
+    Idempotency,
+    IfMatchVersion,
+    IfNoneMatch,
+    after_sync_position,
+    cache_headers,
+    format_etag,
+    format_list_etag,
+    not_modified,
+)
 from backend.models.item import Item
+from backend.models.tombstone import Tombstone
 from backend.schemas.item import ItemCreate, ItemResponse, ItemUpdate
 
 router = APIRouter()
@@ -14,12 +27,40 @@ router = APIRouter()
 @router.get("/", response_model=List[ItemResponse])
 async def read_items(
     db: AsyncDbSession,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_since: Optional[datetime] = None,
+    after_id: Optional[int] = None,
+    if_none_match: IfNoneMatch = None,
 ) -> Any:
-    """アイテム一覧を取得する"""
-    # TODO: 実際のアイテム取得ロジックを実装
-    items = await db.query(Item).offset(skip).limit(limit).all()
+    """アイテム一覧を新しい順に取得する
+
+    itemテーブルは created_at で月単位にパーティション分割されているため、
+    created_after / created_before で期間を指定すると対象のパーティションだけが
+    スキャンされます。updated_since か after_id を指定した場合は差分同期用に、
+    (updated_at, id) が (updated_since, after_id) より後のアイテムを
+    その順に返します（skip は使用しません）。
+    一覧には弱いETagを付与し、If-None-Matchが一致する場合は304を返します。
+    """
+    stmt = select(Item)
+    if created_after is not None:
+        stmt = stmt.where(Item.created_at >= created_after)
+    if created_before is not None:
+        stmt = stmt.where(Item.created_at < created_before)
+    if updated_since is not None or after_id is not None:
+        stmt = after_sync_position(stmt, Item, updated_since, after_id).limit(limit)
+    else:
+        stmt = stmt.order_by(Item.created_at.desc(), Item.id.desc())
+        stmt = stmt.offset(skip).limit(limit)
+    items = (await db.scalars(stmt)).all()
+    etag = format_list_etag(items)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+    cache_headers(response, etag)
     return items
 
 
@@ -27,8 +68,17 @@ async def read_items(
 async def create_item(
     db: AsyncDbSession,
     item_in: ItemCreate,
+    idempotency: Idempotency,
 ) -> Any:
-    """新しいアイテムを作成する"""
+    """新しいアイテムを作成する
+
+    Idempotency-Keyヘッダーが指定された再送リクエストには、
+    アイテムを作成せずに保存済みのレスポンスを返します。
+    """
+    replay = await idempotency.begin(item_in)
+    if replay is not None:
+        return replay
+
     # TODO: 実際のアイテム作成ロジックを実装
     item = Item(
         title=item_in.title,
@@ -38,22 +88,31 @@ async def create_item(
     db.add(item)
     await db.commit()
     await db.refresh(item)
-    return item
+    return await idempotency.complete(
+        ItemResponse.model_validate(item), status.HTTP_201_CREATED
+    )
 
 
 @router.get("/{item_id}", response_model=ItemResponse)
 async def read_item(
     item_id: int,
     db: AsyncDbSession,
+    response: Response,
+    if_none_match: IfNoneMatch = None,
 ) -> Any:
     """特定のアイテム情報を取得する"""
     # TODO: 実際のアイテム取得ロジックを実装
-    item = await db.get(Item, item_id)
+    item = await db.scalar(select(Item).where(Item.id == item_id))
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="アイテムが見つかりません",
         )
+    etag = format_etag(item.version)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+    cache_headers(response, etag)
     return item
 
 
@@ -62,22 +121,39 @@ async def update_item(
     item_id: int,
     item_in: ItemUpdate,
     db: AsyncDbSession,
+    response: Response,
+    if_match: IfMatchVersion,
 ) -> Any:
-    """アイテム情報を更新する"""
-    # TODO: 実際のアイテム更新ロジックを実装
-    item = await db.get(Item, item_id)
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="アイテムが見つかりません",
-        )
+    """アイテム情報を更新する
 
+    読み込みと更新を1回のUPDATE文で行います。If-Matchヘッダーが指定された場合は
+    バージョンが一致するときだけ更新し、一致しなければ412を返します。
+    """
     update_data = item_in.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(item, field, value)
+    stmt = (
+        update(Item)
+        .where(Item.id == item_id)
+        .values(**update_data, version=Item.version + 1)
+        .returning(Item)
+    )
+    if if_match is not None:
+        stmt = stmt.where(Item.version == if_match)
+
+    item = (await db.execute(stmt)).scalar_one_or_none()
+    if item is None:
+        # 更新できなかった場合のみ存在確認を行う
+        if await db.scalar(select(Item.id).where(Item.id == item_id)) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="アイテムが見つかりません",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="アイテムは他のリクエストによって更新されています",
+        )
 
     await db.commit()
-    await db.refresh(item)
+    response.headers["ETag"] = format_etag(item.version)
     return item
 
 
@@ -88,7 +164,7 @@ async def delete_item(
 ) -> None:
     """アイテムを削除する"""
     # TODO: 実際のアイテム削除ロジックを実装
-    item = await db.get(Item, item_id)
+    item = await db.scalar(select(Item).where(Item.id == item_id))
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -96,4 +172,5 @@ async def delete_item(
         )
 
     await db.delete(item)
+    db.add(Tombstone(resource="items", record_id=item_id))
     await db.commit()
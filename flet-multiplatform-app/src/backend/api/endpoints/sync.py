@@ -0,0 +1,33 @@
+"""差分同期関連のAPIエンドポイント"""
+
+from typing import Any, List, Literal
+
+from fastapi import APIRouter, Query
+from sqlalchemy import select
+
+from backend.api.deps import AsyncDbSession
+from backend.models.tombstone import Tombstone
+from backend.schemas.tombstone import TombstoneResponse
+
+router = APIRouter()
+
+
+@router.get("/tombstones", response_model=List[TombstoneResponse])
+async def read_tombstones(
+    db: AsyncDbSession,
+    resource: Literal["users", "items"],
+    after_id: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+) -> Any:
+    """削除されたレコードの記録を取得する
+
+    記録は id の昇順に返します。クライアントは最後に受け取った id を
+    after_id に指定して続きを取得します。
+    """
+    stmt = (
+        select(Tombstone)
+        .where(Tombstone.resource == resource, Tombstone.id > after_id)
+        .order_by(Tombstone.id)
+        .limit(limit)
+    )
+    return (await db.scalars(stmt)).all()
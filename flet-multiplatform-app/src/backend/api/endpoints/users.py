@@ -1,11 +1,26 @@
 """ユーザー関連のAPIエンドポイント"""
 
-from typing import Any, List
-
-from fastapi import APIRouter, Depends, HTTPException, status
-
-from backend.api.deps import AsyncDbSession
-from backend.core.security import get_password_hash
+from datetime import datetime
+from typing import Annotated, Any, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from sqlalchemy import select, update
+
+from backend.api.deps import (
+    AsyncDbSession,
+    Idempotency,
+    IfMatchVersion,
+    IfNoneMatch,
+    after_sync_position,
+    cache_headers,
+    format_etag,
+    format_list_etag,
+    not_modified,
+)
+from backend.core.config import settings
+from backend.core.security import get_password_hash_async
+from backend.models.item import Item
+from backend.models.tombstone import Tombstone
 from backend.models.user import User
 from backend.schemas.user import UserCreate, UserResponse, UserUpdate
 
@@ -15,12 +30,42 @@ router = APIRouter()
 @router.get("/", response_model=List[UserResponse])
 async def read_users(
     db: AsyncDbSession,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    updated_since: Optional[datetime] = None,
+    after_id: Optional[int] = None,
+    ids: Annotated[Optional[List[int]], Query()] = None,
+    if_none_match: IfNoneMatch = None,
 ) -> Any:
-    """ユーザー一覧を取得する"""
-    # TODO: 実際のユーザー取得ロジックを実装
-    users = await db.query(User).offset(skip).limit(limit).all()
+    """ユーザー一覧を取得する
+
+    updated_since か after_id を指定した場合は差分同期用に、
+    (updated_at, id) が (updated_since, after_id) より後のユーザーを
+    その順に返します（skip は使用しません）。
+    ids を指定した場合（?ids=1&ids=2）は、指定したユーザーを1回のクエリで
+    ID順に返します。存在しないIDは結果に含まれません。
+    一覧には弱いETagを付与し、If-None-Matchが一致する場合は304を返します。
+    """
+    if ids is not None:
+        unique_ids = sorted(set(ids))
+        if len(unique_ids) > settings.BATCH_MAX_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"一度に指定できるIDは{settings.BATCH_MAX_IDS}件までです",
+            )
+        stmt = select(User).where(User.id.in_(unique_ids)).order_by(User.id)
+    elif updated_since is not None or after_id is not None:
+        stmt = after_sync_position(select(User), User, updated_since, after_id)
+        stmt = stmt.limit(limit)
+    else:
+        stmt = select(User).order_by(User.id).offset(skip).limit(limit)
+    users = (await db.scalars(stmt)).all()
+    etag = format_list_etag(users)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+    cache_headers(response, etag)
     return users
 
 
@@ -28,26 +73,39 @@ async def read_users(
 async def create_user(
     db: AsyncDbSession,
     user_in: UserCreate,
+    idempotency: Idempotency,
 ) -> Any:
-    """新しいユーザーを作成する"""
+    """新しいユーザーを作成する
+
+    Idempotency-Keyヘッダーが指定された再送リクエストには、
+    ユーザーを作成せずに保存済みのレスポンスを返します。
+    """
+    replay = await idempotency.begin(user_in)
+    if replay is not None:
+        return replay
+
     # TODO: 実際のユーザー作成ロジックを実装
     user = User(
         email=user_in.email,
         username=user_in.username,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         is_active=True,
         is_superuser=False,
     )
     db.add(user)
     await db.commit()
     await db.refresh(user)
-    return user
+    return await idempotency.complete(
+        UserResponse.model_validate(user), status.HTTP_201_CREATED
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def read_user(
     user_id: int,
     db: AsyncDbSession,
+    response: Response,
+    if_none_match: IfNoneMatch = None,
 ) -> Any:
     """特定のユーザー情報を取得する"""
     # TODO: 実際のユーザー取得ロジックを実装
@@ -57,6 +115,11 @@ async def read_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="ユーザーが見つかりません",
         )
+    etag = format_etag(user.version)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+    cache_headers(response, etag)
     return user
 
 
@@ -65,25 +128,44 @@ async def update_user(
     user_id: int,
     user_in: UserUpdate,
     db: AsyncDbSession,
+    response: Response,
+    if_match: IfMatchVersion,
 ) -> Any:
-    """ユーザー情報を更新する"""
-    # TODO: 実際のユーザー更新ロジックを実装
-    user = await db.get(User, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="ユーザーが見つかりません",
-        )
+    """ユーザー情報を更新する
 
+    読み込みと更新を1回のUPDATE文で行います。If-Matchヘッダーが指定された場合は
+    バージョンが一致するときだけ更新し、一致しなければ412を返します。
+    """
     update_data = user_in.dict(exclude_unset=True)
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await get_password_hash_async(
+            update_data.pop("password")
+        )
 
-    for field, value in update_data.items():
-        setattr(user, field, value)
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(**update_data, version=User.version + 1)
+        .returning(User)
+    )
+    if if_match is not None:
+        stmt = stmt.where(User.version == if_match)
+
+    user = (await db.execute(stmt)).scalar_one_or_none()
+    if user is None:
+        # 更新できなかった場合のみ存在確認を行う
+        if await db.scalar(select(User.id).where(User.id == user_id)) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="ユーザーが見つかりません",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="ユーザーは他のリクエストによって更新されています",
+        )
 
     await db.commit()
-    await db.refresh(user)
+    response.headers["ETag"] = format_etag(user.version)
     return user
 
 
@@ -101,5 +183,9 @@ async def delete_user(
             detail="ユーザーが見つかりません",
         )
 
+    # 所有するアイテムも一緒に削除されるため、削除記録を残す
+    item_ids = await db.scalars(select(Item.id).where(Item.owner_id == user_id))
+    db.add_all(Tombstone(resource="items", record_id=item_id) for item_id in item_ids)
     await db.delete(user)
+    db.add(Tombstone(resource="users", record_id=user_id))
     await db.commit()
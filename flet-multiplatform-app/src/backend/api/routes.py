@@ -5,7 +5,7 @@
 
 from fastapi import APIRouter
 
-from backend.api.endpoints import auth, items, users
+from backend.api.endpoints import auth, debug, items, sync, users
 
 # メインのAPIルーター
 api_router = APIRouter()
@@ -18,3 +18,9 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 
 # アイテム関連のルート
 api_router.include_router(items.router, prefix="/items", tags=["items"])
+
+# 差分同期関連のルート
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
+
+# デバッグ用のルート
+api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
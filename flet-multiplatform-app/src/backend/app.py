@@ -1,13 +1,29 @@
 """FastAPIアプリケーションを定義するモジュール"""
 
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.api.routes import api_router
+from backend.config.logging import (
+    CorrelationIdMiddleware,
+    setup_logging,
+    stop_queue_logging,
+)
 from backend.core.config import settings
+from backend.core.profiling import QueryRouteMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    """アプリケーションのライフサイクルを管理する"""
+    # ログ出力はQueueListenerのスレッドで行う
+    setup_logging()
+    yield
+    stop_queue_logging()
 
-# ロギング設定はコアモジュールで対応
-# 必要に応じてロギング設定を行う
 
 # FastAPIアプリケーションの作成
 app = FastAPI(
@@ -16,6 +32,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
+    lifespan=lifespan,
 )
 
 # CORSミドルウェアの設定
@@ -28,6 +45,13 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# SQLプロファイリング用にリクエストのルートを記録する
+if settings.SQL_PROFILING_ENABLED:
+    app.add_middleware(QueryRouteMiddleware)
+
+# リクエストごとの相関IDをログに付与する
+app.add_middleware(CorrelationIdMiddleware)
+
 # APIルーターの追加
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -6,7 +6,7 @@
 import os
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import AnyHttpUrl, EmailStr, HttpUrl, PostgresDsn, field_validator
+from pydantic import AnyHttpUrl, EmailStr, PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -92,6 +92,10 @@ class Settings(BaseSettings):
     )
     FIRST_SUPERUSER_PASSWORD: str = os.getenv("FIRST_SUPERUSER_PASSWORD", "admin")
 
+    # ログ設定
+    LOG_JSON: bool = False
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+
     # テストやJWTで利用される追加設定
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     SQLALCHEMY_DATABASE_URI: Optional[str] = os.getenv("SQLALCHEMY_DATABASE_URI", None)
@@ -1,76 +1,196 @@
-"""ロギング設定モジュール"""
+"""ロギング設定モジュール
 
+ログ出力は QueueHandler / QueueListener 経由で別スレッドに委譲し、
+ディスクやコンソールへの書き込みがイベントループをブロックしないようにします。
+"""
+
+import atexit
+import json
 import logging
 import logging.config
+import queue
 import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-from pythonjsonlogger import jsonlogger
+from typing import Any, Dict, List, Optional, Tuple
 
 from .config import settings
 
+# リクエスト単位の相関ID（CorrelationIdMiddlewareで設定）
+correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+# 相関IDを受け渡すHTTPヘッダー
+CORRELATION_ID_HEADER = "X-Request-ID"
+
+# 稼働中のQueueListenerと、ルートロガーに追加したQueueHandler
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_previous_level: Optional[int] = None
+
+
+class CorrelationIdFilter(logging.Filter):
+    """ログレコードに相関IDを付与するフィルタ
+
+    QueueHandler側（ログを出力したスレッド）で実行する必要があります。
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = correlation_id.get() or "-"
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """高頻度なDEBUGログを呼び出し箇所ごとに間引くフィルタ
+
+    Args:
+        sample_rate: 出力する割合 (0.0〜1.0)。1.0の場合はすべて出力する
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        super().__init__()
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self._every = round(1 / self.sample_rate) if self.sample_rate else 0
+        self._counters: Dict[Tuple[str, int], int] = {}
 
-class JsonFormatter(jsonlogger.JsonFormatter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.sample_rate >= 1.0:
+            return True
+        if not self._every:
+            return False
+        key = (record.pathname, record.lineno)
+        count = self._counters.get(key, 0)
+        self._counters[key] = count + 1
+        return count % self._every == 0
+
+
+class JsonFormatter(logging.Formatter):
     """JSON形式のログフォーマッタ"""
 
-    def add_fields(
-        self,
-        log_record: Dict[str, Any],
-        record: logging.LogRecord,
-        message_dict: Dict[str, Any],
-    ) -> None:
-        super().add_fields(log_record, record, message_dict)
-        if not log_record.get("timestamp"):
-            log_record["timestamp"] = record.created
-        if log_record.get("level"):
-            log_record["level"] = log_record["level"].upper()
-        else:
-            log_record["level"] = record.levelname
+    def format(self, record: logging.LogRecord) -> str:
+        log_record: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, tz=timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", "-"),
+        }
+        if record.exc_info:
+            log_record["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(log_record, ensure_ascii=False, default=str)
+
+
+def start_queue_logging(
+    handlers: List[logging.Handler],
+    log_level: str,
+    debug_sample_rate: float = 1.0,
+) -> QueueListener:
+    """ルートロガーにQueueHandlerを設定し、出力先ハンドラをQueueListenerで起動する
+
+    Args:
+        handlers: 実際に出力を行うハンドラ（リスナースレッドで実行される）
+        log_level: ログレベル
+        debug_sample_rate: DEBUGログを出力する割合
+
+    Returns:
+        QueueListener: 起動したリスナー
+    """
+    global _listener, _queue_handler, _previous_level
+
+    stop_queue_logging()
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+    queue_handler.addFilter(CorrelationIdFilter())
+
+    # アプリが追加していないハンドラ（pytestのcaplogなど）はそのまま残す
+    root_logger = logging.getLogger()
+    _previous_level = root_logger.level
+    root_logger.setLevel(log_level)
+    root_logger.addHandler(queue_handler)
+    _queue_handler = queue_handler
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_queue_logging() -> None:
+    """QueueHandlerを外してQueueListenerを停止し、キューに残っているログを出力する
+
+    停止後のログは、開始前からルートロガーにあったハンドラで出力されます。
+    """
+    global _listener, _queue_handler, _previous_level
+
+    if _queue_handler is not None:
+        root_logger = logging.getLogger()
+        root_logger.removeHandler(_queue_handler)
+        if _previous_level is not None:
+            root_logger.setLevel(_previous_level)
+        _queue_handler = None
+        _previous_level = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_queue_logging)
 
 
 def setup_logging(
     log_level: Optional[str] = None,
     log_file: Optional[str] = None,
-) -> None:
+    json_format: Optional[bool] = None,
+    debug_sample_rate: Optional[float] = None,
+) -> QueueListener:
     """ロギングの設定を行う
 
     Args:
         log_level: ログレベル (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: ログファイルのパス (指定しない場合はコンソールに出力)
+        json_format: コンソール出力もJSON形式にするかどうか
+        debug_sample_rate: DEBUGログを出力する割合
+
+    Returns:
+        QueueListener: 起動したリスナー
     """
     log_level = log_level or ("DEBUG" if settings.DEBUG else "INFO")
     log_file = Path(log_file) if log_file else None
+    json_format = settings.LOG_JSON if json_format is None else json_format
+    if debug_sample_rate is None:
+        debug_sample_rate = settings.LOG_DEBUG_SAMPLE_RATE
 
     # ログディレクトリが存在しない場合は作成
     if log_file and not log_file.parent.exists():
         log_file.parent.mkdir(parents=True, exist_ok=True)
 
     # ログフォーマット
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    json_formatter = JsonFormatter(
-        "%(timestamp)s %(level)s %(name)s %(message)s",
-        timestamp=True,
+    log_format = (
+        "%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] %(message)s"
     )
-
-    # ルートロガーの設定
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-
-    # 既存のハンドラをクリア
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+    json_formatter = JsonFormatter()
 
     # コンソールハンドラの設定
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(logging.Formatter(log_format))
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(
+        json_formatter if json_format else logging.Formatter(log_format)
+    )
+    handlers: List[logging.Handler] = [console_handler]
 
     # ファイルハンドラの設定 (ログファイルが指定されている場合)
     if log_file:
         file_handler = logging.FileHandler(log_file, encoding="utf-8")
         file_handler.setFormatter(json_formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    return start_queue_logging(handlers, log_level, debug_sample_rate)
 
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
@@ -83,3 +203,40 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
         logging.Logger: ロガーインスタンス
     """
     return logging.getLogger(name)
+
+
+class CorrelationIdMiddleware:
+    """リクエストごとに相関IDを設定するASGIミドルウェア
+
+    リクエストヘッダーに相関IDがあればそれを引き継ぎ、なければ新たに発行して
+    レスポンスヘッダーにも付与します。
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._header = CORRELATION_ID_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == self._header:
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self._header, request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        token = correlation_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            correlation_id.reset(token)
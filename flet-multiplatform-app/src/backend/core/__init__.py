@@ -6,5 +6,7 @@ from backend.core.db import AsyncSessionLocal, Base, engine, get_db, init_db
 from backend.core.security import (
     create_access_token,
     get_password_hash,
+    get_password_hash_async,
     verify_password,
+    verify_password_async,
 )
@@ -32,6 +32,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8日間
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
+    # パスワードハッシュの bcrypt コスト（1増えるごとに計算時間が2倍になる）
+    BCRYPT_ROUNDS: int = 12
 
     # CORS設定
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -76,6 +78,22 @@ class Settings(BaseSettings):
 
         return None
 
+    # SQLプロファイリング設定
+    SQL_PROFILING_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+
+    # 冪等性キー設定
+    IDEMPOTENCY_BACKEND: str = "memory"  # "memory" または "sql"
+    IDEMPOTENCY_TTL_SECONDS: int = 60 * 60 * 24  # 24時間
+    # 処理中の予約の有効期間（処理中にプロセスが停止してもこの時間で再送できる）
+    IDEMPOTENCY_LEASE_SECONDS: int = 60 * 5
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+    # SQLストアで期限切れのキーを削除する間隔（予約の回数）
+    IDEMPOTENCY_PURGE_INTERVAL: int = 1000
+
+    # 一括取得で1回に指定できるIDの最大数
+    BATCH_MAX_IDS: int = 100
+
     # 管理者ユーザー設定
     FIRST_SUPERUSER_EMAIL: EmailStr = os.getenv(
         "FIRST_SUPERUSER_EMAIL", "admin@example.com"
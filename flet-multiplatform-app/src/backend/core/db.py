@@ -3,14 +3,11 @@
 このモジュールは、SQLAlchemyを使ったデータベース接続を管理します。
 """
 
-from datetime import datetime
-
-from sqlalchemy import Column, DateTime, Integer
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import registry, sessionmaker
 
 from backend.core.config import settings
+from backend.core.profiling import install_query_profiler
 
 # SQLAlchemy用のベースモデル
 mapper_registry = registry()
@@ -26,6 +23,11 @@ def get_engine():
         future=True,
         pool_pre_ping=True,
     )
+    install_query_profiler(
+        engine,
+        enabled=settings.SQL_PROFILING_ENABLED,
+        slow_query_threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    )
     return engine
 
 
@@ -0,0 +1,359 @@
+"""冪等性キーの管理モジュール。
+
+このモジュールは、Idempotency-Key ヘッダー付きのPOSTリクエストについて
+リクエストのフィンガープリントとレスポンスを保存し、再送時に保存済みの
+レスポンスを返すための仕組みを提供します。
+
+キーとフィンガープリントはSECRET_KEYによるHMACとして保存するため、
+リクエストボディや認証情報そのものは保存先に残りません。
+"""
+
+import hashlib
+import hmac
+import json
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.models.idempotency_key import IdempotencyKey
+
+# 冪等性キーを受け取るHTTPヘッダー
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+# 再送に対して保存済みレスポンスを返したことを示すヘッダー
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+# 処理中の予約の既定の有効期間
+DEFAULT_LEASE = timedelta(minutes=5)
+
+
+@dataclass
+class IdempotencyRecord:
+    """保存された冪等性キーの情報"""
+
+    key: str
+    fingerprint: str
+    expires_at: datetime
+    status_code: Optional[int] = None
+    response_body: Any = None
+
+    @property
+    def is_completed(self) -> bool:
+        """レスポンスが保存済みかどうか"""
+        return self.status_code is not None
+
+
+def _keyed_digest(message: str, secret: Optional[str] = None) -> str:
+    """SECRET_KEYをキーにしたHMAC-SHA256を計算する"""
+    secret = settings.SECRET_KEY if secret is None else secret
+    return hmac.new(
+        secret.encode("utf-8"), message.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+
+def fingerprint_request(
+    method: str, path: str, payload: Any, secret: Optional[str] = None
+) -> str:
+    """リクエストのフィンガープリントを計算する
+
+    Args:
+        method: HTTPメソッド
+        path: リクエストパス
+        payload: リクエストボディ（パース済み）
+        secret: HMACのキー（省略時はSECRET_KEY）
+
+    Returns:
+        str: HMAC-SHA256の値
+    """
+    body = json.dumps(jsonable_encoder(payload), sort_keys=True, ensure_ascii=False)
+    return _keyed_digest(f"{method} {path}\n{body}", secret)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """タイムゾーンを保持しないDB（SQLite）から読んだ日時をUTCとして扱う"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class IdempotencyStore(ABC):
+    """冪等性キーの保存先の基底クラス"""
+
+    @abstractmethod
+    async def reserve(
+        self, key: str, fingerprint: str, lease: timedelta
+    ) -> Optional[IdempotencyRecord]:
+        """キーを処理中として予約する
+
+        Args:
+            key: 冪等性キー
+            fingerprint: リクエストのフィンガープリント
+            lease: 予約の有効期間（完了しないまま過ぎると再び予約できる）
+
+        Returns:
+            Optional[IdempotencyRecord]: 既に有効なキーが存在する場合はその情報、
+                新たに予約できた場合はNone
+        """
+
+    @abstractmethod
+    async def complete(
+        self, key: str, status_code: int, response_body: Any, ttl: timedelta
+    ) -> None:
+        """予約済みのキーにレスポンスを保存し、有効期間をttlに延長する"""
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """予約済みのキーを削除する（処理が失敗した場合）"""
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """プロセス内のLRUキャッシュに保存するストア
+
+    Args:
+        max_entries: 保持するキーの最大数
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._records: "OrderedDict[str, IdempotencyRecord]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def reserve(
+        self, key: str, fingerprint: str, lease: timedelta
+    ) -> Optional[IdempotencyRecord]:
+        now = _utcnow()
+        record = self._records.get(key)
+        if record is not None and record.expires_at > now:
+            self._records.move_to_end(key)
+            return record
+
+        self._records[key] = IdempotencyRecord(key, fingerprint, now + lease)
+        self._records.move_to_end(key)
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+        return None
+
+    async def complete(
+        self, key: str, status_code: int, response_body: Any, ttl: timedelta
+    ) -> None:
+        record = self._records.get(key)
+        if record is not None:
+            record.status_code = status_code
+            record.response_body = response_body
+            record.expires_at = _utcnow() + ttl
+
+    async def release(self, key: str) -> None:
+        self._records.pop(key, None)
+
+
+class SQLIdempotencyStore(IdempotencyStore):
+    """idempotency_key テーブルに保存するストア
+
+    主キー制約によって予約を排他制御するため、複数プロセスで共有できます。
+    クライアントは新しい書き込みごとに新しいキーを送るため、最初の予約と
+    以降 purge_interval 回ごとの予約で期限切れのキーを削除します。
+
+    Args:
+        session_factory: セッションファクトリ
+        purge_interval: 期限切れのキーを削除する間隔（予約の回数、0で削除しない）
+    """
+
+    def __init__(
+        self, session_factory: Callable[[], AsyncSession], purge_interval: int = 1000
+    ):
+        self.session_factory = session_factory
+        self.purge_interval = purge_interval
+        self._reserves = 0
+
+    async def reserve(
+        self, key: str, fingerprint: str, lease: timedelta
+    ) -> Optional[IdempotencyRecord]:
+        if self.purge_interval and self._reserves % self.purge_interval == 0:
+            await self.purge_expired()
+        self._reserves += 1
+
+        now = _utcnow()
+        async with self.session_factory() as session:
+            existing = await session.get(IdempotencyKey, key)
+            if existing is not None:
+                if _as_utc(existing.expires_at) > now:
+                    return self._to_record(existing)
+                await session.delete(existing)
+                await session.flush()
+
+            session.add(
+                IdempotencyKey(
+                    key=key,
+                    fingerprint=fingerprint,
+                    created_at=now,
+                    expires_at=now + lease,
+                )
+            )
+            try:
+                await session.commit()
+            except IntegrityError:
+                # 同時に別のリクエストが予約した
+                await session.rollback()
+                existing = await session.get(IdempotencyKey, key)
+                if existing is None:
+                    raise
+                return self._to_record(existing)
+        return None
+
+    async def complete(
+        self, key: str, status_code: int, response_body: Any, ttl: timedelta
+    ) -> None:
+        async with self.session_factory() as session:
+            record = await session.get(IdempotencyKey, key)
+            if record is not None:
+                record.status_code = status_code
+                record.response_body = response_body
+                record.expires_at = _utcnow() + ttl
+                await session.commit()
+
+    async def release(self, key: str) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.key == key)
+            )
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        """有効期限切れのキーを削除する
+
+        Returns:
+            int: 削除した件数
+        """
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.expires_at <= _utcnow())
+            )
+            await session.commit()
+            return result.rowcount
+
+    @staticmethod
+    def _to_record(model: IdempotencyKey) -> IdempotencyRecord:
+        return IdempotencyRecord(
+            key=model.key,
+            fingerprint=model.fingerprint,
+            expires_at=_as_utc(model.expires_at),
+            status_code=model.status_code,
+            response_body=model.response_body,
+        )
+
+
+class IdempotencyContext:
+    """1リクエスト分の冪等性処理を扱うクラス
+
+    Idempotency-Key ヘッダーがない場合は何もしません。キーは呼び出し元
+    (principal) ごとに分けて管理するため、別のユーザーが同じキーを送っても
+    保存済みのレスポンスは返りません。
+
+    Args:
+        store: 冪等性キーの保存先
+        key: 冪等性キー（ヘッダーがない場合はNone）
+        method: HTTPメソッド
+        path: リクエストパス
+        ttl: 保存したレスポンスの有効期間
+        principal: 呼び出し元を識別する値（Authorizationヘッダーなど）
+        lease: 処理中の予約の有効期間（省略時はDEFAULT_LEASE、最大でttl）
+    """
+
+    def __init__(
+        self,
+        store: IdempotencyStore,
+        key: Optional[str],
+        method: str,
+        path: str,
+        ttl: timedelta,
+        principal: Optional[str] = None,
+        lease: Optional[timedelta] = None,
+    ):
+        self.store = store
+        self.key = (
+            _keyed_digest(f"{method} {path}\n{principal or '-'}\n{key}")
+            if key
+            else None
+        )
+        self.method = method
+        self.path = path
+        self.ttl = ttl
+        self.lease = min(lease or DEFAULT_LEASE, ttl)
+        self._reserved = False
+        self._completed = False
+
+    async def begin(self, payload: Any) -> Optional[JSONResponse]:
+        """キーを予約し、再送であれば保存済みのレスポンスを返す
+
+        Args:
+            payload: フィンガープリントに使うリクエストボディ
+
+        Returns:
+            Optional[JSONResponse]: 再送の場合は保存済みのレスポンス、
+                新規リクエストの場合はNone
+
+        Raises:
+            HTTPException: 同じキーで処理中の場合(409)、
+                同じキーで異なる内容のリクエストの場合(422)
+        """
+        if self.key is None:
+            return None
+
+        fingerprint = fingerprint_request(self.method, self.path, payload)
+        record = await self.store.reserve(self.key, fingerprint, self.lease)
+        if record is None:
+            self._reserved = True
+            return None
+
+        if record.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="同じIdempotency-Keyで異なるリクエストが送信されました",
+            )
+        if not record.is_completed:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="同じIdempotency-Keyのリクエストを処理中です",
+            )
+        return JSONResponse(
+            content=record.response_body,
+            status_code=record.status_code,
+            headers={IDEMPOTENT_REPLAYED_HEADER: "true"},
+        )
+
+    async def complete(self, response: Any, status_code: int) -> Any:
+        """レスポンスを保存する
+
+        Args:
+            response: エンドポイントが返すレスポンス（スキーマまたは辞書）
+            status_code: レスポンスのステータスコード
+
+        Returns:
+            Any: 引数のresponseをそのまま返す
+        """
+        if self._reserved:
+            await self.store.complete(
+                self.key, status_code, jsonable_encoder(response), self.ttl
+            )
+            self._completed = True
+        return response
+
+    async def abort(self) -> None:
+        """処理が完了しなかった場合に予約を解除する"""
+        if self._reserved and not self._completed:
+            await self.store.release(self.key)
+            self._reserved = False
@@ -0,0 +1,226 @@
+"""SQLプロファイリングモジュール。
+
+このモジュールは、SQLAlchemyのカーソル実行イベントにフックして
+ステートメント単位の実行時間を計測し、遅いクエリをログに記録します。
+無効時はイベントリスナー自体を登録しないため、オーバーヘッドは発生しません。
+"""
+
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# 実行中のリクエストのルート（QueryRouteMiddlewareで設定）
+current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+# フィンガープリント用の正規表現
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# conn.info に計測開始時刻を積むためのキー
+_START_TIMES_KEY = "query_profiler_start_times"
+
+
+def fingerprint_sql(statement: str) -> str:
+    """SQL文をリテラルやパラメータを除いたフィンガープリントに正規化する
+
+    Args:
+        statement: 実行されたSQL文
+
+    Returns:
+        str: 正規化されたSQL文
+    """
+    normalized = _PLACEHOLDER.sub("?", statement)
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class QueryStats:
+    """フィンガープリントごとの集計値"""
+
+    fingerprint: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    slow_count: int = 0
+    last_route: Optional[str] = None
+
+    @property
+    def avg_ms(self) -> float:
+        """平均実行時間（ミリ秒）"""
+        return self.total_ms / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書に変換する"""
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.avg_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "slow_count": self.slow_count,
+            "last_route": self.last_route,
+        }
+
+
+class QueryProfiler:
+    """ステートメント単位の実行時間を集計するプロファイラ"""
+
+    def __init__(
+        self,
+        slow_query_threshold_ms: float = 200.0,
+        max_fingerprints: int = 1000,
+    ):
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+        self._engines: List[Engine] = []
+
+    def install(self, engine: Union[Engine, AsyncEngine]) -> None:
+        """エンジンにカーソル実行イベントのリスナーを登録する
+
+        Args:
+            engine: 計測対象のエンジン（非同期エンジンも可）
+        """
+        sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        if sync_engine in self._engines:
+            return
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(sync_engine)
+
+    def uninstall(self) -> None:
+        """登録済みのすべてのリスナーを解除する"""
+        for sync_engine in self._engines:
+            event.remove(
+                sync_engine, "before_cursor_execute", self._before_cursor_execute
+            )
+            event.remove(
+                sync_engine, "after_cursor_execute", self._after_cursor_execute
+            )
+        self._engines.clear()
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        start_times = conn.info.get(_START_TIMES_KEY)
+        if not start_times:
+            return
+        elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000
+        self.record(statement, elapsed_ms)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        """ステートメントの実行時間を記録する
+
+        Args:
+            statement: 実行されたSQL文
+            elapsed_ms: 実行時間（ミリ秒）
+        """
+        fingerprint = fingerprint_sql(statement)
+        route = current_route.get()
+        is_slow = elapsed_ms >= self.slow_query_threshold_ms
+
+        with self._lock:
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    stats = self._stats.setdefault("<other>", QueryStats("<other>"))
+                else:
+                    stats = self._stats[fingerprint] = QueryStats(fingerprint)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.last_route = route
+            if is_slow:
+                stats.slow_count += 1
+
+        if is_slow:
+            logger.warning(
+                "Slow query (%.1f ms) route=%s: %s",
+                elapsed_ms,
+                route or "-",
+                fingerprint,
+            )
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """集計値の上位N件を取得する
+
+        Args:
+            limit: 取得件数
+            order_by: 並び替えキー（total_ms, avg_ms, max_ms, count）
+
+        Returns:
+            List[Dict[str, Any]]: 集計値のリスト
+        """
+        with self._lock:
+            stats = [s.to_dict() for s in self._stats.values()]
+        stats.sort(key=lambda s: s[order_by], reverse=True)
+        return stats[:limit]
+
+    def reset(self) -> None:
+        """集計値をクリアする"""
+        with self._lock:
+            self._stats.clear()
+
+
+class QueryRouteMiddleware:
+    """リクエストのルートをcurrent_routeに設定するASGIミドルウェア"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_route.set(f"{scope['method']} {scope['path']}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_route.reset(token)
+
+
+# アプリケーション全体で共有するプロファイラ
+query_profiler = QueryProfiler()
+
+
+def install_query_profiler(
+    engine: Union[Engine, AsyncEngine],
+    enabled: bool,
+    slow_query_threshold_ms: float,
+) -> None:
+    """設定に応じてエンジンにプロファイラを登録する
+
+    無効時は何も登録しないため、クエリ実行時のオーバーヘッドはありません。
+
+    Args:
+        engine: 計測対象のエンジン
+        enabled: プロファイリングを有効にするかどうか
+        slow_query_threshold_ms: スロークエリとしてログに出す閾値（ミリ秒）
+    """
+    if not enabled:
+        return
+    query_profiler.slow_query_threshold_ms = slow_query_threshold_ms
+    query_profiler.install(engine)
@@ -1,7 +1,10 @@
 """セキュリティ関連のユーティリティを提供するモジュール"""
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Optional
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -9,7 +12,15 @@ from passlib.context import CryptContext
 from backend.core.config import settings
 
 # パスワードのハッシュ化に使用するコンテキスト
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt はCPUを占有するため、イベントループの外でコア数までのスレッドで実行する。
+# コア数を超えて並べてもスループットは上がらず、DBの接続スレッドなどが遅れる
+_password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="password-hash"
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -37,6 +48,26 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """パスワードを検証する（非同期のエンドポイント用）
+
+    検証はパスワード用のスレッドで行い、イベントループを止めません。
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """パスワードをハッシュ化する（非同期のエンドポイント用）
+
+    ハッシュ化はパスワード用のスレッドで行い、イベントループを止めません。
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+
 def create_access_token(
     subject: str | Any,
     expires_delta: Optional[timedelta] = None,
@@ -0,0 +1,71 @@
+"""Create user and item tables
+
+Revision ID: 95d6ac1261a9
+Revises:
+Create Date: 2026-10-19 08:55:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "95d6ac1261a9"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Base.metadata.create_all で作成済みのデータベースでは何もしない
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if "user" not in tables:
+        op.create_table(
+            "user",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.Column("email", sa.String(length=255), nullable=False),
+            sa.Column("username", sa.String(length=50), nullable=False),
+            sa.Column("hashed_password", sa.String(length=255), nullable=False),
+            sa.Column("full_name", sa.String(length=100), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("is_superuser", sa.Boolean(), nullable=False),
+            sa.Column("last_login", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_user_id"), "user", ["id"], unique=False)
+        op.create_index(op.f("ix_user_email"), "user", ["email"], unique=True)
+        op.create_index(op.f("ix_user_username"), "user", ["username"], unique=True)
+
+    if "item" not in tables:
+        op.create_table(
+            "item",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.Column("title", sa.String(length=100), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("owner_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["owner_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_item_id"), "item", ["id"], unique=False)
+        op.create_index(op.f("ix_item_title"), "item", ["title"], unique=False)
+        op.create_index(op.f("ix_item_owner_id"), "item", ["owner_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_item_owner_id"), table_name="item")
+    op.drop_index(op.f("ix_item_title"), table_name="item")
+    op.drop_index(op.f("ix_item_id"), table_name="item")
+    op.drop_table("item")
+    op.drop_index(op.f("ix_user_username"), table_name="user")
+    op.drop_index(op.f("ix_user_email"), table_name="user")
+    op.drop_index(op.f("ix_user_id"), table_name="user")
+    op.drop_table("user")
@@ -0,0 +1,38 @@
+"""Add version columns to item and user
+
+Revision ID: 8e2b5d4c7f13
+Revises: 3c1f7a9d2b40
+Create Date: 2026-10-19 09:15:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8e2b5d4c7f13"
+down_revision = "3c1f7a9d2b40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 既存の行はバージョン1から開始する
+    # (Base.metadata.create_all で作成済みの列は追加しない)
+    inspector = sa.inspect(op.get_bind())
+    for table in ("item", "user"):
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "version" not in columns:
+            op.add_column(
+                table,
+                sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user", "version")
+    op.drop_column("item", "version")
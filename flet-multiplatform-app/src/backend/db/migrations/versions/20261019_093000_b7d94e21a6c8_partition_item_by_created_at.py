@@ -0,0 +1,121 @@
+"""Partition item by created_at month
+
+Revision ID: b7d94e21a6c8
+Revises: 8e2b5d4c7f13
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7d94e21a6c8"
+down_revision = "8e2b5d4c7f13"
+branch_labels = None
+depends_on = None
+
+# 今月から事前に作成しておくパーティションの月数
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 宣言的パーティショニングはPostgreSQLのみ対応
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE item RENAME TO item_unpartitioned")
+    op.execute("ALTER INDEX IF EXISTS ix_item_id RENAME TO ix_item_unpartitioned_id")
+    op.execute(
+        "ALTER INDEX IF EXISTS ix_item_title RENAME TO ix_item_unpartitioned_title"
+    )
+    op.execute(
+        "ALTER INDEX IF EXISTS ix_item_owner_id "
+        "RENAME TO ix_item_unpartitioned_owner_id"
+    )
+    op.execute(
+        "UPDATE item_unpartitioned SET created_at = now() WHERE created_at IS NULL"
+    )
+
+    # パーティションキーを主キーに含める必要がある
+    op.execute(
+        "CREATE TABLE item (LIKE item_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE item ALTER COLUMN created_at SET NOT NULL")
+    op.execute("ALTER TABLE item ADD PRIMARY KEY (id, created_at)")
+    op.execute('ALTER TABLE item ADD FOREIGN KEY (owner_id) REFERENCES "user" (id)')
+    op.create_index(op.f("ix_item_id"), "item", ["id"], unique=False)
+    op.create_index(op.f("ix_item_title"), "item", ["title"], unique=False)
+    op.create_index(op.f("ix_item_owner_id"), "item", ["owner_id"], unique=False)
+    op.create_index(op.f("ix_item_created_at"), "item", ["created_at"], unique=False)
+
+    # 既存データの最古の月から数か月先までの月次パーティションと DEFAULT パーティション
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month_start timestamp;
+        BEGIN
+            FOR month_start IN
+                SELECT generate_series(
+                    date_trunc(
+                        'month',
+                        COALESCE(
+                            (SELECT min(created_at) FROM item_unpartitioned), now()
+                        )
+                    ),
+                    date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF item FOR VALUES FROM (%L) TO (%L)',
+                    'item_p' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    month_start + interval '1 month'
+                );
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute("CREATE TABLE item_default PARTITION OF item DEFAULT")
+
+    op.execute("INSERT INTO item SELECT * FROM item_unpartitioned")
+
+    # id のシーケンスを新しいテーブルに付け替えてから旧テーブルを削除する
+    op.execute("ALTER SEQUENCE IF EXISTS item_id_seq OWNED BY item.id")
+    op.execute("DROP TABLE item_unpartitioned")
+
+    # アーカイブされたパーティションの移動先
+    op.execute("CREATE TABLE item_archive (LIKE item)")
+    op.create_index(
+        op.f("ix_item_archive_created_at"), "item_archive", ["created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_table("item_archive")
+
+    op.execute("ALTER TABLE item RENAME TO item_partitioned")
+    for index in ("id", "title", "owner_id", "created_at"):
+        op.execute(f"ALTER INDEX ix_item_{index} RENAME TO ix_item_partitioned_{index}")
+
+    op.execute("CREATE TABLE item (LIKE item_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE item ADD PRIMARY KEY (id)")
+    op.execute('ALTER TABLE item ADD FOREIGN KEY (owner_id) REFERENCES "user" (id)')
+    op.create_index(op.f("ix_item_id"), "item", ["id"], unique=False)
+    op.create_index(op.f("ix_item_title"), "item", ["title"], unique=False)
+    op.create_index(op.f("ix_item_owner_id"), "item", ["owner_id"], unique=False)
+    op.create_index(op.f("ix_item_created_at"), "item", ["created_at"], unique=False)
+
+    op.execute("INSERT INTO item SELECT * FROM item_partitioned")
+    op.execute("ALTER SEQUENCE IF EXISTS item_id_seq OWNED BY item.id")
+    op.execute(sa.text("DROP TABLE item_partitioned CASCADE"))
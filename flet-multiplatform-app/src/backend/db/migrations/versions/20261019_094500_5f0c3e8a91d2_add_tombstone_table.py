@@ -0,0 +1,43 @@
+"""Add tombstone table
+
+Revision ID: 5f0c3e8a91d2
+Revises: b7d94e21a6c8
+Create Date: 2026-10-19 09:45:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5f0c3e8a91d2"
+down_revision = "b7d94e21a6c8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Base.metadata.create_all で作成済みのデータベースでは何もしない
+    if "tombstone" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "tombstone",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("resource", sa.String(length=50), nullable=False),
+        sa.Column("record_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_tombstone_resource_id", "tombstone", ["resource", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tombstone_resource_id", table_name="tombstone")
+    op.drop_table("tombstone")
@@ -0,0 +1,261 @@
+"""時間パーティションの管理モジュール
+
+PostgreSQLの宣言的パーティショニング（created_at による月単位の RANGE 分割）を
+行ったテーブルについて、パーティションの作成・一覧取得・アーカイブを行います。
+SQLite などパーティショニングに対応していないデータベースでは使用しません。
+"""
+
+import gzip
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# パーティションの境界式 (pg_get_expr の出力) を解析する正規表現
+_BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+@dataclass(frozen=True)
+class Partition:
+    """月単位のパーティション"""
+
+    name: str
+    start: datetime
+    end: datetime
+
+
+def month_start(value: datetime) -> datetime:
+    """指定日時を含む月の初日（0時0分）を返す"""
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """月初の日時に月数を加算する"""
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    """パーティションのテーブル名を返す（例: item_p2026_10）"""
+    return f"{table}_p{start:%Y_%m}"
+
+
+async def default_partition(conn: AsyncConnection, table: str) -> Optional[str]:
+    """親テーブルの DEFAULT パーティション名を取得する（存在しない場合はNone）"""
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_partitioned_table "
+            "JOIN pg_class parent ON pg_partitioned_table.partrelid = parent.oid "
+            "JOIN pg_class child ON pg_partitioned_table.partdefid = child.oid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return result.scalar_one_or_none()
+
+
+async def create_month_partition(
+    conn: AsyncConnection, table: str, start: datetime, column: str = "created_at"
+) -> Partition:
+    """指定月のパーティションを作成する（既に存在する場合は何もしない）
+
+    DEFAULT パーティションに該当月の行がある場合、PARTITION OF での作成は
+    失敗するため、単独のテーブルとして作成して該当行を移してから ATTACH する。
+
+    Args:
+        conn: データベース接続（トランザクション内で呼び出すこと）
+        table: 親テーブル名
+        start: パーティションに含める月の任意の日時
+        column: パーティションキーの列名
+
+    Returns:
+        Partition: 作成したパーティション
+    """
+    start = month_start(start)
+    partition = Partition(partition_name(table, start), start, add_months(start, 1))
+    exists = await conn.scalar(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f'"{partition.name}"'}
+    )
+    if exists:
+        return partition
+
+    bounds = (
+        f"FOR VALUES FROM ('{partition.start.isoformat()}') "
+        f"TO ('{partition.end.isoformat()}')"
+    )
+    default = await default_partition(conn, table)
+    if default is None:
+        await conn.execute(
+            text(f'CREATE TABLE "{partition.name}" PARTITION OF "{table}" {bounds}')
+        )
+        return partition
+
+    await conn.execute(
+        text(
+            f'CREATE TABLE "{partition.name}" '
+            f'(LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+    )
+    await conn.execute(
+        text(
+            f'WITH moved AS (DELETE FROM "{default}" '
+            f'WHERE "{column}" >= :start AND "{column}" < :end RETURNING *) '
+            f'INSERT INTO "{partition.name}" SELECT * FROM moved'
+        ),
+        {"start": partition.start, "end": partition.end},
+    )
+    await conn.execute(
+        text(f'ALTER TABLE "{table}" ATTACH PARTITION "{partition.name}" {bounds}')
+    )
+    return partition
+
+
+def planned_partitions(
+    table: str, months_ahead: int = 3, now: Optional[datetime] = None
+) -> List[Partition]:
+    """今月から指定月数先までに必要なパーティションを返す
+
+    Args:
+        table: 親テーブル名
+        months_ahead: 事前に作成する月数
+        now: 基準日時（省略時は現在日時）
+
+    Returns:
+        List[Partition]: 古い順のパーティション
+    """
+    current = month_start(now or datetime.utcnow())
+    starts = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    return [
+        Partition(partition_name(table, start), start, add_months(start, 1))
+        for start in starts
+    ]
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    table: str,
+    months_ahead: int = 3,
+    now: Optional[datetime] = None,
+) -> List[Partition]:
+    """今月から指定月数先までのパーティションを作成する
+
+    Args:
+        conn: データベース接続
+        table: 親テーブル名
+        months_ahead: 事前に作成する月数
+        now: 基準日時（省略時は現在日時）
+
+    Returns:
+        List[Partition]: 作成（または既存）のパーティション
+    """
+    return [
+        await create_month_partition(conn, table, partition.start)
+        for partition in planned_partitions(table, months_ahead, now)
+    ]
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> List[Partition]:
+    """親テーブルに接続されている月単位のパーティションを古い順に取得する
+
+    DEFAULT パーティションは含みません。
+    """
+    result = await conn.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+
+    partitions = []
+    for name, bound in result:
+        match = _BOUND_PATTERN.search(bound or "")
+        if match is None:
+            continue
+        partitions.append(
+            Partition(
+                name,
+                datetime.fromisoformat(match.group(1)),
+                datetime.fromisoformat(match.group(2)),
+            )
+        )
+    return sorted(partitions, key=lambda p: p.start)
+
+
+def find_cold_partitions(
+    partitions: List[Partition],
+    older_than_months: int,
+    now: Optional[datetime] = None,
+) -> List[Partition]:
+    """指定月数より前に終了しているパーティションを返す
+
+    Args:
+        partitions: パーティションの一覧
+        older_than_months: 残しておく月数（今月を含まない）
+        now: 基準日時（省略時は現在日時）
+
+    Returns:
+        List[Partition]: アーカイブ対象のパーティション
+    """
+    cutoff = add_months(month_start(now or datetime.utcnow()), -older_than_months)
+    return [p for p in partitions if p.end <= cutoff]
+
+
+async def archive_partition(
+    conn: AsyncConnection,
+    table: str,
+    partition: Partition,
+    destination: str = "table",
+    output_dir: Optional[Path] = None,
+) -> int:
+    """パーティションを切り離してアーカイブし、削除する
+
+    Args:
+        conn: データベース接続（トランザクション内で呼び出すこと）
+        table: 親テーブル名
+        partition: アーカイブするパーティション
+        destination: "table" の場合は <table>_archive テーブルへ、
+            "file" の場合は output_dir に gzip 圧縮した JSON Lines として保存する
+        output_dir: ファイル出力先のディレクトリ
+
+    Returns:
+        int: アーカイブした行数
+
+    Raises:
+        ValueError: destination が不正な場合
+    """
+    if destination not in ("table", "file"):
+        raise ValueError(f"Unknown archive destination: {destination}")
+
+    await conn.execute(
+        text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition.name}"')
+    )
+
+    if destination == "table":
+        result = await conn.execute(
+            text(f'INSERT INTO "{table}_archive" SELECT * FROM "{partition.name}"')
+        )
+        archived = result.rowcount
+    else:
+        output_dir = Path(output_dir or "archives")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        archived = 0
+        rows = await conn.stream(text(f'SELECT * FROM "{partition.name}"'))
+        with gzip.open(
+            output_dir / f"{partition.name}.jsonl.gz", "wt", encoding="utf-8"
+        ) as f:
+            async for row in rows.mappings():
+                f.write(json.dumps(dict(row), ensure_ascii=False, default=str))
+                f.write("\n")
+                archived += 1
+
+    await conn.execute(text(f'DROP TABLE "{partition.name}"'))
+    return archived
@@ -1,11 +1,15 @@
 """モデルモジュールの初期化ファイル"""
 
 from backend.core.db import Base
+from backend.models.idempotency_key import IdempotencyKey
 from backend.models.item import Item
+from backend.models.tombstone import Tombstone
 from backend.models.user import User
 
 __all__ = [
     "Base",
     "User",
     "Item",
+    "IdempotencyKey",
+    "Tombstone",
 ]
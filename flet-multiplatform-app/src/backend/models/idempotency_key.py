@@ -0,0 +1,36 @@
+"""冪等性キーモデルを定義するモジュール"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String
+
+from backend.core.db import Base
+
+
+class IdempotencyKey(Base):
+    """冪等性キーモデル
+
+    Idempotency-Key ヘッダーごとにリクエストのフィンガープリントと
+    レスポンスを保存し、再送されたリクエストに同じレスポンスを返します。
+    """
+
+    __tablename__ = "idempotency_key"
+
+    # 呼び出し元・メソッド・パス・キーのHMAC
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+
+    # 処理完了後に保存されるレスポンス（処理中はNULL）
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        """文字列表現を返す"""
+        return f"<IdempotencyKey {self.key}>"
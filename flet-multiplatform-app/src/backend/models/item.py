@@ -1,7 +1,6 @@
 """アイテムモデルを定義するモジュール"""
 
 from datetime import datetime
-from typing import Optional
 
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import relationship
@@ -14,9 +13,16 @@ class Item(Base):
 
     __tablename__ = "item"
 
+    # PostgreSQLでは created_at による月単位のRANGEパーティションとして
+    # マイグレーションで作成する（主キーは (id, created_at)）。
+    # パーティションの管理は backend.db.partitioning を参照。
+    # SQLiteは複合主キーの自動採番に対応しないため、テーブル定義上の主キーは
+    # id のままとし、マッパーの主キーをマイグレーションと同じ (id, created_at) にする。
+    __table_args__ = {"info": {"partition_key": "created_at"}}
+
     # 基本フィールド
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # 基本情報
@@ -27,6 +33,14 @@ class Item(Base):
     owner_id = Column(Integer, ForeignKey("user.id"), nullable=False, index=True)
     owner = relationship("User", back_populates="items")
 
+    # 楽観的排他制御用のバージョン
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {
+        "primary_key": [id, created_at],
+        "version_id_col": version,
+    }
+
     def __repr__(self) -> str:
         """文字列表現を返す"""
         return f"<Item {self.title}>"
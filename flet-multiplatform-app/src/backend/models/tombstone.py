@@ -0,0 +1,28 @@
+"""削除記録（トゥームストーン）モデルを定義するモジュール"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, String
+
+from backend.core.db import Base
+
+
+class Tombstone(Base):
+    """削除記録モデル
+
+    削除されたレコードは一覧APIに現れないため、オフライン対応の
+    クライアントは削除を検出できません。削除時にこの記録を残し、
+    クライアントは id の昇順で差分を取得してローカルから削除します。
+    """
+
+    __tablename__ = "tombstone"
+    __table_args__ = (Index("ix_tombstone_resource_id", "resource", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    resource = Column(String(50), nullable=False)
+    record_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        """文字列表現を返す"""
+        return f"<Tombstone {self.resource}/{self.record_id}>"
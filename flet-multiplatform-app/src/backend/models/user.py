@@ -1,7 +1,6 @@
 """ユーザーモデルを定義するモジュール"""
 
 from datetime import datetime
-from typing import Optional
 
 from sqlalchemy import Boolean, Column, DateTime, Integer, String
 from sqlalchemy.orm import relationship
@@ -35,6 +34,11 @@ class User(Base):
     # リレーションシップ
     items = relationship("Item", back_populates="owner", cascade="all, delete-orphan")
 
+    # 楽観的排他制御用のバージョン
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self) -> str:
         """文字列表現を返す"""
         return f"<User {self.username}>"
@@ -8,6 +8,7 @@ from backend.schemas.base import (
     BaseUpdateSchema,
 )
 from backend.schemas.item import ItemBase, ItemCreate, ItemResponse, ItemUpdate
+from backend.schemas.tombstone import TombstoneResponse
 from backend.schemas.user import (
     Token,
     TokenPayload,
@@ -36,4 +37,6 @@ __all__ = [
     "ItemCreate",
     "ItemUpdate",
     "ItemResponse",
+    # 削除記録スキーマ
+    "TombstoneResponse",
 ]
@@ -1,5 +1,6 @@
 """アイテム関連のスキーマを定義するモジュール"""
 
+from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, Field
@@ -29,6 +30,9 @@ class ItemResponse(ItemBase):
 
     id: int = Field(..., description="アイテムのID")
     owner_id: int = Field(..., description="所有者のID")
+    version: int = Field(1, description="楽観的排他制御用のバージョン")
+    created_at: Optional[datetime] = Field(None, description="作成日時")
+    updated_at: Optional[datetime] = Field(None, description="更新日時")
 
     class Config:
         """Pydantic設定クラス"""
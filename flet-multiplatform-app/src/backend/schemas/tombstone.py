@@ -0,0 +1,19 @@
+"""削除記録関連のスキーマを定義するモジュール"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class TombstoneResponse(BaseModel):
+    """削除記録レスポンススキーマ"""
+
+    id: int = Field(..., description="削除記録のID（差分取得の位置）")
+    resource: str = Field(..., description="リソース名（users / items）")
+    record_id: int = Field(..., description="削除されたレコードのID")
+    deleted_at: datetime = Field(..., description="削除日時")
+
+    class Config:
+        """Pydantic設定クラス"""
+
+        from_attributes = True
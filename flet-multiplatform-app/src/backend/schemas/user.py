@@ -33,9 +33,13 @@ class UserUpdate(UserBase, BaseUpdateSchema):
 class UserInDB(UserBase, BaseResponseSchema):
     """データベース内のユーザースキーマ"""
 
+    # 保存済みのメールアドレスは作成・更新時に検証済みのため、出力時には
+    # email_validator で再検証しない（一覧のレスポンス時間の大半を占めていた）
+    email: str = Field(..., description="メールアドレス")
     is_active: bool = Field(..., description="アクティブ状態")
     is_superuser: bool = Field(..., description="管理者権限")
     last_login: Optional[datetime] = Field(None, description="最終ログイン日時")
+    version: int = Field(1, description="楽観的排他制御用のバージョン")
 
 
 class UserResponse(UserInDB):
@@ -10,6 +10,16 @@ __all__ = [
     "test_stress",
     "test_endurance",
     "test_scalability",
+    "test_open_loop",
+    "test_histogram",
+    "test_transport",
+    "test_distributed",
+    "test_microbenchmarks",
+    "test_stats",
+    "test_results_store",
+    "test_profiler",
+    "test_leaks",
+    "test_budgets",
     "conftest",
     "utils",
 ]
@@ -0,0 +1,143 @@
+"""
+Pytest plugin that enforces performance budgets.
+
+Registered by the performance conftest. Tests request the ``perf_budget``
+fixture and pass their load results to it::
+
+    results = await loader.run_load_test(method="GET", endpoint="/health", ...)
+    perf_budget.enforce(results, "GET", "/health")
+
+``enforce`` compares the results with the budget of the test's scenario and
+endpoint (see ``utils/budgets.py``) and fails the test if any metric is over
+budget. Metrics the test measures itself are passed as keywords, e.g.
+``perf_budget.enforce(error_rate=0.02, rss_growth_mb=12.5)``. The scenario
+is the test name without its ``test_`` prefix, or the argument of
+``@pytest.mark.budget_scenario("name")``. Every comparison is recorded with
+the test's performance metrics and printed in a budget-vs-actual table at
+the end of the run.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from src.backend.tests.performance.utils.budgets import (
+    BUDGET_METRICS,
+    BudgetCheck,
+    Budgets,
+    format_budget_table,
+    load_test_actuals,
+)
+
+
+class BudgetGuard:
+    """Checks the load results of one test against its scenario's budgets."""
+
+    def __init__(
+        self,
+        budgets: Budgets,
+        scenario: str,
+        target: Any = None,
+        metrics: Any = None,
+    ):
+        self.budgets = budgets
+        self.scenario = scenario
+        self.target = target
+        self.metrics = metrics
+        self.checks: List[BudgetCheck] = []
+
+    def _rss_mb(self) -> Optional[float]:
+        process = self.target.process() if self.target is not None else None
+        return (
+            process.memory_info().rss / (1024 * 1024) if process is not None else None
+        )
+
+    def check(
+        self,
+        results: Optional[Dict[str, Any]] = None,
+        method: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        **measured: Optional[float],
+    ) -> List[BudgetCheck]:
+        """Compare load results with the budget and record the comparison.
+
+        Args:
+            results: ``LoadGenerator`` summary, if the test has one
+            method: HTTP method of the endpoint
+            endpoint: Endpoint path, or None to use the scenario's run-wide budget
+            **measured: Budget metrics measured by the test itself; they
+                override those derived from ``results``
+
+        Returns:
+            The comparisons, failed or not
+        """
+        unknown = set(measured) - set(BUDGET_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown budget metrics: {sorted(unknown)}")
+        actual = load_test_actuals(results or {}, rss_mb=self._rss_mb())
+        actual.update(measured)
+        checks = self.budgets.check(actual, self.scenario, method, endpoint)
+        self.checks.extend(checks)
+        if self.metrics is not None:
+            self.metrics.record_test_metric(
+                "budget_checks", [check.to_dict() for check in self.checks]
+            )
+        return checks
+
+    def enforce(
+        self,
+        results: Optional[Dict[str, Any]] = None,
+        method: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        **measured: Optional[float],
+    ) -> None:
+        """Like ``check``, but fail the test if any metric is over budget."""
+        checks = self.check(results, method, endpoint, **measured)
+        failed = [check for check in checks if not check.passed]
+        if failed:
+            raise AssertionError(
+                "Performance budget exceeded:\n"
+                + "\n".join(f"  {check.describe()}" for check in failed)
+            )
+
+
+class BudgetPlugin:
+    """Provides ``perf_budget`` and reports all budget checks of the run."""
+
+    def __init__(self, budgets: Budgets):
+        self.budgets = budgets
+        self.guards: List[BudgetGuard] = []
+
+    @pytest.fixture
+    def perf_budget(self, request) -> BudgetGuard:
+        """Budget guard for the current test's scenario."""
+        marker = request.node.get_closest_marker("budget_scenario")
+        if marker is not None:
+            scenario = marker.args[0]
+        else:
+            name = getattr(request.node, "originalname", request.node.name)
+            scenario = name[len("test_") :] if name.startswith("test_") else name
+
+        target = metrics = None
+        if "perf_target" in request.fixturenames:
+            target = request.getfixturevalue("perf_target")
+        if "performance_metrics" in request.fixturenames:
+            metrics = request.getfixturevalue("performance_metrics")
+
+        guard = BudgetGuard(self.budgets, scenario, target, metrics)
+        self.guards.append(guard)
+        return guard
+
+    def pytest_configure(self, config):
+        config.addinivalue_line(
+            "markers", "budget_scenario(name): budgets scenario used by perf_budget"
+        )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        checks = [check for guard in self.guards for check in guard.checks]
+        if not checks:
+            return
+        terminalreporter.section("performance budgets")
+        terminalreporter.write_line(f"Budgets: {self.budgets.path}")
+        for line in format_budget_table(checks).splitlines():
+            terminalreporter.write_line(line)
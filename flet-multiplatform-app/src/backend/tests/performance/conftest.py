@@ -2,21 +2,85 @@
 Pytest configuration for performance tests.
 
 This module contains fixtures and configuration for performance testing.
+
+The suites drive ``backend.app:app`` through the ``perf_target`` fixture,
+selected with ``--perf-target`` (or the ``PERF_TARGET`` environment variable):
+
+- ``asgi`` (default): call the app in-process, measuring application cost
+  only, with no external server.
+- ``uvicorn``: start the app in a uvicorn subprocess and send real HTTP.
+- any ``http(s)://`` URL: send requests to an already running server.
+
+With ``--perf-profile`` (or ``PERF_PROFILE=1``) the serving process is
+sampled for the duration of each test that uses ``performance_metrics``, and
+collapsed stacks, a flamegraph SVG and speedscope JSON are written next to
+its results file. The ASGI target is sampled in-process; the uvicorn target
+needs ``py-spy`` on PATH. Remote URLs cannot be profiled.
+
+Both local modes use a SQLite database seeded with ``SEED_USERS`` users and
+hash passwords at ``PERF_BCRYPT_ROUNDS``, so write budgets measure the
+request path rather than the bcrypt cost (``test_microbenchmarks`` covers
+that at the configured cost). Start a remote URL target with
+``BCRYPT_ROUNDS=4`` for its results to be comparable.
+Run from ``src/`` with the parent conftest excluded, e.g.::
+
+    PYTHONPATH=..:. python -m pytest backend/tests/performance \
+        --confcutdir=backend/tests/performance --perf-test --perf-target=asgi
 """
 
+import asyncio
 import json
 import os
+import re
+import tempfile
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Dict, Generator, Optional
 
 import psutil
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
-
-from src.backend.app.main import app
-from src.backend.core.config import settings
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.config import settings as app_settings
+from backend.core.db import AsyncSessionLocal, Base
+from backend.core.security import pwd_context
+from backend.models import User
+from src.backend.tests.performance.budget_plugin import BudgetPlugin
+from src.backend.tests.performance.utils import (
+    PySpySampler,
+    ThreadSampler,
+    UvicornServer,
+    current_commit,
+    load_app,
+    load_budgets,
+)
+
+# SQLite database the local targets run against
+PERF_DATABASE_PATH = Path(tempfile.gettempdir()) / "flet_app_perf.db"
+PERF_DATABASE_URL = f"sqlite+aiosqlite:///{PERF_DATABASE_PATH}"
+
+# Settings are created when the backend package is imported, before this
+# module runs, so the in-process app is rebound to this engine instead of
+# configured through DATABASE_URL. SQL echo is off so it is not measured.
+perf_engine = create_async_engine(PERF_DATABASE_URL, echo=False)
+
+# backend.app:app, loaded by path because the backend/app/ package shadows it
+BACKEND_APP = f"{Path(__file__).resolve().parents[2] / 'app.py'}:app"
+app = load_app(BACKEND_APP)
+
+# Number of users created in the perf database (ids 1..SEED_USERS)
+SEED_USERS = 100
+
+# bcrypt cost the local targets hash passwords at (the minimum bcrypt allows).
+# At the production cost of 12 one hash takes ~0.4 s of CPU, so a write budget
+# would only measure how many cores the machine has.
+PERF_BCRYPT_ROUNDS = 4
+
+# bcrypt hash of "testpassword123" at PERF_BCRYPT_ROUNDS
+SEED_PASSWORD_HASH = "$2b$04$GiLbY9.INSqMmWV/VG1Wk.CQtaDParl9qed1Qu/sbSj4xYjn27316"
 
 # Performance test configuration
 PERF_TEST_CONFIG = {
@@ -37,6 +101,12 @@ PERF_TEST_CONFIG = {
         "spawn_rate": 10,
         "duration": "1h",
         "warm_up_time": 30,
+        # Traced memory growth allowed in test_memory_leaks. Tracing slows
+        # allocation-heavy requests several times over, more with deeper
+        # tracebacks, so few requests are served in the test's time window.
+        "leak_budget_kb_per_10k_requests": 1024,
+        "leak_warmup_requests": 200,
+        "leak_traceback_frames": 3,
     },
     "scalability_test": {
         "start_users": 10,
@@ -51,6 +121,9 @@ PERF_TEST_CONFIG = {
 RESULTS_DIR = Path("results/performance")
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Commit under test, recorded with each result so the results store can index it
+COMMIT = current_commit()
+
 
 class PerformanceMetrics:
     """Class to collect and store performance metrics during tests."""
@@ -62,10 +135,13 @@ class PerformanceMetrics:
         self.metrics: Dict[str, Any] = {
             "test_name": test_name,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "commit": COMMIT,
             "system_metrics": [],
             "test_metrics": {},
             "errors": [],
         }
+        # Extra report files saved next to the results: {suffix: content}
+        self.attachments: Dict[str, str] = {}
         self.process = psutil.Process()
 
     def start_timer(self) -> None:
@@ -100,6 +176,10 @@ class PerformanceMetrics:
         """Record a test-specific metric."""
         self.metrics["test_metrics"][name] = value
 
+    def attach(self, suffix: str, content: str) -> None:
+        """Save ``content`` as ``<results file stem>.<suffix>`` with the results."""
+        self.attachments[suffix] = content
+
     def record_error(self, error: Exception) -> None:
         """Record an error that occurred during the test."""
         self.metrics["errors"].append(
@@ -124,18 +204,113 @@ class PerformanceMetrics:
 
         # Create a filename with timestamp and test name
         timestamp = time.strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{self.test_name}.json"
+        # Parametrized test names can contain "/" and other unsafe characters
+        safe_name = re.sub(r"[^\w.-]+", "_", self.test_name).strip("_")
+        filename = f"{timestamp}_{safe_name}.json"
         filepath = RESULTS_DIR / filename
 
         # Save to file
         with open(filepath, "w") as f:
             json.dump(self.metrics, f, indent=2, default=str)
 
+        for suffix, content in self.attachments.items():
+            (RESULTS_DIR / f"{filepath.stem}.{suffix}").write_text(
+                content, encoding="utf-8"
+            )
+
         return filepath
 
 
-@pytest_asyncio.fixture(scope="module")
-async def test_client() -> Generator[TestClient, None, None]:
+@dataclass
+class PerfTarget:
+    """Where the performance suites send their load."""
+
+    mode: str
+    base_url: str
+    app: Any = None
+    pid: Optional[int] = None
+
+    def loader_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments that point a ``LoadGenerator`` at this target."""
+        return {"base_url": self.base_url, "app": self.app}
+
+    def process(self) -> Optional[psutil.Process]:
+        """The process serving requests (this one in ASGI mode, None if remote)."""
+        if self.mode == "asgi":
+            return psutil.Process(os.getpid())
+        return psutil.Process(self.pid) if self.pid else None
+
+
+async def prepare_perf_database(num_users: int = SEED_USERS) -> None:
+    """Recreate the perf database tables and seed users."""
+    async with perf_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            User.__table__.insert(),
+            [
+                {
+                    "email": f"perf{i}@example.com",
+                    "username": f"perf{i}",
+                    "hashed_password": SEED_PASSWORD_HASH,
+                    "full_name": f"Perf User {i}",
+                    "is_active": True,
+                    "is_superuser": False,
+                    "version": 1,
+                }
+                for i in range(1, num_users + 1)
+            ],
+        )
+    # Connections belong to this event loop; each test runs its own
+    await perf_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def perf_target(request) -> Generator[PerfTarget, None, None]:
+    """The app under test, selected with ``--perf-target``."""
+    target = request.config.getoption("--perf-target")
+
+    if target.startswith(("http://", "https://")):
+        yield PerfTarget(mode="url", base_url=target.rstrip("/"))
+        return
+
+    asyncio.run(prepare_perf_database())
+
+    if target == "asgi":
+        AsyncSessionLocal.configure(bind=perf_engine)
+        # Log at INFO like the uvicorn target (DEBUG logging would be measured)
+        app_settings.DEBUG = False
+        pwd_context.update(bcrypt__rounds=PERF_BCRYPT_ROUNDS)
+        yield PerfTarget(mode="asgi", base_url="http://testserver", app=app)
+    elif target == "uvicorn":
+        src_dir = Path(__file__).resolve().parents[3]
+        env = {
+            "DATABASE_URL": PERF_DATABASE_URL,
+            "DEBUG": "False",
+            "BCRYPT_ROUNDS": str(PERF_BCRYPT_ROUNDS),
+            "PYTHONPATH": os.pathsep.join(
+                [str(src_dir), str(src_dir.parent), os.environ.get("PYTHONPATH", "")]
+            ),
+        }
+        with UvicornServer(BACKEND_APP, env=env, cwd=src_dir) as server:
+            yield PerfTarget(mode="uvicorn", base_url=server.base_url, pid=server.pid)
+    else:
+        raise pytest.UsageError(
+            f"--perf-target must be asgi, uvicorn or a URL, got {target!r}"
+        )
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _release_db_connections(request):
+    """Drop pooled connections after each in-process test (each has its own loop)."""
+    yield
+    if "perf_target" in request.fixturenames:
+        if request.getfixturevalue("perf_target").mode == "asgi":
+            await perf_engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def test_client(perf_target: PerfTarget) -> Generator[TestClient, None, None]:
     """Create a test client for FastAPI application."""
     with TestClient(app) as client:
         yield client
@@ -148,6 +323,7 @@ def performance_metrics(request) -> Generator[PerformanceMetrics, None, None]:
     Automatically starts and stops timing, and saves results at the end of the test.
     """
     metrics = PerformanceMetrics(request.node.name)
+    profiler = start_profiler(request)
     metrics.start_timer()
 
     try:
@@ -157,16 +333,44 @@ def performance_metrics(request) -> Generator[PerformanceMetrics, None, None]:
         raise
     finally:
         metrics.stop_timer()
+        profile = None
+        if profiler is not None:
+            try:
+                profile = profiler.stop()
+            except RuntimeError as e:
+                print(f"\nProfiling failed for {request.node.name}: {e}")
         results_file = metrics.save_results()
         print(f"\nPerformance test results saved to: {results_file}")
+        if profile is not None:
+            paths = profile.write(results_file.with_suffix(""), request.node.name)
+            print(f"Profile ({profile.total} samples) saved to: {paths['flamegraph']}")
+
+
+def start_profiler(request) -> Optional[Any]:
+    """Start sampling the serving process if ``--perf-profile`` is set."""
+    if not request.config.getoption("--perf-profile"):
+        return None
+    if "perf_target" not in request.fixturenames:
+        return None
+
+    target: PerfTarget = request.getfixturevalue("perf_target")
+    interval = request.config.getoption("--perf-profile-interval") / 1000
+    if target.mode == "asgi":
+        profiler = ThreadSampler(interval)
+    elif target.pid and PySpySampler.available():
+        profiler = PySpySampler(target.pid, interval)
+    else:
+        reason = "py-spy is not installed" if target.pid else "the server is remote"
+        print(f"\nProfiling skipped for {request.node.name}: {reason}")
+        return None
+    profiler.start()
+    return profiler
 
 
 @pytest.fixture(scope="session")
 def perf_test_config() -> Dict[str, Any]:
     """Load performance test configuration."""
-    config_path = (
-        settings.BASE_DIR / "tests" / "performance" / "config" / "perf_config.json"
-    )
+    config_path = Path(__file__).parent / "config" / "perf_config.json"
     if config_path.exists():
         with open(config_path) as f:
             return {**PERF_TEST_CONFIG, **json.load(f)}
@@ -184,11 +388,44 @@ def pytest_addoption(parser):
         default=None,
         help="Path to performance test configuration file",
     )
+    parser.addoption(
+        "--perf-target",
+        type=str,
+        default=os.getenv("PERF_TARGET", "asgi"),
+        help="Where to send load: asgi (in-process), uvicorn (subprocess) or a URL",
+    )
+    parser.addoption(
+        "--perf-budgets",
+        type=str,
+        default=None,
+        help=(
+            "Budgets file "
+            "(default: PERF_BUDGETS or tests/performance/config/budgets.json)"
+        ),
+    )
+    parser.addoption(
+        "--perf-profile",
+        action="store_true",
+        default=os.getenv("PERF_PROFILE", "").lower() in ("1", "true", "yes"),
+        help=(
+            "Profile the server during each test and save flamegraphs "
+            "with the results"
+        ),
+    )
+    parser.addoption(
+        "--perf-profile-interval",
+        type=float,
+        default=10.0,
+        help="Milliseconds between profiler samples (default: 10)",
+    )
 
 
 def pytest_configure(config):
     """Configure pytest for performance testing."""
     config.addinivalue_line("markers", "performance: mark test as a performance test")
+    # Budget assertions and the budget-vs-actual table (see budget_plugin.py)
+    budgets = load_budgets(config.getoption("--perf-budgets"))
+    config.pluginmanager.register(BudgetPlugin(budgets), "perf_budgets")
 
 
 def pytest_collection_modifyitems(config, items):
@@ -0,0 +1,129 @@
+"""
+Tests for performance budget resolution and checks.
+"""
+
+import pytest
+
+from src.backend.tests.performance.budget_plugin import BudgetGuard
+from src.backend.tests.performance.utils import (
+    Budgets,
+    format_budget_table,
+    load_budgets,
+    load_test_actuals,
+)
+from src.backend.tests.performance.utils.budgets import locust_actuals
+
+BUDGETS = Budgets(
+    {
+        "defaults": {"p95_ms": 1000, "error_rate": 0.05, "min_rps": 10},
+        "scenarios": {
+            "base": {"defaults": {"p50_ms": 200}},
+            "db": {
+                "extends": "base",
+                "defaults": {"error_rate": 0.01},
+                "endpoints": {
+                    "GET /api/v1/users/*": {"p99_ms": 500},
+                    "GET /api/v1/users/me": {"p99_ms": 100, "min_rps": None},
+                    "POST *": {"p95_ms": 2000},
+                },
+            },
+            "loop": {"extends": "loop"},
+        },
+    }
+)
+
+
+def test_budget_resolution_order():
+    assert BUDGETS.budget_for("unknown") == {
+        "p95_ms": 1000,
+        "error_rate": 0.05,
+        "min_rps": 10,
+    }
+    assert BUDGETS.budget_for("db") == {
+        "p50_ms": 200,
+        "p95_ms": 1000,
+        "error_rate": 0.01,
+        "min_rps": 10,
+    }
+    assert BUDGETS.budget_for("db", "get", "/api/v1/users/1")["p99_ms"] == 500
+    # Later entries override earlier ones, and null removes a budget
+    me = BUDGETS.budget_for("db", "GET", "/api/v1/users/me")
+    assert me["p99_ms"] == 100
+    assert "min_rps" not in me
+    assert BUDGETS.budget_for("db", "POST", "/api/v1/users/")["p95_ms"] == 2000
+    assert "p99_ms" not in BUDGETS.budget_for("db", "POST", "/api/v1/users/")
+    assert BUDGETS.budget_for("loop") == BUDGETS.budget_for("unknown")
+
+
+def test_checks_respect_bound_direction():
+    actual = {"p95_ms": 1200.0, "error_rate": 0.0, "min_rps": 5.0, "p50_ms": None}
+    checks = {check.metric: check for check in BUDGETS.check(actual, "db")}
+
+    # Unmeasured metrics are not checked
+    assert set(checks) == {"p95_ms", "error_rate", "min_rps"}
+    assert not checks["p95_ms"].passed
+    assert checks["error_rate"].passed
+    assert not checks["min_rps"].passed
+    assert checks["min_rps"].describe() == "db *: min_rps = 5.0 (budget >= 10.0)"
+
+    table = format_budget_table(list(checks.values()), "Budgets")
+    assert table.splitlines()[0] == "Budgets"
+    assert "OVER" in table and "ok" in table
+
+
+def test_actuals_from_load_results_and_locust():
+    summary = {
+        "total_requests": 100,
+        "success_rate": 0.98,
+        "requests_per_second": 50.0,
+        "response_times": {
+            "median": 0.01,
+            "p90": 0.02,
+            "p95": 0.03,
+            "p99": 0.04,
+            "max": 0.1,
+        },
+    }
+    actual = load_test_actuals(summary, rss_mb=120.0)
+    assert actual["p95_ms"] == 30.0
+    assert abs(actual["error_rate"] - 0.02) < 1e-9
+    assert actual["min_rps"] == 50.0
+    assert actual["max_rss_mb"] == 120.0
+    assert all(
+        value is None for value in load_test_actuals({"total_requests": 0}).values()
+    )
+
+    entry = {"num_requests": 10, "num_failures": 1, "response_time_percentile_95": 80}
+    assert locust_actuals(entry)["error_rate"] == 0.1
+    assert locust_actuals(entry)["p95_ms"] == 80
+
+
+def test_shipped_budgets_cover_locust_scenarios():
+    budgets = load_budgets()
+
+    for scenario in ("smoke", "load", "stress"):
+        assert set(budgets.budget_for(scenario)) >= {
+            "p50_ms",
+            "p95_ms",
+            "error_rate",
+            "min_rps",
+        }
+
+
+def test_guard_checks_metrics_measured_by_the_test():
+    guard = BudgetGuard(load_budgets(), "memory_usage_under_load")
+
+    guard.enforce(rss_growth_mb=20.0)
+    with pytest.raises(AssertionError, match="rss_growth_mb = 150.0"):
+        guard.enforce(rss_growth_mb=150.0)
+    with pytest.raises(ValueError, match="rss_growth"):
+        guard.check(rss_growth=1.0)
+
+
+def test_shipped_budgets_cover_stress_and_endurance_tests():
+    budgets = load_budgets()
+
+    assert budgets.budget_for("high_concurrent_users")["error_rate"] == 0.2
+    assert budgets.budget_for("connection_pool_stability")["error_rate"] == 0.01
+    assert budgets.budget_for("memory_leaks")["rss_growth_mb_per_hour"] == 10
+    assert "cpu_ms_per_request" in budgets.budget_for("cpu_usage_under_load")
@@ -0,0 +1,153 @@
+"""
+Tests for multi-process load generation.
+
+Checks that partitioned arrival schedules add up to the original one, that
+worker snapshots merge into a single report, and that a CPU-bound generator
+is flagged.
+"""
+
+import textwrap
+
+import pytest
+
+from src.backend.tests.performance.utils import (
+    ConstantRate,
+    DistributedLoadGenerator,
+    PoissonArrivals,
+    RampRate,
+    ResultAggregator,
+    UvicornServer,
+    detect_saturation,
+    partition_profile,
+)
+
+APP_SOURCE = textwrap.dedent(
+    """
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/echo")
+    async def echo(i: int):
+        return {"i": i}
+    """
+)
+
+
+def echo_params(index: int) -> dict:
+    # Module-level so it can be sent to worker processes
+    return {"i": index}
+
+
+@pytest.mark.parametrize(
+    "profile",
+    [
+        ConstantRate(rate=100, duration=2),
+        RampRate(start_rate=0, end_rate=200, duration=3),
+        PoissonArrivals(rate=150, duration=2, seed=3),
+    ],
+    ids=lambda profile: profile.name,
+)
+def test_partitions_reproduce_schedule(profile):
+    parts = partition_profile(profile, 3)
+
+    combined = sorted(offset for part in parts for offset in part.offsets())
+
+    assert combined == list(profile.offsets())
+    assert [part.to_dict()["partition"] for part in parts] == [[0, 3], [1, 3], [2, 3]]
+
+
+def test_detect_saturation_flags_busy_workers():
+    stats = [
+        {
+            "worker": 0,
+            "avg_cpu_percent": 40.0,
+            "max_loop_lag": 0.001,
+            "max_schedule_lag": 0.002,
+        },
+        {
+            "worker": 1,
+            "avg_cpu_percent": 97.0,
+            "max_loop_lag": 0.2,
+            "max_schedule_lag": None,
+        },
+    ]
+
+    warnings = detect_saturation(stats, cpu_threshold=90, lag_threshold=0.05)
+
+    assert len(warnings) == 2
+    assert all("worker 1" in warning for warning in warnings)
+
+
+def _interval_snapshot(worker, sequence, requests, duration):
+    aggregator = ResultAggregator()
+    for _ in range(requests):
+        aggregator.add({"success": True, "status_code": 200, "response_time": 0.01})
+    return {
+        "worker": worker,
+        "sequence": sequence,
+        "duration": duration,
+        "cpu_percent": 10.0,
+        "loop_lag": 0.0,
+        "histograms": aggregator.drain(),
+    }
+
+
+def test_partial_final_interval_uses_its_own_duration():
+    loader = DistributedLoadGenerator(
+        "http://testserver", workers=2, snapshot_interval=1.0
+    )
+    snapshots = [
+        _interval_snapshot(0, 0, 50, 1.0),
+        _interval_snapshot(1, 0, 50, 1.0),
+        # The run ended a quarter of a second into the second interval
+        _interval_snapshot(0, 1, 12, 0.25),
+        _interval_snapshot(1, 1, 13, 0.24),
+    ]
+    done = {
+        worker: {"max_loop_lag": 0.0, "max_schedule_lag": None} for worker in (0, 1)
+    }
+
+    results = loader._merge(snapshots, done, elapsed=1.25)
+
+    first, last = results["intervals"]
+    assert first["requests_per_second"] == pytest.approx(100)
+    assert last["duration"] == 0.25
+    assert last["requests_per_second"] == pytest.approx(100)
+    assert results["requests_per_second"] == pytest.approx(100)
+
+
+@pytest.mark.asyncio
+async def test_workers_merge_into_one_report(tmp_path):
+    app_file = tmp_path / "perf_app.py"
+    app_file.write_text(APP_SOURCE)
+
+    with UvicornServer(f"{app_file}:app", cwd=tmp_path) as server:
+        loader = DistributedLoadGenerator(
+            server.base_url, workers=2, max_workers=10, snapshot_interval=0.25
+        )
+        open_results = await loader.run_open_loop_test(
+            "GET", "/echo", ConstantRate(rate=100, duration=1), params=echo_params
+        )
+        closed_results = await loader.run_load_test(
+            "GET", "/echo", num_requests=51, params=echo_params
+        )
+
+    for results in (open_results, closed_results):
+        assert results["workers"] == 2
+        assert results["success_rate"] == 1.0
+        assert sum(interval["requests"] for interval in results["intervals"]) == (
+            results["total_requests"]
+        )
+        assert len({stats["pid"] for stats in results["worker_stats"]}) == 2
+        assert isinstance(results["generator_saturated"], bool)
+
+    assert open_results["total_requests"] == 100
+    assert open_results["offered_rps"] == pytest.approx(100)
+    assert len(open_results["intervals"]) >= 4
+    assert closed_results["total_requests"] == 51
+    assert closed_results["histograms"]["by_endpoint"]["GET /echo 200"]["count"] == 51
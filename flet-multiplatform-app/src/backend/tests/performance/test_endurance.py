@@ -7,51 +7,59 @@ over an extended period under sustained load.
 
 import asyncio
 import random
+import statistics
 import time
+import tracemalloc
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict
 
 import pytest
-import pytest_asyncio
-from fastapi.testclient import TestClient
 
-from src.backend.app.main import app
-from src.backend.tests.performance.utils import LoadGenerator
+from src.backend.tests.performance.utils import (
+    LatencyHistogram,
+    LeakDetector,
+    LoadGenerator,
+)
 
-# Mark all tests in this module as performance tests
-pytestmark = pytest.mark.performance
+# Mark all tests in this module as asyncio performance tests
+pytestmark = [pytest.mark.performance, pytest.mark.asyncio]
 
 
 class TestEndurance:
     """Test suite for endurance testing."""
 
     @pytest.fixture(autouse=True)
-    def setup(self, test_client: TestClient):
-        """Setup test client and base URL."""
-        self.client = test_client
-        self.base_url = "http://testserver"
+    def setup(self, perf_target):
+        """Point the load generators at the app under test."""
+        self.target = perf_target
+        self.base_url = perf_target.base_url
 
     async def test_sustained_load(
         self,
         performance_metrics,
+        perf_budget,
         perf_test_config: Dict[str, Any],
     ):
         """Test the system under sustained load for an extended period."""
-        config = perf_test_config["endurance_test"]
         duration_minutes = (
             5  # Shorter for testing, should be 60+ for real endurance test
         )
 
         # Define test scenarios with different weights
         scenarios = [
-            {"method": "GET", "endpoint": "/api/health", "weight": 3, "params": None},
+            {"method": "GET", "endpoint": "/health", "weight": 3, "params": None},
             {
                 "method": "GET",
-                "endpoint": "/api/users",
+                "endpoint": "/api/v1/users/",
                 "weight": 2,
                 "params": {"limit": 20},
             },
-            {"method": "GET", "endpoint": "/api/users/1", "weight": 1, "params": None},
+            {
+                "method": "GET",
+                "endpoint": "/api/v1/users/1",
+                "weight": 1,
+                "params": None,
+            },
         ]
 
         # Create weighted list of scenarios
@@ -62,7 +70,7 @@ class TestEndurance:
         # Initialize metrics
         total_requests = 0
         successful_requests = 0
-        response_times = []
+        response_times = LatencyHistogram()
 
         # Calculate end time
         end_time = datetime.now() + timedelta(minutes=duration_minutes)
@@ -70,7 +78,7 @@ class TestEndurance:
 
         print(f"\n⏱  Starting endurance test for {duration_minutes} minutes...")
 
-        async with LoadGenerator(self.base_url) as loader:
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
             while datetime.now() < end_time:
                 iteration += 1
                 print(
@@ -95,14 +103,11 @@ class TestEndurance:
                     total_requests += results["total_requests"]
                     successful_requests += results["successful_requests"]
 
-                    if "response_times" in results:
-                        response_times.extend(
-                            [
-                                t
-                                for t in results["response_times"]
-                                if isinstance(t, (int, float))
-                            ]
+                    response_times.merge(
+                        LatencyHistogram.from_dict(
+                            results["histograms"]["response_times"]
                         )
+                    )
 
                     # Print progress
                     success_rate = (
@@ -138,9 +143,7 @@ class TestEndurance:
         success_rate = (
             (successful_requests / total_requests) * 100 if total_requests > 0 else 0
         )
-        avg_response_time = (
-            sum(response_times) / len(response_times) if response_times else 0
-        )
+        avg_response_time = response_times.mean
 
         # Record final metrics
         performance_metrics.record_test_metric(
@@ -150,6 +153,7 @@ class TestEndurance:
                 "successful_requests": successful_requests,
                 "success_rate": success_rate / 100,
                 "avg_response_time": avg_response_time,
+                "p99_response_time": response_times.percentile(99),
                 "duration_minutes": duration_minutes,
             },
         )
@@ -161,30 +165,48 @@ class TestEndurance:
         print(f"Average Response Time: {avg_response_time:.3f}s")
 
         # Assert that success rate remained high throughout the test
-        assert (
-            success_rate >= 95.0
-        ), f"Success rate dropped below 95%: {success_rate:.2f}%"
+        perf_budget.enforce(error_rate=1 - success_rate / 100)
 
     async def test_memory_leaks(
         self,
         performance_metrics,
+        perf_budget,
         perf_test_config: Dict[str, Any],
     ):
         """Test for memory leaks over an extended period."""
-        import os
-
-        import psutil
-
         config = perf_test_config["endurance_test"]
         duration_minutes = 5  # Shorter for testing, should be 60+ for real test
 
-        process = psutil.Process(os.getpid())
+        # The server process (this one when the app runs in-process)
+        process = self.target.process()
+        if process is None:
+            pytest.skip("Memory of a remote target cannot be measured")
+
+        # Allocation sites are only visible when the app runs in this process.
+        # tracemalloc's own tables grow with every traced allocation, so they
+        # are subtracted from the RSS readings rather than reported as a leak.
+        detector = None
+        if self.target.mode == "asgi":
+            detector = LeakDetector(
+                frames=config["leak_traceback_frames"],
+                warmup_requests=config["leak_warmup_requests"],
+            )
+            detector.start()
+        requests_served = 0
+
+        def server_memory_mb() -> float:
+            rss = process.memory_info().rss
+            if detector is not None:
+                rss -= tracemalloc.get_tracemalloc_memory()
+            return rss / (1024 * 1024)
 
         # Track memory usage over time
         memory_samples = []
+        sample_times = []
 
         # Initial memory reading
-        memory_samples.append(process.memory_info().rss / (1024 * 1024))  # MB
+        memory_samples.append(server_memory_mb())
+        sample_times.append(time.monotonic())
 
         print(f"\n🧠 Starting memory leak test for {duration_minutes} minutes...")
         print(f"Initial memory usage: {memory_samples[-1]:.2f} MB")
@@ -192,56 +214,76 @@ class TestEndurance:
         end_time = datetime.now() + timedelta(minutes=duration_minutes)
         iteration = 0
 
-        async with LoadGenerator(self.base_url) as loader:
-            while datetime.now() < end_time:
-                iteration += 1
+        try:
+            async with LoadGenerator(**self.target.loader_kwargs()) as loader:
+                while datetime.now() < end_time:
+                    iteration += 1
+
+                    # Run a mix of operations
+                    if iteration % 3 == 0:
+                        # Memory-intensive operation
+                        await loader.run_load_test(
+                            method="GET",
+                            endpoint="/api/v1/users/",
+                            num_requests=20,
+                            params={"limit": 100},
+                            progress=False,
+                        )
+                        requests_served += 20
+                    else:
+                        # Standard operation
+                        await loader.make_request(
+                            method="GET",
+                            endpoint="/health",
+                        )
+                        requests_served += 1
 
-                # Run a mix of operations
-                if iteration % 3 == 0:
-                    # Memory-intensive operation
-                    await loader.run_load_test(
-                        method="GET",
-                        endpoint="/api/users",
-                        num_requests=20,
-                        params={"limit": 100},
-                        progress=False,
-                    )
-                else:
-                    # Standard operation
-                    await loader.make_request(
-                        method="GET",
-                        endpoint="/api/health",
-                    )
+                    # Record memory usage every few iterations
+                    if iteration % 5 == 0:
+                        memory_mb = server_memory_mb()
+                        memory_samples.append(memory_mb)
+                        sample_times.append(time.monotonic())
+                        print(f"  Iteration {iteration}: {memory_mb:.2f} MB")
+                        if detector is not None:
+                            detector.snapshot(requests_served)
+
+                        # Record memory usage
+                        performance_metrics.record_test_metric(
+                            "memory_usage_mb",
+                            {
+                                "iteration": iteration,
+                                "memory_mb": memory_mb,
+                                "timestamp": datetime.now().isoformat(),
+                            },
+                        )
 
-                # Record memory usage every few iterations
-                if iteration % 5 == 0:
-                    memory_mb = process.memory_info().rss / (1024 * 1024)
-                    memory_samples.append(memory_mb)
-                    print(f"  Iteration {iteration}: {memory_mb:.2f} MB")
-
-                    # Record memory usage
-                    performance_metrics.record_test_metric(
-                        "memory_usage_mb",
-                        {
-                            "iteration": iteration,
-                            "memory_mb": memory_mb,
-                            "timestamp": datetime.now().isoformat(),
-                        },
-                    )
+                    # Small delay between iterations
+                    await asyncio.sleep(1)
+        finally:
+            leak_report = detector.stop() if detector is not None else None
 
-                # Small delay between iterations
-                await asyncio.sleep(1)
+        if leak_report is not None:
+            print(f"\n🔍 {leak_report.format()}")
+            performance_metrics.record_test_metric("tracemalloc", leak_report.to_dict())
+            performance_metrics.attach("leaks.txt", leak_report.format(top=20))
 
         # Analyze memory usage trend
-        if len(memory_samples) > 1:
-            # Calculate memory increase per minute
-            duration_hours = duration_minutes / 60
+        if len(memory_samples) > 2:
             total_increase = memory_samples[-1] - memory_samples[0]
-            increase_per_hour = (
-                (total_increase / duration_hours) if duration_hours > 0 else 0
-            )
 
-            print(f"\n📊 Memory Analysis:")
+            # The first half of a short run is dominated by warm-up (allocator
+            # arenas, caches), so the hourly trend is taken over the second
+            # half. RSS grows in arena-sized steps; a least-squares slope over
+            # every sample is not swung by where the last step happens to fall
+            # the way the difference of two readings is.
+            half = len(memory_samples) // 2
+            steady_increase = memory_samples[-1] - memory_samples[half]
+            hours = [(t - sample_times[half]) / 3600 for t in sample_times[half:]]
+            increase_per_hour = statistics.linear_regression(
+                hours, memory_samples[half:]
+            ).slope
+
+            print("\n📊 Memory Analysis:")
             print(f"Initial: {memory_samples[0]:.2f} MB")
             print(f"Final: {memory_samples[-1]:.2f} MB")
             print(f"Total Increase: {total_increase:.2f} MB")
@@ -254,23 +296,29 @@ class TestEndurance:
                     "initial_mb": memory_samples[0],
                     "final_mb": memory_samples[-1],
                     "total_increase_mb": total_increase,
+                    "steady_increase_mb": steady_increase,
                     "increase_per_hour_mb": increase_per_hour,
                     "duration_minutes": duration_minutes,
                 },
             )
 
+            # Check for memory that grows with traffic, showing where it is allocated
+            if leak_report is not None:
+                budget = config["leak_budget_kb_per_10k_requests"] * 1024
+                assert not leak_report.exceeds(
+                    budget
+                ), f"Possible memory leak:\n{leak_report.format()}"
+
             # Check for significant memory leaks
-            assert (
-                increase_per_hour < 10
-            ), f"Possible memory leak: {increase_per_hour:.2f} MB/hour increase"
+            perf_budget.enforce(rss_growth_mb_per_hour=increase_per_hour)
 
     async def test_connection_pool_stability(
         self,
         performance_metrics,
+        perf_budget,
         perf_test_config: Dict[str, Any],
     ):
         """Test the stability of database connection pools under sustained load."""
-        config = perf_test_config["endurance_test"]
         duration_minutes = 5  # Shorter for testing, should be 30+ for real test
 
         print(
@@ -282,7 +330,7 @@ class TestEndurance:
         successful_requests = 0
         total_requests = 0
 
-        async with LoadGenerator(self.base_url) as loader:
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
             while datetime.now() < end_time:
                 iteration += 1
 
@@ -300,7 +348,7 @@ class TestEndurance:
                     # Run a batch of database queries
                     results = await loader.run_load_test(
                         method="GET",
-                        endpoint="/api/users",
+                        endpoint="/api/v1/users/",
                         num_requests=batch_size,
                         params=params,
                         progress=False,
@@ -335,7 +383,8 @@ class TestEndurance:
                                     else 0
                                 ),
                                 "avg_response_time": results["response_times"]["avg"],
-                                "active_connections": 0,  # Would need DB-specific code to get actual count
+                                # Would need DB-specific code to get the actual count
+                                "active_connections": 0,
                                 "timestamp": datetime.now().isoformat(),
                             },
                         )
@@ -357,6 +406,4 @@ class TestEndurance:
         print(f"Success Rate: {success_rate:.2f}%")
 
         # Assert that success rate remained high throughout the test
-        assert (
-            success_rate >= 99.0
-        ), f"Success rate dropped below 99%: {success_rate:.2f}%"
+        perf_budget.enforce(error_rate=1 - success_rate / 100)
@@ -0,0 +1,95 @@
+"""
+Tests for streaming result aggregation.
+
+Checks that the log-bucketed histogram stays within its precision, merges
+losslessly, and that the aggregator's memory does not grow with the number
+of requests.
+"""
+
+import json
+import random
+
+import numpy as np
+import pytest
+
+from src.backend.tests.performance.utils import LatencyHistogram, ResultAggregator
+
+
+def _result(seconds: float, status: int = 200, data=None) -> dict:
+    return {
+        "status_code": status,
+        "response_time": seconds,
+        "response_time_ns": round(seconds * 1e9),
+        "service_time_ns": round(seconds * 1e9),
+        "data": data,
+        "success": 200 <= status < 300,
+        "error": None if status < 500 else f"HTTP {status}",
+    }
+
+
+def test_percentiles_are_within_histogram_precision():
+    rng = random.Random(0)
+    values = [rng.lognormvariate(-4, 1) for _ in range(50_000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    for percentile in (50, 90, 99, 99.9):
+        exact = np.percentile(values, percentile, method="inverted_cdf")
+        assert histogram.percentile(percentile) == pytest.approx(exact, rel=1 / 128)
+    assert histogram.mean == pytest.approx(np.mean(values), rel=1e-6)
+    assert histogram.max_ns == round(max(values) * 1e9)
+
+
+def test_merged_histograms_equal_single_histogram():
+    rng = random.Random(1)
+    values = [rng.uniform(0.001, 2.0) for _ in range(10_000)]
+    whole = LatencyHistogram()
+    parts = [LatencyHistogram() for _ in range(4)]
+    for i, value in enumerate(values):
+        whole.record(value)
+        parts[i % 4].record(value)
+
+    # Round-trip through JSON as a worker process would
+    merged = LatencyHistogram.merged(
+        LatencyHistogram.from_dict(json.loads(json.dumps(part.to_dict())))
+        for part in parts
+    )
+
+    assert merged.to_dict() == whole.to_dict()
+
+
+def test_aggregator_memory_is_bounded_by_buckets():
+    aggregator = ResultAggregator(sample_bodies=3, seed=0)
+    for i in range(100_000):
+        status = 503 if i % 100 == 0 else 200
+        aggregator.add(
+            _result(0.001 + (i % 1000) / 1e4, status, data={"i": i}), "GET", "/ping"
+        )
+
+    summary = aggregator.summary()
+
+    assert summary["total_requests"] == 100_000
+    assert summary["failed_requests"] == 1000
+    assert summary["status_codes"] == {"200": 99_000, "503": 1000}
+    assert summary["errors"] == ["HTTP 503"]
+    assert set(summary["endpoints"]) == {"GET /ping 200", "GET /ping 503"}
+    assert len(summary["samples"]) == 3
+    assert len(aggregator.response_times.counts) < 2000
+
+
+def test_aggregators_merge_from_summaries():
+    first, second = ResultAggregator(), ResultAggregator()
+    for i in range(100):
+        first.add(_result(0.01), "GET", "/a")
+        second.add(_result(0.5, 500), "GET", "/b")
+
+    combined = ResultAggregator.from_dict(first.summary()["histograms"])
+    combined.merge(ResultAggregator.from_dict(second.summary()["histograms"]))
+    summary = combined.summary()
+
+    assert summary["total_requests"] == 200
+    assert summary["success_rate"] == 0.5
+    assert summary["response_times"]["median"] == pytest.approx(0.01, rel=0.01)
+    assert summary["response_times"]["p99"] == pytest.approx(0.5, rel=0.01)
+    assert summary["endpoints"]["GET /b 500"]["count"] == 100
@@ -0,0 +1,47 @@
+"""
+Tests for the tracemalloc leak detector.
+"""
+
+from src.backend.tests.performance.utils import LeakDetector
+
+
+def serve(requests: int, retained: list, leak: bool) -> None:
+    """Stand-in for request handling that optionally keeps 1 KiB per request."""
+    for _ in range(requests):
+        body = bytearray(1024)
+        if leak:
+            retained.append(body)
+
+
+def run(leak: bool):
+    retained: list = []
+    detector = LeakDetector(warmup_requests=100)
+    detector.start()
+    try:
+        served = 0
+        for _ in range(8):
+            serve(100, retained, leak)
+            served += 100
+            detector.snapshot(served)
+    finally:
+        report = detector.stop()
+    return report
+
+
+def test_reports_growing_site_with_traceback():
+    report = run(leak=True)
+
+    assert report.snapshots == 8
+    assert report.requests == 700
+    # 1 KiB per request is about 10 MiB per 10k requests
+    assert 9 * 1024 * 1024 < report.growth_per_10k < 11 * 1024 * 1024
+    assert report.exceeds(1024 * 1024)
+    assert "body = bytearray(1024)" in "\n".join(report.sites[0].traceback)
+    assert "Traced memory grew" in report.format()
+    assert report.to_dict()["top_sites"][0]["last_count"] >= 800
+
+
+def test_steady_memory_stays_within_budget():
+    report = run(leak=False)
+
+    assert not report.exceeds(64 * 1024)
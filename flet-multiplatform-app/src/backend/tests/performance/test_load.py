@@ -6,42 +6,42 @@ to verify the application's performance characteristics.
 """
 
 import asyncio
-import json
 from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 import pytest
-import pytest_asyncio
-from fastapi.testclient import TestClient
 
-from src.backend.app.main import app
-from src.backend.tests.performance.utils import LoadGenerator
+from src.backend.tests.performance.utils import (
+    ConstantRate,
+    LoadGenerator,
+    ResultAggregator,
+)
 
-# Mark all tests in this module as performance tests
-pytestmark = pytest.mark.performance
+# Mark all tests in this module as asyncio performance tests
+pytestmark = [pytest.mark.performance, pytest.mark.asyncio]
 
 
 class TestLoadEndpoints:
     """Test suite for load testing API endpoints."""
 
     @pytest.fixture(autouse=True)
-    def setup(self, test_client: TestClient):
-        """Setup test client and base URL."""
-        self.client = test_client
-        self.base_url = "http://testserver"
+    def setup(self, perf_target):
+        """Point the load generators at the app under test."""
+        self.target = perf_target
+        self.base_url = perf_target.base_url
 
     @pytest.mark.parametrize(
         "endpoint,method,params",
         [
-            ("/api/health", "GET", None),
-            ("/api/users", "GET", None),
-            ("/api/users/1", "GET", None),
+            ("/health", "GET", None),
+            ("/api/v1/users/", "GET", None),
+            ("/api/v1/users/1", "GET", None),
         ],
     )
     async def test_endpoint_load(
         self,
         performance_metrics,
+        perf_budget,
         endpoint: str,
         method: str,
         params: Optional[Dict[str, Any]],
@@ -55,7 +55,7 @@ class TestLoadEndpoints:
         config = perf_test_config["load_test"]
         num_requests = config["users"]
 
-        async with LoadGenerator(self.base_url) as loader:
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
             results = await loader.run_load_test(
                 method=method,
                 endpoint=endpoint,
@@ -67,15 +67,10 @@ class TestLoadEndpoints:
         performance_metrics.record_test_metric("load_test_results", results)
 
         # Assert performance criteria
-        assert (
-            results["success_rate"] >= 0.95
-        ), f"Success rate too low: {results['success_rate']}"
-        assert (
-            results["response_times"]["p95"] < 1.0
-        ), f"95th percentile response time too high: {results['response_times']['p95']}s"
+        perf_budget.enforce(results, method, endpoint)
 
     async def test_mixed_workload(
-        self, performance_metrics, perf_test_config: Dict[str, Any]
+        self, performance_metrics, perf_budget, perf_test_config: Dict[str, Any]
     ):
         """Test a mixed workload simulating real-world usage patterns."""
         config = perf_test_config["load_test"]
@@ -83,16 +78,16 @@ class TestLoadEndpoints:
 
         # Define a list of endpoints to test with their methods and parameters
         endpoints = [
-            {"method": "GET", "endpoint": "/api/health", "params": None},
-            {"method": "GET", "endpoint": "/api/users", "params": {"limit": 10}},
-            {"method": "GET", "endpoint": "/api/users/1", "params": None},
+            {"method": "GET", "endpoint": "/health", "params": None},
+            {"method": "GET", "endpoint": "/api/v1/users/", "params": {"limit": 10}},
+            {"method": "GET", "endpoint": "/api/v1/users/1", "params": None},
             # Add more endpoints as needed
         ]
 
         # Distribute requests among endpoints
         requests_per_endpoint = num_users // len(endpoints)
 
-        async with LoadGenerator(self.base_url) as loader:
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
             tasks = []
 
             for endpoint_config in endpoints:
@@ -109,16 +104,13 @@ class TestLoadEndpoints:
             results = await asyncio.gather(*tasks)
 
         # Aggregate results
-        total_requests = sum(r["total_requests"] for r in results)
-        successful_requests = sum(r["successful_requests"] for r in results)
-        success_rate = successful_requests / total_requests if total_requests > 0 else 0
-
-        # Calculate overall response times
-        all_response_times = []
+        combined = ResultAggregator()
         for r in results:
-            all_response_times.extend(
-                [t for t in r.get("response_times", []) if isinstance(t, (int, float))]
-            )
+            combined.merge(ResultAggregator.from_dict(r["histograms"]))
+        total_requests = combined.total_requests
+        successful_requests = combined.successful_requests
+        success_rate = successful_requests / total_requests if total_requests > 0 else 0
+        response_times = combined.response_times
 
         # Record metrics
         performance_metrics.record_test_metric("total_requests", total_requests)
@@ -127,36 +119,33 @@ class TestLoadEndpoints:
         )
         performance_metrics.record_test_metric("success_rate", success_rate)
 
-        if all_response_times:
+        if response_times.count:
             performance_metrics.record_test_metric(
-                "avg_response_time", sum(all_response_times) / len(all_response_times)
+                "avg_response_time", response_times.mean
             )
             performance_metrics.record_test_metric(
-                "max_response_time", max(all_response_times)
+                "max_response_time", response_times.max_ns / 1e9
             )
             performance_metrics.record_test_metric(
-                "min_response_time", min(all_response_times)
+                "min_response_time", response_times.min_ns / 1e9
             )
 
-        # Assert performance criteria
-        assert success_rate >= 0.95, f"Overall success rate too low: {success_rate}"
-
-        if all_response_times:
-            p95 = sorted(all_response_times)[int(len(all_response_times) * 0.95)]
-            assert p95 < 2.0, f"95th percentile response time too high: {p95}s"
+        # Assert performance criteria for the workload as a whole
+        perf_budget.enforce(combined.summary())
 
     @pytest.mark.parametrize("concurrent_users", [10, 50, 100])
     async def test_concurrent_users(
         self,
         performance_metrics,
+        perf_budget,
         concurrent_users: int,
         perf_test_config: Dict[str, Any],
     ):
         """Test how the system handles different levels of concurrent users."""
-        endpoint = "/api/health"
+        endpoint = "/health"
         method = "GET"
 
-        async with LoadGenerator(self.base_url) as loader:
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
             results = await loader.run_load_test(
                 method=method,
                 endpoint=endpoint,
@@ -169,26 +158,22 @@ class TestLoadEndpoints:
         performance_metrics.record_test_metric(test_metric_name, results)
 
         # Assert performance criteria
-        assert (
-            results["success_rate"] >= 0.95
-        ), f"Success rate too low for {concurrent_users} users: {results['success_rate']}"
-        assert (
-            results["response_times"]["p95"] < 1.5
-        ), f"95th percentile response time too high for {concurrent_users} users: {results['response_times']['p95']}s"
+        perf_budget.enforce(results, method, endpoint)
 
 
 class TestDatabasePerformance:
     """Performance tests focused on database operations."""
 
     @pytest.fixture(autouse=True)
-    def setup(self, test_client: TestClient):
-        """Setup test client and base URL."""
-        self.client = test_client
-        self.base_url = "http://testserver"
+    def setup(self, perf_target):
+        """Point the load generators at the app under test."""
+        self.target = perf_target
+        self.base_url = perf_target.base_url
 
     async def test_database_query_performance(
         self,
         performance_metrics,
+        perf_budget,
         perf_test_config: Dict[str, Any],
     ):
         """Test performance of database queries under load."""
@@ -196,10 +181,10 @@ class TestDatabasePerformance:
         num_queries = config["users"]
 
         # Test a simple query
-        async with LoadGenerator(self.base_url) as loader:
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
             results = await loader.run_load_test(
                 method="GET",
-                endpoint="/api/users",
+                endpoint="/api/v1/users/",
                 num_requests=num_queries,
                 params={"limit": 10},
             )
@@ -208,16 +193,12 @@ class TestDatabasePerformance:
         performance_metrics.record_test_metric("db_query_results", results)
 
         # Assert performance criteria
-        assert (
-            results["success_rate"] >= 0.99
-        ), f"Query success rate too low: {results['success_rate']}"
-        assert (
-            results["response_times"]["p99"] < 0.5
-        ), f"99th percentile query time too high: {results['response_times']['p99']}s"
+        perf_budget.enforce(results, "GET", "/api/v1/users/")
 
     async def test_database_write_performance(
         self,
         performance_metrics,
+        perf_budget,
         perf_test_config: Dict[str, Any],
     ):
         """Test performance of database write operations under load."""
@@ -236,12 +217,14 @@ class TestDatabasePerformance:
                 "full_name": f"Load Test User {index}",
             }
 
-        # Test user creation
-        async with LoadGenerator(self.base_url) as loader:
-            results = await loader.run_load_test(
+        # Test user creation at a steady rate, so the p95 measures each write
+        # rather than how long a burst of them queues behind the others
+        write_rate = 20  # writes per second
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
+            results = await loader.run_open_loop_test(
                 method="POST",
-                endpoint="/api/users/",
-                num_requests=num_writes,
+                endpoint="/api/v1/users/",
+                profile=ConstantRate(rate=write_rate, duration=num_writes / write_rate),
                 json_data=generate_user_data,
             )
 
@@ -249,9 +232,4 @@ class TestDatabasePerformance:
         performance_metrics.record_test_metric("db_write_results", results)
 
         # Assert performance criteria
-        assert (
-            results["success_rate"] >= 0.95
-        ), f"Write success rate too low: {results['success_rate']}"
-        assert (
-            results["response_times"]["p95"] < 1.0
-        ), f"95th percentile write time too high: {results['response_times']['p95']}s"
+        perf_budget.enforce(results, "POST", "/api/v1/users/")
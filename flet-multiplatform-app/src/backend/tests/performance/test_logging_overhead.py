@@ -0,0 +1,104 @@
+"""
+Logging overhead benchmark.
+
+Measures request latency through the queue-based logging pipeline with the
+root logger at INFO versus DEBUG, using a handler that emits the same
+per-session debug logs as ``config.database.get_db``.
+"""
+
+import logging
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+import numpy as np
+import pytest
+from fastapi import FastAPI
+
+from backend.config.logging import (
+    CorrelationIdMiddleware,
+    JsonFormatter,
+    start_queue_logging,
+    stop_queue_logging,
+)
+
+# Mark all tests in this module as asyncio performance tests
+pytestmark = [pytest.mark.performance, pytest.mark.asyncio]
+
+NUM_REQUESTS = 2000
+
+logger = logging.getLogger("benchmark.logging")
+
+
+def _create_app() -> FastAPI:
+    """Create a minimal app that logs like a request holding a DB session."""
+    app = FastAPI()
+    app.add_middleware(CorrelationIdMiddleware)
+
+    @app.get("/ping")
+    async def ping() -> Dict[str, str]:
+        logger.debug("Yielding database session")
+        logger.debug("Database session committed")
+        logger.debug("Closing database session")
+        logger.info("Handled ping")
+        return {"status": "ok"}
+
+    return app
+
+
+async def _measure_latency(log_level: str, log_file: Path) -> Dict[str, Any]:
+    """Send sequential requests and return latency statistics in milliseconds."""
+    file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    start_queue_logging([file_handler], log_level)
+    app = _create_app()
+    latencies = []
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as client:
+            for _ in range(NUM_REQUESTS):
+                start = time.perf_counter_ns()
+                response = await client.get("/ping")
+                latencies.append((time.perf_counter_ns() - start) / 1e6)
+                assert response.status_code == 200
+    finally:
+        stop_queue_logging()
+
+    return {
+        "requests": NUM_REQUESTS,
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+async def test_request_latency_info_vs_debug(performance_metrics, tmp_path):
+    """Compare request latency with logging at INFO and at DEBUG."""
+    info = await _measure_latency("INFO", tmp_path / "info.log")
+    debug = await _measure_latency("DEBUG", tmp_path / "debug.log")
+
+    performance_metrics.record_test_metric("logging_info", info)
+    performance_metrics.record_test_metric("logging_debug", debug)
+    performance_metrics.record_test_metric(
+        "debug_overhead_ratio", debug["mean_ms"] / info["mean_ms"]
+    )
+
+    print(
+        f"\nINFO  mean={info['mean_ms']:.3f}ms p95={info['p95_ms']:.3f}ms"
+        f"\nDEBUG mean={debug['mean_ms']:.3f}ms p95={debug['p95_ms']:.3f}ms"
+    )
+
+    # Writes happen on the listener thread, so DEBUG must not dominate latency
+    assert debug["p95_ms"] < info["p95_ms"] * 2, (
+        f"DEBUG logging p95 {debug['p95_ms']:.3f}ms is more than twice "
+        f"INFO p95 {info['p95_ms']:.3f}ms"
+    )
+    assert (tmp_path / "debug.log").stat().st_size > (
+        tmp_path / "info.log"
+    ).stat().st_size
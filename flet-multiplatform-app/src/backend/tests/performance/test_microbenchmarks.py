@@ -0,0 +1,164 @@
+"""
+Microbenchmarks for per-request backend hot paths.
+
+The endpoint-level suites measure whole requests; these isolate the
+functions that dominate per-request CPU so a slowdown can be traced to its
+source. They use pytest-benchmark and are compared against stored baselines
+with ``scripts/compare_benchmarks.py``::
+
+    python scripts/compare_benchmarks.py run --save-baseline
+    python scripts/compare_benchmarks.py run --compare
+
+Run directly from ``src/`` with::
+
+    PYTHONPATH=..:. python -m pytest backend/tests/performance/test_microbenchmarks.py \
+        --confcutdir=backend/tests/performance --perf-test --benchmark-only
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from jose import jwt
+
+from backend.core.config import Settings, settings
+from backend.core.security import (
+    create_access_token,
+    get_password_hash,
+    pwd_context,
+    verify_password,
+)
+from backend.models import Item, User
+from backend.models.base import Base
+from backend.schemas import TokenPayload
+from backend.schemas.item import ItemResponse
+from backend.schemas.user import UserResponse
+
+# Mark all tests in this module as performance tests
+pytestmark = pytest.mark.performance
+
+PASSWORD = "testpassword123"
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def production_bcrypt_cost():
+    """Hash at the configured cost even if a load target lowered it this session."""
+    saved = pwd_context.to_dict()
+    pwd_context.update(bcrypt__rounds=settings.BCRYPT_ROUNDS)
+    yield
+    pwd_context.load(saved)
+
+
+@pytest.fixture(scope="module")
+def password_hash() -> str:
+    """A bcrypt hash of ``PASSWORD`` made with the app's password context."""
+    try:
+        return pwd_context.hash(PASSWORD)
+    except ValueError as e:
+        # passlib 1.7 cannot drive bcrypt >= 5.0 (the lock pins 4.3); nothing to measure
+        pytest.skip(f"bcrypt backend unusable: {e}")
+
+
+@pytest.fixture
+def user() -> User:
+    return User(
+        id=1,
+        email="bench@example.com",
+        username="benchuser",
+        hashed_password="x" * 60,
+        full_name="Bench User",
+        is_active=True,
+        is_superuser=False,
+        last_login=NOW,
+        created_at=NOW,
+        updated_at=NOW,
+        version=3,
+    )
+
+
+@pytest.fixture
+def item() -> Item:
+    return Item(
+        id=1,
+        title="Benchmark item",
+        description="An item used for serialization benchmarks" * 4,
+        owner_id=1,
+        created_at=NOW,
+        updated_at=NOW,
+        version=2,
+    )
+
+
+@pytest.mark.benchmark(group="auth")
+def test_create_access_token(benchmark):
+    token = benchmark(create_access_token, 1, timedelta(minutes=30))
+
+    assert (
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])["sub"]
+        == "1"
+    )
+
+
+@pytest.mark.benchmark(group="auth")
+def test_decode_access_token(benchmark):
+    token = create_access_token(1, timedelta(minutes=30))
+
+    def decode() -> TokenPayload:
+        # The token handling done by get_current_user before its DB lookup
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        return TokenPayload(**payload)
+
+    assert benchmark(decode).sub == 1
+
+
+@pytest.mark.benchmark(group="password")
+def test_verify_password(benchmark, password_hash):
+    assert benchmark(verify_password, PASSWORD, password_hash)
+
+
+@pytest.mark.benchmark(group="password")
+def test_get_password_hash(benchmark, password_hash):
+    assert benchmark(get_password_hash, PASSWORD).startswith("$2")
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_model_to_dict(benchmark, user):
+    data = benchmark(Base.to_dict, user)
+
+    assert data["username"] == "benchuser"
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_user_response_validation(benchmark, user):
+    response = benchmark(UserResponse.model_validate, user)
+
+    assert response.version == 3
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_user_response_serialization(benchmark, user):
+    response = UserResponse.model_validate(user)
+
+    assert '"benchuser"' in benchmark(response.model_dump_json)
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_item_response_validation(benchmark, item):
+    response = benchmark(ItemResponse.model_validate, item)
+
+    assert response.owner_id == 1
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_item_response_serialization(benchmark, item):
+    response = ItemResponse.model_validate(item)
+
+    assert '"Benchmark item"' in benchmark(response.model_dump_json)
+
+
+@pytest.mark.benchmark(group="config")
+def test_settings_construction(benchmark):
+    assert benchmark(Settings).API_V1_STR == settings.API_V1_STR
@@ -0,0 +1,131 @@
+"""
+Tests for open-loop load generation.
+
+Checks the arrival profiles and that the open-loop runner reports the
+queueing a closed-loop run hides when the server cannot keep up.
+"""
+
+import asyncio
+import gc
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.backend.tests.performance.utils import (
+    ConstantRate,
+    LoadGenerator,
+    PoissonArrivals,
+    RampRate,
+    StepRate,
+    create_arrival_profile,
+)
+
+SERVICE_TIME = 0.02
+
+
+@pytest_asyncio.fixture
+async def serial_server():
+    """Serve ``/ping`` one request at a time with a fixed service time."""
+    lock = asyncio.Lock()
+
+    async def ping(request: web.Request) -> web.Response:
+        async with lock:
+            await asyncio.sleep(SERVICE_TIME)
+        return web.json_response({"status": "ok"})
+
+    app = web.Application()
+    app.router.add_get("/ping", ping)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
+
+
+def test_constant_and_step_profiles_schedule_expected_counts():
+    offsets = list(ConstantRate(rate=10, duration=2).offsets())
+    assert len(offsets) == 20
+    assert offsets[1] - offsets[0] == pytest.approx(0.1)
+
+    step = StepRate([(1, 10), (1, 0), (1, 20)])
+    assert step.duration == 3
+    assert step.expected_requests() == 30
+    assert all(not 1 <= t < 2 for t in step.offsets())
+
+
+def test_ramp_profile_integrates_rate():
+    ramp = RampRate(start_rate=0, end_rate=100, duration=2)
+    offsets = list(ramp.offsets())
+
+    # Average rate 50/s over 2s
+    assert len(offsets) == 100
+    assert offsets == sorted(offsets)
+    # More arrivals in the second half than the first
+    assert sum(1 for t in offsets if t >= 1) == 3 * sum(1 for t in offsets if t < 1)
+
+
+@pytest.mark.parametrize(
+    "start_rate, end_rate, duration, expected",
+    [(100, 20, 2, 120), (100, 0, 2, 100), (3, 0, 1, 2)],
+)
+def test_ramp_down_profile(start_rate, end_rate, duration, expected):
+    ramp = RampRate(start_rate=start_rate, end_rate=end_rate, duration=duration)
+    offsets = list(ramp.offsets())
+
+    # One arrival per whole request of the integrated rate, even when the
+    # ramp ends before the next one is due
+    assert len(offsets) == expected
+    assert offsets == sorted(offsets)
+    assert all(0 <= t < duration for t in offsets)
+    # Fewer arrivals in the second half than the first
+    half = duration / 2
+    assert sum(1 for t in offsets if t >= half) < sum(1 for t in offsets if t < half)
+
+
+def test_poisson_profile_is_reproducible_with_seed():
+    first = list(PoissonArrivals(rate=200, duration=5, seed=1).offsets())
+    second = list(
+        create_arrival_profile("poisson", rate=200, duration=5, seed=1).offsets()
+    )
+
+    assert first == second
+    assert len(first) == pytest.approx(1000, rel=0.1)
+
+    with pytest.raises(ValueError):
+        create_arrival_profile("burst", rate=1, duration=1)
+
+
+@pytest.mark.asyncio
+async def test_open_loop_exposes_queueing_hidden_by_closed_loop(serial_server):
+    # A full collection of the test process takes several service times and
+    # would show up as the closed loop's p99
+    gc.collect()
+    gc.disable()
+    try:
+        async with LoadGenerator(serial_server, max_workers=1) as loader:
+            closed = await loader.run_load_test(
+                "GET", "/ping", num_requests=25, progress=False
+            )
+            # Offer twice what the server can handle
+            profile = ConstantRate(rate=2 / SERVICE_TIME, duration=0.5)
+            open_loop = await loader.run_open_loop_test(
+                "GET", "/ping", profile, progress=False
+            )
+    finally:
+        gc.enable()
+
+    assert closed["mode"] == "closed"
+    assert open_loop["mode"] == "open"
+    assert open_loop["total_requests"] == 50
+    assert open_loop["success_rate"] == 1.0
+    assert open_loop["offered_rps"] == pytest.approx(100)
+    assert open_loop["achieved_rps"] < open_loop["offered_rps"]
+
+    # Closed loop sees roughly the service time; open loop sees the queue
+    assert closed["response_times"]["p99"] < SERVICE_TIME * 3
+    assert open_loop["response_times"]["p99"] > closed["response_times"]["p99"] * 5
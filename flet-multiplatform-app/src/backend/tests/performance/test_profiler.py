@@ -0,0 +1,103 @@
+"""
+Tests for the sampling profiler and its output formats.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+
+import psutil
+
+from src.backend.tests.performance.utils import (
+    PySpySampler,
+    StackProfile,
+    ThreadSampler,
+)
+
+
+def busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_thread_sampler_attributes_time_to_busy_function():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    sampler = ThreadSampler(interval=0.002)
+
+    worker.start()
+    sampler.start()
+    time.sleep(0.3)
+    profile = sampler.stop()
+    stop.set()
+    worker.join()
+
+    busy_thread = {
+        stack: count
+        for stack, count in profile.samples.items()
+        if stack[0] == "thread (busy)"
+    }
+    in_busy_loop = sum(
+        count
+        for stack, count in busy_thread.items()
+        if any(frame.startswith("busy_loop ") for frame in stack)
+    )
+    assert sum(busy_thread.values()) > 20
+    assert in_busy_loop >= 0.9 * sum(busy_thread.values())
+
+
+def test_py_spy_sampler_keeps_no_file_descriptor_open():
+    process = psutil.Process()
+    open_fds = process.num_fds()
+
+    samplers = [PySpySampler(pid=process.pid) for _ in range(10)]
+
+    assert process.num_fds() == open_fds
+    for sampler in samplers:
+        assert sampler.stop().samples == Counter()
+        assert not sampler._output.exists()
+
+
+def test_collapsed_stacks_round_trip():
+    profile = StackProfile(
+        0.01,
+        Counter(
+            {("main (app.py:1)", "handler (app.py:10)"): 3, ("main (app.py:1)",): 1}
+        ),
+    )
+
+    parsed = StackProfile.from_collapsed(profile.to_collapsed(), 0.01)
+
+    assert parsed.samples == profile.samples
+    assert (
+        profile.to_collapsed().splitlines()[-1]
+        == "main (app.py:1);handler (app.py:10) 3"
+    )
+
+
+def test_speedscope_and_flamegraph_output(tmp_path):
+    profile = StackProfile(
+        0.01,
+        Counter(
+            {
+                ("main (app.py:1)", "handler (app.py:10)"): 3,
+                ("main (app.py:1)", "<idle>"): 1,
+            }
+        ),
+    )
+
+    paths = profile.write(tmp_path / "20240101_000000_test_load", "test_load")
+
+    speedscope = json.loads(paths["speedscope"].read_text())
+    frames = speedscope["shared"]["frames"]
+    sampled = speedscope["profiles"][0]
+    assert frames[0] == {"name": "main", "file": "app.py", "line": 1}
+    assert {"name": "<idle>"} in frames
+    assert sum(sampled["weights"]) == sampled["endValue"] == 0.04
+    assert all(len(stack) == 2 for stack in sampled["samples"])
+
+    svg = paths["flamegraph"].read_text()
+    assert svg.startswith("<svg") and "handler (app.py:10) (3 samples, 75.00%)" in svg
+    assert "&lt;idle&gt;" in svg
+    assert paths["collapsed"].name == "20240101_000000_test_load.collapsed.txt"
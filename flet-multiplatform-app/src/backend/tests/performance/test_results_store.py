@@ -0,0 +1,208 @@
+"""
+Tests for the performance results store.
+"""
+
+import csv
+import json
+import random
+
+import pytest
+
+from src.backend.tests.performance.utils import (
+    ResultsStore,
+    analyze_performance_results,
+    detect_change_points,
+)
+
+
+def locust_result(timestamp: str, p95: int) -> dict:
+    """A record shaped like the Locust ``save_test_results`` output."""
+    return {
+        "timestamp": timestamp,
+        "test_duration_seconds": 60.0,
+        "total_requests": 1000,
+        "total_failures": 5,
+        "error_rate": 0.5,
+        "response_times": {"min": 5, "avg": 40, "median": 35, "p95": p95, "p99": 180},
+        "requests_per_second": 16.67,
+    }
+
+
+def append_csv(path, record: dict) -> None:
+    exists = path.exists()
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=record.keys())
+        if not exists:
+            writer.writeheader()
+        writer.writerow(record)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultsStore(tmp_path / "results.db") as store:
+        yield store
+
+
+def test_ingests_every_result_format(store, tmp_path):
+    results = tmp_path / "results"
+    results.mkdir()
+    record = locust_result("2024-01-01T10:00:00", 120)
+    (results / "test_results_1704103200.json").write_text(json.dumps(record))
+    # The same run also appears in the summary CSV
+    append_csv(results / "test_results_summary.csv", record)
+    (results / "load_report.json").write_text(
+        json.dumps(
+            {
+                "scenario": "load",
+                "timestamp": "2024-01-02T10:00:00",
+                "total_requests": 500,
+                "total_failures": 1,
+                "failure_rate": 0.002,
+                "rps": 50.0,
+                "response_time": {"p95": 90.0},
+            }
+        )
+    )
+    (results / "stress_results.json").write_text(
+        json.dumps(
+            {"total_rps": 80.0, "p95_response_time": 250.0, "success_rate": 0.99}
+        )
+    )
+    (results / "20240103_100000_test_api_load.json").write_text(
+        json.dumps(
+            {
+                "test_name": "test_api_load",
+                "timestamp": "2024-01-03 10:00:00",
+                "commit": "abc123",
+                "duration_seconds": 12.5,
+                "errors": [],
+                "system_metrics": [{"cpu_percent": 20.0}, {"cpu_percent": 40.0}],
+                "test_metrics": {
+                    "load_test_results": {
+                        "total_requests": 200,
+                        "requests_per_second": 100.0,
+                        "response_times": {"p95": 0.05},
+                        "endpoints": {
+                            "GET /api/v1/items/": {"count": 200, "p95": 0.05}
+                        },
+                        "histograms": {"total": {"counts": [1, 2]}},
+                    }
+                },
+            }
+        )
+    )
+
+    assert store.ingest_path(results, commit="def456") == 4
+    assert store.scenarios() == ["load", "locust", "stress", "test_api_load"]
+
+    locust = store.runs(format="locust")
+    assert len(locust) == 1
+    metrics = store.run_metrics(locust[0]["id"])[""]
+    assert metrics["response_time_ms.p95"] == 120
+    assert metrics["error_rate"] == pytest.approx(0.005)
+
+    assert store.trend("response_time_ms.p95", scenario="stress")[0]["value"] == 250.0
+    assert store.trend("error_rate", scenario="load")[0]["value"] == 0.002
+
+    suite = store.runs(format="perf_suite")[0]
+    assert suite["commit_sha"] == "abc123"
+    assert suite["document"]["test_name"] == "test_api_load"
+    metrics = store.run_metrics(suite["id"])
+    assert metrics[""]["load_test_results.response_time_ms.p95"] == pytest.approx(50.0)
+    assert metrics[""]["system.cpu_percent.max"] == 40.0
+    assert metrics["GET /api/v1/items/"]["load_test_results.requests"] == 200
+    assert not any("histograms" in name for name in metrics[""])
+
+
+def test_ingest_is_incremental(store, tmp_path):
+    csv_file = tmp_path / "test_results_summary.csv"
+    append_csv(csv_file, locust_result("2024-01-01T10:00:00", 100))
+    append_csv(csv_file, locust_result("2024-01-02T10:00:00", 110))
+
+    assert store.ingest_file(csv_file) == 2
+    assert store.ingest_file(csv_file) == 0
+
+    append_csv(csv_file, locust_result("2024-01-03T10:00:00", 300))
+    assert store.ingest_file(csv_file) == 1
+    assert [point["value"] for point in store.trend("response_time_ms.p95")] == [
+        100,
+        110,
+        300,
+    ]
+
+
+def test_runs_can_be_limited_to_a_source_directory(store, tmp_path):
+    for name in ("nightly", "nightly-old"):
+        directory = tmp_path / name
+        directory.mkdir()
+        (directory / "load_report.json").write_text(
+            json.dumps({"scenario": name, "timestamp": "2024-01-01T10:00:00"})
+        )
+        store.ingest_path(directory)
+
+    assert len(store.runs(format="report")) == 2
+    runs = store.runs(format="report", source=tmp_path / "nightly")
+    assert [run["scenario"] for run in runs] == ["nightly"]
+    # Files ingested without a commit do not get one
+    assert runs[0]["commit_sha"] is None
+
+
+def test_analysis_reads_the_shared_store_for_its_directory(tmp_path, monkeypatch):
+    # The default store path is relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    for name, duration in (("nightly", 10.0), ("nightly-old", 30.0)):
+        directory = tmp_path / name
+        directory.mkdir()
+        (directory / f"20240101_100000_test_{name}.json").write_text(
+            json.dumps(
+                {
+                    "test_name": f"test_{name}",
+                    "timestamp": "2024-01-01 10:00:00",
+                    "duration_seconds": duration,
+                    "errors": [],
+                    "test_metrics": {},
+                }
+            )
+        )
+        analyze_performance_results(directory)
+
+    analysis = analyze_performance_results(tmp_path / "nightly")
+
+    assert analysis["total_tests"] == 1
+    assert analysis["avg_duration_seconds"] == 10.0
+    assert (tmp_path / "results" / "performance" / "results.db").exists()
+    assert not (tmp_path / "nightly" / "results.db").exists()
+
+
+def test_rolling_baseline_and_change_points(store):
+    rng = random.Random(1)
+    values = [rng.gauss(100, 2) for _ in range(12)] + [
+        rng.gauss(130, 2) for _ in range(8)
+    ]
+    for i, value in enumerate(values):
+        store.add_run(
+            f"run:{i}",
+            "synthetic",
+            "perf_suite",
+            "load",
+            f"2024-01-{i + 1:02d}T00:00:00",
+            [("", "response_time_ms.p95", value)],
+            commit=f"commit{i}",
+        )
+
+    baseline = store.rolling_baseline(
+        "response_time_ms.p95", scenario="load", window=5, before="2024-01-13"
+    )
+    assert baseline["n"] == 5
+    assert baseline["median"] == pytest.approx(100, abs=5)
+
+    changes = store.change_points("response_time_ms.p95", scenario="load")
+    assert [change["index"] for change in changes] == [12]
+    assert changes[0]["commit_sha"] == "commit12"
+    assert changes[0]["change"] == pytest.approx(0.3, abs=0.05)
+
+
+def test_detect_change_points_ignores_noise():
+    rng = random.Random(3)
+
+    assert detect_change_points([rng.gauss(100, 5) for _ in range(40)]) == []
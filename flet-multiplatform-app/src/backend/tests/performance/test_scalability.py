@@ -6,30 +6,70 @@ and identify the maximum capacity before performance degrades.
 """
 
 import asyncio
+import os
+import random
 import statistics
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Optional
 
-import numpy as np
 import pytest
-import pytest_asyncio
-from fastapi.testclient import TestClient
 
-from src.backend.app.main import app
-from src.backend.tests.performance.utils import LoadGenerator
+from src.backend.tests.performance.utils import DistributedLoadGenerator, LoadGenerator
 
-# Mark all tests in this module as performance tests
-pytestmark = pytest.mark.performance
+# Mark all tests in this module as asyncio performance tests
+pytestmark = [pytest.mark.performance, pytest.mark.asyncio]
 
 
 class TestScalability:
     """Test suite for scalability testing."""
 
     @pytest.fixture(autouse=True)
-    def setup(self, test_client: TestClient):
-        """Setup test client and base URL."""
-        self.client = test_client
-        self.base_url = "http://testserver"
+    def setup(self, perf_target):
+        """Point the load generators at the app under test."""
+        self.target = perf_target
+        self.base_url = perf_target.base_url
+
+    async def run_load_level(
+        self,
+        method: str,
+        endpoint: str,
+        users: int,
+        num_requests: int,
+        params: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Run one load level, spreading it over several processes for HTTP targets.
+
+        A single generator process saturates before the server does at the
+        higher levels, so HTTP targets use ``DistributedLoadGenerator``, which
+        also reports whether the generator itself was CPU-bound. In-process
+        ASGI targets share the test's event loop and use ``LoadGenerator``.
+        """
+        if self.target.app is None:
+            loader = DistributedLoadGenerator(
+                self.base_url,
+                workers=min(os.cpu_count() or 1, users),
+                max_workers=users,
+            )
+            return await loader.run_load_test(
+                method=method,
+                endpoint=endpoint,
+                num_requests=num_requests,
+                params=params,
+                json_data=json_data,
+            )
+
+        async with LoadGenerator(
+            **self.target.loader_kwargs(), max_workers=users
+        ) as loader:
+            return await loader.run_load_test(
+                method=method,
+                endpoint=endpoint,
+                num_requests=num_requests,
+                params=params,
+                json_data=json_data,
+                progress=False,
+            )
 
     async def run_scalability_test(
         self,
@@ -54,7 +94,7 @@ class TestScalability:
         # Warm-up phase
         if warm_up:
             print("\n🔥 Warming up...")
-            async with LoadGenerator(self.base_url) as loader:
+            async with LoadGenerator(**self.target.loader_kwargs()) as loader:
                 await loader.run_load_test(
                     method=method,
                     endpoint=endpoint,
@@ -84,40 +124,42 @@ class TestScalability:
         for users in load_levels:
             print(f"\n📊 Testing with {users} concurrent users...")
 
-            async with LoadGenerator(self.base_url) as loader:
-                # Run load test for this level
-                test_results = await loader.run_load_test(
-                    method=method,
-                    endpoint=endpoint,
-                    num_requests=users * 2,  # 2 requests per user
-                    params=params,
-                    json_data=json_data,
-                    progress=False,
-                )
-
-                # Store results
-                results[users] = {
-                    "success_rate": test_results["success_rate"],
-                    "response_times": test_results["response_times"],
-                    "throughput": (
-                        test_results["successful_requests"]
-                        / test_results["response_times"]["avg"]
-                        if test_results["response_times"]["avg"] > 0
-                        else 0
-                    ),
-                }
+            # Run load test for this level
+            test_results = await self.run_load_level(
+                method=method,
+                endpoint=endpoint,
+                users=users,
+                num_requests=users * 2,  # 2 requests per user
+                params=params,
+                json_data=json_data,
+            )
+
+            # Store results
+            results[users] = {
+                "success_rate": test_results["success_rate"],
+                "response_times": test_results["response_times"],
+                "throughput": (
+                    test_results["successful_requests"]
+                    / test_results["response_times"]["avg"]
+                    if test_results["response_times"]["avg"] > 0
+                    else 0
+                ),
+                "generator_saturated": test_results.get("generator_saturated", False),
+            }
 
-                # Print summary
-                print(f"  Success Rate: {results[users]['success_rate']:.1%}")
-                print(
-                    f"  Avg. Response Time: {results[users]['response_times']['avg']:.3f}s"
-                )
-                print(f"  Throughput: {results[users]['throughput']:.1f} req/s")
+            # Print summary
+            print(f"  Success Rate: {results[users]['success_rate']:.1%}")
+            print(
+                f"  Avg. Response Time: {results[users]['response_times']['avg']:.3f}s"
+            )
+            print(f"  Throughput: {results[users]['throughput']:.1f} req/s")
+            for warning in test_results.get("warnings", []):
+                print(f"  ⚠️  {warning}")
 
-                # Stop if success rate drops below 95%
-                if results[users]["success_rate"] < 0.95:
-                    print("⚠️  Success rate dropped below 95%, stopping test")
-                    break
+            # Stop if success rate drops below 95%
+            if results[users]["success_rate"] < 0.95:
+                print("⚠️  Success rate dropped below 95%, stopping test")
+                break
 
         return results
 
@@ -127,11 +169,10 @@ class TestScalability:
         perf_test_config: Dict[str, Any],
     ):
         """Test how well the system scales with read operations."""
-        config = perf_test_config["scalability_test"]
 
         # Run scalability test for a read-heavy endpoint
         results = await self.run_scalability_test(
-            endpoint="/api/users",
+            endpoint="/api/v1/users/",
             method="GET",
             params={"limit": 50},
         )
@@ -167,7 +208,6 @@ class TestScalability:
         perf_test_config: Dict[str, Any],
     ):
         """Test how well the system scales with write operations."""
-        config = perf_test_config["scalability_test"]
 
         # Generate unique user data for each request
         timestamp = int(time.time())
@@ -182,7 +222,7 @@ class TestScalability:
 
         # Run scalability test for a write-heavy endpoint
         results = await self.run_scalability_test(
-            endpoint="/api/users/",
+            endpoint="/api/v1/users/",
             method="POST",
             json_data=generate_user_data,
         )
@@ -208,9 +248,10 @@ class TestScalability:
         print(f"Maximum Throughput: {max_throughput:.1f} requests/second")
 
         # Assert that the system can handle at least 50 concurrent users for writes
-        assert (
-            max_users >= 50
-        ), f"System failed to scale to 50 concurrent users for writes (max: {max_users})"
+        assert max_users >= 50, (
+            "System failed to scale to 50 concurrent users for writes "
+            f"(max: {max_users})"
+        )
 
     async def test_mixed_workload_scalability(
         self,
@@ -218,18 +259,27 @@ class TestScalability:
         perf_test_config: Dict[str, Any],
     ):
         """Test how well the system scales with a mixed read/write workload."""
-        config = perf_test_config["scalability_test"]
 
         # Define a mix of read and write operations
         operations = [
             {
                 "method": "GET",
-                "endpoint": "/api/users",
+                "endpoint": "/api/v1/users/",
                 "params": {"limit": 20},
                 "weight": 3,
             },
-            {"method": "GET", "endpoint": "/api/users/1", "params": None, "weight": 2},
-            {"method": "POST", "endpoint": "/api/users/", "params": None, "weight": 1},
+            {
+                "method": "GET",
+                "endpoint": "/api/v1/users/1",
+                "params": None,
+                "weight": 2,
+            },
+            {
+                "method": "POST",
+                "endpoint": "/api/v1/users/",
+                "params": None,
+                "weight": 1,
+            },
         ]
 
         # Create weighted list of operations
@@ -257,7 +307,7 @@ class TestScalability:
         for users in load_levels:
             print(f"\n📊 Testing with {users} concurrent users...")
 
-            async with LoadGenerator(self.base_url) as loader:
+            async with LoadGenerator(**self.target.loader_kwargs()) as loader:
                 # Run a mix of operations for this load level
                 tasks = []
 
@@ -338,7 +388,9 @@ class TestScalability:
         print(f"Maximum Concurrent Users: {max_users}")
         print(f"Maximum Throughput: {max_throughput:.1f} requests/second")
 
-        # Assert that the system can handle at least 50 concurrent users with mixed workload
-        assert (
-            max_users >= 50
-        ), f"System failed to scale to 50 concurrent users with mixed workload (max: {max_users})"
+        # Assert that the system can handle at least 50 concurrent users with mixed
+        # workload
+        assert max_users >= 50, (
+            "System failed to scale to 50 concurrent users with mixed workload "
+            f"(max: {max_users})"
+        )
@@ -0,0 +1,55 @@
+"""
+Tests for the statistical comparison helpers.
+"""
+
+import random
+
+import pytest
+
+from src.backend.tests.performance.utils import (
+    bootstrap_ci,
+    mann_whitney_u,
+    welch_t_test,
+)
+
+
+def test_mann_whitney_detects_shift_only_in_one_direction():
+    rng = random.Random(0)
+    baseline = [rng.gauss(1.0, 0.05) for _ in range(50)]
+    slower = [rng.gauss(1.1, 0.05) for _ in range(50)]
+
+    _, p_slower = mann_whitney_u(baseline, slower)
+    _, p_faster = mann_whitney_u(slower, baseline)
+
+    assert p_slower < 0.001
+    assert p_faster > 0.999
+
+
+def test_mann_whitney_matches_reference_value():
+    # Ranks of the second sample are 6, 8, 9, 10, 11 (the three 5s share rank 6),
+    # so U = 44 - 15 = 29; with tie and continuity corrections z = 2.4875
+    u, p = mann_whitney_u([1, 2, 3, 4, 5, 5], [5, 6, 7, 8, 9])
+
+    assert u == 29
+    assert p == pytest.approx(0.00643, abs=1e-4)
+
+
+def test_identical_samples_are_not_significant():
+    _, p = mann_whitney_u([1.0] * 10, [1.0] * 10)
+    _, p_t = welch_t_test(1.0, 0.1, 30, 1.0, 0.1, 30)
+
+    assert p == 0.5
+    assert p_t == pytest.approx(0.5)
+
+
+def test_bootstrap_ci_covers_true_change_and_excludes_zero():
+    rng = random.Random(2)
+    baseline = [rng.gauss(100, 3) for _ in range(20)]
+    current = [rng.gauss(120, 3) for _ in range(20)]
+
+    low, high = bootstrap_ci(baseline, current, seed=0)
+    noise_low, noise_high = bootstrap_ci(baseline, baseline[::-1], seed=0)
+
+    assert 0 < low < 0.2 < high
+    assert noise_low <= 0 <= noise_high
+    assert bootstrap_ci(baseline, current, seed=0) == (low, high)
@@ -7,31 +7,29 @@ often to a breaking point, to observe how the system behaves under extreme condi
 
 import asyncio
 import random
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict
 
 import pytest
-import pytest_asyncio
-from fastapi.testclient import TestClient
 
-from src.backend.app.main import app
-from src.backend.tests.performance.utils import LoadGenerator
+from src.backend.tests.performance.utils import LoadGenerator, LatencyHistogram
 
-# Mark all tests in this module as performance tests
-pytestmark = pytest.mark.performance
+# Mark all tests in this module as asyncio performance tests
+pytestmark = [pytest.mark.performance, pytest.mark.asyncio]
 
 
 class TestStressEndpoints:
     """Test suite for stress testing API endpoints."""
 
     @pytest.fixture(autouse=True)
-    def setup(self, test_client: TestClient):
-        """Setup test client and base URL."""
-        self.client = test_client
-        self.base_url = "http://testserver"
+    def setup(self, perf_target):
+        """Point the load generators at the app under test."""
+        self.target = perf_target
+        self.base_url = perf_target.base_url
 
     async def test_high_concurrent_users(
         self,
         performance_metrics,
+        perf_budget,
         perf_test_config: Dict[str, Any],
     ):
         """Test the system with a very high number of concurrent users."""
@@ -40,17 +38,17 @@ class TestStressEndpoints:
 
         # Define a list of endpoints to test
         endpoints = [
-            {"method": "GET", "endpoint": "/api/health"},
-            {"method": "GET", "endpoint": "/api/users"},
-            {"method": "GET", "endpoint": "/api/users/1"},
+            {"method": "GET", "endpoint": "/health"},
+            {"method": "GET", "endpoint": "/api/v1/users/"},
+            {"method": "GET", "endpoint": "/api/v1/users/1"},
         ]
 
-        async with LoadGenerator(self.base_url) as loader:
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
             # Warm-up phase
             print(f"\n🔥 Warming up with {num_users // 10} requests...")
             await loader.run_load_test(
                 method="GET",
-                endpoint="/api/health",
+                endpoint="/health",
                 num_requests=num_users // 10,
                 progress=False,
             )
@@ -76,7 +74,7 @@ class TestStressEndpoints:
         # Process results
         successful_requests = 0
         total_requests = 0
-        response_times = []
+        response_times = LatencyHistogram()
 
         for result in results:
             if isinstance(result, Exception):
@@ -85,11 +83,9 @@ class TestStressEndpoints:
 
             successful_requests += result["successful_requests"]
             total_requests += result["total_requests"]
-
-            if "response_times" in result:
-                response_times.extend(
-                    [t for t in result["response_times"] if isinstance(t, (int, float))]
-                )
+            response_times.merge(
+                LatencyHistogram.from_dict(result["histograms"]["response_times"])
+            )
 
         success_rate = successful_requests / total_requests if total_requests > 0 else 0
 
@@ -100,37 +96,34 @@ class TestStressEndpoints:
         )
         performance_metrics.record_test_metric("success_rate", success_rate)
 
-        if response_times:
+        if response_times.count:
             performance_metrics.record_test_metric(
-                "avg_response_time", sum(response_times) / len(response_times)
+                "avg_response_time", response_times.mean
             )
             performance_metrics.record_test_metric(
-                "max_response_time", max(response_times)
+                "max_response_time", response_times.max_ns / 1e9
             )
             performance_metrics.record_test_metric(
-                "min_response_time", min(response_times)
+                "min_response_time", response_times.min_ns / 1e9
             )
 
-        print(f"\n📊 Stress Test Results:")
+        print("\n📊 Stress Test Results:")
         print(f"Total Requests: {total_requests}")
         print(f"Successful Requests: {successful_requests}")
         print(f"Success Rate: {success_rate:.2%}")
 
-        if response_times:
-            print(
-                f"Average Response Time: {sum(response_times) / len(response_times):.3f}s"
-            )
-            print(f"Max Response Time: {max(response_times):.3f}s")
-            print(f"Min Response Time: {min(response_times):.3f}s")
+        if response_times.count:
+            print(f"Average Response Time: {response_times.mean:.3f}s")
+            print(f"Max Response Time: {response_times.max_ns / 1e9:.3f}s")
+            print(f"Min Response Time: {response_times.min_ns / 1e9:.3f}s")
 
         # Assert performance criteria (more lenient than load tests)
-        assert (
-            success_rate >= 0.80
-        ), f"Success rate too low under stress: {success_rate:.2%}"
+        perf_budget.enforce(error_rate=1 - success_rate)
 
     async def test_system_under_extreme_load(
         self,
         performance_metrics,
+        perf_budget,
         perf_test_config: Dict[str, Any],
     ):
         """Test the system under extreme load conditions."""
@@ -141,9 +134,9 @@ class TestStressEndpoints:
 
         # Test a mix of read and write operations
         endpoints = [
-            {"method": "GET", "endpoint": "/api/health", "weight": 5},
-            {"method": "GET", "endpoint": "/api/users", "weight": 3},
-            {"method": "GET", "endpoint": "/api/users/1", "weight": 2},
+            {"method": "GET", "endpoint": "/health", "weight": 5},
+            {"method": "GET", "endpoint": "/api/v1/users/", "weight": 3},
+            {"method": "GET", "endpoint": "/api/v1/users/1", "weight": 2},
         ]
 
         # Create a weighted list of endpoints
@@ -151,12 +144,12 @@ class TestStressEndpoints:
         for endpoint in endpoints:
             weighted_endpoints.extend([endpoint] * endpoint["weight"])
 
-        async with LoadGenerator(self.base_url) as loader:
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
             # Warm-up phase
             print(f"\n🔥 Warming up with {num_requests // 10} requests...")
             await loader.run_load_test(
                 method="GET",
-                endpoint="/api/health",
+                endpoint="/health",
                 num_requests=num_requests // 10,
                 progress=False,
             )
@@ -191,9 +184,8 @@ class TestStressEndpoints:
                 )
 
                 # Print progress
-                print(
-                    f"  Processed {min(i + current_batch_size, num_requests)}/{num_requests} requests..."
-                )
+                processed = min(i + current_batch_size, num_requests)
+                print(f"  Processed {processed}/{num_requests} requests...")
 
         # Process results
         successful_requests = sum(1 for r in results if r.get("success", False))
@@ -215,53 +207,49 @@ class TestStressEndpoints:
             },
         )
 
-        print(f"\n📊 Extreme Load Test Results:")
+        print("\n📊 Extreme Load Test Results:")
         print(f"Total Requests: {total_requests}")
         print(f"Successful Requests: {successful_requests}")
         print(f"Success Rate: {success_rate:.2%}")
 
         if response_times:
-            print(
-                f"Average Response Time: {sum(response_times) / len(response_times):.3f}s"
-            )
+            avg_response_time = sum(response_times) / len(response_times)
+            print(f"Average Response Time: {avg_response_time:.3f}s")
 
         # Assert that the system didn't completely fail
-        assert (
-            success_rate > 0.5
-        ), f"System failed under extreme load: {success_rate:.2%} success rate"
+        perf_budget.enforce(error_rate=1 - success_rate)
 
 
 class TestResourceUtilization:
     """Tests focused on monitoring and analyzing resource utilization under stress."""
 
     @pytest.fixture(autouse=True)
-    def setup(self, test_client: TestClient):
-        """Setup test client and base URL."""
-        self.client = test_client
-        self.base_url = "http://testserver"
+    def setup(self, perf_target):
+        """Point the load generators at the app under test."""
+        self.target = perf_target
+        self.base_url = perf_target.base_url
 
     async def test_memory_usage_under_load(
         self,
         performance_metrics,
+        perf_budget,
         perf_test_config: Dict[str, Any],
     ):
         """Test memory usage under sustained load."""
-        import os
-
-        import psutil
-
         config = perf_test_config["stress_test"]
         num_requests = config["users"]
 
-        # Get initial memory usage
-        process = psutil.Process(os.getpid())
+        # Get initial memory usage of the server process
+        process = self.target.process()
+        if process is None:
+            pytest.skip("Memory of a remote target cannot be measured")
         initial_memory = process.memory_info().rss / (1024 * 1024)  # MB
 
         # Run load test
-        async with LoadGenerator(self.base_url) as loader:
-            results = await loader.run_load_test(
+        async with LoadGenerator(**self.target.loader_kwargs()) as loader:
+            await loader.run_load_test(
                 method="GET",
-                endpoint="/api/users",
+                endpoint="/api/v1/users/",
                 num_requests=num_requests,
                 params={"limit": 50},
             )
@@ -278,39 +266,40 @@ class TestResourceUtilization:
             memory_increase / num_requests if num_requests > 0 else 0,
         )
 
-        print(f"\n💾 Memory Usage:")
+        print("\n💾 Memory Usage:")
         print(f"Initial: {initial_memory:.2f} MB")
         print(f"Final: {final_memory:.2f} MB")
         print(f"Increase: {memory_increase:.2f} MB")
-        print(
-            f"Per request: {memory_increase / num_requests if num_requests > 0 else 0:.4f} MB"
-        )
+        per_request = memory_increase / num_requests if num_requests > 0 else 0
+        print(f"Per request: {per_request:.4f} MB")
 
         # Assert that memory usage is within reasonable bounds
-        assert (
-            memory_increase < 100
-        ), f"Memory increase too high: {memory_increase:.2f} MB"
+        perf_budget.enforce(rss_growth_mb=memory_increase)
 
     async def test_cpu_usage_under_load(
         self,
         performance_metrics,
+        perf_budget,
         perf_test_config: Dict[str, Any],
     ):
         """Test CPU usage under sustained load."""
         import psutil
 
         config = perf_test_config["stress_test"]
-        duration = 30  # seconds
 
         # Start measuring CPU usage
         psutil.cpu_percent(interval=None)  # Initialize
+        # CPU time of the serving process (in-process mode: the app and the
+        # load generator); None for a remote target
+        process = self.target.process()
+        cpu_times_before = process.cpu_times() if process is not None else None
 
         # Run load test in the background
         async def run_load():
-            async with LoadGenerator(self.base_url) as loader:
+            async with LoadGenerator(**self.target.loader_kwargs()) as loader:
                 return await loader.run_load_test(
                     method="GET",
-                    endpoint="/api/users",
+                    endpoint="/api/v1/users/",
                     num_requests=config["users"],
                     params={"limit": 50},
                     progress=False,
@@ -318,37 +307,47 @@ class TestResourceUtilization:
 
         load_task = asyncio.create_task(run_load())
 
-        # Monitor CPU usage during the test
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Monitor CPU usage during the test without blocking the event loop,
+        # which also runs the app in in-process mode
         cpu_percent_during_test = []
 
         while not load_task.done():
-            cpu_percent = psutil.cpu_percent(interval=1)
+            await asyncio.sleep(1)
+            cpu_percent = psutil.cpu_percent(interval=None)
             cpu_percent_during_test.append(cpu_percent)
             print(f"CPU Usage: {cpu_percent:.1f}%")
 
         # Get test results
         results = await load_task
 
+        # System CPU is close to 100% whenever the closed-loop run saturates a
+        # core, so the budget is on CPU time per request instead
+        cpu_ms_per_request = None
+        if process is not None and results["total_requests"]:
+            cpu_times_after = process.cpu_times()
+            cpu_seconds = (cpu_times_after.user + cpu_times_after.system) - (
+                cpu_times_before.user + cpu_times_before.system
+            )
+            cpu_ms_per_request = cpu_seconds * 1000 / results["total_requests"]
+
         # Calculate average CPU usage
         avg_cpu = (
             sum(cpu_percent_during_test) / len(cpu_percent_during_test)
             if cpu_percent_during_test
             else 0
         )
+        max_cpu = max(cpu_percent_during_test) if cpu_percent_during_test else 0
 
         # Record metrics
         performance_metrics.record_test_metric("avg_cpu_percent", avg_cpu)
-        performance_metrics.record_test_metric(
-            "max_cpu_percent",
-            max(cpu_percent_during_test) if cpu_percent_during_test else 0,
-        )
+        performance_metrics.record_test_metric("max_cpu_percent", max_cpu)
+        performance_metrics.record_test_metric("cpu_ms_per_request", cpu_ms_per_request)
 
-        print(f"\n💻 CPU Usage During Test:")
+        print("\n💻 CPU Usage During Test:")
         print(f"Average: {avg_cpu:.1f}%")
-        print(
-            f"Max: {max(cpu_percent_during_test) if cpu_percent_during_test else 0:.1f}%"
-        )
+        print(f"Max: {max_cpu:.1f}%")
+        if cpu_ms_per_request is not None:
+            print(f"CPU time per request: {cpu_ms_per_request:.1f} ms")
 
         # Assert that CPU usage is within reasonable bounds
-        assert avg_cpu < 90, f"Average CPU usage too high: {avg_cpu:.1f}%"
+        perf_budget.enforce(cpu_ms_per_request=cpu_ms_per_request)
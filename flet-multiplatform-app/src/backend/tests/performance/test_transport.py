@@ -0,0 +1,80 @@
+"""
+Tests for the LoadGenerator transports.
+
+Checks that the in-process ASGI transport and a uvicorn subprocess give the
+same results through the same LoadGenerator API.
+"""
+
+import textwrap
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+
+from src.backend.tests.performance.utils import LoadGenerator, UvicornServer, load_app
+
+APP_SOURCE = textwrap.dedent(
+    """
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+    """
+)
+
+
+@pytest.fixture
+def app_file(tmp_path):
+    path = tmp_path / "perf_app.py"
+    path.write_text(APP_SOURCE)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_asgi_transport_runs_app_in_process(app_file):
+    events = []
+    app = load_app(f"{app_file}:app")
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        events.append("startup")
+        yield
+        events.append("shutdown")
+
+    app.router.lifespan_context = lifespan
+
+    async with LoadGenerator("http://testserver", app=app, sample_bodies=1) as loader:
+        assert events == ["startup"]
+        ok = await loader.run_load_test(
+            "GET", "/health", num_requests=20, progress=False
+        )
+        failed = await loader.run_load_test(
+            "GET", "/boom", num_requests=5, progress=False
+        )
+
+    assert events == ["startup", "shutdown"]
+    assert ok["success_rate"] == 1.0
+    assert ok["samples"] == [{"status": "ok"}]
+    # Unhandled errors are reported as a server would, not raised
+    assert failed["status_codes"] == {"500": 5}
+
+
+@pytest.mark.asyncio
+async def test_uvicorn_server_serves_same_app(app_file):
+    with UvicornServer(f"{app_file}:app", cwd=app_file.parent) as server:
+        assert server.pid is not None
+        async with LoadGenerator(server.base_url) as loader:
+            results = await loader.run_load_test(
+                "GET", "/health", num_requests=20, progress=False
+            )
+
+    assert server.pid is None
+    assert results["success_rate"] == 1.0
+    assert results["status_codes"] == {"200": 20}
@@ -1,4 +1,4 @@
-""
+"""
 Performance testing utilities.
 
 This module provides utility functions and classes for performance testing,
@@ -15,11 +15,40 @@ from functools import partial
 import json
 from pathlib import Path
 
-import aiohttp
 import psutil
-import numpy as np
 from tqdm import tqdm
 
+from .arrival import (
+    ArrivalProfile,
+    ConstantRate,
+    PoissonArrivals,
+    RampRate,
+    PartitionedProfile,
+    StepRate,
+    create_arrival_profile,
+    partition_profile,
+)
+from .histogram import LatencyHistogram, ResultAggregator
+from .transport import AiohttpTransport, ASGITransport, UvicornServer, load_app
+from .distributed import DistributedLoadGenerator, detect_saturation
+from .stats import (
+    bootstrap_ci,
+    detect_change_points,
+    mann_whitney_u,
+    relative_median_change,
+    welch_t_test,
+)
+from .results_store import ResultsStore, current_commit
+from .profiler import PySpySampler, StackProfile, ThreadSampler
+from .leaks import LeakDetector, LeakReport
+from .budgets import (
+    BudgetCheck,
+    Budgets,
+    format_budget_table,
+    load_budgets,
+    load_test_actuals,
+)
+
 
 class LoadGenerator:
     """Generate load for performance testing."""
@@ -29,6 +58,8 @@ class LoadGenerator:
         base_url: str = "http://localhost:8000",
         max_workers: int = 100,
         timeout: int = 30,
+        sample_bodies: int = 0,
+        app: Any = None,
     ):
         """Initialize the load generator.
 
@@ -36,21 +67,37 @@ class LoadGenerator:
             base_url: Base URL of the API to test
             max_workers: Maximum number of concurrent workers
             timeout: Request timeout in seconds
+            sample_bodies: Number of parsed response bodies to keep per run
+                (reservoir-sampled). Bodies are read but discarded by default.
+            app: ASGI app to call in-process instead of sending HTTP requests
+                to ``base_url``; ``base_url`` then only sets the Host header
         """
         self.base_url = base_url.rstrip("/")
         self.max_workers = max_workers
-        self.timeout = aiohttp.ClientTimeout(total=timeout)
-        self.session = None
+        self.sample_bodies = sample_bodies
+        self.app = app
+        if app is not None:
+            self.transport = ASGITransport(app, timeout=timeout)
+        else:
+            self.transport = AiohttpTransport(timeout=timeout)
+        self._opened = False
+
+    @property
+    def session(self):
+        """The underlying aiohttp session or httpx client (None until opened)."""
+        return self.transport.session if self._opened else None
 
     async def __aenter__(self):
-        """Create an aiohttp session."""
-        self.session = aiohttp.ClientSession(timeout=self.timeout)
+        """Open the transport (aiohttp session or in-process ASGI client)."""
+        await self.transport.open()
+        self._opened = True
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Close the aiohttp session."""
-        if self.session:
-            await self.session.close()
+        """Close the transport."""
+        if self._opened:
+            self._opened = False
+            await self.transport.close()
 
     async def make_request(
         self,
@@ -59,6 +106,8 @@ class LoadGenerator:
         params: Optional[Dict] = None,
         json_data: Optional[Dict] = None,
         headers: Optional[Dict] = None,
+        intended_start_ns: Optional[int] = None,
+        parse_body: bool = False,
     ) -> Dict[str, Any]:
         """Make an HTTP request and return timing information.
 
@@ -68,46 +117,54 @@ class LoadGenerator:
             params: Query parameters
             json_data: JSON request body
             headers: HTTP headers
+            intended_start_ns: ``time.perf_counter_ns()`` value at which the
+                request was scheduled to be sent. ``response_time`` is measured
+                from this point so that time spent waiting behind a slow server
+                is included; defaults to the actual send time.
+            parse_body: Whether to parse the JSON body into ``data``. The body
+                is always read in full so timings are comparable.
 
         Returns:
-            Dict containing response data and timing information
+            Dict containing response data and timing information. Times are in
+            seconds (with ``*_ns`` integer variants); ``service_time`` is
+            measured from the actual send.
         """
-        if not self.session:
-            raise RuntimeError("Session not initialized. Use 'async with LoadGenerator()'")
+        if not self._opened:
+            raise RuntimeError(
+                "Session not initialized. Use 'async with LoadGenerator()'"
+            )
 
         url = f"{self.base_url}{endpoint}"
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        if intended_start_ns is None:
+            intended_start_ns = start_ns
         status_code = None
+        response_data = None
         error = None
 
         try:
-            async with self.session.request(
-                method=method,
-                url=url,
+            status_code, response_data = await self.transport.request(
+                method,
+                url,
                 params=params,
-                json=json_data,
+                json_data=json_data,
                 headers=headers,
-            ) as response:
-                status_code = response.status
-                response_data = await response.json()
-                response_time = time.time() - start_time
-
-                return {
-                    "status_code": status_code,
-                    "response_time": response_time,
-                    "data": response_data,
-                    "success": 200 <= status_code < 300,
-                    "error": None,
-                }
+                parse_body=parse_body,
+            )
         except Exception as e:
-            response_time = time.time() - start_time
-            return {
-                "status_code": status_code,
-                "response_time": response_time,
-                "data": None,
-                "success": False,
-                "error": str(e),
-            }
+            error = str(e)
+
+        end_ns = time.perf_counter_ns()
+        return {
+            "status_code": status_code,
+            "response_time": (end_ns - intended_start_ns) / 1e9,
+            "response_time_ns": end_ns - intended_start_ns,
+            "service_time": (end_ns - start_ns) / 1e9,
+            "service_time_ns": end_ns - start_ns,
+            "data": response_data,
+            "success": error is None and 200 <= status_code < 300,
+            "error": error,
+        }
 
     async def run_load_test(
         self,
@@ -118,8 +175,17 @@ class LoadGenerator:
         json_data: Optional[Union[Dict, Callable]] = None,
         headers: Optional[Dict] = None,
         progress: bool = True,
+        aggregator: Optional[ResultAggregator] = None,
     ) -> Dict[str, Any]:
-        """Run a load test with multiple concurrent requests.
+        """Run a closed-loop load test with multiple concurrent requests.
+
+        At most ``max_workers`` requests are in flight, and each worker only
+        sends its next request after the previous one completes, so a slow
+        server also slows the generator. Use ``run_open_loop_test`` to see
+        latency the way independent clients would.
+
+        Results are aggregated as they arrive (see ``ResultAggregator``), so
+        memory does not grow with ``num_requests``.
 
         Args:
             method: HTTP method
@@ -129,15 +195,23 @@ class LoadGenerator:
             json_data: JSON request body (can be a function that takes an index)
             headers: HTTP headers
             progress: Whether to show a progress bar
+            aggregator: Aggregator to record results into, e.g. one that is
+                periodically drained for interval snapshots
 
         Returns:
             Aggregated test results
         """
-        results = []
-        semaphore = asyncio.Semaphore(self.max_workers)
+        if aggregator is None:
+            aggregator = ResultAggregator(sample_bodies=self.sample_bodies)
+        indexes = iter(range(num_requests))
+        pbar = None
+        if progress:
+            print(f"Sending {num_requests} requests to {method} {endpoint}")
+            pbar = tqdm(total=num_requests)
 
-        async def make_request_with_semaphore(index: int):
-            async with semaphore:
+        async def worker():
+            # Workers share one index iterator, so each request is sent once
+            for index in indexes:
                 # Generate dynamic parameters if callable
                 req_params = params(index) if callable(params) else params
                 req_json = json_data(index) if callable(json_data) else json_data
@@ -148,49 +222,126 @@ class LoadGenerator:
                     params=req_params,
                     json_data=req_json,
                     headers=headers,
+                    parse_body=aggregator.wants_body(),
                 )
-                return result
-
-        # Run requests concurrently
-        tasks = [make_request_with_semaphore(i) for i in range(num_requests)]
-
-        if progress:
-            print(f"Sending {num_requests} requests to {method} {endpoint}")
-            with tqdm(total=num_requests) as pbar:
-                for coro in asyncio.as_completed(tasks):
-                    result = await coro
-                    results.append(result)
+                aggregator.add(result, method, endpoint)
+                if pbar is not None:
                     pbar.update(1)
-        else:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Process results
-        successful_requests = [r for r in results if r and r.get("success", False)]
-        failed_requests = [r for r in results if not r or not r.get("success", True)]
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(worker() for _ in range(min(self.max_workers, num_requests)))
+            )
+        finally:
+            if pbar is not None:
+                pbar.close()
+        elapsed = time.perf_counter() - started
+
+        summary = aggregator.summary()
+        summary["mode"] = "closed"
+        summary["duration_seconds"] = elapsed
+        summary["requests_per_second"] = num_requests / elapsed if elapsed > 0 else 0
+        return summary
+
+    async def run_open_loop_test(
+        self,
+        method: str,
+        endpoint: str,
+        profile: ArrivalProfile,
+        params: Optional[Union[Dict, Callable]] = None,
+        json_data: Optional[Union[Dict, Callable]] = None,
+        headers: Optional[Dict] = None,
+        progress: bool = True,
+        aggregator: Optional[ResultAggregator] = None,
+    ) -> Dict[str, Any]:
+        """Run an open-loop load test at a target arrival rate.
+
+        Unlike ``run_load_test``, requests are sent on the schedule given by
+        ``profile`` whether or not earlier requests have completed, and
+        ``response_time`` is measured from each request's intended send time.
+        When the server falls behind, the resulting queueing shows up in the
+        percentiles instead of reducing the offered load.
 
-        response_times = [r["response_time"] for r in results if r and "response_time" in r]
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            profile: Arrival profile giving the intended send times
+            params: Query parameters (can be a function that takes an index)
+            json_data: JSON request body (can be a function that takes an index)
+            headers: HTTP headers
+            progress: Whether to show a progress bar
+            aggregator: Aggregator to record results into, e.g. one that is
+                periodically drained for interval snapshots
 
-        return {
-            "total_requests": num_requests,
-            "successful_requests": len(successful_requests),
-            "failed_requests": len(failed_requests),
-            "success_rate": len(successful_requests) / num_requests if num_requests > 0 else 0,
-            "response_times": {
-                "min": min(response_times, default=0),
-                "max": max(response_times, default=0),
-                "avg": statistics.mean(response_times) if response_times else 0,
-                "median": statistics.median(response_times) if response_times else 0,
-                "p90": np.percentile(response_times, 90) if response_times else 0,
-                "p95": np.percentile(response_times, 95) if response_times else 0,
-                "p99": np.percentile(response_times, 99) if response_times else 0,
-            },
-            "status_codes": {
-                str(r["status_code"]): sum(1 for req in results if req and req.get("status_code") == r["status_code"])
-                for r in results
-                if r and "status_code" in r
-            },
-            "errors": [r["error"] for r in results if r and "error" in r and r["error"] is not None],
-        }
+        Returns:
+            Aggregated test results, including the offered and achieved rates,
+            service times measured from the actual send, and how far the
+            generator itself lagged behind the schedule.
+        """
+        if aggregator is None:
+            aggregator = ResultAggregator(sample_bodies=self.sample_bodies)
+        in_flight = set()
+        max_lag_ns = 0
+        pbar = None
+        if progress:
+            print(
+                f"Sending requests to {method} {endpoint} "
+                f"({profile.name} arrivals over {profile.duration}s)"
+            )
+            pbar = tqdm(total=profile.expected_requests())
+
+        sent = 0
+
+        async def send(index: int, intended_ns: int):
+            req_params = params(index) if callable(params) else params
+            req_json = json_data(index) if callable(json_data) else json_data
+            result = await self.make_request(
+                method=method,
+                endpoint=endpoint,
+                params=req_params,
+                json_data=req_json,
+                headers=headers,
+                intended_start_ns=intended_ns,
+                parse_body=aggregator.wants_body(),
+            )
+            aggregator.add(result, method, endpoint)
+            if pbar is not None:
+                pbar.update(1)
+
+        run_start_ns = time.perf_counter_ns()
+        try:
+            for index, offset in enumerate(profile.offsets()):
+                intended_ns = run_start_ns + int(offset * 1e9)
+                delay_ns = intended_ns - time.perf_counter_ns()
+                if delay_ns > 0:
+                    await asyncio.sleep(delay_ns / 1e9)
+                max_lag_ns = max(max_lag_ns, time.perf_counter_ns() - intended_ns)
+
+                task = asyncio.ensure_future(send(index, intended_ns))
+                sent += 1
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        finally:
+            if pbar is not None:
+                pbar.close()
+        elapsed = (time.perf_counter_ns() - run_start_ns) / 1e9
+
+        summary = aggregator.summary()
+        summary.update(
+            {
+                "mode": "open",
+                "arrival": profile.to_dict(),
+                "offered_rps": sent / profile.duration,
+                "achieved_rps": sent / elapsed if elapsed > 0 else 0,
+                "max_schedule_lag": max_lag_ns / 1e9,
+                "service_times": aggregator.service_times.summary(),
+            }
+        )
+        return summary
 
 
 def analyze_performance_results(results_dir: Union[str, Path]) -> Dict[str, Any]:
@@ -206,26 +357,23 @@ def analyze_performance_results(results_dir: Union[str, Path]) -> Dict[str, Any]
     if not results_dir.exists() or not results_dir.is_dir():
         raise ValueError(f"Results directory not found: {results_dir}")
 
-    result_files = list(results_dir.glob("*.json"))
-    if not result_files:
+    if not any(results_dir.glob("*.json")):
         return {"message": "No result files found"}
 
-    all_results = []
-
-    for result_file in result_files:
-        try:
-            with open(result_file, "r") as f:
-                result_data = json.load(f)
-                all_results.append(result_data)
-        except Exception as e:
-            print(f"Error loading result file {result_file}: {e}")
+    # Only new or changed files are parsed; earlier runs come from the store,
+    # which is shared with other result directories
+    with ResultsStore() as store:
+        store.ingest_path(results_dir, patterns=["*.json"])
+        all_results = [
+            run["document"]
+            for run in store.runs(format="perf_suite", source=results_dir)
+        ]
 
     if not all_results:
         return {"message": "No valid result data found"}
 
     # Aggregate metrics
     durations = [r.get("duration_seconds", 0) for r in all_results]
-    test_metrics = [r.get("test_metrics", {}) for r in all_results]
 
     # Calculate statistics
     return {
@@ -237,9 +385,13 @@ def analyze_performance_results(results_dir: Union[str, Path]) -> Dict[str, Any]
             "success": sum(1 for r in all_results if not r.get("errors")),
             "failed": sum(1 for r in all_results if r.get("errors")),
         },
-        "common_errors": statistics.mode(
-            [e["message"] for r in all_results for e in r.get("errors", [])]
-        ) if any(r.get("errors") for r in all_results) else "No common errors",
+        "common_errors": (
+            statistics.mode(
+                [e["message"] for r in all_results for e in r.get("errors", [])]
+            )
+            if any(r.get("errors") for r in all_results)
+            else "No common errors"
+        ),
         "test_metrics_summary": {
             # Add more specific metric summaries as needed
         },
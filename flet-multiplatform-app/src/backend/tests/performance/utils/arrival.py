@@ -0,0 +1,262 @@
+"""
+Arrival-rate profiles for open-loop load generation.
+
+An arrival profile turns a target request rate into the schedule of
+*intended* send times. The open-loop runner in ``LoadGenerator`` sends each
+request at its scheduled time regardless of how many earlier requests are
+still in flight, and measures latency from that intended time, so a slow
+server shows up as queueing in the percentiles instead of silently lowering
+the offered load (coordinated omission).
+"""
+
+import itertools
+import math
+import random
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class ArrivalProfile:
+    """Base class for arrival-rate profiles.
+
+    Subclasses implement ``rate_at`` (requests per second at a given offset
+    from the start of the run). The default ``offsets`` spaces requests
+    evenly according to that instantaneous rate.
+    """
+
+    name = "base"
+
+    def __init__(self, duration: float):
+        """Initialize the profile.
+
+        Args:
+            duration: Length of the run in seconds
+        """
+        if duration <= 0:
+            raise ValueError(f"duration must be positive, got {duration}")
+        self.duration = duration
+
+    def rate_at(self, t: float) -> float:
+        """Return the target arrival rate (requests/second) at offset ``t``."""
+        raise NotImplementedError
+
+    def offsets(self) -> Iterator[float]:
+        """Yield intended send offsets in seconds from the start of the run."""
+        t = 0.0
+        while t < self.duration:
+            rate = self.rate_at(t)
+            if rate <= 0:
+                # Nothing scheduled at this point; skip ahead a little
+                t += 0.01
+                continue
+            yield t
+            t += 1.0 / rate
+
+    def expected_requests(self) -> int:
+        """Return the number of requests the profile will schedule."""
+        return sum(1 for _ in self.offsets())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the profile for inclusion in test results."""
+        return {"profile": self.name, "duration": self.duration}
+
+
+class ConstantRate(ArrivalProfile):
+    """Evenly spaced arrivals at a fixed rate."""
+
+    name = "constant"
+
+    def __init__(self, rate: float, duration: float):
+        super().__init__(duration)
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+
+    def rate_at(self, t: float) -> float:
+        return self.rate
+
+    def offsets(self) -> Iterator[float]:
+        # Multiply instead of accumulating to avoid drift over long runs
+        count = math.ceil(self.duration * self.rate)
+        for i in range(count):
+            yield i / self.rate
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), "rate": self.rate}
+
+
+class RampRate(ArrivalProfile):
+    """Arrival rate that changes linearly from ``start_rate`` to ``end_rate``."""
+
+    name = "ramp"
+
+    def __init__(self, start_rate: float, end_rate: float, duration: float):
+        super().__init__(duration)
+        if start_rate < 0 or end_rate < 0 or start_rate == end_rate == 0:
+            raise ValueError("ramp rates must be non-negative and not both zero")
+        self.start_rate = start_rate
+        self.end_rate = end_rate
+
+    def rate_at(self, t: float) -> float:
+        fraction = min(max(t / self.duration, 0.0), 1.0)
+        return self.start_rate + (self.end_rate - self.start_rate) * fraction
+
+    def offsets(self) -> Iterator[float]:
+        # The k-th arrival is where the integrated rate reaches k, which
+        # keeps a ramp starting at zero from stalling on its first request.
+        a = self.start_rate
+        b = (self.end_rate - self.start_rate) / self.duration
+        k = 0
+        while True:
+            if b == 0:
+                t = k / a
+            else:
+                discriminant = a * a + 2 * b * k
+                if discriminant < 0:
+                    # A falling ramp never reaches this many arrivals
+                    return
+                t = (-a + math.sqrt(discriminant)) / b
+            if t >= self.duration:
+                return
+            yield t
+            k += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **super().to_dict(),
+            "start_rate": self.start_rate,
+            "end_rate": self.end_rate,
+        }
+
+
+class PoissonArrivals(ArrivalProfile):
+    """Arrivals with exponentially distributed gaps around a mean rate.
+
+    This models many independent clients better than evenly spaced
+    requests, since bursts naturally occur.
+    """
+
+    name = "poisson"
+
+    def __init__(self, rate: float, duration: float, seed: Optional[int] = None):
+        super().__init__(duration)
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.seed = seed
+
+    def rate_at(self, t: float) -> float:
+        return self.rate
+
+    def offsets(self) -> Iterator[float]:
+        rng = random.Random(self.seed)
+        t = rng.expovariate(self.rate)
+        while t < self.duration:
+            yield t
+            t += rng.expovariate(self.rate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), "rate": self.rate, "seed": self.seed}
+
+
+class StepRate(ArrivalProfile):
+    """Piecewise-constant arrival rate.
+
+    ``steps`` is a sequence of ``(duration, rate)`` pairs run back to back,
+    e.g. ``[(30, 50), (30, 100), (30, 200)]``.
+    """
+
+    name = "step"
+
+    def __init__(self, steps: Sequence[Tuple[float, float]]):
+        if not steps:
+            raise ValueError("steps must not be empty")
+        self.steps: List[Tuple[float, float]] = [
+            (float(duration), float(rate)) for duration, rate in steps
+        ]
+        if any(duration <= 0 or rate < 0 for duration, rate in self.steps):
+            raise ValueError("step durations must be positive and rates non-negative")
+        super().__init__(sum(duration for duration, _ in self.steps))
+
+    def rate_at(self, t: float) -> float:
+        elapsed = 0.0
+        for duration, rate in self.steps:
+            elapsed += duration
+            if t < elapsed:
+                return rate
+        return self.steps[-1][1]
+
+    def offsets(self) -> Iterator[float]:
+        start = 0.0
+        for duration, rate in self.steps:
+            if rate > 0:
+                count = math.ceil(duration * rate)
+                for i in range(count):
+                    yield start + i / rate
+            start += duration
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), "steps": self.steps}
+
+
+class PartitionedProfile(ArrivalProfile):
+    """Every ``count``-th arrival of another profile, starting at ``index``.
+
+    Splitting a profile this way across ``count`` load-generator processes
+    reproduces the original schedule exactly when their requests are
+    combined, whatever the shape of the profile.
+    """
+
+    name = "partition"
+
+    def __init__(self, profile: ArrivalProfile, index: int, count: int):
+        if not 0 <= index < count:
+            raise ValueError(f"index must be in [0, {count}), got {index}")
+        super().__init__(profile.duration)
+        self.profile = profile
+        self.index = index
+        self.count = count
+
+    def rate_at(self, t: float) -> float:
+        return self.profile.rate_at(t) / self.count
+
+    def offsets(self) -> Iterator[float]:
+        return itertools.islice(self.profile.offsets(), self.index, None, self.count)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.profile.to_dict(),
+            "partition": [self.index, self.count],
+        }
+
+
+def partition_profile(profile: ArrivalProfile, count: int) -> List[ArrivalProfile]:
+    """Split a profile into ``count`` interleaved parts, one per worker."""
+    return [PartitionedProfile(profile, index, count) for index in range(count)]
+
+
+ARRIVAL_PROFILES = {
+    ConstantRate.name: ConstantRate,
+    RampRate.name: RampRate,
+    PoissonArrivals.name: PoissonArrivals,
+    StepRate.name: StepRate,
+}
+
+
+def create_arrival_profile(profile: str, **kwargs: Any) -> ArrivalProfile:
+    """Create an arrival profile by name.
+
+    Args:
+        profile: One of ``constant``, ``ramp``, ``poisson`` or ``step``
+        **kwargs: Arguments for the profile class
+
+    Returns:
+        The arrival profile
+    """
+    try:
+        profile_class = ARRIVAL_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown arrival profile: {profile} "
+            f"(expected one of {', '.join(ARRIVAL_PROFILES)})"
+        ) from None
+    return profile_class(**kwargs)
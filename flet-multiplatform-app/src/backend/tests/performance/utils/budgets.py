@@ -0,0 +1,270 @@
+"""
+Per-endpoint performance budgets.
+
+Budgets live in one JSON file, ``tests/performance/config/budgets.json``
+(``PERF_BUDGETS`` overrides the path). The pytest perf suites, the Locust
+runs, ``scripts/performance_alert.py`` and ``tests/performance/config.py``
+all read it, so a budget is tightened in one place::
+
+    {
+      "defaults": {"p95_ms": 1000, "error_rate": 0.05, "min_rps": 10},
+      "scenarios": {
+        "db_read": {
+          "defaults": {"error_rate": 0.01},
+          "endpoints": {"GET /api/v1/users/*": {"p99_ms": 500}}
+        }
+      }
+    }
+
+A budget is resolved from the top-level defaults, then the scenario's
+defaults, then every endpoint entry whose ``"METHOD /path"`` pattern
+(``fnmatch`` syntax) matches, in file order, so later entries override
+earlier ones. A scenario with ``"extends": "<scenario>"`` starts from that
+scenario's defaults and endpoints. Latencies are in milliseconds,
+``error_rate`` is a fraction, ``min_rps`` is a lower bound and everything
+else an upper bound. Other keys of a scenario, such as ``"note"``, are
+ignored.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+DEFAULT_BUDGETS_PATH = Path(
+    os.getenv(
+        "PERF_BUDGETS",
+        Path(__file__).resolve().parents[5]
+        / "tests"
+        / "performance"
+        / "config"
+        / "budgets.json",
+    )
+)
+
+# Budget metrics in display order
+BUDGET_METRICS = (
+    "p50_ms",
+    "p90_ms",
+    "p95_ms",
+    "p99_ms",
+    "max_ms",
+    "error_rate",
+    "min_rps",
+    "max_rss_mb",
+    "rss_growth_mb",
+    "rss_growth_mb_per_hour",
+    "cpu_ms_per_request",
+)
+
+# Metrics that must stay at or above their budget
+LOWER_BOUNDS = {"min_rps"}
+
+
+@dataclass
+class BudgetCheck:
+    """One metric compared with its budget."""
+
+    scenario: str
+    endpoint: str  # "METHOD /path", or "*" for a whole run
+    metric: str
+    budget: float
+    actual: Optional[float]
+
+    @property
+    def passed(self) -> bool:
+        if self.actual is None:
+            return True
+        if self.metric in LOWER_BOUNDS:
+            return self.actual >= self.budget
+        return self.actual <= self.budget
+
+    def describe(self) -> str:
+        bound = ">=" if self.metric in LOWER_BOUNDS else "<="
+        return (
+            f"{self.scenario} {self.endpoint}: {self.metric} = {_format(self.actual)} "
+            f"(budget {bound} {_format(self.budget)})"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "passed": self.passed}
+
+
+def _format(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.4f}" if abs(value) < 1 else f"{value:.1f}"
+
+
+class Budgets:
+    """Budgets loaded from the budgets file."""
+
+    def __init__(self, data: Dict[str, Any], path: Optional[Path] = None):
+        self.data = data
+        self.path = path
+
+    @classmethod
+    def load(cls, path: Union[str, Path, None] = None) -> "Budgets":
+        path = Path(path) if path else DEFAULT_BUDGETS_PATH
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), path)
+
+    def scenarios(self) -> List[str]:
+        return list(self.data.get("scenarios", {}))
+
+    def budget_for(
+        self,
+        scenario: str,
+        method: Optional[str] = None,
+        endpoint: Optional[str] = None,
+    ) -> Dict[str, float]:
+        """Resolve the budget of an endpoint (or of a whole run if none is given)."""
+        # The scenario and the scenarios it extends, most general first
+        scenarios = self.data.get("scenarios", {})
+        chain: List[Dict[str, Any]] = []
+        name: Optional[str] = scenario
+        while name in scenarios and all(data is not scenarios[name] for data in chain):
+            chain.insert(0, scenarios[name])
+            name = scenarios[name].get("extends")
+
+        budget = dict(self.data.get("defaults", {}))
+        for data in chain:
+            budget.update(data.get("defaults", {}))
+        if endpoint is not None:
+            key = f"{(method or 'GET').upper()} {endpoint}"
+            for data in chain:
+                for pattern, overrides in data.get("endpoints", {}).items():
+                    if fnmatchcase(key, pattern):
+                        budget.update(overrides)
+        return {
+            metric: budget[metric]
+            for metric in BUDGET_METRICS
+            if budget.get(metric) is not None
+        }
+
+    def check(
+        self,
+        actual: Dict[str, Optional[float]],
+        scenario: str,
+        method: Optional[str] = None,
+        endpoint: Optional[str] = None,
+    ) -> List[BudgetCheck]:
+        """Compare measured metrics with the budget; unmeasured metrics are skipped."""
+        label = (
+            f"{(method or 'GET').upper()} {endpoint}" if endpoint is not None else "*"
+        )
+        return [
+            BudgetCheck(scenario, label, metric, budget, actual[metric])
+            for metric, budget in self.budget_for(scenario, method, endpoint).items()
+            if actual.get(metric) is not None
+        ]
+
+
+def load_budgets(path: Union[str, Path, None] = None) -> Budgets:
+    """Load the budgets file (``PERF_BUDGETS`` or the default location)."""
+    return Budgets.load(path)
+
+
+def load_test_actuals(
+    summary: Dict[str, Any],
+    duration: Optional[float] = None,
+    rss_mb: Optional[float] = None,
+) -> Dict[str, Optional[float]]:
+    """Budget metrics from a ``LoadGenerator`` summary (latencies in seconds).
+
+    Args:
+        summary: Result of ``run_load_test`` or ``run_open_loop_test``
+        duration: Run length in seconds, if the summary has no request rate
+        rss_mb: Resident memory of the server at the end of the run
+    """
+    times = summary.get("response_times") or {}
+    total = summary.get("total_requests") or 0
+    rps = summary.get("requests_per_second", summary.get("achieved_rps"))
+    if rps is None and duration:
+        rps = total / duration
+
+    def ms(key: str) -> Optional[float]:
+        return times[key] * 1000 if total and times.get(key) is not None else None
+
+    return {
+        "p50_ms": ms("median"),
+        "p90_ms": ms("p90"),
+        "p95_ms": ms("p95"),
+        "p99_ms": ms("p99"),
+        "max_ms": ms("max"),
+        "error_rate": 1 - summary["success_rate"] if total else None,
+        "min_rps": rps,
+        "max_rss_mb": rss_mb,
+    }
+
+
+def locust_actuals(entry: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Budget metrics from one Locust stats entry (milliseconds already).
+
+    Accepts the dicts of Locust's JSON stats (``response_time_percentile_95``,
+    ``fail_ratio``, ``total_rps``, ...) as well as ``StatsEntry`` attributes
+    converted with ``locust_entry_dict``.
+    """
+    requests = entry.get("num_requests", 0)
+
+    def value(key: str) -> Optional[float]:
+        return entry.get(key) if requests else None
+
+    error_rate = entry.get("fail_ratio")
+    if error_rate is None and requests:
+        error_rate = entry.get("num_failures", 0) / requests
+    return {
+        "p50_ms": value("response_time_percentile_50") or value("median_response_time"),
+        "p90_ms": value("response_time_percentile_90"),
+        "p95_ms": value("response_time_percentile_95"),
+        "p99_ms": value("response_time_percentile_99"),
+        "max_ms": value("max_response_time"),
+        "error_rate": error_rate,
+        "min_rps": value("total_rps"),
+        "max_rss_mb": None,
+    }
+
+
+def locust_entry_dict(entry: Any) -> Dict[str, Any]:
+    """Convert a Locust ``StatsEntry`` into the dict read by ``locust_actuals``."""
+    return {
+        "name": entry.name,
+        "method": entry.method,
+        "num_requests": entry.num_requests,
+        "num_failures": entry.num_failures,
+        "fail_ratio": entry.fail_ratio,
+        "max_response_time": entry.max_response_time,
+        "total_rps": entry.total_rps,
+        **{
+            f"response_time_percentile_{p}": entry.get_response_time_percentile(p / 100)
+            for p in (50, 90, 95, 99)
+        },
+    }
+
+
+def format_budget_table(checks: List[BudgetCheck], title: Optional[str] = None) -> str:
+    """Render budget checks as a plain-text budget-vs-actual table."""
+    rows = [("scenario", "endpoint", "metric", "budget", "actual", "status")]
+    for check in checks:
+        bound = ">=" if check.metric in LOWER_BOUNDS else "<="
+        rows.append(
+            (
+                check.scenario,
+                check.endpoint,
+                check.metric,
+                f"{bound} {_format(check.budget)}",
+                _format(check.actual),
+                "ok" if check.passed else "OVER",
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = [title] if title else []
+    for index, row in enumerate(rows):
+        lines.append(
+            "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        )
+        if index == 0:
+            lines.append("  ".join("-" * width for width in widths))
+    return "\n".join(lines)
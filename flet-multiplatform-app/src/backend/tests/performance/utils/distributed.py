@@ -0,0 +1,482 @@
+"""
+Multi-process load generation.
+
+A single asyncio process tops out at a few thousand requests per second, and
+once it is CPU-bound the latencies it reports include its own scheduling
+delays. ``DistributedLoadGenerator`` spreads a run over several local worker
+processes, each running its own ``LoadGenerator``:
+
+- closed-loop runs split the request count and concurrency between workers;
+- open-loop runs give each worker an interleaved share of the arrival
+  schedule (see ``PartitionedProfile``), so together they send exactly the
+  requests the profile describes.
+
+Workers stream a histogram snapshot every ``snapshot_interval`` seconds over
+a pipe, together with their own CPU usage and event-loop lag. The
+coordinator merges the snapshots into one result with a per-interval
+timeline and flags workers that were saturated, since their numbers measure
+the generator rather than the server.
+
+Callables passed as ``params`` or ``json_data`` are sent to the workers and
+must therefore be picklable (module-level functions, not lambdas).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+import traceback
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import psutil
+
+from .arrival import ArrivalProfile, partition_profile
+from .histogram import LatencyHistogram, ResultAggregator
+
+
+class _GlobalIndex:
+    """Map a worker's local request index back to the run-wide index."""
+
+    def __init__(self, func: Callable, start: int, step: int):
+        self.func = func
+        self.start = start
+        self.step = step
+
+    def __call__(self, index: int) -> Any:
+        return self.func(self.start + index * self.step)
+
+
+def _with_global_index(value: Any, start: int, step: int) -> Any:
+    return _GlobalIndex(value, start, step) if callable(value) else value
+
+
+def _snapshot(
+    aggregator: ResultAggregator,
+    process: psutil.Process,
+    sequence: int,
+    loop_lag: float,
+    duration: float,
+) -> Dict[str, Any]:
+    return {
+        "sequence": sequence,
+        "time": time.time(),
+        "duration": duration,
+        "cpu_percent": process.cpu_percent(None),
+        "loop_lag": loop_lag,
+        "histograms": aggregator.drain(),
+    }
+
+
+async def _run_worker(
+    conn: Connection, worker_id: int, spec: Dict[str, Any]
+) -> Dict[str, Any]:
+    # Imported here because the package imports this module
+    from . import LoadGenerator
+
+    process = psutil.Process()
+    process.cpu_percent(None)
+    aggregator = ResultAggregator()
+    interval = spec["snapshot_interval"]
+    sequence = 0
+    max_loop_lag = 0.0
+    last_snapshot = time.perf_counter()
+
+    def send_snapshot(loop_lag: float) -> None:
+        nonlocal sequence, last_snapshot
+        now = time.perf_counter()
+        snapshot = _snapshot(
+            aggregator, process, sequence, loop_lag, now - last_snapshot
+        )
+        conn.send(("snapshot", worker_id, snapshot))
+        sequence += 1
+        last_snapshot = now
+
+    async def report():
+        nonlocal max_loop_lag
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            # How late the sleep returned: time the loop was too busy to run us
+            loop_lag = max(time.perf_counter() - start - interval, 0.0)
+            max_loop_lag = max(max_loop_lag, loop_lag)
+            send_snapshot(loop_lag)
+
+    async with LoadGenerator(
+        spec["base_url"], max_workers=spec["max_workers"], timeout=spec["timeout"]
+    ) as loader:
+        start = last_snapshot = time.perf_counter()
+        reporter = asyncio.ensure_future(report())
+        try:
+            if spec["mode"] == "open":
+                summary = await loader.run_open_loop_test(
+                    spec["method"],
+                    spec["endpoint"],
+                    spec["profile"],
+                    params=spec["params"],
+                    json_data=spec["json_data"],
+                    headers=spec["headers"],
+                    progress=False,
+                    aggregator=aggregator,
+                )
+            else:
+                summary = await loader.run_load_test(
+                    spec["method"],
+                    spec["endpoint"],
+                    spec["num_requests"],
+                    params=spec["params"],
+                    json_data=spec["json_data"],
+                    headers=spec["headers"],
+                    progress=False,
+                    aggregator=aggregator,
+                )
+        finally:
+            reporter.cancel()
+        elapsed = time.perf_counter() - start
+
+    # Whatever arrived since the last periodic snapshot
+    send_snapshot(0.0)
+    return {
+        "pid": os.getpid(),
+        "elapsed": elapsed,
+        "max_loop_lag": max_loop_lag,
+        "offered_rps": summary.get("offered_rps"),
+        "achieved_rps": summary.get("achieved_rps"),
+        "max_schedule_lag": summary.get("max_schedule_lag"),
+    }
+
+
+def _worker_main(conn: Connection, worker_id: int, spec: Dict[str, Any]) -> None:
+    """Entry point of a worker process."""
+    try:
+        conn.send(("ready", worker_id, None))
+        # Wait for the coordinator so all workers start their schedules together
+        conn.recv()
+        result = asyncio.run(_run_worker(conn, worker_id, spec))
+        conn.send(("done", worker_id, result))
+    except BaseException:
+        conn.send(("error", worker_id, traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def detect_saturation(
+    worker_stats: List[Dict[str, Any]],
+    cpu_threshold: float = 90.0,
+    lag_threshold: float = 0.05,
+) -> List[str]:
+    """Return warnings for workers whose own CPU or scheduling limited the run.
+
+    A worker is considered saturated when its average CPU usage reaches
+    ``cpu_threshold`` percent of one core, or when its event loop or arrival
+    schedule fell behind by more than ``lag_threshold`` seconds.
+
+    Args:
+        worker_stats: Per-worker statistics from ``DistributedLoadGenerator``
+        cpu_threshold: Average CPU percentage considered saturated
+        lag_threshold: Loop or schedule lag in seconds considered saturated
+
+    Returns:
+        One message per problem found (empty if the generator kept up)
+    """
+    warnings = []
+    for stats in worker_stats:
+        worker = f"Load generator worker {stats['worker']}"
+        if stats["avg_cpu_percent"] >= cpu_threshold:
+            warnings.append(
+                f"{worker} averaged {stats['avg_cpu_percent']:.0f}% CPU "
+                f"(threshold {cpu_threshold:.0f}%)"
+            )
+        if stats["max_loop_lag"] > lag_threshold:
+            lag_ms = stats["max_loop_lag"] * 1000
+            warnings.append(f"{worker} event loop lagged by up to {lag_ms:.0f}ms")
+        schedule_lag = stats.get("max_schedule_lag")
+        if schedule_lag is not None and schedule_lag > lag_threshold:
+            warnings.append(
+                f"{worker} fell {schedule_lag * 1000:.0f}ms behind its arrival schedule"
+            )
+    return warnings
+
+
+class DistributedLoadGenerator:
+    """Run a load test across several local worker processes.
+
+    Example:
+        loader = DistributedLoadGenerator(server.base_url, workers=4)
+        results = await loader.run_open_loop_test(
+            "GET", "/health", ConstantRate(rate=2000, duration=30)
+        )
+        assert not results["generator_saturated"], results["warnings"]
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        workers: Optional[int] = None,
+        max_workers: int = 100,
+        timeout: int = 30,
+        snapshot_interval: float = 1.0,
+        cpu_saturation_threshold: float = 90.0,
+        lag_threshold: float = 0.05,
+    ):
+        """Initialize the coordinator.
+
+        Args:
+            base_url: Base URL of the API to test (HTTP only; in-process ASGI
+                apps cannot be shared between processes)
+            workers: Number of worker processes (defaults to the CPU count)
+            max_workers: Total concurrency, split between the processes
+            timeout: Request timeout in seconds
+            snapshot_interval: Seconds between histogram snapshots
+            cpu_saturation_threshold: Worker CPU percentage flagged as saturated
+            lag_threshold: Worker loop/schedule lag in seconds flagged as saturated
+        """
+        self.base_url = base_url.rstrip("/")
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.snapshot_interval = snapshot_interval
+        self.cpu_saturation_threshold = cpu_saturation_threshold
+        self.lag_threshold = lag_threshold
+
+    def _base_spec(self, worker_count: int, index: int) -> Dict[str, Any]:
+        concurrency = self.max_workers // worker_count
+        if index < self.max_workers % worker_count:
+            concurrency += 1
+        return {
+            "base_url": self.base_url,
+            "max_workers": max(concurrency, 1),
+            "timeout": self.timeout,
+            "snapshot_interval": self.snapshot_interval,
+        }
+
+    async def run_load_test(
+        self,
+        method: str,
+        endpoint: str,
+        num_requests: int,
+        params: Optional[Union[Dict, Callable]] = None,
+        json_data: Optional[Union[Dict, Callable]] = None,
+        headers: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Run a closed-loop test, splitting requests and concurrency between workers.
+
+        Returns:
+            Merged results (see ``LoadGenerator.run_load_test``) plus
+            ``intervals``, ``worker_stats``, ``generator_saturated`` and
+            ``warnings``
+        """
+        worker_count = max(1, min(self.workers, num_requests))
+        specs = []
+        start = 0
+        for index in range(worker_count):
+            count = num_requests // worker_count + (index < num_requests % worker_count)
+            specs.append(
+                {
+                    **self._base_spec(worker_count, index),
+                    "mode": "closed",
+                    "method": method,
+                    "endpoint": endpoint,
+                    "num_requests": count,
+                    "params": _with_global_index(params, start, 1),
+                    "json_data": _with_global_index(json_data, start, 1),
+                    "headers": headers,
+                }
+            )
+            start += count
+
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, self._run, specs)
+        results["mode"] = "closed"
+        return results
+
+    async def run_open_loop_test(
+        self,
+        method: str,
+        endpoint: str,
+        profile: ArrivalProfile,
+        params: Optional[Union[Dict, Callable]] = None,
+        json_data: Optional[Union[Dict, Callable]] = None,
+        headers: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Run an open-loop test with the arrival schedule shared between workers.
+
+        Returns:
+            Merged results (see ``LoadGenerator.run_open_loop_test``) plus
+            ``intervals``, ``worker_stats``, ``generator_saturated`` and
+            ``warnings``
+        """
+        worker_count = self.workers
+        specs = [
+            {
+                **self._base_spec(worker_count, index),
+                "mode": "open",
+                "method": method,
+                "endpoint": endpoint,
+                "profile": part,
+                "params": _with_global_index(params, index, worker_count),
+                "json_data": _with_global_index(json_data, index, worker_count),
+                "headers": headers,
+            }
+            for index, part in enumerate(partition_profile(profile, worker_count))
+        ]
+
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, self._run, specs)
+        stats = results["worker_stats"]
+        results.update(
+            {
+                "mode": "open",
+                "arrival": profile.to_dict(),
+                "offered_rps": sum(s["offered_rps"] or 0 for s in stats),
+                "achieved_rps": sum(s["achieved_rps"] or 0 for s in stats),
+                "max_schedule_lag": max(s["max_schedule_lag"] or 0 for s in stats),
+            }
+        )
+        return results
+
+    def _run(self, specs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Start the workers, collect their snapshots and merge them."""
+        # spawn avoids forking the coordinator's event loop and open sockets
+        context = multiprocessing.get_context("spawn")
+        connections: Dict[Connection, int] = {}
+        processes = []
+        for worker_id, spec in enumerate(specs):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_worker_main, args=(child_conn, worker_id, spec), daemon=True
+            )
+            process.start()
+            child_conn.close()
+            connections[parent_conn] = worker_id
+            processes.append(process)
+
+        snapshots: List[Dict[str, Any]] = []
+        done: Dict[int, Dict[str, Any]] = {}
+        started = False
+        ready = set()
+        pending = dict(connections)
+        start = time.perf_counter()
+        try:
+            while pending:
+                for conn in wait(list(pending), timeout=1.0):
+                    try:
+                        kind, worker_id, payload = conn.recv()
+                    except EOFError:
+                        raise RuntimeError(
+                            f"Load generator worker {pending[conn]} exited unexpectedly"
+                        ) from None
+                    if kind == "ready":
+                        ready.add(worker_id)
+                    elif kind == "snapshot":
+                        snapshots.append({"worker": worker_id, **payload})
+                    elif kind == "done":
+                        done[worker_id] = payload
+                        del pending[conn]
+                    elif kind == "error":
+                        raise RuntimeError(
+                            f"Load generator worker {worker_id} failed:\n{payload}"
+                        )
+                if not started and len(ready) == len(specs):
+                    start = time.perf_counter()
+                    for conn in connections:
+                        conn.send("start")
+                    started = True
+        finally:
+            for process in processes:
+                # Don't wait for the rest of a run that has already failed
+                process.join(timeout=0 if pending else 5)
+                if process.is_alive():
+                    process.terminate()
+            for conn in connections:
+                conn.close()
+        elapsed = time.perf_counter() - start
+
+        return self._merge(snapshots, done, elapsed)
+
+    def _merge(
+        self,
+        snapshots: List[Dict[str, Any]],
+        done: Dict[int, Dict[str, Any]],
+        elapsed: float,
+    ) -> Dict[str, Any]:
+        total = ResultAggregator()
+        intervals: Dict[int, ResultAggregator] = {}
+        interval_stats: Dict[int, Dict[str, List[float]]] = {}
+        interval_durations: Dict[int, float] = {}
+        worker_cpu: Dict[int, List[float]] = {worker_id: [] for worker_id in done}
+
+        for snapshot in snapshots:
+            part = ResultAggregator.from_dict(snapshot["histograms"])
+            total.merge(part)
+            sequence = snapshot["sequence"]
+            if sequence in intervals:
+                intervals[sequence].merge(part)
+            else:
+                intervals[sequence] = part
+            stats = interval_stats.setdefault(sequence, {"cpu": [], "lag": []})
+            stats["cpu"].append(snapshot["cpu_percent"])
+            stats["lag"].append(snapshot["loop_lag"])
+            worker_cpu[snapshot["worker"]].append(snapshot["cpu_percent"])
+            # The workers' snapshots of one interval cover the same stretch of
+            # time; the final one of each worker is usually shorter
+            interval_durations[sequence] = max(
+                interval_durations.get(sequence, 0.0), snapshot["duration"]
+            )
+
+        timeline = []
+        for sequence in sorted(intervals):
+            part = intervals[sequence]
+            histogram: LatencyHistogram = part.response_times
+            duration = interval_durations[sequence]
+            timeline.append(
+                {
+                    "interval": sequence,
+                    "requests": part.total_requests,
+                    "duration": duration,
+                    "requests_per_second": (
+                        part.total_requests / duration if duration > 0 else 0
+                    ),
+                    "success_rate": (
+                        part.successful_requests / part.total_requests
+                        if part.total_requests
+                        else 0
+                    ),
+                    "p50": histogram.percentile(50),
+                    "p95": histogram.percentile(95),
+                    "p99": histogram.percentile(99),
+                    "max_cpu_percent": max(interval_stats[sequence]["cpu"]),
+                    "max_loop_lag": max(interval_stats[sequence]["lag"]),
+                }
+            )
+
+        worker_stats = []
+        for worker_id in sorted(done):
+            cpu = worker_cpu[worker_id]
+            worker_stats.append(
+                {
+                    "worker": worker_id,
+                    **done[worker_id],
+                    "avg_cpu_percent": sum(cpu) / len(cpu) if cpu else 0.0,
+                    "max_cpu_percent": max(cpu, default=0.0),
+                }
+            )
+        warnings = detect_saturation(
+            worker_stats, self.cpu_saturation_threshold, self.lag_threshold
+        )
+
+        summary = total.summary()
+        summary.update(
+            {
+                "workers": len(done),
+                "elapsed": elapsed,
+                "requests_per_second": (
+                    total.total_requests / elapsed if elapsed > 0 else 0
+                ),
+                "intervals": timeline,
+                "worker_stats": worker_stats,
+                "generator_saturated": bool(warnings),
+                "warnings": warnings,
+            }
+        )
+        return summary
@@ -0,0 +1,315 @@
+"""
+Streaming latency aggregation for load tests.
+
+``LatencyHistogram`` is an HDR-style histogram: values are recorded as
+integer nanoseconds into log-linear buckets, so every recorded value is
+represented to within ``2 ** -significant_bits`` of its true value while
+memory depends only on the range of values seen, not on how many were
+recorded. Histograms with the same precision can be merged by adding their
+bucket counts, which lets workers aggregate independently and combine
+results afterwards.
+
+``ResultAggregator`` keeps one histogram per endpoint and status code plus
+the counters the load-test summary needs, so a million-request run uses the
+same memory as a hundred-request one.
+"""
+
+import math
+import random
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of non-negative durations in nanoseconds."""
+
+    def __init__(self, significant_bits: int = 7):
+        """Initialize an empty histogram.
+
+        Args:
+            significant_bits: Bits of precision kept per value. The default of
+                7 keeps values within 1/128 (about 0.8%) of their true value.
+        """
+        if not 1 <= significant_bits <= 16:
+            raise ValueError(f"significant_bits must be 1-16, got {significant_bits}")
+        self.significant_bits = significant_bits
+        self._sub_bucket_count = 1 << significant_bits
+        self._half_count = self._sub_bucket_count >> 1
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns: Optional[int] = None
+
+    def _index(self, value_ns: int) -> int:
+        if value_ns < self._sub_bucket_count:
+            return value_ns
+        shift = value_ns.bit_length() - self.significant_bits
+        return shift * self._half_count + (value_ns >> shift)
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Return the lowest and highest value that fall into a bucket."""
+        if index < self._sub_bucket_count:
+            return index, index
+        shift = index // self._half_count - 1
+        mantissa = index - shift * self._half_count
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record_ns(self, value_ns: int, count: int = 1) -> None:
+        """Record a duration in nanoseconds."""
+        value_ns = max(int(value_ns), 0)
+        index = self._index(value_ns)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total_ns += value_ns * count
+        if self.min_ns is None or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if self.max_ns is None or value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def record(self, seconds: float) -> None:
+        """Record a duration in seconds."""
+        self.record_ns(round(seconds * 1e9))
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add the counts of another histogram into this one."""
+        if other.significant_bits != self.significant_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        if other.min_ns is not None and (
+            self.min_ns is None or other.min_ns < self.min_ns
+        ):
+            self.min_ns = other.min_ns
+        if other.max_ns is not None and (
+            self.max_ns is None or other.max_ns > self.max_ns
+        ):
+            self.max_ns = other.max_ns
+        return self
+
+    def percentile_ns(self, percentile: float) -> int:
+        """Return the value at a percentile (0-100) in nanoseconds."""
+        if self.count == 0:
+            return 0
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self._bounds(index)
+                # Report the middle of the bucket, clamped to what was seen
+                value = (low + high) // 2
+                return min(max(value, self.min_ns), self.max_ns)
+        return self.max_ns
+
+    def percentile(self, percentile: float) -> float:
+        """Return the value at a percentile (0-100) in seconds."""
+        return self.percentile_ns(percentile) / 1e9
+
+    @property
+    def mean(self) -> float:
+        """Mean of the recorded values in seconds."""
+        return self.total_ns / self.count / 1e9 if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Return the statistics reported in load-test results, in seconds."""
+        return {
+            "min": (self.min_ns or 0) / 1e9,
+            "max": (self.max_ns or 0) / 1e9,
+            "avg": self.mean,
+            "median": self.percentile(50),
+            "p90": self.percentile(90),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the histogram (JSON- and pickle-friendly)."""
+        return {
+            "significant_bits": self.significant_bits,
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "counts": [[index, count] for index, count in sorted(self.counts.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram produced by ``to_dict``."""
+        histogram = cls(data["significant_bits"])
+        histogram.counts = {int(index): int(count) for index, count in data["counts"]}
+        histogram.count = data["count"]
+        histogram.total_ns = data["total_ns"]
+        histogram.min_ns = data["min_ns"]
+        histogram.max_ns = data["max_ns"]
+        return histogram
+
+    @classmethod
+    def merged(cls, histograms: Iterable["LatencyHistogram"]) -> "LatencyHistogram":
+        """Return a new histogram combining all of ``histograms``."""
+        result: Optional[LatencyHistogram] = None
+        for histogram in histograms:
+            if result is None:
+                result = cls(histogram.significant_bits)
+            result.merge(histogram)
+        return result if result is not None else cls()
+
+
+class ResultAggregator:
+    """Aggregate request results in constant memory.
+
+    Results are folded into histograms as they arrive instead of being kept,
+    so only up to ``sample_bodies`` response bodies (chosen by reservoir
+    sampling) and ``max_error_messages`` distinct error messages are retained.
+    """
+
+    def __init__(
+        self,
+        sample_bodies: int = 0,
+        max_error_messages: int = 100,
+        significant_bits: int = 7,
+        seed: Optional[int] = None,
+    ):
+        self.sample_bodies = sample_bodies
+        self.max_error_messages = max_error_messages
+        self.significant_bits = significant_bits
+        self.response_times = LatencyHistogram(significant_bits)
+        self.service_times = LatencyHistogram(significant_bits)
+        self.by_endpoint: Dict[str, LatencyHistogram] = {}
+        self.status_codes: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.total_requests = 0
+        self.successful_requests = 0
+        self.samples: List[Any] = []
+        self._rng = random.Random(seed)
+
+    def wants_body(self) -> bool:
+        """Whether the next result's body should be parsed and offered for sampling."""
+        if self.sample_bodies <= 0:
+            return False
+        if len(self.samples) < self.sample_bodies:
+            return True
+        # Reservoir sampling: keep the next result with probability k/n
+        return self._rng.randrange(self.total_requests + 1) < self.sample_bodies
+
+    def add(self, result: Dict[str, Any], method: str = "", endpoint: str = "") -> None:
+        """Fold one result from ``LoadGenerator.make_request`` into the aggregates."""
+        self.total_requests += 1
+        if result.get("success"):
+            self.successful_requests += 1
+        status = result.get("status_code")
+        self.status_codes[str(status)] += 1
+
+        response_ns = result.get("response_time_ns")
+        if response_ns is None:
+            response_ns = round(result.get("response_time", 0) * 1e9)
+        self.response_times.record_ns(response_ns)
+        service_ns = result.get("service_time_ns")
+        if service_ns is not None:
+            self.service_times.record_ns(service_ns)
+
+        key = f"{method} {endpoint} {status}".strip()
+        histogram = self.by_endpoint.get(key)
+        if histogram is None:
+            histogram = self.by_endpoint[key] = LatencyHistogram(self.significant_bits)
+        histogram.record_ns(response_ns)
+
+        error = result.get("error")
+        if error is not None and (
+            error in self.errors or len(self.errors) < self.max_error_messages
+        ):
+            self.errors[error] += 1
+
+        if result.get("data") is not None and self.sample_bodies > 0:
+            if len(self.samples) < self.sample_bodies:
+                self.samples.append(result["data"])
+            else:
+                self.samples[self._rng.randrange(self.sample_bodies)] = result["data"]
+
+    def drain(self) -> Dict[str, Any]:
+        """Return the mergeable state (``to_dict``) and start again from empty.
+
+        Used to send per-interval snapshots while a run is in progress.
+        """
+        snapshot = self.to_dict()
+        self.response_times = LatencyHistogram(self.significant_bits)
+        self.service_times = LatencyHistogram(self.significant_bits)
+        self.by_endpoint = {}
+        self.status_codes = Counter()
+        self.errors = Counter()
+        self.total_requests = 0
+        self.successful_requests = 0
+        return snapshot
+
+    def merge(self, other: "ResultAggregator") -> "ResultAggregator":
+        """Add another aggregator's results into this one."""
+        self.total_requests += other.total_requests
+        self.successful_requests += other.successful_requests
+        self.response_times.merge(other.response_times)
+        self.service_times.merge(other.service_times)
+        for key, histogram in other.by_endpoint.items():
+            if key in self.by_endpoint:
+                self.by_endpoint[key].merge(histogram)
+            else:
+                self.by_endpoint[key] = LatencyHistogram.from_dict(histogram.to_dict())
+        self.status_codes.update(other.status_codes)
+        self.errors.update(other.errors)
+        self.samples.extend(
+            other.samples[: max(self.sample_bodies - len(self.samples), 0)]
+        )
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the load-test summary computed from the aggregates."""
+        total = self.total_requests
+        summary = {
+            "total_requests": total,
+            "successful_requests": self.successful_requests,
+            "failed_requests": total - self.successful_requests,
+            "success_rate": self.successful_requests / total if total > 0 else 0,
+            "response_times": self.response_times.summary(),
+            "status_codes": dict(self.status_codes),
+            "errors": list(self.errors),
+            "endpoints": {
+                key: {"count": histogram.count, **histogram.summary()}
+                for key, histogram in sorted(self.by_endpoint.items())
+            },
+            "histograms": self.to_dict(),
+        }
+        if self.sample_bodies > 0:
+            summary["samples"] = list(self.samples)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the mergeable state (bodies and sampling state excluded)."""
+        return {
+            "total_requests": self.total_requests,
+            "successful_requests": self.successful_requests,
+            "response_times": self.response_times.to_dict(),
+            "service_times": self.service_times.to_dict(),
+            "by_endpoint": {
+                key: histogram.to_dict() for key, histogram in self.by_endpoint.items()
+            },
+            "status_codes": dict(self.status_codes),
+            "errors": dict(self.errors),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResultAggregator":
+        """Rebuild an aggregator from ``to_dict`` output or a summary's histograms."""
+        response_times = LatencyHistogram.from_dict(data["response_times"])
+        aggregator = cls(significant_bits=response_times.significant_bits)
+        aggregator.total_requests = data["total_requests"]
+        aggregator.successful_requests = data["successful_requests"]
+        aggregator.response_times = response_times
+        aggregator.service_times = LatencyHistogram.from_dict(data["service_times"])
+        aggregator.by_endpoint = {
+            key: LatencyHistogram.from_dict(histogram)
+            for key, histogram in data["by_endpoint"].items()
+        }
+        aggregator.status_codes = Counter(data["status_codes"])
+        aggregator.errors = Counter(data["errors"])
+        return aggregator
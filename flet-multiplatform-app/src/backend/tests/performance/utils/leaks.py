@@ -0,0 +1,253 @@
+"""
+Memory leak detection with tracemalloc.
+
+Process RSS grows for reasons other than leaks (allocator fragmentation,
+arenas that are never returned, caches filling up) and does not say where
+memory went. ``LeakDetector`` instead takes periodic ``tracemalloc``
+snapshots during sustained load, reduces each to the bytes held per
+allocation site (traceback), and fits a least-squares slope of each site's
+size against the number of requests served. A leak shows up as a site (or
+a total) that keeps growing with traffic, reported in bytes per 10k requests.
+Only running regression sums are kept per site, so the detector's own
+memory does not grow with the number of snapshots (it would otherwise show
+up in the RSS it is compared with).
+
+Snapshots taken during warm-up, while caches and pools are still filling,
+are left out of the fit.
+
+tracemalloc only sees allocations made by Python in this process, so this
+works for the in-process ASGI target only.
+
+Example:
+    detector = LeakDetector(warmup_requests=500)
+    detector.start()
+    ...
+    detector.snapshot(requests_served)
+    ...
+    report = detector.stop()
+    assert not report.exceeds(budget_bytes), report.format()
+"""
+
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Growth is reported per this many requests
+REQUESTS_UNIT = 10_000
+
+# Allocations made by the measurement itself, anywhere in their traceback
+_MEASUREMENT_FILES = (tracemalloc.__file__, __file__)
+
+# Allocations made by the import system
+_IMPORT_FILES = (
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+)
+
+
+def _slope(n: int, sum_x: float, sum_xx: float, sum_y: float, sum_xy: float) -> float:
+    """Least-squares slope from running sums (0 if x does not vary)."""
+    denominator = n * sum_xx - sum_x * sum_x
+    if n < 2 or denominator == 0:
+        return 0.0
+    return (n * sum_xy - sum_x * sum_y) / denominator
+
+
+@dataclass
+class LeakSite:
+    """An allocation site and how much it grew."""
+
+    traceback: List[str]
+    growth_per_10k: float  # bytes per 10k requests
+    first_size: int
+    last_size: int
+    last_count: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceback": self.traceback,
+            "growth_bytes_per_10k_requests": self.growth_per_10k,
+            "first_size_bytes": self.first_size,
+            "last_size_bytes": self.last_size,
+            "last_count": self.last_count,
+        }
+
+
+@dataclass
+class LeakReport:
+    """Growth of traced memory over the measured part of a run."""
+
+    requests: int  # Requests covered by the fit (after warm-up)
+    snapshots: int
+    growth_per_10k: float  # Total traced bytes per 10k requests
+    traced_bytes: List[Tuple[int, int]]  # (requests served, traced bytes) per snapshot
+    sites: List[LeakSite] = field(default_factory=list)  # Fastest growing first
+
+    def exceeds(self, budget_bytes_per_10k: float) -> bool:
+        """Whether traced memory grew faster than the budget."""
+        return self.snapshots >= 3 and self.growth_per_10k > budget_bytes_per_10k
+
+    def format(self, top: int = 5) -> str:
+        """Describe the total growth and the top growing allocation sites."""
+        lines = [
+            f"Traced memory grew {self.growth_per_10k / 1024:.1f} KiB per "
+            f"{REQUESTS_UNIT:,} requests ({self.snapshots} snapshots over "
+            f"{self.requests:,} requests)"
+        ]
+        for rank, site in enumerate(self.sites[:top], 1):
+            lines.append(
+                f"#{rank}: +{site.growth_per_10k / 1024:.1f} KiB/"
+                f"{REQUESTS_UNIT // 1000}k requests, "
+                f"{site.first_size / 1024:.1f} -> {site.last_size / 1024:.1f} KiB "
+                f"in {site.last_count} blocks"
+            )
+            lines.extend(f"    {line}" for line in site.traceback)
+        return "\n".join(lines)
+
+    def to_dict(self, top: int = 20) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "snapshots": self.snapshots,
+            "growth_bytes_per_10k_requests": self.growth_per_10k,
+            "traced_bytes": [list(point) for point in self.traced_bytes],
+            "top_sites": [site.to_dict() for site in self.sites[:top]],
+        }
+
+
+class _SiteSums:
+    """Running regression sums for one allocation site."""
+
+    __slots__ = (
+        "sum_y",
+        "sum_xy",
+        "first_size",
+        "last_size",
+        "last_count",
+        "last_seen",
+    )
+
+    def __init__(self, first_size: int):
+        self.sum_y = 0
+        self.sum_xy = 0
+        self.first_size = first_size
+        self.last_size = 0
+        self.last_count = 0
+        self.last_seen = -1
+
+
+class LeakDetector:
+    """Track per-site traced memory against requests served."""
+
+    def __init__(self, frames: int = 10, warmup_requests: int = 0):
+        """Create a detector.
+
+        Args:
+            frames: Traceback depth recorded per allocation. Tracing cost grows
+                with depth; a few frames are usually enough to find the caller.
+            warmup_requests: Snapshots taken before this many requests are not fitted
+        """
+        self.frames = frames
+        self.warmup_requests = warmup_requests
+        self._sites: Dict[tracemalloc.Traceback, _SiteSums] = {}
+        # Sums over snapshots of x (requests served), x^2, total y and x * total y
+        self._n = 0
+        self._sum_x = 0
+        self._sum_xx = 0
+        self._sum_total = 0
+        self._sum_x_total = 0
+        self._traced_bytes: List[Tuple[int, int]] = []
+        self._started = False
+
+    def start(self) -> None:
+        """Start tracing allocations (if tracemalloc is not already running)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+
+    def snapshot(self, requests: int) -> Optional[int]:
+        """Record traced memory per site after ``requests`` requests.
+
+        Returns:
+            Total traced bytes, or None during warm-up
+        """
+        if requests < self.warmup_requests:
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, path, all_frames=True)
+                for path in _MEASUREMENT_FILES
+            ]
+            + [tracemalloc.Filter(False, path) for path in _IMPORT_FILES]
+        )
+        index = self._n
+        total = 0
+        for stat in snapshot.statistics("traceback"):
+            sums = self._sites.get(stat.traceback)
+            if sums is None:
+                # Absent from earlier snapshots, which counts as size 0
+                sums = self._sites[stat.traceback] = _SiteSums(
+                    stat.size if index == 0 else 0
+                )
+            sums.sum_y += stat.size
+            sums.sum_xy += requests * stat.size
+            sums.last_size = stat.size
+            sums.last_count = stat.count
+            sums.last_seen = index
+            total += stat.size
+        # Drop the snapshot itself before the next one is taken
+        del snapshot
+
+        self._n += 1
+        self._sum_x += requests
+        self._sum_xx += requests * requests
+        self._sum_total += total
+        self._sum_x_total += requests * total
+        self._traced_bytes.append((requests, total))
+        return total
+
+    def stop(self) -> LeakReport:
+        """Stop tracing (if this detector started it) and fit the growth."""
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+        return self.report()
+
+    def report(self) -> LeakReport:
+        """Fit growth slopes over the snapshots taken so far."""
+        if not self._n:
+            return LeakReport(
+                requests=0, snapshots=0, growth_per_10k=0.0, traced_bytes=[]
+            )
+
+        n, sum_x, sum_xx = self._n, self._sum_x, self._sum_xx
+        growth = (
+            _slope(n, sum_x, sum_xx, self._sum_total, self._sum_x_total) * REQUESTS_UNIT
+        )
+
+        growing = []
+        for traceback, sums in self._sites.items():
+            site_growth = (
+                _slope(n, sum_x, sum_xx, sums.sum_y, sums.sum_xy) * REQUESTS_UNIT
+            )
+            if site_growth <= 0:
+                continue
+            present = sums.last_seen == n - 1
+            growing.append(
+                LeakSite(
+                    traceback=traceback.format(most_recent_first=True),
+                    growth_per_10k=site_growth,
+                    first_size=sums.first_size,
+                    last_size=sums.last_size if present else 0,
+                    last_count=sums.last_count if present else 0,
+                )
+            )
+        growing.sort(key=lambda site: site.growth_per_10k, reverse=True)
+
+        return LeakReport(
+            requests=self._traced_bytes[-1][0] - self._traced_bytes[0][0],
+            snapshots=n,
+            growth_per_10k=growth,
+            traced_bytes=list(self._traced_bytes),
+            sites=growing,
+        )
@@ -0,0 +1,336 @@
+"""
+Sampling profilers for performance scenarios.
+
+When a scenario slows down, a profile of the server taken during the run
+shows where the time went. Two samplers are provided, both cheap enough to
+leave on for a whole scenario:
+
+- ``ThreadSampler`` samples every thread of this process from a background
+  thread via ``sys._current_frames()``. It covers the in-process ASGI target,
+  where the app runs inside the test process.
+- ``PySpySampler`` attaches ``py-spy`` to another process by pid, for the
+  uvicorn target. py-spy reads the target's memory from outside, so the
+  server is not slowed by the profiler itself.
+
+Both produce a ``StackProfile`` (sample counts per call stack), which writes
+the usual exchange formats: collapsed stacks (``flamegraph.pl``/inferno
+input), a standalone flamegraph SVG and speedscope JSON.
+"""
+
+import html
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+Stack = Tuple[str, ...]  # Frame labels, outermost first
+
+# "function (path/to/file.py:line)", as written by py-spy and ThreadSampler
+_FRAME_LABEL = re.compile(r"^(?P<name>.*) \((?P<file>.*):(?P<line>\d+)\)$")
+
+
+class StackProfile:
+    """Sample counts per call stack."""
+
+    def __init__(self, interval: float, samples: Optional[Counter] = None):
+        """Create a profile.
+
+        Args:
+            interval: Seconds between samples, used to turn counts into time
+            samples: Initial ``{stack: count}`` counts
+        """
+        self.interval = interval
+        self.samples: Counter = samples if samples is not None else Counter()
+
+    def add(self, stack: Stack, count: int = 1) -> None:
+        self.samples[stack] += count
+
+    @property
+    def total(self) -> int:
+        return sum(self.samples.values())
+
+    @classmethod
+    def from_collapsed(cls, text: str, interval: float) -> "StackProfile":
+        """Parse collapsed stacks (``frame;frame;frame count`` per line)."""
+        profile = cls(interval)
+        for line in text.splitlines():
+            stack, _, count = line.rstrip().rpartition(" ")
+            if stack and count.isdigit():
+                profile.add(tuple(stack.split(";")), int(count))
+        return profile
+
+    def to_collapsed(self) -> str:
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in sorted(self.samples.items())
+        )
+
+    def to_speedscope(self, name: str) -> Dict:
+        """Return the profile in speedscope's sampled-profile file format."""
+        frames: List[Dict] = []
+        index: Dict[str, int] = {}
+        samples, weights = [], []
+        for stack, count in sorted(self.samples.items()):
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    match = _FRAME_LABEL.match(label)
+                    frames.append(
+                        {
+                            "name": match["name"],
+                            "file": match["file"],
+                            "line": int(match["line"]),
+                        }
+                        if match
+                        else {"name": label}
+                    )
+            samples.append([index[label] for label in stack])
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "backend performance tests",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.total * self.interval,
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def to_flamegraph_svg(
+        self, title: str, width: int = 1200, frame_height: int = 16
+    ) -> str:
+        """Render a flamegraph (callers below callees) as standalone SVG."""
+        # Merge stacks into a call tree: label -> [count, children]
+        root: Dict[str, list] = {}
+        depth = 0
+        for stack, count in self.samples.items():
+            depth = max(depth, len(stack))
+            children = root
+            for label in stack:
+                node = children.setdefault(label, [0, {}])
+                node[0] += count
+                children = node[1]
+
+        total = max(self.total, 1)
+        scale = (width - 20) / total
+        top = 40
+        height = top + (depth + 1) * frame_height + 10
+        base = height - 10 - frame_height
+
+        rects: List[str] = []
+
+        def draw(children: Dict[str, list], x: float, level: int) -> None:
+            for label, (count, grandchildren) in sorted(children.items()):
+                w = count * scale
+                if w >= 0.2:
+                    y = base - level * frame_height
+                    hue = zlib.crc32(label.encode()) % 55
+                    fill = f"rgb({205 + hue % 50},{80 + hue * 2},{40 + hue % 30})"
+                    name = html.escape(label)
+                    percent = 100 * count / total
+                    chars = int((w - 6) / 7)
+                    text = ""
+                    if chars >= 3:
+                        short = (
+                            label if len(label) <= chars else label[: chars - 2] + ".."
+                        )
+                        text = (
+                            f'<text x="{x + 3:.1f}" y="{y + frame_height - 4}">'
+                            f"{html.escape(short)}</text>"
+                        )
+                    rects.append(
+                        f"<g><title>{name} ({count} samples, {percent:.2f}%)</title>"
+                        f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" '
+                        f'height="{frame_height - 1}" '
+                        f'fill="{fill}" rx="2"/>{text}</g>'
+                    )
+                    draw(grandchildren, x, level + 1)
+                x += w
+
+        draw(root, 10.0, 0)
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" '
+            f'width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" font-family="monospace" font-size="12">'
+            f'<rect width="100%" height="100%" fill="#f8f8f8"/>'
+            f'<text x="{width / 2}" y="24" text-anchor="middle" font-size="16">'
+            f"{html.escape(title)} ({self.total} samples)</text>"
+            + "".join(rects)
+            + "</svg>\n"
+        )
+
+    def write(self, stem: Path, name: str) -> Dict[str, Path]:
+        """Write the collapsed stacks, flamegraph and speedscope files next to ``stem``.
+
+        The files are ``<stem>.collapsed.txt``, ``<stem>.flamegraph.svg`` and
+        ``<stem>.speedscope.json``.
+        """
+        paths = {
+            "collapsed": stem.with_name(f"{stem.name}.collapsed.txt"),
+            "flamegraph": stem.with_name(f"{stem.name}.flamegraph.svg"),
+            "speedscope": stem.with_name(f"{stem.name}.speedscope.json"),
+        }
+        paths["collapsed"].write_text(self.to_collapsed(), encoding="utf-8")
+        paths["flamegraph"].write_text(self.to_flamegraph_svg(name), encoding="utf-8")
+        with open(paths["speedscope"], "w", encoding="utf-8") as f:
+            json.dump(self.to_speedscope(name), f)
+        return paths
+
+
+# Directory prefixes stripped from frame file names, most specific first
+_PATH_PREFIXES = sorted(
+    {os.path.join(path, "") for path in sysconfig.get_paths().values() if path},
+    key=len,
+    reverse=True,
+)
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    # Keep paths short and stable: relative to site-packages, the stdlib or the cwd
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            filename = filename[len(prefix) :]
+            break
+    else:
+        try:
+            filename = os.path.relpath(filename)
+        except ValueError:
+            pass
+    # ";" separates frames in the collapsed format
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class ThreadSampler:
+    """Sample the stacks of every thread in this process."""
+
+    def __init__(self, interval: float = 0.01):
+        """Create a sampler.
+
+        Args:
+            interval: Seconds between samples (default 10 ms)
+        """
+        self.interval = interval
+        self.profile = StackProfile(interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._sample, name="perf-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> StackProfile:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.profile
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        labels: Dict[object, str] = {}
+        next_sample = time.perf_counter()
+        while not self._stop.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(f"thread ({names.get(ident, ident)})")
+                self.profile.add(tuple(reversed(stack)))
+            # Keep the rate steady regardless of how long sampling took
+            next_sample += self.interval
+            self._stop.wait(max(0.0, next_sample - time.perf_counter()))
+
+
+class PySpySampler:
+    """Sample another Python process with py-spy."""
+
+    def __init__(self, pid: int, interval: float = 0.01):
+        """Create a sampler.
+
+        Args:
+            pid: Process to profile
+            interval: Seconds between samples (default 10 ms)
+        """
+        self.pid = pid
+        self.interval = interval
+        # py-spy writes the file itself; only its name is needed here
+        fd, name = tempfile.mkstemp(prefix="perf-profile-", suffix=".txt")
+        os.close(fd)
+        self._output = Path(name)
+        self._process: Optional[subprocess.Popen] = None
+
+    @staticmethod
+    def available() -> bool:
+        return shutil.which("py-spy") is not None
+
+    def start(self) -> None:
+        self._process = subprocess.Popen(
+            [
+                "py-spy",
+                "record",
+                "--pid",
+                str(self.pid),
+                "--rate",
+                str(round(1 / self.interval)),
+                "--format",
+                "raw",
+                "--output",
+                str(self._output),
+                "--nonblocking",
+                "--threads",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+    def stop(self) -> StackProfile:
+        if self._process is None:
+            self._output.unlink(missing_ok=True)
+            return StackProfile(self.interval)
+        if self._process.poll() is None:
+            # py-spy writes its output on SIGINT
+            self._process.send_signal(signal.SIGINT)
+        try:
+            _, stderr = self._process.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            _, stderr = self._process.communicate()
+        try:
+            text = self._output.read_text(encoding="utf-8")
+        except OSError:
+            text = ""
+        finally:
+            self._output.unlink(missing_ok=True)
+        if not text and self._process.returncode:
+            raise RuntimeError(f"py-spy failed: {stderr.strip()}")
+        return StackProfile.from_collapsed(text, self.interval)
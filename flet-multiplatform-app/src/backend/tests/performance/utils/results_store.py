@@ -0,0 +1,674 @@
+"""
+Local store of historical performance results.
+
+Performance results are written in several formats by different tools:
+
+- ``test_results_<ts>.json`` and the append-only ``test_results_summary.csv``
+  from the Locust helpers in ``tests/performance/utils.py``;
+- ``<scenario>_report.json`` read by ``scripts/analyze_perf_results.py``;
+- ``<test_type>_results.json`` read by ``scripts/analyze_performance.py``;
+- ``<YYYYmmdd_HHMMSS>_<test>.json`` written by the pytest perf suites
+  (``PerformanceMetrics.save_results``).
+
+``ResultsStore`` ingests all of them into one SQLite database with a row per
+run (indexed by commit and scenario) and a row per numeric metric (indexed by
+metric and endpoint). Ingestion is incremental: files whose size and
+modification time are unchanged are skipped, and the CSV is read from where
+the previous ingest stopped, so reports only parse what is new.
+
+Latencies from the Locust and report formats are stored as
+``response_time_ms.<stat>``; perf-suite load results (in seconds) are
+converted to the same names. Other numeric values keep their dotted path.
+"""
+
+import ast
+import csv
+import json
+import os
+import re
+import sqlite3
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .stats import detect_change_points
+
+# Default database location, next to the results it indexes
+DEFAULT_DB_PATH = Path(os.getenv("PERF_RESULTS_DB", "results/performance/results.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    format TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    commit_sha TEXT,
+    started_at TEXT NOT NULL,
+    ingested_at TEXT NOT NULL,
+    document TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_runs_scenario_started ON runs (scenario, started_at);
+CREATE INDEX IF NOT EXISTS ix_runs_commit ON runs (commit_sha);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL DEFAULT '',
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, endpoint, metric)
+);
+CREATE INDEX IF NOT EXISTS ix_metrics_metric_endpoint ON metrics (metric, endpoint);
+CREATE INDEX IF NOT EXISTS ix_metrics_endpoint ON metrics (endpoint);
+
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    offset INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# File name patterns of the known result formats
+LOCUST_JSON = re.compile(r"^test_results_\d+\.json$")
+LOCUST_CSV = re.compile(r"^test_results_summary\.csv$")
+REPORT_JSON = re.compile(r"^(?P<scenario>.+)_report\.json$")
+RESULTS_JSON = re.compile(r"^(?P<scenario>.+)_results\.json$")
+PERF_SUITE_JSON = re.compile(r"^(?P<date>\d{8})_(?P<time>\d{6})_(?P<test>.+)\.json$")
+
+# Keys of LoadGenerator summaries that are not scalar metrics
+_SKIPPED_KEYS = {
+    "histograms",
+    "samples",
+    "intervals",
+    "worker_stats",
+    "arrival",
+    "errors",
+}
+
+Metric = Tuple[str, str, float]  # (endpoint, metric, value)
+
+
+def current_commit() -> Optional[str]:
+    """Return the commit being tested (``GITHUB_SHA`` or ``git rev-parse HEAD``)."""
+    commit = os.getenv("GITHUB_SHA") or os.getenv("GIT_COMMIT")
+    if commit:
+        return commit
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def _parse_time(value: Any) -> Optional[str]:
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value).isoformat()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+        except ValueError:
+            return None
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _flatten(data: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in data.items():
+        if key in _SKIPPED_KEYS:
+            continue
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{path}.")
+        else:
+            number = _number(value)
+            if number is not None:
+                yield path, number
+
+
+def _locust_metrics(data: Dict[str, Any]) -> List[Metric]:
+    """Metrics from a ``save_test_results`` record (JSON file or CSV row)."""
+    metrics: List[Metric] = []
+    for stat, value in (data.get("response_times") or {}).items():
+        if _number(value) is not None:
+            metrics.append(("", f"response_time_ms.{stat}", float(value)))
+    for source, target, scale in (
+        ("total_requests", "total_requests", 1),
+        ("total_failures", "failed_requests", 1),
+        # Saved as a percentage
+        ("error_rate", "error_rate", 0.01),
+        ("requests_per_second", "requests_per_second", 1),
+        ("test_duration_seconds", "duration_seconds", 1),
+    ):
+        value = _number(data.get(source))
+        if value is not None:
+            metrics.append(("", target, value * scale))
+    return metrics
+
+
+def _report_metrics(data: Dict[str, Any]) -> List[Metric]:
+    """Metrics from a ``<scenario>_report.json`` file."""
+    metrics: List[Metric] = []
+    for stat, value in (data.get("response_time") or {}).items():
+        if _number(value) is not None:
+            metrics.append(("", f"response_time_ms.{stat}", float(value)))
+    for source, target in (
+        ("total_requests", "total_requests"),
+        ("total_failures", "failed_requests"),
+        ("failure_rate", "error_rate"),
+        ("rps", "requests_per_second"),
+    ):
+        value = _number(data.get(source))
+        if value is not None:
+            metrics.append(("", target, value))
+    return metrics
+
+
+def _results_metrics(data: Dict[str, Any]) -> List[Metric]:
+    """Metrics from a ``<test_type>_results.json`` file."""
+    metrics: List[Metric] = []
+    for key, value in data.items():
+        number = _number(value)
+        if number is None:
+            continue
+        match = re.match(r"^(?P<stat>\w+?)_response_time$", key)
+        if match:
+            stat = {"avg": "avg", "median": "median"}.get(match["stat"], match["stat"])
+            metrics.append(("", f"response_time_ms.{stat}", number))
+        elif key == "total_rps":
+            metrics.append(("", "requests_per_second", number))
+        else:
+            metrics.append(("", key, number))
+    return metrics
+
+
+def _is_load_summary(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and isinstance(value.get("response_times"), dict)
+        and "total_requests" in value
+    )
+
+
+def _load_summary_metrics(name: str, summary: Dict[str, Any]) -> List[Metric]:
+    """Metrics from a ``LoadGenerator`` summary recorded by a perf suite."""
+    metrics: List[Metric] = []
+    prefix = f"{name}." if name else ""
+    for stat, value in summary["response_times"].items():
+        if _number(value) is not None:
+            metrics.append(("", f"{prefix}response_time_ms.{stat}", value * 1000))
+    for key in (
+        "total_requests",
+        "successful_requests",
+        "failed_requests",
+        "success_rate",
+        "requests_per_second",
+        "offered_rps",
+        "achieved_rps",
+    ):
+        value = _number(summary.get(key))
+        if value is not None:
+            metrics.append(("", f"{prefix}{key}", value))
+    for endpoint, stats in (summary.get("endpoints") or {}).items():
+        for stat, value in stats.items():
+            if _number(value) is None:
+                continue
+            if stat == "count":
+                metrics.append((endpoint, f"{prefix}requests", value))
+            else:
+                metrics.append(
+                    (endpoint, f"{prefix}response_time_ms.{stat}", value * 1000)
+                )
+    return metrics
+
+
+def _perf_suite_metrics(data: Dict[str, Any]) -> List[Metric]:
+    """Metrics from a ``PerformanceMetrics.save_results`` file."""
+    metrics: List[Metric] = []
+    duration = _number(data.get("duration_seconds"))
+    if duration is not None:
+        metrics.append(("", "duration_seconds", duration))
+    metrics.append(("", "errors", float(len(data.get("errors") or []))))
+
+    for name, value in (data.get("test_metrics") or {}).items():
+        if _is_load_summary(value):
+            metrics.extend(_load_summary_metrics(name, value))
+        elif isinstance(value, dict):
+            nested = False
+            for key, inner in value.items():
+                if _is_load_summary(inner):
+                    metrics.extend(_load_summary_metrics(f"{name}.{key}", inner))
+                    nested = True
+            if not nested:
+                metrics.extend(
+                    ("", path, number) for path, number in _flatten(value, f"{name}.")
+                )
+        else:
+            number = _number(value)
+            if number is not None:
+                metrics.append(("", name, number))
+
+    system = data.get("system_metrics") or []
+    for field in ("cpu_percent", "memory_rss_mb"):
+        samples = [s[field] for s in system if _number(s.get(field)) is not None]
+        if samples:
+            metrics.append(("", f"system.{field}.max", max(samples)))
+            metrics.append(("", f"system.{field}.avg", sum(samples) / len(samples)))
+    return metrics
+
+
+class ResultsStore:
+    """SQLite store of performance results with trend queries.
+
+    Example:
+        with ResultsStore() as store:
+            store.ingest_path("results/performance")
+            history = store.trend("response_time_ms.p95", scenario="load")
+            baseline = store.rolling_baseline("response_time_ms.p95", scenario="load")
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH):
+        """Open (and create if needed) the store.
+
+        Args:
+            path: SQLite database file, or ``":memory:"``
+        """
+        self.path = path
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # Ingestion
+
+    def add_run(
+        self,
+        run_key: str,
+        source: str,
+        format: str,
+        scenario: str,
+        started_at: str,
+        metrics: Iterable[Metric],
+        commit: Optional[str] = None,
+        document: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """Insert a run and its metrics; returns its id, or None if already stored."""
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO runs "
+            "(run_key, source, format, scenario, commit_sha, started_at, ingested_at, "
+            "document) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                run_key,
+                source,
+                format,
+                scenario,
+                commit,
+                started_at,
+                datetime.now().isoformat(),
+                json.dumps(document, default=str) if document is not None else None,
+            ),
+        )
+        if cursor.rowcount == 0:
+            return None
+        run_id = cursor.lastrowid
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO metrics (run_id, endpoint, metric, value) "
+            "VALUES (?, ?, ?, ?)",
+            [(run_id, endpoint, metric, value) for endpoint, metric, value in metrics],
+        )
+        return run_id
+
+    def ingest_path(
+        self,
+        path: Union[str, Path],
+        commit: Optional[str] = None,
+        patterns: Optional[List[str]] = None,
+    ) -> int:
+        """Ingest a result file, or every recognized file under a directory.
+
+        Args:
+            path: File or directory
+            commit: Commit to record for runs whose files do not name one
+            patterns: Glob patterns to limit which files in a directory are read
+
+        Returns:
+            Number of new runs stored
+        """
+        path = Path(path)
+        if path.is_file():
+            return self.ingest_file(path, commit)
+        files = set()
+        for pattern in patterns or ["*.json", "*.csv"]:
+            files.update(path.rglob(pattern))
+        return sum(self.ingest_file(file, commit) for file in sorted(files))
+
+    def ingest_file(self, path: Union[str, Path], commit: Optional[str] = None) -> int:
+        """Ingest one result file if it is new or has changed since the last ingest.
+
+        Returns:
+            Number of new runs stored
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        seen = self.connection.execute(
+            "SELECT size, mtime_ns, offset FROM ingested_files WHERE path = ?",
+            (str(path),),
+        ).fetchone()
+        if (
+            seen
+            and seen["size"] == stat.st_size
+            and seen["mtime_ns"] == stat.st_mtime_ns
+        ):
+            return 0
+
+        name = path.name
+        offset = 0
+        if LOCUST_CSV.match(name):
+            # Append-only: continue from the previous end unless it was rewritten
+            start = seen["offset"] if seen and seen["offset"] <= stat.st_size else 0
+            added, offset = self._ingest_locust_csv(path, start, commit)
+        elif name.endswith(".json"):
+            added = self._ingest_json(path, commit)
+        else:
+            added = 0
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO ingested_files (path, size, mtime_ns, offset) "
+                "VALUES (?, ?, ?, ?)",
+                (str(path), stat.st_size, stat.st_mtime_ns, offset),
+            )
+        return added
+
+    def _ingest_json(self, path: Path, commit: Optional[str]) -> int:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        if not isinstance(data, dict):
+            return 0
+
+        name = path.name
+        mtime = datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+        commit = data.get("commit") or commit
+        if LOCUST_JSON.match(name):
+            started_at = _parse_time(data.get("timestamp")) or mtime
+            run = ("locust", "locust", f"locust:{started_at}", _locust_metrics(data))
+        elif PERF_SUITE_JSON.match(name) and "test_metrics" in data:
+            match = PERF_SUITE_JSON.match(name)
+            started_at = (
+                _parse_time(data.get("timestamp"))
+                or datetime.strptime(
+                    match["date"] + match["time"], "%Y%m%d%H%M%S"
+                ).isoformat()
+            )
+            scenario = data.get("test_name") or match["test"]
+            run = ("perf_suite", scenario, f"file:{path}", _perf_suite_metrics(data))
+        elif REPORT_JSON.match(name):
+            scenario = data.get("scenario") or REPORT_JSON.match(name)["scenario"]
+            started_at = _parse_time(data.get("timestamp")) or mtime
+            run = (
+                "report",
+                scenario,
+                f"file:{path}:{started_at}",
+                _report_metrics(data),
+            )
+        elif RESULTS_JSON.match(name):
+            scenario = RESULTS_JSON.match(name)["scenario"]
+            started_at = _parse_time(data.get("timestamp")) or mtime
+            run = (
+                "results",
+                scenario,
+                f"file:{path}:{started_at}",
+                _results_metrics(data),
+            )
+        else:
+            return 0
+
+        format, scenario, run_key, metrics = run
+        with self.connection:
+            run_id = self.add_run(
+                run_key, str(path), format, scenario, started_at, metrics, commit, data
+            )
+        return 1 if run_id is not None else 0
+
+    def _ingest_locust_csv(
+        self, path: Path, start: int, commit: Optional[str]
+    ) -> Tuple[int, int]:
+        added = 0
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            header = next(csv.reader([f.readline()]), [])
+            f.seek(max(start, f.tell()))
+            lines = f.read()
+            offset = f.tell()
+
+        with self.connection:
+            for row in csv.DictReader(lines.splitlines(), fieldnames=header):
+                record: Dict[str, Any] = {}
+                for key, value in row.items():
+                    try:
+                        # Nested dicts are written with their repr
+                        record[key] = ast.literal_eval(value)
+                    except (ValueError, SyntaxError):
+                        record[key] = value
+                started_at = _parse_time(record.get("timestamp"))
+                if started_at is None:
+                    continue
+                # Same key as the run's JSON file, so each run is stored once
+                run_id = self.add_run(
+                    f"locust:{started_at}",
+                    str(path),
+                    "locust",
+                    "locust",
+                    started_at,
+                    _locust_metrics(record),
+                    commit,
+                    record,
+                )
+                added += run_id is not None
+        return added, offset
+
+    # Queries
+
+    def runs(
+        self,
+        scenario: Optional[str] = None,
+        format: Optional[str] = None,
+        commit: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+        source: Union[str, Path, None] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return stored runs in time order, with their original documents.
+
+        ``source`` limits the runs to those ingested from that file or from
+        files under that directory.
+        """
+        if source is not None:
+            source_path = Path(source).resolve()
+            source = (
+                f"{source_path}{os.sep}" if source_path.is_dir() else str(source_path)
+            )
+        clauses, params = self._filters(
+            scenario=scenario, format=format, commit=commit, since=since, source=source
+        )
+        query = f"SELECT * FROM runs r {clauses} ORDER BY r.started_at DESC, r.id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = [
+            {
+                **{key: row[key] for key in row.keys() if key != "document"},
+                "document": json.loads(row["document"]) if row["document"] else None,
+            }
+            for row in self.connection.execute(query, params)
+        ]
+        # Most recent ``limit`` runs, returned oldest first
+        return rows[::-1]
+
+    def scenarios(self) -> List[str]:
+        """Return the scenarios that have stored runs."""
+        return [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT DISTINCT scenario FROM runs ORDER BY 1"
+            )
+        ]
+
+    def run_metrics(self, run_id: int) -> Dict[str, Dict[str, float]]:
+        """Return ``{endpoint: {metric: value}}`` for one run."""
+        metrics: Dict[str, Dict[str, float]] = {}
+        for row in self.connection.execute(
+            "SELECT endpoint, metric, value FROM metrics WHERE run_id = ?", (run_id,)
+        ):
+            metrics.setdefault(row["endpoint"], {})[row["metric"]] = row["value"]
+        return metrics
+
+    def trend(
+        self,
+        metric: str,
+        scenario: Optional[str] = None,
+        endpoint: str = "",
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return a metric's values over time, oldest first.
+
+        Each point has ``run_id``, ``started_at``, ``commit_sha``, ``scenario``
+        and ``value``.
+        """
+        clauses, params = self._filters(scenario=scenario, since=since)
+        clauses = (
+            f"{clauses} {'AND' if clauses else 'WHERE'} m.metric = ? AND m.endpoint = ?"
+        )
+        params += [metric, endpoint]
+        query = (
+            "SELECT r.id AS run_id, r.started_at, r.commit_sha, r.scenario, m.value "
+            f"FROM metrics m JOIN runs r ON r.id = m.run_id {clauses} "
+            "ORDER BY r.started_at DESC, r.id DESC"
+        )
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = [dict(row) for row in self.connection.execute(query, params)]
+        return rows[::-1]
+
+    def rolling_baseline(
+        self,
+        metric: str,
+        scenario: Optional[str] = None,
+        endpoint: str = "",
+        window: int = 10,
+        before: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Summarize a metric over the last ``window`` runs before ``before``.
+
+        Returns:
+            ``n``, ``median``, ``mean``, ``stdev`` (0 for fewer than two runs),
+            ``values`` and the ``run_ids`` they came from
+        """
+        points = self.trend(metric, scenario, endpoint)
+        if before is not None:
+            points = [point for point in points if point["started_at"] < before]
+        points = points[-window:]
+        values = [point["value"] for point in points]
+        if not values:
+            return {
+                "n": 0,
+                "median": None,
+                "mean": None,
+                "stdev": None,
+                "values": [],
+                "run_ids": [],
+            }
+
+        ordered = sorted(values)
+        middle = len(ordered) // 2
+        median = (
+            ordered[middle]
+            if len(ordered) % 2
+            else (ordered[middle - 1] + ordered[middle]) / 2
+        )
+        mean = sum(values) / len(values)
+        stdev = (
+            (sum((v - mean) ** 2 for v in values) / (len(values) - 1)) ** 0.5
+            if len(values) > 1
+            else 0.0
+        )
+        return {
+            "n": len(values),
+            "median": median,
+            "mean": mean,
+            "stdev": stdev,
+            "values": values,
+            "run_ids": [point["run_id"] for point in points],
+        }
+
+    def change_points(
+        self,
+        metric: str,
+        scenario: Optional[str] = None,
+        endpoint: str = "",
+        min_size: int = 3,
+        alpha: float = 0.01,
+        min_change: float = 0.05,
+    ) -> List[Dict[str, Any]]:
+        """Find runs where a metric shifted to a new level.
+
+        See ``stats.detect_change_points``. Each change point also names the
+        first run after the change (``run_id``, ``started_at``, ``commit_sha``),
+        which is where to start looking for the cause.
+        """
+        points = self.trend(metric, scenario, endpoint)
+        changes = detect_change_points(
+            [point["value"] for point in points], min_size, alpha, min_change
+        )
+        for change in changes:
+            point = points[change["index"]]
+            change.update(
+                {
+                    "run_id": point["run_id"],
+                    "started_at": point["started_at"],
+                    "commit_sha": point["commit_sha"],
+                }
+            )
+        return changes
+
+    @staticmethod
+    def _filters(**filters: Optional[str]) -> Tuple[str, List[Any]]:
+        columns = {
+            "scenario": "r.scenario = ?",
+            "format": "r.format = ?",
+            "commit": "r.commit_sha LIKE ? || '%'",
+            "since": "r.started_at >= ?",
+            "source": "instr(r.source, ?) = 1",
+        }
+        clauses, params = [], []
+        for key, value in filters.items():
+            if value is not None:
+                clauses.append(columns[key])
+                params.append(value)
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
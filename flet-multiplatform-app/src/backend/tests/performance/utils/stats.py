@@ -0,0 +1,223 @@
+"""
+Statistical tests for comparing performance measurements.
+
+Benchmark and load-test timings are noisy and rarely normally distributed
+(they are bounded below and have long right tails), so comparisons use the
+rank-based Mann-Whitney U test when raw samples are available and bootstrap
+confidence intervals for the size of a change. Welch's t-test is provided
+for results that only kept summary statistics, and ``detect_change_points``
+finds level shifts in a metric's history.
+
+Implemented with the standard library only so that comparison scripts do
+not need scipy.
+"""
+
+import math
+import random
+import statistics
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+def _normal_sf(z: float) -> float:
+    """Survival function (1 - CDF) of the standard normal distribution."""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def mann_whitney_u(
+    baseline: Sequence[float], current: Sequence[float]
+) -> Tuple[float, float]:
+    """One-sided Mann-Whitney U test that ``current`` tends to be larger.
+
+    Uses the normal approximation with tie and continuity corrections, which
+    is accurate for the sample sizes benchmarks produce (more than ~10 each).
+
+    Args:
+        baseline: Baseline samples
+        current: Current samples
+
+    Returns:
+        ``(u, p_value)`` where ``u`` is the U statistic of ``current`` and a
+        small ``p_value`` means ``current`` is significantly larger (slower)
+    """
+    n1, n2 = len(baseline), len(current)
+    if n1 == 0 or n2 == 0:
+        raise ValueError("Both samples must be non-empty")
+
+    combined = sorted(
+        [(value, 0) for value in baseline] + [(value, 1) for value in current]
+    )
+    # Average ranks over ties
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = rank
+        ties = j - i + 1
+        tie_term += ties**3 - ties
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 1)
+    u = rank_sum - n2 * (n2 + 1) / 2
+    mean_u = n1 * n2 / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        # All values identical
+        return u, 0.5 if u == mean_u else (0.0 if u > mean_u else 1.0)
+    z = (u - mean_u - 0.5) / math.sqrt(variance)
+    return u, _normal_sf(z)
+
+
+def welch_t_test(
+    baseline_mean: float,
+    baseline_stddev: float,
+    baseline_n: int,
+    current_mean: float,
+    current_stddev: float,
+    current_n: int,
+) -> Tuple[float, float]:
+    """One-sided Welch's t-test from summary statistics.
+
+    The t distribution is approximated by the normal distribution, which
+    slightly overstates significance below ~30 samples per side.
+
+    Returns:
+        ``(t, p_value)``; a small ``p_value`` means the current mean is
+        significantly larger
+    """
+    if baseline_n < 2 or current_n < 2:
+        raise ValueError("Each side needs at least two samples")
+    standard_error = math.sqrt(
+        baseline_stddev**2 / baseline_n + current_stddev**2 / current_n
+    )
+    if standard_error == 0:
+        difference = current_mean - baseline_mean
+        return 0.0, 0.5 if difference == 0 else (0.0 if difference > 0 else 1.0)
+    t = (current_mean - baseline_mean) / standard_error
+    return t, _normal_sf(t)
+
+
+def relative_median_change(
+    baseline: Sequence[float], current: Sequence[float]
+) -> float:
+    """Relative change of the median, ``(current - baseline) / |baseline|``."""
+    base = statistics.median(baseline)
+    if base == 0:
+        return 0.0 if statistics.median(current) == 0 else math.inf
+    return (statistics.median(current) - base) / abs(base)
+
+
+def bootstrap_ci(
+    baseline: Sequence[float],
+    current: Sequence[float],
+    statistic: Callable[
+        [Sequence[float], Sequence[float]], float
+    ] = relative_median_change,
+    confidence: float = 0.95,
+    n_resamples: int = 2000,
+    seed: Optional[int] = None,
+) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval of a two-sample statistic.
+
+    Each side is resampled with replacement independently, so the interval
+    reflects the run-to-run spread of both.
+
+    Args:
+        baseline: Baseline samples
+        current: Current samples
+        statistic: Function of ``(baseline, current)``; defaults to the
+            relative change of the median
+        confidence: Confidence level of the interval
+        n_resamples: Number of bootstrap resamples
+        seed: Seed for reproducible intervals
+
+    Returns:
+        ``(low, high)`` bounds of the interval
+    """
+    if not baseline or not current:
+        raise ValueError("Both samples must be non-empty")
+    rng = random.Random(seed)
+    estimates = sorted(
+        statistic(
+            rng.choices(baseline, k=len(baseline)),
+            rng.choices(current, k=len(current)),
+        )
+        for _ in range(n_resamples)
+    )
+    tail = (1 - confidence) / 2
+    low = estimates[int(tail * (n_resamples - 1))]
+    high = estimates[int(math.ceil((1 - tail) * (n_resamples - 1)))]
+    return low, high
+
+
+def _sum_of_squares(values: Sequence[float]) -> float:
+    mean = sum(values) / len(values)
+    return sum((value - mean) ** 2 for value in values)
+
+
+def detect_change_points(
+    values: Sequence[float],
+    min_size: int = 3,
+    alpha: float = 0.01,
+    min_change: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """Find points where a series shifts to a new level (binary segmentation).
+
+    Each segment is split where the split best reduces the within-segment
+    sum of squares. The split is kept only if the two sides differ
+    significantly (two-sided Mann-Whitney U test at ``alpha``) and their
+    medians differ by more than ``min_change``; both sides are then searched
+    again.
+
+    Args:
+        values: Series in time order, e.g. a metric across consecutive runs
+        min_size: Smallest number of points on each side of a change
+        alpha: Significance level of the test at each split
+        min_change: Smallest relative change of the median to report
+
+    Returns:
+        Change points sorted by position, each with the ``index`` of the first
+        value after the change, the medians ``before`` and ``after`` (within
+        the enclosing segment), the relative ``change`` and the ``p_value``
+    """
+    found: List[Dict[str, Any]] = []
+
+    def search(start: int, end: int) -> None:
+        if end - start < 2 * min_size:
+            return
+        segment = values[start:end]
+        best_index, best_cost = None, _sum_of_squares(segment)
+        for split in range(min_size, len(segment) - min_size + 1):
+            cost = _sum_of_squares(segment[:split]) + _sum_of_squares(segment[split:])
+            if cost < best_cost:
+                best_index, best_cost = split, cost
+        if best_index is None:
+            return
+
+        before, after = segment[:best_index], segment[best_index:]
+        _, p_up = mann_whitney_u(before, after)
+        _, p_down = mann_whitney_u(after, before)
+        p_value = min(1.0, 2 * min(p_up, p_down))
+        change = relative_median_change(before, after)
+        if p_value >= alpha or abs(change) <= min_change:
+            return
+
+        found.append(
+            {
+                "index": start + best_index,
+                "before": statistics.median(before),
+                "after": statistics.median(after),
+                "change": change,
+                "p_value": p_value,
+            }
+        )
+        search(start, start + best_index)
+        search(start + best_index, end)
+
+    search(0, len(values))
+    return sorted(found, key=lambda point: point["index"])
@@ -0,0 +1,290 @@
+"""
+Transports and targets for ``LoadGenerator``.
+
+``LoadGenerator`` sends requests through a transport:
+
+- ``AiohttpTransport`` talks HTTP to a running server (a real deployment or a
+  ``UvicornServer`` subprocess), so results include network and server
+  overhead.
+- ``ASGITransport`` calls an ASGI app in the same process and event loop,
+  with no sockets involved, so results reflect application cost only and do
+  not need an external server.
+
+``UvicornServer`` starts ``backend.app:app`` (or another app) in a uvicorn
+subprocess on a free local port for runs that should include the HTTP stack.
+
+Apps are given as ``"module:attribute"`` or ``"path/to/file.py:attribute"``.
+The file form is needed for ``src/backend/app.py``, which the
+``src/backend/app/`` package shadows on import.
+"""
+
+import contextlib
+import importlib
+import importlib.util
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+import httpx
+
+
+class AiohttpTransport:
+    """Send requests over HTTP with an aiohttp session."""
+
+    def __init__(self, timeout: float = 30):
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def open(self) -> None:
+        """Create the aiohttp session."""
+        self.session = aiohttp.ClientSession(timeout=self.timeout)
+
+    async def close(self) -> None:
+        """Close the aiohttp session."""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        parse_body: bool = False,
+    ) -> Tuple[int, Any]:
+        """Send a request and return ``(status_code, body or None)``.
+
+        The body is parsed as JSON when ``parse_body`` is set, falling back to
+        text for non-JSON responses.
+        """
+        async with self.session.request(
+            method=method, url=url, params=params, json=json_data, headers=headers
+        ) as response:
+            if not parse_body:
+                await response.read()
+                return response.status, None
+            try:
+                return response.status, await response.json()
+            except (aiohttp.ContentTypeError, ValueError):
+                # Keep the status of non-JSON responses such as plain-text 500s
+                return response.status, await response.text()
+
+
+class ASGITransport:
+    """Call an ASGI app in-process through httpx's ASGI transport.
+
+    The app's lifespan handlers run when the transport is opened and closed,
+    as they would under a server.
+    """
+
+    def __init__(self, app: Any, timeout: float = 30, lifespan: bool = True):
+        self.app = app
+        self.timeout = timeout
+        self.lifespan = lifespan
+        self.client: Optional[httpx.AsyncClient] = None
+        self._stack: Optional[contextlib.AsyncExitStack] = None
+
+    async def open(self) -> None:
+        """Run the app's startup and create the client."""
+        # httpx logs every request at INFO, which would be measured as app time
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        self._stack = contextlib.AsyncExitStack()
+        router = getattr(self.app, "router", None)
+        if self.lifespan and hasattr(router, "lifespan_context"):
+            await self._stack.enter_async_context(router.lifespan_context(self.app))
+        self.client = await self._stack.enter_async_context(
+            httpx.AsyncClient(
+                # Unhandled app errors become 500 responses, as under a server
+                transport=httpx.ASGITransport(app=self.app, raise_app_exceptions=False),
+                timeout=self.timeout,
+            )
+        )
+
+    async def close(self) -> None:
+        """Close the client and run the app's shutdown."""
+        if self._stack is not None:
+            await self._stack.aclose()
+            self._stack = None
+            self.client = None
+
+    @property
+    def session(self) -> Optional[httpx.AsyncClient]:
+        return self.client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        parse_body: bool = False,
+    ) -> Tuple[int, Any]:
+        """Send a request and return ``(status_code, body or None)``.
+
+        The body is parsed as JSON when ``parse_body`` is set, falling back to
+        text for non-JSON responses.
+        """
+        response = await self.client.request(
+            method, url, params=params, json=json_data, headers=headers
+        )
+        if not parse_body:
+            return response.status_code, None
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, response.text
+
+
+def load_app(target: str) -> Any:
+    """Load an ASGI app from ``"module:attribute"`` or ``"file.py:attribute"``."""
+    location, _, attribute = target.rpartition(":")
+    if not location:
+        location, attribute = attribute, "app"
+    if location.endswith(".py"):
+        path = Path(location).resolve()
+        spec = importlib.util.spec_from_file_location(f"perf_app_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(location)
+    return getattr(module, attribute)
+
+
+# Runs uvicorn on an app loaded from a file path (uvicorn only accepts modules)
+_FILE_APP_LAUNCHER = """
+import importlib.util, sys, uvicorn
+path, attribute, host, port = sys.argv[1:5]
+spec = importlib.util.spec_from_file_location("perf_app", path)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+uvicorn.run(getattr(module, attribute), host=host, port=int(port), log_level="warning")
+"""
+
+
+def find_free_port(host: str = "127.0.0.1") -> int:
+    """Return a TCP port that is currently free on ``host``."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class UvicornServer:
+    """Run an ASGI app in a uvicorn subprocess for the duration of a test run.
+
+    Example:
+        with UvicornServer("backend.app:app", env={"DATABASE_URL": url}) as server:
+            async with LoadGenerator(server.base_url) as loader:
+                ...
+    """
+
+    def __init__(
+        self,
+        app: str = "backend.app:app",
+        host: str = "127.0.0.1",
+        port: Optional[int] = None,
+        workers: int = 1,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[Path] = None,
+        health_path: str = "/health",
+        startup_timeout: float = 30,
+    ):
+        self.app = app
+        self.host = host
+        self.port = port or find_free_port(host)
+        self.workers = workers
+        self.env = env or {}
+        self.cwd = cwd
+        self.health_path = health_path
+        self.startup_timeout = startup_timeout
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def pid(self) -> Optional[int]:
+        """PID of the server process (the uvicorn master when workers > 1)."""
+        return self.process.pid if self.process else None
+
+    def start(self) -> "UvicornServer":
+        """Start the server and wait until the health check responds."""
+        location, _, attribute = self.app.rpartition(":")
+        if location.endswith(".py"):
+            if self.workers != 1:
+                raise ValueError("Multiple workers need a module:attribute app")
+            command = [
+                sys.executable,
+                "-c",
+                _FILE_APP_LAUNCHER,
+                str(Path(location).resolve()),
+                attribute,
+                self.host,
+                str(self.port),
+            ]
+        else:
+            command = [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                self.app,
+                "--host",
+                self.host,
+                "--port",
+                str(self.port),
+                "--workers",
+                str(self.workers),
+                "--log-level",
+                "warning",
+            ]
+        self.process = subprocess.Popen(
+            command, cwd=self.cwd, env={**os.environ, **self.env}
+        )
+
+        deadline = time.monotonic() + self.startup_timeout
+        url = f"{self.base_url}{self.health_path}"
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(
+                    f"uvicorn exited with code {self.process.returncode} during startup"
+                )
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return self
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.1)
+
+        self.stop()
+        raise TimeoutError(f"Server did not become healthy at {url}")
+
+    def stop(self) -> None:
+        """Stop the server process."""
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+
+    def __enter__(self) -> "UvicornServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -7,21 +7,21 @@ def create_loading_skeleton() -> ft.Column:
             ft.Container(
                 height=20,
                 width=float("inf"),
-                bgcolor=ft.colors.GREY_300,
+                bgcolor=ft.Colors.GREY_300,
                 border_radius=4,
                 margin=ft.margin.only(bottom=8),
             ),
             ft.Container(
                 height=20,
                 width=float("inf"),
-                bgcolor=ft.colors.GREY_300,
+                bgcolor=ft.Colors.GREY_300,
                 border_radius=4,
                 margin=ft.margin.only(bottom=8),
             ),
             ft.Container(
                 height=20,
                 width=float("inf"),
-                bgcolor=ft.colors.GREY_300,
+                bgcolor=ft.Colors.GREY_300,
                 border_radius=4,
                 margin=ft.margin.only(bottom=8),
             ),
@@ -0,0 +1,292 @@
+"""大量のアイテムを表示するための仮想化リストを提供するモジュール。
+
+表示範囲（と前後の余白分）の行だけをコントロールとして構築し、スクロール時は
+行コントロールを再利用して内容だけを差し替えます。表示範囲の外はスペーサーの
+高さで表現するため、アイテム数が増えてもクライアントへ送信する量は一定です。
+データはページ単位で取得し、末尾に近づくと次のページを先読みします。
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import flet as ft
+
+from src.components.common.loading_skeleton import create_loading_skeleton
+from src.frontend.utils.update_scheduler import schedule_update
+
+logger = logging.getLogger(__name__)
+
+# (offset, limit) を受け取り、アイテムのリストを返す非同期関数
+FetchPage = Callable[[int, int], Awaitable[List[Any]]]
+
+
+def default_create_row() -> ft.Control:
+    """既定の行コントロールを作成する"""
+    return ft.ListTile(title=ft.Text(), subtitle=ft.Text())
+
+
+def default_bind_row(row: ft.Control, item: Dict[str, Any]) -> None:
+    """既定の行コントロールにアイテムの内容を設定する"""
+    row.title.value = item.get("title", "")
+    row.subtitle.value = item.get("description") or ""
+
+
+class VirtualList(ft.Column):
+    """表示中の行だけを構築する仮想化リスト。
+
+    行の高さは固定（item_extent）とし、スクロール位置から表示範囲を計算します。
+    アイテムはページ単位で保持し、表示範囲から離れたページは破棄できます。
+
+    Attributes:
+        first_index (int): 先頭の行コントロールが表示しているアイテムの位置
+        total (Optional[int]): アイテムの総数（不明な場合はNone）
+
+    Example:
+        ```python
+        item_list = VirtualList(fetch_page=api_client.get_items, item_extent=72)
+        page.add(item_list)  # 追加時に最初のページを取得する
+        ```
+    """
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        create_row: Callable[[], ft.Control] = default_create_row,
+        bind_row: Callable[[ft.Control, Any], None] = default_bind_row,
+        item_extent: float = 72,
+        viewport_height: float = 600,
+        page_size: int = 50,
+        overscan: int = 5,
+        prefetch_pages: int = 1,
+        max_pages: Optional[int] = None,
+        total: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """VirtualList インスタンスを初期化します。
+
+        Args:
+            fetch_page: ページ単位でアイテムを取得する非同期関数
+            create_row: 行コントロールを作成する関数（行数分だけ呼ばれる）
+            bind_row: 行コントロールにアイテムの内容を設定する関数
+            item_extent: 1行の高さ
+            viewport_height: 表示領域の高さ（スクロールイベントで更新される）
+            page_size: 1回に取得するアイテム数
+            overscan: 表示範囲の前後に余分に構築する行数
+            prefetch_pages: 表示範囲の先に先読みするページ数
+            max_pages: メモリに保持する最大ページ数（省略時は無制限）
+            total: アイテムの総数（分かっている場合）
+            **kwargs: ft.Column に渡す引数
+        """
+        kwargs.setdefault("scroll", ft.ScrollMode.AUTO)
+        kwargs.setdefault("on_scroll_interval", 50)
+        super().__init__(spacing=0, **kwargs)
+        self.on_scroll = self._on_scroll
+        self.fetch_page = fetch_page
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.item_extent = item_extent
+        self.viewport_height = viewport_height
+        self.page_size = page_size
+        self.overscan = overscan
+        self.prefetch_pages = prefetch_pages
+        self.max_pages = max_pages
+        self.total = total
+        self.first_index = 0
+
+        self._pages: Dict[int, List[Any]] = {}
+        self._loading: Dict[int, asyncio.Task] = {}
+        self._top = ft.Container(height=0)
+        self._bottom = ft.Container(height=0)
+        self._slots: List[ft.Container] = []
+        self._resize_slots()
+        self._layout()
+
+    @property
+    def item_count(self) -> int:
+        """スクロール範囲に含めるアイテム数
+
+        総数が不明な場合は、取得済みの範囲に次のページ分のプレースホルダーを加えます。
+        """
+        if self.total is not None:
+            return self.total
+        if not self._pages:
+            return self.page_size
+        return (max(self._pages) + 2) * self.page_size
+
+    @property
+    def slot_count(self) -> int:
+        """構築する行コントロールの数"""
+        visible = int(self.viewport_height // self.item_extent) + 1
+        return visible + self.overscan * 2
+
+    @property
+    def loaded_pages(self) -> List[int]:
+        """メモリに保持しているページ番号"""
+        return sorted(self._pages)
+
+    def item_at(self, index: int) -> Any:
+        """指定位置のアイテムを返す（未取得の場合はNone）"""
+        page = self._pages.get(index // self.page_size)
+        offset = index % self.page_size
+        if page is None or offset >= len(page):
+            return None
+        return page[offset]
+
+    def _resize_slots(self) -> None:
+        """表示領域の高さに合わせて行コントロールの数を調整する"""
+        while len(self._slots) < self.slot_count:
+            self._slots.append(
+                ft.Container(
+                    content=ft.Stack([self.create_row(), create_loading_skeleton()]),
+                    height=self.item_extent,
+                    clip_behavior=ft.ClipBehavior.HARD_EDGE,
+                    visible=False,
+                )
+            )
+        del self._slots[self.slot_count :]
+        self.controls = [self._top, *self._slots, self._bottom]
+
+    def _layout(self) -> None:
+        """現在の表示範囲に合わせて行とスペーサーを更新する
+
+        行コントロールは作り直さず、内容と表示状態だけを変更します。
+        """
+        count = self.item_count
+        first = max(0, min(self.first_index, count - len(self._slots)))
+        self.first_index = first
+        for offset, slot in enumerate(self._slots):
+            index = first + offset
+            row, skeleton = slot.content.controls
+            if index >= count:
+                slot.visible = False
+                continue
+            item = self.item_at(index)
+            slot.visible = True
+            row.visible = item is not None
+            skeleton.visible = item is None
+            if item is not None:
+                self.bind_row(row, item)
+        shown = min(len(self._slots), max(0, count - first))
+        self._top.height = first * self.item_extent
+        self._bottom.height = max(0, count - first - shown) * self.item_extent
+
+    def did_mount(self) -> None:
+        """ページに追加されたら最初のページを取得する"""
+        super().did_mount()
+        self._schedule_fetch()
+
+    def _refresh(self) -> None:
+        self._layout()
+        if self.page:
+            # 複数ページの取得完了による更新を1回の送信にまとめる
+            schedule_update(self.page, self)
+
+    def scroll_to_offset(
+        self, pixels: float, viewport_height: Optional[float] = None
+    ) -> None:
+        """スクロール位置に合わせて表示範囲を移動する
+
+        Args:
+            pixels: スクロール位置
+            viewport_height: 表示領域の高さ（変わった場合）
+        """
+        resized = bool(viewport_height) and viewport_height != self.viewport_height
+        if resized:
+            self.viewport_height = viewport_height
+            self._resize_slots()
+
+        first = max(0, int(pixels // self.item_extent) - self.overscan)
+        if resized or first != self.first_index:
+            self.first_index = first
+            self._refresh()
+        self._schedule_fetch()
+
+    def _on_scroll(self, e: ft.OnScrollEvent) -> None:
+        if e.pixels is not None:
+            self.scroll_to_offset(e.pixels, e.viewport_dimension)
+
+    def _wanted_pages(self) -> List[int]:
+        """表示範囲と先読み範囲に含まれる未取得のページ"""
+        first_page = self.first_index // self.page_size
+        last_index = self.first_index + len(self._slots) - 1
+        last_page = last_index // self.page_size + self.prefetch_pages
+        if self.total is not None:
+            last_page = min(last_page, max(0, self.total - 1) // self.page_size)
+        return [
+            n
+            for n in range(first_page, last_page + 1)
+            if n not in self._pages and n not in self._loading
+        ]
+
+    def _schedule_fetch(self) -> None:
+        """必要なページの取得をページのイベントループで開始する"""
+        if self.page and self._wanted_pages():
+            self.page.run_task(self.load_visible)
+
+    async def load_visible(self) -> None:
+        """表示範囲と先読み範囲のページを並行して取得する"""
+        await asyncio.gather(*(self.load_page(n) for n in self._wanted_pages()))
+
+    async def load_page(self, number: int) -> None:
+        """ページを取得する（取得中の場合は完了を待つ）"""
+        if number in self._pages:
+            return
+        task = self._loading.get(number)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(number))
+            self._loading[number] = task
+        await asyncio.shield(task)
+
+    async def _fetch(self, number: int) -> None:
+        try:
+            items = await self.fetch_page(number * self.page_size, self.page_size)
+        except Exception:
+            logger.exception(f"Failed to fetch list page {number}")
+            raise
+        finally:
+            self._loading.pop(number, None)
+        self.prime_page(number, items)
+
+    def prime_page(self, number: int, items: List[Any]) -> None:
+        """取得済みのページを登録する（ログイン時に先読みしたデータなど）"""
+        self._pages[number] = list(items)
+        if self.total is None and len(items) < self.page_size:
+            # 最後のページに達したので総数が確定する
+            self.total = number * self.page_size + len(items)
+        self._evict()
+        self._refresh()
+
+    def set_items(self, items: List[Any]) -> None:
+        """すべてのアイテムを登録する（ローカルストアなど手元にあるデータの場合）
+
+        スクロール位置は維持し、表示中の行の内容だけを差し替えます。
+        """
+        for task in self._loading.values():
+            task.cancel()
+        self._loading.clear()
+        self._pages = {
+            start // self.page_size: list(items[start : start + self.page_size])
+            for start in range(0, len(items), self.page_size)
+        }
+        self.total = len(items)
+        self._refresh()
+
+    def _evict(self) -> None:
+        """表示範囲から遠いページを破棄する"""
+        if self.max_pages is None:
+            return
+        current = self.first_index // self.page_size
+        while len(self._pages) > self.max_pages:
+            farthest = max(self._pages, key=lambda n: abs(n - current))
+            del self._pages[farthest]
+
+    def reset(self, total: Optional[int] = None) -> None:
+        """取得済みのアイテムを破棄して先頭から読み直せるようにする"""
+        for task in self._loading.values():
+            task.cancel()
+        self._loading.clear()
+        self._pages.clear()
+        self.total = total
+        self.first_index = 0
+        self._refresh()
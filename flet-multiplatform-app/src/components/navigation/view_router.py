@@ -0,0 +1,195 @@
+"""画面を遅延構築してキャッシュするビュールーター
+
+各画面は最初に表示されるときに1回だけ構築し、以降は表示・非表示の切り替えだけで
+遷移します。構築済みの画面は入力中の値やスクロール位置などの状態を保持したまま
+上限数までキャッシュし、上限を超えると最も長く使われていない画面から破棄します。
+次に表示されそうな画面はバックグラウンドで事前に構築できます。
+"""
+
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+import flet as ft
+
+from src.frontend.utils.update_scheduler import get_update_scheduler
+
+
+@dataclass
+class ViewRoute:
+    """ルーターに登録する画面
+
+    Attributes:
+        name: 画面の名前
+        build: 画面のコントロールを構築する関数
+        title: 表示時に設定するページのタイトル
+        load: 構築後に呼ばれるデータ取得などの非同期処理
+        preload: この画面の次に表示されそうな画面の名前
+    """
+
+    name: str
+    build: Callable[[], ft.Control]
+    title: Optional[str] = None
+    load: Optional[Callable[[ft.Control], Awaitable[None]]] = None
+    preload: Sequence[str] = ()
+
+
+class ViewRouter(ft.Stack):
+    """画面の表示を切り替えるコンテナ
+
+    構築済みの画面は Stack に残したまま visible だけを切り替えるため、
+    遷移時にクライアントへ送信されるのは表示状態の変更だけです。
+
+    Example:
+        ```python
+        router = ViewRouter(
+            [
+                ViewRoute("home", lambda: create_home_view(page), preload=["profile"]),
+                ViewRoute("profile", lambda: create_profile_view(page)),
+            ],
+            max_cached=2,
+        )
+        page.add(router)
+        router.navigate("home")
+        ```
+    """
+
+    def __init__(
+        self,
+        routes: Iterable[ViewRoute],
+        max_cached: int = 3,
+        on_change: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ):
+        """ViewRouter インスタンスを初期化します。
+
+        Args:
+            routes: 登録する画面
+            max_cached: 保持する構築済み画面の最大数
+            on_change: 表示する画面が変わったときに呼ばれる関数
+            **kwargs: ft.Stack に渡す引数
+        """
+        kwargs.setdefault("expand", True)
+        super().__init__(**kwargs)
+        if max_cached < 1:
+            raise ValueError("max_cached must be at least 1")
+        self.routes: Dict[str, ViewRoute] = {route.name: route for route in routes}
+        self.max_cached = max_cached
+        self.on_change = on_change
+        self.current: Optional[str] = None
+        self.build_count: Dict[str, int] = {name: 0 for name in self.routes}
+        self._views: "OrderedDict[str, ft.Container]" = OrderedDict()
+
+    @property
+    def cached(self) -> List[str]:
+        """構築済みの画面（使われた順）"""
+        return list(self._views)
+
+    def is_built(self, name: str) -> bool:
+        """画面が構築済みかどうか"""
+        return name in self._views
+
+    def view(self, name: str) -> Optional[ft.Control]:
+        """構築済みの画面のコントロールを返す"""
+        holder = self._views.get(name)
+        return holder.content if holder is not None else None
+
+    def navigate(self, name: str) -> ft.Control:
+        """画面を表示する（未構築の場合は構築する）
+
+        Returns:
+            ft.Control: 表示した画面のコントロール
+
+        Raises:
+            KeyError: 登録されていない画面の場合
+        """
+        route = self.routes[name]
+        with self._batch():
+            holder = self._ensure(name)
+            if self.current is not None and self.current != name:
+                previous = self._views.get(self.current)
+                if previous is not None:
+                    previous.visible = False
+            holder.visible = True
+            self.current = name
+            self._views.move_to_end(name)
+            self._evict()
+            if self.page is not None:
+                if route.title:
+                    self.page.title = route.title
+                    self._request(self.page)
+                self._request(self)
+
+        if self.on_change:
+            self.on_change(name)
+        self._schedule_preload(route.preload)
+        return holder.content
+
+    async def preload(self, name: str) -> None:
+        """画面を表示せずに構築しておく"""
+        if name not in self.routes or name in self._views:
+            return
+        with self._batch():
+            holder = self._ensure(name, load=False)
+            if self.current is not None:
+                # 事前構築した画面より表示中の画面を新しいものとして扱う
+                self._views.move_to_end(self.current)
+            self._evict()
+            if self.page is not None:
+                self._request(self)
+        route = self.routes[name]
+        if route.load is not None and name in self._views:
+            await route.load(holder.content)
+
+    def evict(self, name: str) -> None:
+        """構築済みの画面を破棄する（表示中の画面も破棄できる）"""
+        holder = self._views.pop(name, None)
+        if holder is None:
+            return
+        self.controls.remove(holder)
+        if self.current == name:
+            self.current = None
+        if self.page is not None:
+            self._request(self)
+
+    def clear(self) -> None:
+        """すべての構築済み画面を破棄する"""
+        for name in list(self._views):
+            self.evict(name)
+
+    def _ensure(self, name: str, load: bool = True) -> ft.Container:
+        holder = self._views.get(name)
+        if holder is not None:
+            return holder
+        route = self.routes[name]
+        holder = ft.Container(content=route.build(), expand=True, visible=False)
+        self.build_count[name] += 1
+        self._views[name] = holder
+        self.controls.append(holder)
+        if load and route.load is not None and self.page is not None:
+            self.page.run_task(route.load, holder.content)
+        return holder
+
+    def _evict(self) -> None:
+        """上限を超えた分を使われていない順に破棄する（表示中の画面は残す）"""
+        for name in list(self._views):
+            if len(self._views) <= self.max_cached:
+                break
+            if name != self.current:
+                self.evict(name)
+
+    def _schedule_preload(self, names: Sequence[str]) -> None:
+        if self.page is None:
+            return
+        for name in names:
+            if name in self.routes and name not in self._views:
+                self.page.run_task(self.preload, name)
+
+    def _batch(self):
+        if self.page is None:
+            return nullcontext()
+        return get_update_scheduler(self.page).batch()
+
+    def _request(self, control: ft.Control) -> None:
+        get_update_scheduler(self.page).request(control)
@@ -1,21 +1,34 @@
-from flet import Column, ElevatedButton, Page, Row, Text
+from typing import Callable, Optional
 
+from flet import Column, ElevatedButton, Page, Text
 
-def home_screen(page: Page):
-    page.title = "ホーム"
-    page.vertical_alignment = "center"
 
-    content = Column(
+def create_home_view(
+    page: Page, on_navigate: Optional[Callable[[str], None]] = None
+) -> Column:
+    """ホーム画面のコントロールを構築する
+
+    Args:
+        page: FletのPageオブジェクト
+        on_navigate: 画面名を受け取って遷移する関数（省略時は page.go でルート遷移）
+    """
+    navigate = on_navigate or (lambda name: page.go(f"/{name}"))
+    return Column(
         controls=[
             Text("ようこそ！", size=32, weight="bold"),
             Text("このアプリケーションはマルチプラットフォーム対応です。", size=16),
-            ElevatedButton("設定に移動", on_click=lambda e: page.go("/settings")),
+            ElevatedButton("設定に移動", on_click=lambda e: navigate("settings")),
             ElevatedButton(
-                "プロフィールに移動", on_click=lambda e: page.go("/profile")
+                "プロフィールに移動", on_click=lambda e: navigate("profile")
             ),
         ],
         alignment="center",
         spacing=20,
     )
 
-    page.add(content)
+
+def home_screen(page: Page):
+    page.title = "ホーム"
+    page.vertical_alignment = "center"
+
+    page.add(create_home_view(page))
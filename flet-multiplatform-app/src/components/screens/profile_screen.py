@@ -1,14 +1,32 @@
-from flet import Column, Container, IconButton, Page, Row, Text, icons
+from typing import Any, Optional
 
+from flet import (
+    BoxShadow,
+    Colors,
+    Column,
+    Container,
+    IconButton,
+    Icons,
+    Offset,
+    Page,
+    Text,
+)
 
-def profile_screen(page: Page):
-    page.title = "プロフィール"
-    page.vertical_alignment = "center"
+
+def create_profile_view(page: Page, user: Optional[Any] = None) -> Container:
+    """プロフィール画面のコントロールを構築する
+
+    Args:
+        page: FletのPageオブジェクト
+        user: 表示するユーザー（省略時はサンプルのユーザー）
+    """
+    username = user.username if user else "山田太郎"
+    email = user.email if user else "yamada@example.com"
 
     profile_info = Column(
         [
-            Text("ユーザー名: 山田太郎", size=24, weight="bold"),
-            Text("メール: yamada@example.com", size=16),
+            Text(f"ユーザー名: {username}", size=24, weight="bold"),
+            Text(f"メール: {email}", size=16),
             Text(
                 "自己紹介: Python開発者。Fletを使用してマルチプラットフォームアプリを開発しています。",
                 size=14,
@@ -19,20 +37,27 @@ def profile_screen(page: Page):
     )
 
     edit_button = IconButton(
-        icon=icons.EDIT, tooltip="プロフィールを編集", on_click=lambda e: edit_profile()
+        icon=Icons.EDIT, tooltip="プロフィールを編集", on_click=lambda e: edit_profile()
     )
 
-    page.add(
-        Container(
-            content=Column([profile_info, edit_button]),
-            padding=20,
-            bgcolor="white",
-            border_radius=10,
-            box_shadow="0 4px 10px rgba(0, 0, 0, 0.1)",
-        )
+    return Container(
+        content=Column([profile_info, edit_button]),
+        padding=20,
+        bgcolor="white",
+        border_radius=10,
+        shadow=BoxShadow(
+            blur_radius=10, offset=Offset(0, 4), color=Colors.with_opacity(0.1, "black")
+        ),
     )
 
 
+def profile_screen(page: Page):
+    page.title = "プロフィール"
+    page.vertical_alignment = "center"
+
+    page.add(create_profile_view(page))
+
+
 def edit_profile():
     # プロフィール編集のロジックをここに追加
     pass
@@ -1,11 +1,9 @@
-from flet import AppBar, Column, ElevatedButton, IconButton, Page, Text, icons
+from flet import Column, ElevatedButton, Page, Text
 
 
-def settings_screen(page: Page):
-    page.title = "設定"
-    page.vertical_alignment = "center"
-
-    settings_content = Column(
+def create_settings_view(page: Page) -> Column:
+    """設定画面のコントロールを構築する"""
+    return Column(
         controls=[
             Text("設定画面", size=24, weight="bold"),
             Text("ここでアプリの設定を変更できます。", size=16),
@@ -16,7 +14,12 @@ def settings_screen(page: Page):
         spacing=20,
     )
 
-    page.add(settings_content)
+
+def settings_screen(page: Page):
+    page.title = "設定"
+    page.vertical_alignment = "center"
+
+    page.add(create_settings_view(page))
 
 
 def save_settings():
@@ -1,18 +1,29 @@
 """ロギングの設定を管理するモジュール"""
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 
 from .settings import settings
 
+# 稼働中のQueueListenerと、ルートロガーに追加したQueueHandler
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
 
 def setup_logging() -> None:
-    """ロギングの設定を行う"""
-    # ルートロガーの設定
-    root_logger = logging.getLogger()
-    root_logger.setLevel(settings.LOG_LEVEL)
+    """ロギングの設定を行う
+
+    出力先ハンドラはQueueListenerのスレッドで実行されるため、
+    ファイルへの書き込みが呼び出し元をブロックすることはありません。
+    """
+    global _listener, _queue_handler
+
+    stop_logging()
 
     # フォーマッターの設定
     formatter = logging.Formatter(settings.LOG_FORMAT)
@@ -20,7 +31,6 @@ def setup_logging() -> None:
     # コンソールハンドラーの設定
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
 
     # ファイルハンドラーの設定
     log_file = Path(settings.LOG_DIR) / settings.LOG_FILE
@@ -31,7 +41,18 @@ def setup_logging() -> None:
         encoding="utf-8",
     )
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+
+    # ルートロガーの設定
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(settings.LOG_LEVEL)
+    root_logger.addHandler(_queue_handler)
+
+    _listener = QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
 
     # サードパーティライブラリのログレベルを設定
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -41,6 +62,23 @@ def setup_logging() -> None:
     logging.getLogger("flet").setLevel(logging.INFO)
 
 
+def stop_logging() -> None:
+    """QueueHandlerを外してQueueListenerを停止し、残っているログを出力する"""
+    global _listener, _queue_handler
+
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """指定された名前のロガーを取得する"""
     return logging.getLogger(name)
@@ -3,6 +3,7 @@
 import flet as ft
 
 from .app import create_app
+from .frontend.api.transport import shutdown_transport_pool
 
 
 def main(page: ft.Page):
@@ -12,4 +13,8 @@ def main(page: ft.Page):
 
 
 if __name__ == "__main__":
-    ft.app(target=main)
+    try:
+        ft.app(target=main)
+    finally:
+        # 全ページで共有しているHTTP接続を閉じる
+        shutdown_transport_pool()
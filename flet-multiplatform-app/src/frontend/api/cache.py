@@ -0,0 +1,298 @@
+"""APIクライアント用のHTTPキャッシュ
+
+GETレスポンスをメモリ上のLRUキャッシュ（必要に応じてディスクにも）に保存し、
+Cache-Control の max-age の間はリクエストを送信せずに返します。期限切れの
+レスポンスは If-None-Match で再検証し、304 の場合は保存済みの本文を使います。
+
+ディスクのキャッシュは認証情報ごとのサブディレクトリに分けて保存し、
+そのユーザーのリクエストで初めて使うときに読み込みます。ディレクトリを
+複数のクライアントで共有しても、他のユーザーのエントリは読み込まず、
+ログアウト時にも削除しません。
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Cache-Control ヘッダーをディレクティブの辞書に変換する
+
+    例: "private, max-age=60" -> {"private": None, "max-age": "60"}
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+@dataclass
+class CacheEntry:
+    """キャッシュされたレスポンス"""
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: str
+    stored_at: float
+    max_age: Optional[float] = None
+    no_cache: bool = False
+
+    @property
+    def etag(self) -> Optional[str]:
+        """レスポンスのETag"""
+        return self.headers.get("etag")
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """再検証せずに使用できるかどうか"""
+        if self.no_cache or self.max_age is None:
+            return False
+        return (now or time.time()) - self.stored_at < self.max_age
+
+    def refresh(self, response: httpx.Response) -> None:
+        """304レスポンスのヘッダーで鮮度情報を更新する"""
+        self.stored_at = time.time()
+        if "cache-control" in response.headers:
+            self.headers["cache-control"] = response.headers["cache-control"]
+            self.max_age, self.no_cache = _freshness(response.headers)
+        if "etag" in response.headers:
+            self.headers["etag"] = response.headers["etag"]
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        """保存済みの内容からレスポンスを組み立てる"""
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content.encode("utf-8"),
+            request=request,
+        )
+
+
+@dataclass
+class CacheStats:
+    """キャッシュの統計"""
+
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+    def to_dict(self) -> dict:
+        """辞書形式に変換する"""
+        return asdict(self)
+
+
+def _freshness(headers: httpx.Headers) -> "tuple[Optional[float], bool]":
+    directives = parse_cache_control(headers.get("cache-control"))
+    max_age = directives.get("max-age")
+    try:
+        max_age_seconds = float(max_age) if max_age is not None else None
+    except ValueError:
+        max_age_seconds = None
+    return max_age_seconds, "no-cache" in directives
+
+
+class HTTPCache:
+    """上限付きLRUのHTTPキャッシュ
+
+    Args:
+        max_entries: 保持するレスポンスの最大数
+        directory: 指定した場合はディスクにも保存し、ユーザーごとに初回使用時に読み込む
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        directory: Optional[Union[str, Path]] = None,
+    ):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # ディスクから読み込み済みのユーザー（キーの接頭辞）
+        self._loaded: Set[str] = set()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(request: httpx.Request) -> str:
+        """リクエストのキャッシュキーを返す
+
+        認証ヘッダーを含めるため、ユーザーごとに別のエントリになります。
+        キーは "<ユーザー>/<URLのハッシュ>" の形式で、ディスク上の
+        サブディレクトリとファイル名に対応します。
+        """
+        vary = request.headers.get("authorization", "")
+        owner = (
+            hashlib.sha256(vary.encode("utf-8")).hexdigest()[:16]
+            if vary
+            else "anonymous"
+        )
+        digest = hashlib.sha256(f"{request.url}\n{vary}".encode("utf-8")).hexdigest()
+        return f"{owner}/{digest}"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """エントリを取得する（そのユーザーのディスク上のエントリも読み込む）"""
+        self._load(key.partition("/")[0])
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, response: httpx.Response) -> Optional[CacheEntry]:
+        """レスポンスを保存する（no-store や ETag も鮮度情報もない場合は保存しない）"""
+        directives = parse_cache_control(response.headers.get("cache-control"))
+        if "no-store" in directives:
+            self.delete(key)
+            return None
+        max_age, no_cache = _freshness(response.headers)
+        if max_age is None and "etag" not in response.headers:
+            return None
+
+        entry = CacheEntry(
+            url=str(response.request.url),
+            status_code=response.status_code,
+            headers={
+                name: response.headers[name]
+                for name in ("content-type", "etag", "cache-control")
+                if name in response.headers
+            },
+            content=response.text,
+            stored_at=time.time(),
+            max_age=max_age,
+            no_cache=no_cache,
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._write(key, entry)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._remove_file(evicted)
+        return entry
+
+    def delete(self, key: str) -> None:
+        """エントリを削除する"""
+        if self._entries.pop(key, None) is not None:
+            self._remove_file(key)
+
+    def invalidate(self, url_prefix: str) -> int:
+        """URLが指定のプレフィックスで始まるエントリを削除する
+
+        Returns:
+            int: 削除した件数
+        """
+        keys = [k for k, e in self._entries.items() if e.url.startswith(url_prefix)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """このキャッシュが保持しているすべてのエントリを削除する
+
+        ディスク上のファイルは、このキャッシュが読み込んだユーザーのものだけを
+        削除します。
+        """
+        for key in list(self._entries):
+            self.delete(key)
+
+    async def send(
+        self, client: httpx.AsyncClient, request: httpx.Request
+    ) -> httpx.Response:
+        """キャッシュを考慮してリクエストを送信する
+
+        GET 以外のリクエストが成功した場合は、同じリソースのエントリを破棄します。
+        """
+        if request.method != "GET":
+            response = await client.send(request)
+            if response.is_success:
+                self.invalidate(_collection_url(request.url))
+            return response
+
+        key = self.key_for(request)
+        entry = self.get(key)
+        if entry is not None and entry.is_fresh():
+            self.stats.hits += 1
+            self.stats.bytes_saved += len(entry.content)
+            return entry.to_response(request)
+
+        if entry is not None and entry.etag:
+            request.headers["If-None-Match"] = entry.etag
+
+        response = await client.send(request)
+        if response.status_code == 304 and entry is not None:
+            self.stats.revalidated += 1
+            self.stats.bytes_saved += len(entry.content)
+            entry.refresh(response)
+            self._write(key, entry)
+            return entry.to_response(request)
+
+        self.stats.misses += 1
+        if response.status_code == 200:
+            self.store(key, response)
+        return response
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _write(self, key: str, entry: CacheEntry) -> None:
+        if self.directory is None:
+            return
+        try:
+            path = self._path(key)
+            path.parent.mkdir(exist_ok=True)
+            path.write_text(json.dumps(asdict(entry)), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to write HTTP cache entry: {e}")
+
+    def _remove_file(self, key: str) -> None:
+        if self.directory is not None:
+            self._path(key).unlink(missing_ok=True)
+
+    def _load(self, owner: str) -> None:
+        """ユーザーのディスク上のエントリを読み込む（初回のみ）
+
+        読み込んだエントリはメモリ上の既存のエントリより古いものとして扱い、
+        上限を超えた分は古いものから削除します。
+        """
+        if self.directory is None or owner in self._loaded:
+            return
+        self._loaded.add(owner)
+        files = sorted(
+            (self.directory / owner).glob("*.json"), key=lambda p: p.stat().st_mtime
+        )
+        # 新しい順に先頭へ挿入し、古い順の並びにする
+        for path in reversed(files):
+            key = f"{owner}/{path.stem}"
+            if key in self._entries:
+                continue
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                self._entries[key] = CacheEntry(**data)
+            except (OSError, ValueError, TypeError):
+                path.unlink(missing_ok=True)
+                continue
+            self._entries.move_to_end(key, last=False)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._remove_file(evicted)
+
+
+def _collection_url(url: httpx.URL) -> str:
+    """/api/v1/users/1 のようなURLからコレクションのURL (/api/v1/users) を返す"""
+    path = url.path.rstrip("/")
+    parent = path.rsplit("/", 1)[0] if path.rsplit("/", 1)[-1].isdigit() else path
+    return str(url.copy_with(path=parent, query=None))
@@ -1,26 +1,55 @@
 """APIクライアントの実装"""
 
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import httpx
 from flet import Page
 
 from src.backend.schemas.user import UserCreate, UserResponse
+from src.frontend.api.cache import HTTPCache
+from src.frontend.api.dataloader import DataLoader
+from src.frontend.api.transport import TransportPool, get_transport_pool
 from src.frontend.config import settings
 
 
 class APIClient:
-    """APIクライアントクラス"""
+    """APIクライアントクラス
 
-    def __init__(self, page: Page):
+    HTTP接続はプロセス全体で共有する TransportPool を使用し、
+    認証ヘッダーはページごとにリクエスト単位で付与します。
+    GETレスポンスは HTTPCache に保存し、ETag で再検証します。
+    get_user() は DataLoader で同じ周回の呼び出しを1回の一括取得にまとめます。
+
+    Args:
+        page: Fletのページ
+        pool: 使用するトランスポートプール（省略時は共有プール）
+        cache: 使用するHTTPキャッシュ（省略時は設定に従って作成）
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        pool: Optional[TransportPool] = None,
+        cache: Optional[HTTPCache] = None,
+    ):
         self.page = page
-        self.base_url = settings.API_BASE_URL
+        self._pool = pool or get_transport_pool()
+        if cache is None:
+            cache = HTTPCache(
+                max_entries=settings.HTTP_CACHE_MAX_ENTRIES,
+                directory=settings.HTTP_CACHE_DIR,
+            )
+        self.cache = cache
+        self.base_url = self._pool.base_url
         self._access_token: Optional[str] = None
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url,
-            timeout=30.0,
+        self._headers: Dict[str, str] = {}
+        self._closed = False
+        self.user_loader: DataLoader[int, UserResponse] = DataLoader(
+            self._load_users,
+            max_batch_size=settings.USER_BATCH_SIZE,
+            max_age=settings.USER_LOADER_MAX_AGE,
         )
+        self._pool.acquire()
 
     @property
     def access_token(self) -> Optional[str]:
@@ -32,53 +61,172 @@ class APIClient:
         """アクセストークンの設定"""
         self._access_token = token
         if token:
-            self._client.headers["Authorization"] = f"Bearer {token}"
+            self._headers["Authorization"] = f"Bearer {token}"
         else:
-            self._client.headers.pop("Authorization", None)
+            # ログアウト時は他のユーザーに見えないようキャッシュを破棄する
+            self._headers.pop("Authorization", None)
+            self.cache.clear()
+            self.user_loader.clear()
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """共有クライアントでリクエストを送信する"""
+        if self._closed:
+            raise RuntimeError("APIClient is closed")
+        client = self._pool.client
+        headers = {**self._headers, **kwargs.pop("headers", {})}
+        request = client.build_request(method, url, headers=headers, **kwargs)
+        response = await self.cache.send(client, request)
+        response.raise_for_status()
+        return response
 
     async def login(self, username: str, password: str) -> Dict[str, Any]:
         """ログイン"""
-        response = await self._client.post(
+        response = await self._request(
+            "POST",
             "/api/v1/auth/login",
             data={"username": username, "password": password},
         )
-        response.raise_for_status()
         data = response.json()
         self.access_token = data["access_token"]
         return data
 
     async def get_current_user(self) -> UserResponse:
         """現在のユーザー情報を取得"""
-        response = await self._client.get("/api/v1/auth/me")
-        response.raise_for_status()
+        response = await self._request("GET", "/api/v1/auth/me")
         return UserResponse(**response.json())
 
     async def create_user(self, user_data: UserCreate) -> UserResponse:
         """ユーザーを作成"""
-        response = await self._client.post(
+        response = await self._request(
+            "POST",
             "/api/v1/users/",
             json=user_data.dict(),
         )
-        response.raise_for_status()
         return UserResponse(**response.json())
 
     async def get_users(self) -> list[UserResponse]:
         """ユーザー一覧を取得"""
-        response = await self._client.get("/api/v1/users/")
-        response.raise_for_status()
+        response = await self._request("GET", "/api/v1/users/")
         return [UserResponse(**user) for user in response.json()]
 
     async def get_user(self, user_id: int) -> UserResponse:
-        """特定のユーザー情報を取得"""
-        response = await self._client.get(f"/api/v1/users/{user_id}")
-        response.raise_for_status()
-        return UserResponse(**response.json())
+        """特定のユーザー情報を取得
+
+        同じ周回で呼ばれた get_user() は1回のリクエストにまとめられます。
+
+        Raises:
+            httpx.HTTPStatusError: ユーザーが存在しない場合（404）
+        """
+        try:
+            return await self.user_loader.load(user_id)
+        except KeyError:
+            # 一括取得の結果に含まれなかったユーザーは、個別に取得した場合と同じ
+            # 404 エラーにする
+            request = self._pool.client.build_request("GET", f"/api/v1/users/{user_id}")
+            response = httpx.Response(404, request=request)
+            raise httpx.HTTPStatusError(
+                f"User {user_id} not found", request=request, response=response
+            ) from None
+
+    async def get_users_by_ids(self, user_ids: List[int]) -> list[UserResponse]:
+        """複数のユーザー情報をまとめて取得（存在しないIDは含まれない）"""
+        response = await self._request(
+            "GET",
+            "/api/v1/users/",
+            params={"ids": user_ids, "limit": len(user_ids)},
+        )
+        return [UserResponse(**user) for user in response.json()]
+
+    async def _load_users(self, user_ids: List[int]) -> Dict[int, UserResponse]:
+        """DataLoader 用の一括取得関数"""
+        if len(user_ids) == 1:
+            # 1件の場合は個別のURLを使い、ETag による再検証を利用する
+            try:
+                response = await self._request("GET", f"/api/v1/users/{user_ids[0]}")
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    return {}
+                raise
+            return {user_ids[0]: UserResponse(**response.json())}
+        return {user.id: user for user in await self.get_users_by_ids(user_ids)}
+
+    async def get_items(self, skip: int = 0, limit: int = 100) -> list[Dict[str, Any]]:
+        """アイテム一覧をページ単位で取得"""
+        response = await self._request(
+            "GET", "/api/v1/items/", params={"skip": skip, "limit": limit}
+        )
+        return response.json()
+
+    async def get_changes(
+        self,
+        resource: str,
+        since: Optional[str],
+        after_id: int = 0,
+        limit: int = 100,
+    ) -> list[Dict[str, Any]]:
+        """(更新日時, ID) が (since, after_id) より後のレコードを取得（差分同期用）"""
+        params: Dict[str, Any] = {"after_id": after_id, "limit": limit}
+        if since:
+            params["updated_since"] = since
+        response = await self._request("GET", f"/api/v1/{resource}/", params=params)
+        return response.json()
+
+    async def get_tombstones(
+        self, resource: str, after_id: int = 0, limit: int = 100
+    ) -> list[Dict[str, Any]]:
+        """after_id より後に記録された削除を取得（差分同期用）"""
+        response = await self._request(
+            "GET",
+            "/api/v1/sync/tombstones",
+            params={"resource": resource, "after_id": after_id, "limit": limit},
+        )
+        return response.json()
+
+    async def get_resource(self, resource: str, record_id: int) -> Dict[str, Any]:
+        """レコードを1件取得"""
+        response = await self._request("GET", f"/api/v1/{resource}/{record_id}")
+        return response.json()
+
+    async def create_resource(
+        self, resource: str, data: Dict[str, Any], idempotency_key: str
+    ) -> Dict[str, Any]:
+        """レコードを作成（再送しても重複しないよう冪等性キーを付与）"""
+        response = await self._request(
+            "POST",
+            f"/api/v1/{resource}/",
+            json=data,
+            headers={"Idempotency-Key": idempotency_key},
+        )
+        return response.json()
+
+    async def update_resource(
+        self,
+        resource: str,
+        record_id: int,
+        data: Dict[str, Any],
+        version: Optional[int],
+    ) -> Dict[str, Any]:
+        """レコードを更新（バージョンを指定した場合は If-Match で競合を検出）"""
+        headers = {"If-Match": f'"{version}"'} if version is not None else {}
+        response = await self._request(
+            "PUT", f"/api/v1/{resource}/{record_id}", json=data, headers=headers
+        )
+        if resource == "users":
+            self.user_loader.clear(record_id)
+        return response.json()
+
+    async def delete_resource(self, resource: str, record_id: int) -> None:
+        """レコードを削除"""
+        await self._request("DELETE", f"/api/v1/{resource}/{record_id}")
+        if resource == "users":
+            self.user_loader.clear(record_id)
 
     async def close(self) -> None:
-        """クライアントを閉じる"""
-        await self._client.aclose()
+        """クライアントを閉じる
 
-    def __del__(self) -> None:
-        """デストラクタ"""
-        if hasattr(self, "_client"):
-            self.page.loop.create_task(self.close())
+        共有プールの利用登録を解除するだけで、接続は他のページで再利用されます。
+        """
+        if not self._closed:
+            self._closed = True
+            self.access_token = None
+            self._pool.release()
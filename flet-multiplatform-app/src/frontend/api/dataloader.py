@@ -0,0 +1,164 @@
+"""複数の取得要求を1回のリクエストにまとめる DataLoader
+
+同じイベントループの周回で呼ばれた load(key) を集めておき、次の周回で
+まとめて1回の一括取得関数に渡します。取得中・取得済みの値はキーごとに
+キャッシュし（max_age 秒間）、同じキーの load() ではリクエストを送信しません。
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# キーのリストを受け取り、キーと値の辞書を返す一括取得関数
+BatchLoadFn = Callable[[List[K]], Awaitable[Mapping[K, V]]]
+
+
+@dataclass
+class LoaderStats:
+    """DataLoader の統計"""
+
+    loads: int = 0
+    cache_hits: int = 0
+    batches: int = 0
+
+    def to_dict(self) -> dict:
+        """辞書形式に変換する"""
+        return asdict(self)
+
+
+class DataLoader(Generic[K, V]):
+    """キー単位の取得をまとめて一括取得する
+
+    Args:
+        batch_load: 一括取得関数（結果に含まれないキーは KeyError になる）
+        max_batch_size: 1回の一括取得に含めるキーの最大数
+        max_age: 取得した値をキャッシュする秒数（None は無期限、0 は取得中の
+            要求をまとめるだけでキャッシュしない）
+    """
+
+    def __init__(
+        self,
+        batch_load: BatchLoadFn,
+        max_batch_size: int = 100,
+        max_age: Optional[float] = None,
+    ):
+        self.batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self.max_age = max_age
+        self.stats = LoaderStats()
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._expires: Dict[K, float] = {}
+        self._queue: List[K] = []
+        self._dispatch_scheduled = False
+        # 実行中の一括取得（完了前にガベージコレクションされないよう参照を保持する）
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V:
+        """キーの値を取得する
+
+        Raises:
+            KeyError: 一括取得の結果にキーが含まれなかった場合
+        """
+        self.stats.loads += 1
+        loop = asyncio.get_running_loop()
+        expires = self._expires.get(key)
+        if expires is not None and loop.time() >= expires:
+            self.clear(key)
+
+        future = self._futures.get(key)
+        if future is not None:
+            self.stats.cache_hits += 1
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._futures[key] = future
+        self._queue.append(key)
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            # 同じ周回で呼ばれた load() が揃ってから送信する
+            loop.call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Sequence[K]) -> List[V]:
+        """複数のキーの値を取得する"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """取得済みの値をキャッシュに登録する"""
+        if key in self._futures and not self._futures[key].done():
+            return
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._futures[key] = future
+        self._set_expiry(key)
+
+    def clear(self, key: Optional[K] = None) -> None:
+        """キーのキャッシュを削除する（省略時はすべて削除、取得中のものは残す）"""
+        keys = list(self._futures) if key is None else [key]
+        for k in keys:
+            future = self._futures.get(k)
+            if future is not None and future.done():
+                del self._futures[k]
+                self._expires.pop(k, None)
+
+    def _dispatch(self) -> None:
+        self._dispatch_scheduled = False
+        keys, self._queue = self._queue, []
+        for start in range(0, len(keys), self.max_batch_size):
+            batch = keys[start : start + self.max_batch_size]
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, keys: List[K]) -> None:
+        self.stats.batches += 1
+        try:
+            values = await self.batch_load(keys)
+        except Exception as e:
+            for key in keys:
+                self._resolve(key, error=e)
+            return
+        for key in keys:
+            if key in values:
+                self._resolve(key, value=values[key])
+            else:
+                self._resolve(key, error=KeyError(key))
+
+    def _resolve(
+        self, key: K, value: Optional[V] = None, error: Optional[Exception] = None
+    ) -> None:
+        future = self._futures.get(key)
+        if future is None or future.done():
+            return
+        if error is not None:
+            # 失敗した結果はキャッシュしない
+            del self._futures[key]
+            future.set_exception(error)
+            # 待っている呼び出し元がない場合に警告が出ないようにする
+            future.exception()
+        else:
+            future.set_result(value)
+            self._set_expiry(key)
+
+    def _set_expiry(self, key: K) -> None:
+        if self.max_age is None:
+            return
+        if self.max_age <= 0:
+            self._futures.pop(key, None)
+            return
+        self._expires[key] = asyncio.get_running_loop().time() + self.max_age
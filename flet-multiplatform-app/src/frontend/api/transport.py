@@ -0,0 +1,217 @@
+"""HTTPトランスポートの共有プール
+
+Flet の Web モードでは1つの Python プロセスが多数のページ（セッション）を
+処理するため、ページごとに httpx.AsyncClient を作成するとコネクションが
+使い回されず、セッション終了後もクライアントが残り続けます。
+このモジュールはプロセス全体で1つの AsyncClient を共有し、接続数の上限、
+Keep-Alive の有効期限、HTTP/2 をまとめて設定します。
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+
+from src.frontend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 新しいコネクションが確立されたことを示す httpcore のトレースイベント
+_CONNECT_EVENTS = frozenset(
+    {
+        "connection.connect_tcp.complete",
+        "connection.connect_unix_socket.complete",
+    }
+)
+
+
+@dataclass
+class TransportMetrics:
+    """コネクション再利用の統計"""
+
+    requests: int = 0
+    connections_opened: int = 0
+    active_clients: int = 0
+
+    @property
+    def reused_requests(self) -> int:
+        """既存のコネクションで送信されたリクエスト数"""
+        return max(0, self.requests - self.connections_opened)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """コネクションを再利用したリクエストの割合"""
+        return self.reused_requests / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> dict:
+        """辞書形式に変換する"""
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reused_requests": self.reused_requests,
+            "reuse_ratio": self.reuse_ratio,
+            "active_clients": self.active_clients,
+        }
+
+
+class _MetricsTransport(httpx.AsyncHTTPTransport):
+    """リクエスト数と新規コネクション数を数えるトランスポート"""
+
+    def __init__(self, metrics: TransportMetrics, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._metrics.requests += 1
+        request.extensions = {**request.extensions, "trace": self._trace}
+        return await super().handle_async_request(request)
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name in _CONNECT_EVENTS:
+            self._metrics.connections_opened += 1
+
+
+def http2_available() -> bool:
+    """HTTP/2 に必要な h2 パッケージがインストールされているかどうか"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class TransportPool:
+    """プロセス全体で共有する HTTP クライアント
+
+    クライアントは最初に使用されたときにイベントループ上で作成されます。
+    APIClient は acquire()/release() で利用を登録し、認証ヘッダーなど
+    ページ固有の情報はリクエストごとに渡します。
+
+    Args:
+        base_url: APIのベースURL
+        max_connections: 同時接続数の上限
+        max_keepalive_connections: Keep-Alive で保持する接続数の上限
+        keepalive_expiry: アイドル状態の接続を保持する秒数
+        http2: HTTP/2 を使用するかどうか（h2 がない場合は HTTP/1.1 になる）
+        timeout: リクエストのタイムアウト秒数
+        transport: テスト用に差し替えるトランスポート
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if http2 and not http2_available():
+            logger.warning("h2 is not installed; falling back to HTTP/1.1")
+            http2 = False
+
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.timeout = timeout
+        self.metrics = TransportMetrics()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """共有クライアントを取得する（未作成の場合は作成する）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                transport=self._transport
+                or _MetricsTransport(
+                    self.metrics, limits=self.limits, http2=self.http2
+                ),
+            )
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._loop = None
+        return self._client
+
+    def acquire(self) -> None:
+        """APIClient からの利用を登録する
+
+        クライアント自体はイベントループ上で最初のリクエストを送るときに作成します。
+        """
+        self.metrics.active_clients += 1
+
+    def release(self) -> None:
+        """APIClient の利用登録を解除する（接続は閉じない）"""
+        self.metrics.active_clients = max(0, self.metrics.active_clients - 1)
+
+    async def aclose(self) -> None:
+        """共有クライアントとすべての接続を閉じる"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+    def close_sync(self) -> None:
+        """イベントループの外から共有クライアントを閉じる
+
+        クライアントを作成したループが既に閉じられている場合は、
+        接続はプロセス終了時に解放されるため参照を破棄するだけにします。
+        """
+        if self._client is None:
+            return
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._client = None
+        elif loop.is_running():
+            loop.create_task(self.aclose())
+        else:
+            loop.run_until_complete(self.aclose())
+
+
+_pool: Optional[TransportPool] = None
+
+
+def get_transport_pool() -> TransportPool:
+    """プロセス全体で共有するトランスポートプールを取得する"""
+    global _pool
+
+    if _pool is None:
+        _pool = TransportPool(
+            base_url=settings.API_BASE_URL,
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            http2=settings.HTTP2_ENABLED,
+            timeout=settings.API_TIMEOUT,
+        )
+    return _pool
+
+
+async def close_transport_pool() -> None:
+    """アプリケーション終了時に共有プールを閉じる"""
+    global _pool
+
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
+
+
+def shutdown_transport_pool() -> None:
+    """イベントループの外（プロセス終了時など）で共有プールを閉じる"""
+    global _pool
+
+    if _pool is not None:
+        _pool.close_sync()
+        _pool = None
+
+
+atexit.register(shutdown_transport_pool)
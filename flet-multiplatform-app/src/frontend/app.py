@@ -3,12 +3,9 @@
 from typing import Optional
 
 from flet import (
-    AppBar,
     Column,
     Container,
     ElevatedButton,
-    Icon,
-    IconButton,
     NavigationRail,
     NavigationRailDestination,
     Page,
@@ -20,13 +17,19 @@ from flet import (
     icons,
 )
 
+from src.components.common.virtual_list import VirtualList
+from src.components.navigation.view_router import ViewRoute, ViewRouter
+from src.components.screens.profile_screen import create_profile_view
+from src.components.screens.settings_screen import create_settings_view
 from src.frontend.api.client import APIClient
+from src.frontend.config import settings
 from src.frontend.store.auth_store import AuthStore
+from src.frontend.store.local_store import LocalStore
+from src.frontend.store.sync_engine import SyncEngine
 from src.frontend.utils.async_utils import (
     AsyncError,
     LoadingManager,
     handle_async_errors,
-    with_loading,
 )
 
 
@@ -61,7 +64,6 @@ class LoginView(UserControl):
             alignment="center",
         )
 
-    @with_loading(loading_manager)
     @handle_async_errors("ログインに失敗しました")
     async def _login(self, e):
         username = self.username_field.value
@@ -74,17 +76,25 @@ class LoginView(UserControl):
             return
 
         try:
-            await self.auth_store.login(username, password)
+            await self.loading_manager.with_loading(
+                self.auth_store.login(username, password)
+            )
             self.error_text.visible = False
             self.update()
-        except AsyncError as e:
-            self.error_text.value = str(e)
+        except AsyncError as error:
+            self.error_text.value = str(error)
             self.error_text.visible = True
             self.update()
 
 
 class MainView(UserControl):
-    """メインビュー"""
+    """メインビュー
+
+    各画面は最初に選択されたときに構築し、以降は表示の切り替えだけで遷移します。
+    """
+
+    # ナビゲーションレールの並び順に対応する画面名
+    SCREENS = ("dashboard", "profile", "settings")
 
     def __init__(self, auth_store: AuthStore, loading_manager: LoadingManager):
         super().__init__()
@@ -112,19 +122,37 @@ class MainView(UserControl):
             ],
             on_change=self._rail_changed,
         )
-        self.content = Column(
-            controls=[
-                Text("ダッシュボード", size=30, weight="bold"),
+        self.router = ViewRouter(
+            [
+                ViewRoute(
+                    "dashboard",
+                    self._build_dashboard,
+                    title="ダッシュボード",
+                    preload=["profile"],
+                ),
+                ViewRoute(
+                    "profile",
+                    lambda: create_profile_view(
+                        auth_store.page, auth_store.current_user
+                    ),
+                    title="プロフィール",
+                    preload=["settings"],
+                ),
+                ViewRoute(
+                    "settings",
+                    lambda: create_settings_view(auth_store.page),
+                    title="設定",
+                ),
             ],
-            expand=True,
         )
+        self.router.navigate(self.SCREENS[0])
 
     def build(self):
         return Row(
             controls=[
                 self.navigation_rail,
                 Container(
-                    content=self.content,
+                    content=self.router,
                     expand=True,
                     padding=20,
                 ),
@@ -132,15 +160,43 @@ class MainView(UserControl):
             expand=True,
         )
 
+    def _build_dashboard(self):
+        # アイテム一覧は表示中の行だけを構築する
+        store = self.auth_store.local_store
+        prefetched = self.auth_store.prefetch.pop("items")
+        if store is None:
+            # ローカルストアがない場合はスクロールに合わせてページ単位で取得する
+            self.item_list = VirtualList(
+                fetch_page=self.auth_store.api_client.get_items,
+                page_size=settings.ITEM_PAGE_SIZE,
+                expand=True,
+            )
+            # ログイン時に先読みした最初のページがあれば、取得を待たずに表示する
+            if prefetched is not None:
+                self.item_list.prime_page(0, prefetched)
+        else:
+            # ローカルストアから表示し、同期やオフライン中の変更に追従する
+            if prefetched is not None:
+                store.apply_remote("items", prefetched)
+            self.items_query = store.live_query(
+                "items", order_by="created_at", descending=True
+            )
+            self.item_list = VirtualList(
+                fetch_page=self._local_items_page,
+                page_size=settings.ITEM_PAGE_SIZE,
+                expand=True,
+            )
+            self.items_query.subscribe(self.item_list.set_items)
+        return Column(
+            controls=[Text("ダッシュボード", size=30, weight="bold"), self.item_list],
+            expand=True,
+        )
+
+    async def _local_items_page(self, skip: int, limit: int):
+        return self.items_query.results[skip : skip + limit]
+
     def _rail_changed(self, e):
-        index = e.control.selected_index
-        if index == 0:
-            self.content.controls = [Text("ダッシュボード", size=30, weight="bold")]
-        elif index == 1:
-            self.content.controls = [Text("プロフィール", size=30, weight="bold")]
-        elif index == 2:
-            self.content.controls = [Text("設定", size=30, weight="bold")]
-        self.update()
+        self.router.navigate(self.SCREENS[e.control.selected_index])
 
 
 def create_app(page: Page):
@@ -156,19 +212,60 @@ def create_app(page: Page):
 
     # コンポーネントの初期化
     api_client = APIClient(page)
-    auth_store = AuthStore(page, api_client)
+    auth_store = AuthStore(
+        page,
+        api_client,
+        local_store_factory=lambda user_id: LocalStore(
+            settings.LOCAL_DB_PATH.format(user_id=user_id)
+        ),
+    )
     loading_manager = LoadingManager(page)
+    sync_engine: Optional[SyncEngine] = None
+
+    # ログイン画面とメイン画面は1回だけ構築し、表示を切り替える
+    root = ViewRouter(
+        [
+            ViewRoute("login", lambda: LoginView(auth_store, loading_manager)),
+            ViewRoute("main", lambda: MainView(auth_store, loading_manager)),
+        ],
+        max_cached=2,
+    )
+    page.add(root)
 
-    # 認証状態に応じてビューを切り替え
+    # 認証状態に応じてビューを切り替え、ログイン中はユーザーのローカルストアと同期する
     def on_auth_state_changed():
+        nonlocal sync_engine
         if auth_store.is_authenticated:
-            page.controls = [MainView(auth_store, loading_manager)]
+            if root.current != "main":
+                root.navigate("main")
+            if sync_engine is None and auth_store.local_store is not None:
+                sync_engine = SyncEngine(
+                    auth_store.local_store,
+                    api_client,
+                    interval=settings.SYNC_INTERVAL_SECONDS,
+                )
+                sync_engine.start()
         else:
-            page.controls = [LoginView(auth_store, loading_manager)]
-        page.update()
+            if sync_engine is not None:
+                sync_engine.stop()
+                sync_engine = None
+            # メイン画面はユーザーごとの状態を持つため、ログアウト時に破棄する
+            root.evict("main")
+            root.navigate("login")
 
     # 認証状態の変更を監視
     auth_store.add_listener(on_auth_state_changed)
 
+    # セッション終了時に同期を停止し、共有HTTPプールの利用登録を解除
+    # （ローカルストアの内容は次回のオフライン表示のために残す）
+    def on_close(_):
+        if sync_engine is not None:
+            sync_engine.stop()
+        if auth_store.local_store is not None:
+            auth_store.local_store.close()
+        page.run_task(api_client.close)
+
+    page.on_close = on_close
+
     # 初期ビューの設定
     on_auth_state_changed()
@@ -0,0 +1,45 @@
+"""フロントエンドの設定モジュール"""
+
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+
+
+class FrontendSettings(BaseSettings):
+    """フロントエンドの設定クラス"""
+
+    # API設定
+    API_BASE_URL: str = "http://localhost:8000"
+    API_TIMEOUT: float = 30.0
+
+    # HTTP接続プール設定（プロセス内の全ページで共有）
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True
+
+    # HTTPキャッシュ設定（HTTP_CACHE_DIR を指定するとディスクにも保存する）
+    HTTP_CACHE_MAX_ENTRIES: int = 256
+    HTTP_CACHE_DIR: Optional[str] = None
+
+    # get_user() をまとめて取得する際の1リクエストあたりの最大件数
+    # （バックエンドの BATCH_MAX_IDS 以下にすること）
+    USER_BATCH_SIZE: int = 100
+    # 取得したユーザーを再利用する秒数（0 の場合は同じ周回の重複だけをまとめ、
+    # 鮮度は HTTPキャッシュの ETag 再検証に任せる）
+    USER_LOADER_MAX_AGE: float = 0.0
+
+    # 一覧画面で1回に取得するアイテム数（ログイン時に最初のページを先読みする）
+    ITEM_PAGE_SIZE: int = 50
+
+    # オフライン用ローカルストアと同期の設定
+    # （{user_id} はログインしたユーザーのIDに置き換え、ユーザーごとに分ける）
+    LOCAL_DB_PATH: str = "flet_app_local_{user_id}.db"
+    SYNC_INTERVAL_SECONDS: float = 30.0
+
+    class Config:
+        env_prefix = "FRONTEND_"
+        case_sensitive = True
+
+
+settings = FrontendSettings()
@@ -1,20 +1,34 @@
 """認証状態管理ストア"""
 
+import asyncio
+import functools
 from dataclasses import dataclass, field
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from flet import Page
 
 from src.backend.schemas.user import UserResponse
 from src.frontend.api.client import APIClient
+from src.frontend.config import settings
+from src.frontend.store.local_store import LocalStore
+from src.frontend.store.prefetch_store import Loader, PrefetchStore
 
 
 @dataclass
 class AuthStore:
-    """認証状態管理クラス"""
+    """認証状態管理クラス
+
+    ログイン後はユーザー情報とアイテムの最初のページを並行して取得し、
+    prefetch に保存します。画面は prefetch からすぐに描画できます。
+    local_store_factory を指定した場合は、ログインしたユーザーのIDで
+    ローカルストアを開き、ログアウト時にその内容を削除します。
+    """
 
     page: Page
     api_client: APIClient
+    prefetch: PrefetchStore = field(default_factory=PrefetchStore)
+    local_store_factory: Optional[Callable[[int], LocalStore]] = None
+    local_store: Optional[LocalStore] = None
     _current_user: Optional[UserResponse] = None
     _listeners: List[Callable[[], None]] = field(default_factory=list)
 
@@ -41,17 +55,53 @@ class AuthStore:
         for listener in self._listeners:
             listener()
 
+    def prefetch_loaders(self) -> Dict[str, Loader]:
+        """ログイン直後に並行して取得するデータ"""
+        return {
+            "profile": self.api_client.get_current_user,
+            "items": functools.partial(
+                self.api_client.get_items, 0, settings.ITEM_PAGE_SIZE
+            ),
+        }
+
     async def login(self, username: str, password: str) -> None:
-        """ログイン"""
+        """ログイン
+
+        トークンを取得した後、画面に必要なデータを並行して取得します。
+        ユーザー情報以外の取得に失敗しても、画面側で再取得するためログインは続行します。
+        """
         await self.api_client.login(username, password)
-        self._current_user = await self.api_client.get_current_user()
+        self.prefetch.start(self.prefetch_loaders())
+        results = await self.prefetch.gather()
+
+        profile = results.get("profile")
+        if isinstance(profile, asyncio.CancelledError):
+            # 取得中にログアウトされた
+            return
+        if isinstance(profile, BaseException):
+            self.prefetch.cancel()
+            self.api_client.access_token = None
+            raise profile
+        self._current_user = profile
+        if self.local_store_factory is not None:
+            self.local_store = self.local_store_factory(profile.id)
         self._notify_listeners()
 
     async def logout(self) -> None:
-        """ログアウト"""
+        """ログアウト
+
+        取得中のデータは破棄します。次に同じ端末を使うユーザーに見えないよう、
+        ローカルストアのレコードと未送信の変更も削除します。
+        """
+        self.prefetch.cancel()
         self.api_client.access_token = None
         self._current_user = None
+        local_store, self.local_store = self.local_store, None
+        # リスナーが同期を停止してからローカルストアを削除する
         self._notify_listeners()
+        if local_store is not None:
+            local_store.clear()
+            local_store.close()
 
     async def refresh_user(self) -> None:
         """ユーザー情報の更新"""
@@ -0,0 +1,470 @@
+"""オフライン対応のローカルストア
+
+ユーザーとアイテムをSQLiteに保存し、画面表示をネットワークを待たずに
+行えるようにします。オフライン中の変更は送信キュー（outbox）に保存し、
+SyncEngine がオンライン復帰時にサーバーへ送信します。
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 同期対象のリソース（APIのパス名）
+RESOURCES = ("users", "items")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    resource TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    updated_at TEXT,
+    version INTEGER,
+    PRIMARY KEY (resource, id)
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    resource TEXT NOT NULL,
+    record_id INTEGER NOT NULL,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    base_version INTEGER,
+    idempotency_key TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_outbox_record ON outbox (resource, record_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    cursor TEXT,
+    last_id INTEGER
+);
+"""
+
+
+@dataclass
+class OutboxEntry:
+    """サーバーへ未送信の変更"""
+
+    seq: int
+    resource: str
+    record_id: int
+    op: str
+    payload: Dict[str, Any]
+    base_version: Optional[int]
+    idempotency_key: str
+    status: str
+    attempts: int
+    last_error: Optional[str]
+
+    @property
+    def is_local_only(self) -> bool:
+        """サーバーにまだ存在しないレコード（一時ID）かどうか"""
+        return self.record_id < 0
+
+
+class LocalStore:
+    """SQLiteを使ったローカルストア
+
+    1つのリソースにつき1レコードあたり最大1件の未送信の変更を保持し、
+    同じレコードへの連続した変更はまとめて送信されます。
+    データベースはユーザーごとに分け、ログアウト時には clear() で削除します。
+
+    Args:
+        path: SQLiteデータベースのパス（":memory:" でメモリ上に作成）
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._listeners: Dict[str, List[Callable[[], None]]] = {}
+
+    def close(self) -> None:
+        """データベースを閉じる"""
+        self._conn.close()
+
+    def clear(self) -> None:
+        """レコード・送信キュー・同期位置をすべて削除する（ログアウト時）"""
+        with self._lock, self._conn:
+            for table in ("records", "outbox", "sync_state"):
+                self._conn.execute(f"DELETE FROM {table}")
+        for resource in list(self._listeners):
+            self._notify(resource)
+
+    # ------------------------------------------------------------------
+    # 変更通知
+    # ------------------------------------------------------------------
+
+    def subscribe(
+        self, resource: str, listener: Callable[[], None]
+    ) -> Callable[[], None]:
+        """リソースの変更を監視する
+
+        Returns:
+            Callable[[], None]: 監視を解除する関数
+        """
+        self._listeners.setdefault(resource, []).append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners.get(resource, []):
+                self._listeners[resource].remove(listener)
+
+        return unsubscribe
+
+    def _notify(self, resource: str) -> None:
+        for listener in list(self._listeners.get(resource, [])):
+            listener()
+
+    # ------------------------------------------------------------------
+    # 読み込み
+    # ------------------------------------------------------------------
+
+    def get(self, resource: str, record_id: int) -> Optional[Dict[str, Any]]:
+        """レコードを取得する"""
+        row = self._conn.execute(
+            "SELECT data FROM records WHERE resource = ? AND id = ?",
+            (resource, record_id),
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def query(
+        self,
+        resource: str,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: str = "id",
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """レコードを検索する
+
+        Args:
+            resource: リソース名
+            filters: フィールド名と値の完全一致条件
+            order_by: 並び替えに使うフィールド名
+            descending: 降順にするかどうか
+            limit: 最大件数
+        """
+        sql = "SELECT data FROM records WHERE resource = ?"
+        params: List[Any] = [resource]
+        for name, value in (filters or {}).items():
+            sql += " AND json_extract(data, ?) = ?"
+            params.extend([f"$.{name}", value])
+        sql += f" ORDER BY json_extract(data, ?) {'DESC' if descending else 'ASC'}"
+        params.append(f"$.{order_by}")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row["data"]) for row in self._conn.execute(sql, params)]
+
+    def live_query(self, resource: str, **kwargs: Any) -> "LiveQuery":
+        """変更に追従する検索結果を作成する"""
+        return LiveQuery(self, resource, **kwargs)
+
+    # ------------------------------------------------------------------
+    # サーバーからの反映
+    # ------------------------------------------------------------------
+
+    def apply_remote(self, resource: str, records: List[Dict[str, Any]]) -> int:
+        """サーバーから取得したレコードを保存する
+
+        未送信の変更があるレコードはローカルの内容を優先し、上書きしません。
+
+        Returns:
+            int: 保存した件数
+        """
+        if not records:
+            return 0
+        with self._lock, self._conn:
+            dirty = {
+                row["record_id"]
+                for row in self._conn.execute(
+                    "SELECT record_id FROM outbox WHERE resource = ?", (resource,)
+                )
+            }
+            rows = [
+                (
+                    resource,
+                    record["id"],
+                    json.dumps(record, ensure_ascii=False),
+                    record.get("updated_at"),
+                    record.get("version"),
+                )
+                for record in records
+                if record["id"] not in dirty
+            ]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records "
+                "(resource, id, data, updated_at, version) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        self._notify(resource)
+        return len(rows)
+
+    def remove_remote(self, resource: str, *record_ids: int) -> None:
+        """サーバー上で削除されたレコードと、それらへの未送信の変更を削除する"""
+        if not record_ids:
+            return
+        params = [(resource, record_id) for record_id in record_ids]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM records WHERE resource = ? AND id = ?", params
+            )
+            self._conn.executemany(
+                "DELETE FROM outbox WHERE resource = ? AND record_id = ?", params
+            )
+        self._notify(resource)
+
+    def get_cursor(self, resource: str) -> Tuple[Optional[str], Optional[int]]:
+        """差分取得の位置（最後に取得したレコードの更新日時とID）を取得する"""
+        row = self._conn.execute(
+            "SELECT cursor, last_id FROM sync_state WHERE resource = ?", (resource,)
+        ).fetchone()
+        return (row["cursor"], row["last_id"]) if row else (None, None)
+
+    def set_cursor(
+        self, resource: str, cursor: Optional[str], last_id: Optional[int]
+    ) -> None:
+        """差分取得の位置を保存する"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (resource, cursor, last_id) "
+                "VALUES (?, ?, ?)",
+                (resource, cursor, last_id),
+            )
+
+    # ------------------------------------------------------------------
+    # ローカルでの変更
+    # ------------------------------------------------------------------
+
+    def save_local(self, resource: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """レコードをローカルで作成・更新し、送信キューに追加する
+
+        id がないレコードは一時ID（負の値）で作成します。
+
+        Returns:
+            Dict[str, Any]: 保存したレコード
+        """
+        with self._lock, self._conn:
+            record_id = data.get("id")
+            current = self.get(resource, record_id) if record_id is not None else None
+            if record_id is None:
+                record_id = self._next_temp_id()
+                op = "create"
+            else:
+                op = "update"
+
+            record = {**(current or {}), **data, "id": record_id}
+            self._conn.execute(
+                "INSERT OR REPLACE INTO records "
+                "(resource, id, data, updated_at, version) VALUES (?, ?, ?, ?, ?)",
+                (
+                    resource,
+                    record_id,
+                    json.dumps(record, ensure_ascii=False),
+                    record.get("updated_at"),
+                    record.get("version"),
+                ),
+            )
+
+            payload = {k: v for k, v in data.items() if k not in ("id", "version")}
+            pending = self._pending_for(resource, record_id)
+            if pending is None:
+                self._enqueue(
+                    resource,
+                    record_id,
+                    op,
+                    payload,
+                    (current or {}).get("version"),
+                )
+            else:
+                # 未送信の変更に内容をまとめる
+                self._conn.execute(
+                    "UPDATE outbox SET payload = ?, status = 'pending' WHERE seq = ?",
+                    (
+                        json.dumps({**pending.payload, **payload}, ensure_ascii=False),
+                        pending.seq,
+                    ),
+                )
+        self._notify(resource)
+        return record
+
+    def delete_local(self, resource: str, record_id: int) -> None:
+        """レコードをローカルで削除し、送信キューに追加する"""
+        with self._lock, self._conn:
+            current = self.get(resource, record_id)
+            self._conn.execute(
+                "DELETE FROM records WHERE resource = ? AND id = ?",
+                (resource, record_id),
+            )
+            pending = self._pending_for(resource, record_id)
+            if pending is not None:
+                self._conn.execute("DELETE FROM outbox WHERE seq = ?", (pending.seq,))
+            # サーバーに存在しないレコードは削除を送信する必要がない
+            if record_id >= 0:
+                base_version = (
+                    pending.base_version if pending else (current or {}).get("version")
+                )
+                self._enqueue(resource, record_id, "delete", {}, base_version)
+        self._notify(resource)
+
+    # ------------------------------------------------------------------
+    # 送信キュー
+    # ------------------------------------------------------------------
+
+    def pending_ops(self) -> List[OutboxEntry]:
+        """未送信の変更を追加された順に取得する（競合中のものは除く）"""
+        rows = self._conn.execute(
+            "SELECT * FROM outbox WHERE status = 'pending' ORDER BY seq"
+        ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def conflicts(self) -> List[OutboxEntry]:
+        """サーバーとの競合で保留されている変更を取得する"""
+        rows = self._conn.execute(
+            "SELECT * FROM outbox WHERE status = 'conflict' ORDER BY seq"
+        ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def complete_op(
+        self, entry: OutboxEntry, server_record: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """送信が完了した変更をキューから削除し、サーバーの内容を反映する
+
+        作成した場合は一時IDのレコードをサーバーのIDに置き換えます。
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM outbox WHERE seq = ?", (entry.seq,))
+            if server_record is not None:
+                if server_record["id"] != entry.record_id:
+                    self._conn.execute(
+                        "DELETE FROM records WHERE resource = ? AND id = ?",
+                        (entry.resource, entry.record_id),
+                    )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO records "
+                    "(resource, id, data, updated_at, version) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        entry.resource,
+                        server_record["id"],
+                        json.dumps(server_record, ensure_ascii=False),
+                        server_record.get("updated_at"),
+                        server_record.get("version"),
+                    ),
+                )
+        self._notify(entry.resource)
+
+    def fail_op(self, entry: OutboxEntry, error: str, conflict: bool = False) -> None:
+        """送信に失敗した変更を記録する
+
+        Args:
+            entry: 失敗した変更
+            error: エラー内容
+            conflict: サーバーとの競合の場合はTrue（自動では再送しない）
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ?, status = ? "
+                "WHERE seq = ?",
+                (error, "conflict" if conflict else "pending", entry.seq),
+            )
+
+    def rebase_op(self, entry: OutboxEntry, base_version: int) -> None:
+        """競合を解決した変更を新しいバージョンに対して再送できるようにする"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET base_version = ?, status = 'pending' WHERE seq = ?",
+                (base_version, entry.seq),
+            )
+
+    def _pending_for(self, resource: str, record_id: int) -> Optional[OutboxEntry]:
+        row = self._conn.execute(
+            "SELECT * FROM outbox WHERE resource = ? AND record_id = ?",
+            (resource, record_id),
+        ).fetchone()
+        return self._to_entry(row) if row else None
+
+    def _enqueue(
+        self,
+        resource: str,
+        record_id: int,
+        op: str,
+        payload: Dict[str, Any],
+        base_version: Optional[int],
+    ) -> None:
+        self._conn.execute(
+            "INSERT INTO outbox (resource, record_id, op, payload, base_version, "
+            "idempotency_key, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                resource,
+                record_id,
+                op,
+                json.dumps(payload, ensure_ascii=False),
+                base_version,
+                uuid.uuid4().hex,
+                datetime.utcnow().isoformat(),
+            ),
+        )
+
+    def _next_temp_id(self) -> int:
+        row = self._conn.execute("SELECT MIN(id) AS min_id FROM records").fetchone()
+        return min(row["min_id"] or 0, 0) - 1
+
+    @staticmethod
+    def _to_entry(row: sqlite3.Row) -> OutboxEntry:
+        return OutboxEntry(
+            seq=row["seq"],
+            resource=row["resource"],
+            record_id=row["record_id"],
+            op=row["op"],
+            payload=json.loads(row["payload"]),
+            base_version=row["base_version"],
+            idempotency_key=row["idempotency_key"],
+            status=row["status"],
+            attempts=row["attempts"],
+            last_error=row["last_error"],
+        )
+
+
+class LiveQuery:
+    """ローカルストアの変更に追従する検索結果
+
+    ビューは subscribe() で結果の変化を受け取り、画面を更新します。
+    """
+
+    def __init__(self, store: LocalStore, resource: str, **query: Any):
+        self.store = store
+        self.resource = resource
+        self.query = query
+        self.results: List[Dict[str, Any]] = store.query(resource, **query)
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._unsubscribe = store.subscribe(resource, self._refresh)
+
+    def subscribe(
+        self, listener: Callable[[List[Dict[str, Any]]], None]
+    ) -> Callable[[], None]:
+        """結果の変化を監視する（登録時に現在の結果で一度呼び出す）"""
+        self._listeners.append(listener)
+        listener(self.results)
+        return lambda: self._listeners.remove(listener)
+
+    def close(self) -> None:
+        """ストアの監視を解除する"""
+        self._unsubscribe()
+        self._listeners.clear()
+
+    def _refresh(self) -> None:
+        results = self.store.query(self.resource, **self.query)
+        if results == self.results:
+            return
+        self.results = results
+        for listener in list(self._listeners):
+            listener(results)
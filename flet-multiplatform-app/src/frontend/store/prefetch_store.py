@@ -0,0 +1,86 @@
+"""ログイン直後に取得するデータの共有ストア
+
+複数のデータを並行して取得し、取得結果を名前で保持します。画面は
+peek() で取得済みのデータをすぐに使い、未取得の場合は wait() で待つか
+自分で取得します。ログアウト時は cancel() で取得中の処理を中止します。
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# 引数なしで呼び出してデータを返す非同期関数
+Loader = Callable[[], Awaitable[Any]]
+
+
+class PrefetchStore:
+    """並行して取得したデータを保持するストア"""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._results: Dict[str, Any] = {}
+        self._generation = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._results
+
+    def start(self, loaders: Mapping[str, Loader]) -> None:
+        """データの取得を並行して開始する（実行中の取得は中止される）"""
+        self.cancel()
+        for name, loader in loaders.items():
+            self._tasks[name] = asyncio.ensure_future(self._run(name, loader))
+
+    async def _run(self, name: str, loader: Loader) -> Any:
+        generation = self._generation
+        result = await loader()
+        # 取得中にログアウトされた場合は結果を保存しない
+        if generation == self._generation:
+            self._results[name] = result
+        return result
+
+    async def gather(self) -> Dict[str, Any]:
+        """すべての取得の完了を待つ
+
+        Returns:
+            Dict[str, Any]: 名前ごとの結果（失敗・中止した場合は例外オブジェクト）
+        """
+        names = list(self._tasks)
+        results = await asyncio.gather(
+            *(self._tasks[name] for name in names), return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Prefetch of {name} failed: {result!r}")
+        return dict(zip(names, results))
+
+    def peek(self, name: str, default: Any = None) -> Any:
+        """取得済みのデータを返す（未取得の場合は default）"""
+        return self._results.get(name, default)
+
+    async def wait(self, name: str) -> Optional[Any]:
+        """データの取得完了を待つ（開始されていない場合はNone）
+
+        Raises:
+            Exception: 取得に失敗した場合はその例外
+        """
+        if name in self._results:
+            return self._results[name]
+        task = self._tasks.get(name)
+        if task is None:
+            return None
+        return await asyncio.shield(task)
+
+    def pop(self, name: str, default: Any = None) -> Any:
+        """取得済みのデータを取り出す（画面で1回だけ使う場合）"""
+        return self._results.pop(name, default)
+
+    def cancel(self) -> None:
+        """取得中の処理を中止し、取得済みのデータを破棄する"""
+        self._generation += 1
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+        self._tasks.clear()
+        self._results.clear()
@@ -0,0 +1,238 @@
+"""ローカルストアとサーバーの同期エンジン
+
+送信キューの変更をサーバーへ送信（push）した後、サーバー上での削除記録と
+(updated_at, id) 順の差分を取得（pull）してローカルストアに反映します。
+ネットワークに接続できない場合は変更をキューに残したまま次回の同期まで
+待機します。
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import httpx
+
+from src.frontend.api.client import APIClient
+from src.frontend.store.local_store import RESOURCES, LocalStore, OutboxEntry
+
+logger = logging.getLogger(__name__)
+
+# 競合時に呼び出す関数の型
+# (ローカルの変更, サーバーの最新レコード) -> 再送する内容（Noneの場合はサーバーを優先）
+ConflictResolver = Callable[[OutboxEntry, Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# 再送すれば成功しうる4xx
+# （認証切れ、タイムアウト、処理中の冪等キー、レート制限）
+RETRYABLE_STATUS_CODES = frozenset({401, 408, 409, 429})
+
+
+@dataclass
+class SyncResult:
+    """1回の同期の結果"""
+
+    pushed: int = 0
+    pulled: int = 0
+    deleted: int = 0
+    conflicts: int = 0
+    online: bool = True
+
+
+class SyncEngine:
+    """ローカルストアとAPIを同期するクラス
+
+    Args:
+        store: ローカルストア
+        api_client: APIクライアント
+        resources: 同期するリソース
+        interval: バックグラウンド同期の間隔（秒）
+        page_size: 差分取得の1回あたりの件数
+        on_conflict: 競合時の解決方法（省略時はサーバーの内容を優先）
+    """
+
+    def __init__(
+        self,
+        store: LocalStore,
+        api_client: APIClient,
+        resources: Sequence[str] = RESOURCES,
+        interval: float = 30.0,
+        page_size: int = 100,
+        on_conflict: Optional[ConflictResolver] = None,
+    ):
+        self.store = store
+        self.api_client = api_client
+        self.resources = tuple(resources)
+        self.interval = interval
+        self.page_size = page_size
+        self.on_conflict = on_conflict
+        self.online = True
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """バックグラウンド同期が動作中かどうか"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """バックグラウンド同期を開始する（イベントループ上で呼び出すこと）"""
+        if not self.is_running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """バックグラウンド同期を停止する"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def request_sync(self) -> None:
+        """次の同期を待たずにすぐ同期する（ローカルで変更した直後など）"""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Background sync failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def sync(self) -> SyncResult:
+        """送信キューを送信してから差分を取得する"""
+        async with self._lock:
+            result = SyncResult()
+            try:
+                result.pushed, result.conflicts = await self.push()
+                for resource in self.resources:
+                    # IDが再利用された場合に新しいレコードを消さないよう、削除を先に反映する
+                    result.deleted += await self.pull_deletions(resource)
+                    result.pulled += await self.pull(resource)
+                self.online = True
+            except httpx.TransportError as e:
+                logger.info(f"Offline, keeping local changes queued: {e}")
+                self.online = False
+            result.online = self.online
+            return result
+
+    async def push(self) -> "tuple[int, int]":
+        """送信キューの変更を順番に送信する
+
+        Returns:
+            tuple[int, int]: 送信した件数と競合した件数
+
+        Raises:
+            httpx.TransportError: サーバーに接続できない場合（残りは次回送信）
+        """
+        pushed = conflicts = 0
+        for entry in self.store.pending_ops():
+            try:
+                server_record = await self._send(entry)
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                if status_code == 412:
+                    conflicts += 1
+                    await self._resolve_conflict(entry)
+                elif status_code == 404 and entry.op != "create":
+                    # サーバー上で削除済み
+                    self.store.remove_remote(entry.resource, entry.record_id)
+                elif status_code in RETRYABLE_STATUS_CODES:
+                    # 次回の同期で再送する
+                    self.store.fail_op(entry, str(e))
+                    if status_code == 401:
+                        # 再ログインするまでは残りの変更も失敗するため送信を止める
+                        break
+                elif 400 <= status_code < 500:
+                    # 入力エラーなど再送しても成功しない変更は競合として保留する
+                    self.store.fail_op(entry, str(e), conflict=True)
+                else:
+                    self.store.fail_op(entry, str(e))
+                continue
+            self.store.complete_op(entry, server_record)
+            pushed += 1
+        return pushed, conflicts
+
+    async def pull(self, resource: str) -> int:
+        """前回の同期以降に更新されたレコードを取得する
+
+        (updated_at, id) の順に、最後に取得したレコードより後をページ単位で
+        取得するため、取得中にレコードが更新されても取りこぼしません。
+
+        Returns:
+            int: 取得した件数
+        """
+        cursor, last_id = self.store.get_cursor(resource)
+        pulled = 0
+        while True:
+            records = await self.api_client.get_changes(
+                resource, cursor, after_id=last_id or 0, limit=self.page_size
+            )
+            self.store.apply_remote(resource, records)
+            pulled += len(records)
+            if records:
+                cursor, last_id = records[-1].get("updated_at"), records[-1]["id"]
+                self.store.set_cursor(resource, cursor, last_id)
+            if len(records) < self.page_size:
+                return pulled
+
+    async def pull_deletions(self, resource: str) -> int:
+        """前回の同期以降にサーバー上で削除されたレコードをローカルから削除する
+
+        Returns:
+            int: 取得した削除記録の件数
+        """
+        key = f"{resource}:tombstones"
+        _, last_id = self.store.get_cursor(key)
+        deleted = 0
+        while True:
+            tombstones = await self.api_client.get_tombstones(
+                resource, after_id=last_id or 0, limit=self.page_size
+            )
+            self.store.remove_remote(
+                resource, *(tombstone["record_id"] for tombstone in tombstones)
+            )
+            deleted += len(tombstones)
+            if tombstones:
+                last_id = tombstones[-1]["id"]
+                self.store.set_cursor(key, None, last_id)
+            if len(tombstones) < self.page_size:
+                return deleted
+
+    async def _send(self, entry: OutboxEntry) -> Optional[Dict[str, Any]]:
+        if entry.op == "create":
+            return await self.api_client.create_resource(
+                entry.resource, entry.payload, entry.idempotency_key
+            )
+        if entry.op == "update":
+            return await self.api_client.update_resource(
+                entry.resource, entry.record_id, entry.payload, entry.base_version
+            )
+        await self.api_client.delete_resource(entry.resource, entry.record_id)
+        return None
+
+    async def _resolve_conflict(self, entry: OutboxEntry) -> None:
+        """サーバーの最新レコードと比較して競合を解決する"""
+        try:
+            server_record = await self.api_client.get_resource(
+                entry.resource, entry.record_id
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+            self.store.remove_remote(entry.resource, entry.record_id)
+            return
+
+        resolved = self.on_conflict(entry, server_record) if self.on_conflict else None
+        if resolved is None:
+            # サーバーの内容を優先し、ローカルの変更を破棄する
+            self.store.complete_op(entry, server_record)
+            return
+
+        self.store.save_local(entry.resource, {**resolved, "id": entry.record_id})
+        self.store.rebase_op(entry, server_record["version"])
@@ -0,0 +1,102 @@
+"""ログイン時の先読みのテスト"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.frontend.api.cache import HTTPCache
+from src.frontend.api.client import APIClient
+from src.frontend.api.transport import TransportPool
+from src.frontend.store.auth_store import AuthStore
+
+LATENCY = 0.05
+
+USER = {
+    "id": 1,
+    "email": "user@example.com",
+    "username": "user",
+    "is_active": True,
+    "is_superuser": False,
+    "created_at": "2026-10-19T00:00:00",
+    "updated_at": "2026-10-19T00:00:00",
+}
+
+
+class SlowServer:
+    """すべてのリクエストに一定の遅延を入れるテスト用サーバー"""
+
+    def __init__(self, fail_profile: bool = False):
+        self.fail_profile = fail_profile
+        self.paths = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        await asyncio.sleep(LATENCY)
+        if request.url.path == "/api/v1/auth/login":
+            return httpx.Response(200, json={"access_token": "token"})
+        if request.url.path == "/api/v1/auth/me":
+            if self.fail_profile:
+                return httpx.Response(500)
+            return httpx.Response(200, json=USER)
+        return httpx.Response(200, json=[{"id": 1, "title": "item"}])
+
+
+def _store(server: SlowServer) -> AuthStore:
+    pool = TransportPool(
+        "http://testserver", http2=False, transport=httpx.MockTransport(server)
+    )
+    client = APIClient(page=None, pool=pool, cache=HTTPCache())
+    return AuthStore(page=None, api_client=client)
+
+
+@pytest.mark.asyncio
+async def test_login_prefetches_concurrently_and_halves_time_to_interactive():
+    """ログイン後のデータ取得が並行に行われ、表示までの時間が短くなること"""
+    # 変更前: トークン取得・ユーザー情報・アイテム一覧を順番に取得
+    before_store = _store(SlowServer())
+    started = time.perf_counter()
+    await before_store.api_client.login("user", "password")
+    await before_store.api_client.get_current_user()
+    await before_store.api_client.get_items(0, 50)
+    before = time.perf_counter() - started
+
+    store = _store(SlowServer())
+    started = time.perf_counter()
+    await store.login("user", "password")
+    after = time.perf_counter() - started
+
+    assert store.current_user.id == 1
+    assert store.prefetch.peek("items") == [{"id": 1, "title": "item"}]
+    assert set(store.prefetch_loaders()) == {"profile", "items"}
+    assert after < before * 0.8
+
+
+@pytest.mark.asyncio
+async def test_logout_cancels_pending_prefetch():
+    """先読み中にログアウトすると取得が中止され、ログイン状態にならないこと"""
+    store = _store(SlowServer())
+    notified = []
+    store.add_listener(lambda: notified.append(store.is_authenticated))
+
+    login = asyncio.ensure_future(store.login("user", "password"))
+    await asyncio.sleep(LATENCY * 1.5)  # トークン取得後、先読み中
+    await store.logout()
+    await login
+
+    assert store.is_authenticated is False
+    assert store.prefetch.peek("items") is None
+    assert notified == [False]
+
+
+@pytest.mark.asyncio
+async def test_profile_failure_fails_login():
+    """ユーザー情報の取得に失敗した場合はログインが失敗し、トークンが破棄されること"""
+    store = _store(SlowServer(fail_profile=True))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await store.login("user", "password")
+
+    assert store.is_authenticated is False
+    assert store.api_client.access_token is None
@@ -0,0 +1,154 @@
+"""DataLoader のテスト"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.frontend.api.cache import HTTPCache
+from src.frontend.api.client import APIClient
+from src.frontend.api.dataloader import DataLoader
+from src.frontend.api.transport import TransportPool
+
+
+def _user(user_id: int) -> dict:
+    return {
+        "id": user_id,
+        "email": f"user{user_id}@example.com",
+        "username": f"user{user_id}",
+        "is_active": True,
+        "is_superuser": False,
+        "created_at": "2026-10-19T00:00:00",
+        "updated_at": "2026-10-19T00:00:00",
+    }
+
+
+class FakeUsersServer:
+    """?ids= による一括取得に対応したテスト用サーバー"""
+
+    def __init__(self, existing=range(1, 100)):
+        self.existing = set(existing)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path.rstrip("/")
+        if path == "/api/v1/users":
+            ids = sorted({int(i) for i in request.url.params.get_list("ids")})
+            return httpx.Response(
+                200, json=[_user(i) for i in ids if i in self.existing]
+            )
+        user_id = int(path.rsplit("/", 1)[-1])
+        if user_id not in self.existing:
+            return httpx.Response(404, json={"detail": "not found"})
+        return httpx.Response(200, json=_user(user_id))
+
+
+def _client(server: FakeUsersServer) -> APIClient:
+    pool = TransportPool(
+        "http://testserver", http2=False, transport=httpx.MockTransport(server)
+    )
+    return APIClient(page=None, pool=pool, cache=HTTPCache())
+
+
+@pytest.mark.asyncio
+async def test_get_user_calls_in_one_tick_become_one_request():
+    """同じ周回の get_user() が1回の一括リクエストになること"""
+    server = FakeUsersServer()
+    client = _client(server)
+
+    users = await asyncio.gather(*(client.get_user(i) for i in (3, 1, 2, 3)))
+
+    assert [user.id for user in users] == [3, 1, 2, 3]
+    assert len(server.requests) == 1
+    assert server.requests[0].url.params.get_list("ids") == ["3", "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_missing_user_raises_404_without_failing_others():
+    """存在しないユーザーだけが個別取得と同じ 404 エラーになること"""
+    server = FakeUsersServer(existing=[1])
+    client = _client(server)
+
+    results = await asyncio.gather(
+        client.get_user(1), client.get_user(2), return_exceptions=True
+    )
+
+    assert results[0].id == 1
+    assert isinstance(results[1], httpx.HTTPStatusError)
+    assert results[1].response.status_code == 404
+    assert len(server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_by_max_batch_size():
+    """最大件数を超えるキーは複数のバッチに分割されること"""
+    batches = []
+
+    async def batch_load(keys):
+        batches.append(list(keys))
+        return {key: key * 10 for key in keys}
+
+    loader = DataLoader(batch_load, max_batch_size=2)
+
+    assert await loader.load_many([1, 2, 3]) == [10, 20, 30]
+    assert batches == [[1, 2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_running_batches_are_referenced_until_done():
+    """実行中の一括取得タスクが完了まで参照され、完了後に破棄されること"""
+    release = asyncio.Event()
+
+    async def batch_load(keys):
+        await release.wait()
+        return {key: key for key in keys}
+
+    loader = DataLoader(batch_load)
+    pending = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert len(loader._tasks) == 1
+    release.set()
+    assert await pending == 1
+    await asyncio.sleep(0)
+    assert not loader._tasks
+
+
+@pytest.mark.asyncio
+async def test_values_are_cached_per_key_until_cleared():
+    """取得した値がキーごとにキャッシュされ、clear() で破棄されること"""
+    batches = []
+
+    async def batch_load(keys):
+        batches.append(list(keys))
+        return {key: object() for key in keys}
+
+    loader = DataLoader(batch_load)
+    first = await loader.load(1)
+
+    assert await loader.load(1) is first
+    assert loader.stats.cache_hits == 1
+
+    loader.clear(1)
+    assert await loader.load(1) is not first
+    assert batches == [[1], [1]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_not_cached():
+    """一括取得の失敗はキャッシュされず、次の load() で再取得されること"""
+    calls = []
+
+    async def batch_load(keys):
+        calls.append(list(keys))
+        if len(calls) == 1:
+            raise httpx.ConnectError("offline")
+        return {key: key for key in keys}
+
+    loader = DataLoader(batch_load)
+
+    with pytest.raises(httpx.ConnectError):
+        await loader.load(1)
+    assert await loader.load(1) == 1
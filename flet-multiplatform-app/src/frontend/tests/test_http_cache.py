@@ -0,0 +1,160 @@
+"""HTTPキャッシュのテスト"""
+
+import httpx
+import pytest
+
+from src.frontend.api.cache import HTTPCache, parse_cache_control
+from src.frontend.api.client import APIClient
+from src.frontend.api.transport import TransportPool
+
+USER = {
+    "id": 1,
+    "email": "user@example.com",
+    "username": "user",
+    "is_active": True,
+    "is_superuser": False,
+    "created_at": "2026-10-19T00:00:00",
+    "updated_at": "2026-10-19T00:00:00",
+}
+
+
+class FakeServer:
+    """ETagとCache-Controlを返すテスト用サーバー"""
+
+    def __init__(self, cache_control: str = "private, no-cache"):
+        self.cache_control = cache_control
+        self.version = 1
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method != "GET":
+            self.version += 1
+            return httpx.Response(200, json=USER)
+        etag = f'"{self.version}"'
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json=USER, headers=headers)
+
+
+def _client(server: FakeServer, cache: HTTPCache = None) -> APIClient:
+    pool = TransportPool(
+        "http://testserver", http2=False, transport=httpx.MockTransport(server)
+    )
+    return APIClient(
+        page=None, pool=pool, cache=cache if cache is not None else HTTPCache()
+    )
+
+
+def test_parse_cache_control():
+    """Cache-Controlのディレクティブが解析されること"""
+    assert parse_cache_control('Private, max-age="60", no-cache') == {
+        "private": None,
+        "max-age": "60",
+        "no-cache": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_revalidates_with_etag_and_serves_304_from_cache():
+    """期限切れのエントリがIf-None-Matchで再検証され、304で本文が再利用されること"""
+    server = FakeServer()
+    client = _client(server)
+
+    first = await client.get_user(1)
+    second = await client.get_user(1)
+
+    assert first == second
+    assert server.requests[1].headers["If-None-Match"] == '"1"'
+    assert client.cache.stats.revalidated == 1
+    assert client.cache.stats.bytes_saved > 0
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_without_request():
+    """max-ageの間はリクエストを送信しないこと"""
+    server = FakeServer(cache_control="private, max-age=60")
+    client = _client(server)
+
+    await client.get_user(1)
+    await client.get_user(1)
+
+    assert len(server.requests) == 1
+    assert client.cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_no_store_is_not_cached():
+    """no-storeのレスポンスは保存されないこと"""
+    server = FakeServer(cache_control="no-store")
+    client = _client(server)
+
+    await client.get_user(1)
+    await client.get_user(1)
+
+    assert "If-None-Match" not in server.requests[1].headers
+    assert len(client.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_mutation_invalidates_collection():
+    """更新系リクエストの成功で同じリソースのキャッシュが破棄されること"""
+    server = FakeServer(cache_control="private, max-age=60")
+    client = _client(server)
+
+    await client.get_user(1)
+    assert len(client.cache) == 1
+
+    await client._request("PUT", "/api/v1/users/1", json={"username": "new"})
+
+    assert len(client.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_disk_persistence(tmp_path):
+    """上限を超えると古いエントリが削除され、ディスクから復元できること"""
+    server = FakeServer()
+    cache = HTTPCache(max_entries=2, directory=tmp_path)
+    client = _client(server, cache)
+
+    for user_id in (1, 2, 3):
+        await client.get_user(user_id)
+
+    assert len(cache) == 2
+    assert len(list(tmp_path.glob("anonymous/*.json"))) == 2
+
+    restored = HTTPCache(max_entries=2, directory=tmp_path)
+    await _client(server, restored).get_user(3)
+
+    urls = sorted(entry.url for entry in restored._entries.values())
+    assert urls == [
+        "http://testserver/api/v1/users/2",
+        "http://testserver/api/v1/users/3",
+    ]
+    assert server.requests[-1].headers["If-None-Match"] == '"1"'
+
+
+@pytest.mark.asyncio
+async def test_shared_directory_keeps_users_apart(tmp_path):
+    """ディスクを共有しても他のユーザーのエントリを読み込まず、ログアウトで消さないこと"""
+    server = FakeServer()
+    alice = _client(server, HTTPCache(directory=tmp_path))
+    alice.access_token = "alice-token"
+    await alice.get_user(1)
+
+    bob = _client(server, HTTPCache(directory=tmp_path))
+    bob.access_token = "bob-token"
+    await bob.get_user(1)
+    assert len(bob.cache) == 1
+
+    bob.access_token = None
+
+    assert len(bob.cache) == 0
+    files = list(tmp_path.glob("*/*.json"))
+    assert len(files) == 1
+    restored = HTTPCache(directory=tmp_path)
+    restored_alice = _client(server, restored)
+    restored_alice.access_token = "alice-token"
+    await restored_alice.get_user(1)
+    assert restored.stats.revalidated == 1
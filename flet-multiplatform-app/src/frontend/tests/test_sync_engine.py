@@ -0,0 +1,310 @@
+"""ローカルストアと同期エンジンのテスト"""
+
+import uuid
+from typing import Optional
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.api.routes import api_router
+from backend.core.db import Base, get_db
+from src.frontend.api.cache import HTTPCache
+from src.frontend.api.client import APIClient
+from src.frontend.api.transport import TransportPool
+from src.frontend.store.auth_store import AuthStore
+from src.frontend.store.local_store import LocalStore
+from src.frontend.store.sync_engine import SyncEngine
+
+
+class SwitchableTransport(httpx.AsyncBaseTransport):
+    """オフライン状態を切り替えられるトランスポート"""
+
+    def __init__(self, app: FastAPI):
+        self.inner = httpx.ASGITransport(app=app)
+        self.offline = False
+        # 設定した場合はサーバーに届けずにこのステータスコードを返す
+        self.status_code: Optional[int] = None
+        self.requests = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.offline:
+            raise httpx.ConnectError("network is unreachable", request=request)
+        self.requests += 1
+        if self.status_code is not None:
+            return httpx.Response(self.status_code, json={"detail": "error"})
+        return await self.inner.handle_async_request(request)
+
+
+@pytest_asyncio.fixture
+async def transport(tmp_path):
+    """テスト用のバックエンドに接続するトランスポート"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'server.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = override_get_db
+
+    yield SwitchableTransport(app)
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def store():
+    """メモリ上のローカルストア"""
+    local_store = LocalStore()
+    yield local_store
+    local_store.close()
+
+
+def _engine(transport, store) -> SyncEngine:
+    pool = TransportPool("http://testserver", http2=False, transport=transport)
+    client = APIClient(page=None, pool=pool, cache=HTTPCache())
+    return SyncEngine(store, client, resources=("items",), page_size=2)
+
+
+@pytest.mark.asyncio
+async def test_offline_writes_are_queued_and_replayed(transport, store):
+    """オフライン中の作成がキューに残り、オンライン復帰後にサーバーIDへ置き換わること"""
+    engine = _engine(transport, store)
+    transport.offline = True
+
+    local = store.save_local("items", {"title": "offline", "owner_id": 1})
+    result = await engine.sync()
+
+    assert local["id"] < 0
+    assert result.online is False
+    assert len(store.pending_ops()) == 1
+
+    transport.offline = False
+    result = await engine.sync()
+
+    assert result.online is True
+    assert result.pushed == 1
+    assert store.pending_ops() == []
+    [item] = store.query("items")
+    assert item["id"] > 0
+    assert item["title"] == "offline"
+
+
+@pytest.mark.asyncio
+async def test_pull_fetches_deltas_in_pages(transport, store):
+    """差分がページ単位で取得され、カーソルが更新されること"""
+    engine = _engine(transport, store)
+    for i in range(5):
+        await engine.api_client.create_resource(
+            "items", {"title": f"item {i}", "owner_id": 1}, uuid.uuid4().hex
+        )
+
+    assert await engine.pull("items") == 5
+    assert len(store.query("items")) == 5
+    last = max(store.query("items"), key=lambda r: (r["updated_at"], r["id"]))
+    assert store.get_cursor("items") == (last["updated_at"], last["id"])
+
+    # 次の同期では、その後に更新されたレコードだけを取得する
+    first = min(store.query("items"), key=lambda r: r["id"])
+    await engine.api_client.update_resource(
+        "items", first["id"], {"title": "updated"}, first["version"]
+    )
+    assert await engine.pull("items") == 1
+    assert store.get("items", first["id"])["title"] == "updated"
+
+
+@pytest.mark.asyncio
+async def test_server_deletes_are_applied_from_tombstones(transport, store):
+    """サーバー上での削除が削除記録から反映され、未送信の変更も破棄されること"""
+    engine = _engine(transport, store)
+    created = [
+        await engine.api_client.create_resource(
+            "items", {"title": f"item {i}", "owner_id": 1}, uuid.uuid4().hex
+        )
+        for i in range(3)
+    ]
+    await engine.sync()
+
+    # 別の端末での削除
+    for item in created[:2]:
+        await engine.api_client.delete_resource("items", item["id"])
+    store.save_local("items", {"id": created[0]["id"], "title": "local"})
+
+    result = await engine.sync()
+
+    assert result.deleted == 2
+    assert [item["id"] for item in store.query("items")] == [created[2]["id"]]
+    assert store.pending_ops() == []
+    assert (await engine.sync()).deleted == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_update_is_detected_as_conflict(transport, store):
+    """古いバージョンへの更新が競合として検出され、既定ではサーバーが優先されること"""
+    engine = _engine(transport, store)
+    created = await engine.api_client.create_resource(
+        "items", {"title": "original", "owner_id": 1}, uuid.uuid4().hex
+    )
+    await engine.pull("items")
+
+    # 別の端末での更新
+    await engine.api_client.update_resource(
+        "items", created["id"], {"title": "remote"}, created["version"]
+    )
+    store.save_local("items", {"id": created["id"], "title": "local"})
+
+    result = await engine.sync()
+
+    assert result.conflicts == 1
+    assert store.pending_ops() == []
+    assert store.get("items", created["id"])["title"] == "remote"
+
+
+@pytest.mark.asyncio
+async def test_conflict_resolver_can_keep_local_changes(transport, store):
+    """競合解決関数が返した内容が最新バージョンに対して再送されること"""
+    engine = _engine(transport, store)
+    engine.on_conflict = lambda entry, server: entry.payload
+    created = await engine.api_client.create_resource(
+        "items", {"title": "original", "owner_id": 1}, uuid.uuid4().hex
+    )
+    await engine.pull("items")
+    await engine.api_client.update_resource(
+        "items", created["id"], {"title": "remote"}, created["version"]
+    )
+    store.save_local("items", {"id": created["id"], "title": "local"})
+
+    await engine.sync()
+    await engine.sync()
+
+    server = await engine.api_client.get_resource("items", created["id"])
+    assert server["title"] == "local"
+    assert server["version"] == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code", [408, 409, 429])
+async def test_retryable_errors_keep_changes_pending(transport, store, status_code):
+    """処理中の冪等キーなど再送で成功しうるエラーでは、変更が次回の同期で再送されること"""
+    engine = _engine(transport, store)
+    store.save_local("items", {"title": "first", "owner_id": 1})
+    store.save_local("items", {"title": "second", "owner_id": 1})
+
+    transport.status_code = status_code
+    assert await engine.push() == (0, 0)
+
+    assert [entry.attempts for entry in store.pending_ops()] == [1, 1]
+    assert store.conflicts() == []
+
+    transport.status_code = None
+    assert await engine.push() == (2, 0)
+    assert store.pending_ops() == []
+
+
+@pytest.mark.asyncio
+async def test_expired_token_stops_push_without_stranding_changes(transport, store):
+    """認証切れでは送信を止め、変更を再ログイン後の同期まで残すこと"""
+    engine = _engine(transport, store)
+    store.save_local("items", {"title": "first", "owner_id": 1})
+    store.save_local("items", {"title": "second", "owner_id": 1})
+
+    transport.status_code = 401
+    assert await engine.push() == (0, 0)
+
+    assert transport.requests == 1
+    assert [entry.attempts for entry in store.pending_ops()] == [1, 0]
+    assert store.conflicts() == []
+
+    transport.status_code = None
+    assert await engine.push() == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_validation_errors_are_held_as_conflicts(transport, store):
+    """入力エラーの変更は自動では再送せず、競合として保留すること"""
+    engine = _engine(transport, store)
+    store.save_local("items", {"title": "invalid", "owner_id": 1})
+
+    transport.status_code = 422
+    await engine.push()
+
+    assert store.pending_ops() == []
+    assert [entry.last_error is not None for entry in store.conflicts()] == [True]
+
+
+def test_live_query_follows_local_changes(store):
+    """LiveQueryがローカルの変更に追従すること"""
+    seen = []
+    live = store.live_query("items", filters={"owner_id": 1}, order_by="title")
+    live.subscribe(lambda results: seen.append([r["title"] for r in results]))
+
+    store.save_local("items", {"title": "b", "owner_id": 1})
+    store.save_local("items", {"title": "a", "owner_id": 1})
+    store.save_local("items", {"title": "other", "owner_id": 2})
+
+    assert seen == [[], ["b"], ["a", "b"]]
+    live.close()
+
+
+@pytest.mark.asyncio
+async def test_switching_users_does_not_leak_local_data(tmp_path):
+    """ログアウトでローカルのデータと送信キューが消え、次のユーザーには見えないこと"""
+    users = {
+        name: {
+            "id": user_id,
+            "email": f"{name}@example.com",
+            "username": name,
+            "is_active": True,
+            "is_superuser": False,
+            "created_at": "2026-10-19T00:00:00",
+            "updated_at": "2026-10-19T00:00:00",
+        }
+        for user_id, name in enumerate(("alice", "bob"), start=1)
+    }
+    current = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v1/auth/login":
+            username = dict(
+                pair.split("=") for pair in request.content.decode().split("&")
+            )["username"]
+            current["user"] = users[username]
+            return httpx.Response(200, json={"access_token": username})
+        if request.url.path == "/api/v1/auth/me":
+            return httpx.Response(200, json=current["user"])
+        return httpx.Response(200, json=[])
+
+    pool = TransportPool(
+        "http://testserver", http2=False, transport=httpx.MockTransport(handler)
+    )
+    auth_store = AuthStore(
+        page=None,
+        api_client=APIClient(page=None, pool=pool, cache=HTTPCache()),
+        local_store_factory=lambda user_id: LocalStore(
+            str(tmp_path / f"local_{user_id}.db")
+        ),
+    )
+
+    await auth_store.login("alice", "password")
+    auth_store.local_store.save_local("items", {"title": "alice's", "owner_id": 1})
+    await auth_store.logout()
+
+    assert auth_store.local_store is None
+    reopened = LocalStore(str(tmp_path / "local_1.db"))
+    assert reopened.query("items") == []
+    assert reopened.pending_ops() == []
+    reopened.close()
+
+    await auth_store.login("bob", "password")
+    assert auth_store.local_store.path == str(tmp_path / "local_2.db")
+    assert auth_store.local_store.query("items") == []
+    await auth_store.logout()
@@ -0,0 +1,76 @@
+"""共有HTTPトランスポートのテスト"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.frontend.api.client import APIClient
+from src.frontend.api.transport import TransportPool
+
+
+async def _serve_keepalive(reader, writer):
+    """Keep-Aliveで固定のレスポンスを返す簡易HTTPサーバー"""
+    while True:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            break
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/json\r\n"
+            b"Content-Length: 2\r\n\r\n{}"
+        )
+        await writer.drain()
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connections():
+    """連続したリクエストで接続が再利用され、統計に反映されること"""
+    server = await asyncio.start_server(_serve_keepalive, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    pool = TransportPool(f"http://127.0.0.1:{port}", http2=False)
+
+    try:
+        for _ in range(5):
+            response = await pool.client.get("/")
+            assert response.status_code == 200
+    finally:
+        await pool.aclose()
+        server.close()
+
+    assert pool.metrics.requests == 5
+    assert pool.metrics.connections_opened == 1
+    assert pool.metrics.reuse_ratio == pytest.approx(0.8)
+
+
+@pytest.mark.asyncio
+async def test_clients_share_pool_with_separate_auth_headers():
+    """ページごとのAPIClientが接続を共有しつつ、認証ヘッダーは分離されること"""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("Authorization"))
+        return httpx.Response(200, json=[])
+
+    pool = TransportPool(
+        "http://testserver", http2=False, transport=httpx.MockTransport(handler)
+    )
+    first = APIClient(page=None, pool=pool)
+    second = APIClient(page=None, pool=pool)
+    first.access_token = "token-a"
+
+    await first.get_users()
+    await second.get_users()
+    assert seen == ["Bearer token-a", None]
+    assert pool.metrics.active_clients == 2
+
+    # ページを閉じても共有クライアントは閉じられない
+    await first.close()
+    assert pool.metrics.active_clients == 1
+    assert not pool.client.is_closed
+    with pytest.raises(RuntimeError):
+        await first.get_users()
+
+    await second.close()
+    await pool.aclose()
@@ -0,0 +1,160 @@
+"""更新スケジューラのテスト"""
+
+import asyncio
+import threading
+
+import flet as ft
+import pytest
+
+from src.frontend.utils.async_utils import LoadingManager
+from src.frontend.utils.headless import create_headless_page
+from src.frontend.utils.update_scheduler import UpdateScheduler, get_update_scheduler
+
+
+async def _next_tick():
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+def _targets(conn) -> set:
+    """送信された set コマンドの対象コントロールID"""
+    return {
+        value
+        for message in conn.messages
+        for command in message.commands
+        if command.name == "set"
+        for value in command.values
+    }
+
+
+@pytest.mark.asyncio
+async def test_requests_in_same_tick_are_coalesced():
+    """同じ周回の更新要求が1回の送信にまとめられ、変更したコントロールだけが送られること"""
+    page, conn = create_headless_page()
+    first, second, untouched = ft.Text("a"), ft.Text("b"), ft.Text("c")
+    page.add(first, second, untouched)
+    scheduler = get_update_scheduler(page)
+    conn.reset()
+
+    first.value = "a2"
+    scheduler.request(first)
+    second.value = "b2"
+    scheduler.request(second)
+    scheduler.request(first)
+    assert conn.messages == []
+
+    await _next_tick()
+
+    assert len(conn.messages) == 1
+    assert _targets(conn) == {first.uid, second.uid}
+
+
+@pytest.mark.asyncio
+async def test_descendants_of_dirty_controls_are_not_sent_twice():
+    """祖先が更新対象の場合は子孫を別に送信しないこと"""
+    page, conn = create_headless_page()
+    child = ft.Text("a")
+    column = ft.Column([child])
+    page.add(column)
+    scheduler = UpdateScheduler(page)
+    conn.reset()
+
+    child.value = "b"
+    scheduler.request(child, column)
+    await _next_tick()
+
+    [message] = conn.messages
+    assert [command.values for command in message.commands] == [[child.uid]]
+
+
+@pytest.mark.asyncio
+async def test_batch_flushes_once_on_outermost_exit():
+    """batch() 内の要求は一番外側のブロックを抜けたときに1回だけ送信されること"""
+    page, conn = create_headless_page()
+    text = ft.Text("a")
+    page.add(text)
+    scheduler = UpdateScheduler(page)
+    conn.reset()
+
+    with scheduler.batch():
+        text.value = "b"
+        scheduler.request(text)
+        with scheduler.batch():
+            text.value = "c"
+            scheduler.request(text)
+        assert conn.messages == []
+
+    assert len(conn.messages) == 1
+    assert scheduler.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_from_worker_threads_are_flushed_on_the_loop():
+    """スレッドプールの同期ハンドラからの要求もページのイベントループで送信されること"""
+    page, conn = create_headless_page()
+    text = ft.Text("a")
+    page.add(text)
+    scheduler = UpdateScheduler(page)
+    conn.reset()
+
+    def handler():
+        text.value = "b"
+        scheduler.request(text)
+        scheduler.request(text)
+
+    thread = threading.Thread(target=handler)
+    thread.start()
+    thread.join()
+    await _next_tick()
+
+    assert len(conn.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_messages_per_interaction():
+    """ローディング表示とデータ取得の待機を伴う1回の操作で送信されるメッセージ数"""
+    page, conn = create_headless_page()
+    content = ft.Column([ft.Text("ダッシュボード")])
+    page.add(content)
+
+    async def fetch():
+        # ネットワーク越しのデータ取得
+        await asyncio.sleep(0.01)
+
+    # 変更前: ローディング開始・画面切り替え・ローディング終了のたびに送信
+    progress_bar = ft.ProgressBar(visible=False)
+    page.add(progress_bar)
+    conn.reset()
+    progress_bar.visible = True
+    page.update()
+    await fetch()
+    content.controls = [ft.Text("プロフィール")]
+    content.update()
+    progress_bar.visible = False
+    page.update()
+    before = len(conn.messages)
+
+    # 変更後: 待機前にローディング表示だけが送られ、
+    # 待機後の画面切り替えとローディング終了は1回にまとまる
+    loading_manager = LoadingManager(page)
+    await _next_tick()
+    conn.reset()
+
+    async def show_settings():
+        await fetch()
+        content.controls = [ft.Text("設定")]
+        get_update_scheduler(page).request(content)
+
+    await loading_manager.with_loading(show_settings())
+    await _next_tick()
+    after = len(conn.messages)
+
+    assert before == 3
+    assert after == 2
+    # ローディング表示は待機中に画面へ届いている
+    assert loading_manager._progress_bar.uid in {
+        value
+        for command in conn.messages[0].commands
+        if command.name == "set"
+        for value in command.values
+    }
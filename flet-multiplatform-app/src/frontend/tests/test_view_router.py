@@ -0,0 +1,101 @@
+"""ビュールーターのテスト"""
+
+import asyncio
+
+import flet as ft
+import pytest
+
+from src.components.navigation.view_router import ViewRoute, ViewRouter
+from src.components.screens.profile_screen import create_profile_view
+from src.components.screens.settings_screen import create_settings_view
+from src.frontend.utils.headless import create_headless_page
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _router(page, max_cached=3) -> ViewRouter:
+    return ViewRouter(
+        [
+            ViewRoute("home", lambda: ft.Column([ft.TextField()]), preload=["profile"]),
+            ViewRoute(
+                "profile", lambda: create_profile_view(page), title="プロフィール"
+            ),
+            ViewRoute("settings", lambda: create_settings_view(page), title="設定"),
+        ],
+        max_cached=max_cached,
+    )
+
+
+@pytest.mark.asyncio
+async def test_views_are_built_once_and_keep_state():
+    """画面は1回だけ構築され、戻ったときに状態が保持されていること"""
+    page, conn = create_headless_page()
+    router = _router(page)
+    page.add(router)
+
+    home = router.navigate("home")
+    home.controls[0].value = "入力中"
+    router.navigate("settings")
+    again = router.navigate("home")
+
+    assert again is home
+    assert again.controls[0].value == "入力中"
+    assert router.build_count["home"] == 1
+    assert page.title == "設定"
+
+
+@pytest.mark.asyncio
+async def test_navigation_to_built_view_only_toggles_visibility():
+    """構築済みの画面への遷移ではコントロールの追加が送信されないこと"""
+    page, conn = create_headless_page()
+    router = _router(page)
+    page.add(router)
+    router.navigate("home")
+    router.navigate("settings")
+    await _settle()
+    conn.reset()
+
+    router.navigate("home")
+    await _settle()
+
+    names = [name for message in conn.messages for name in message.names]
+    assert "add" not in names
+    assert len(conn.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_next_screen_is_preloaded_in_background():
+    """表示した画面の次の画面がバックグラウンドで構築されること"""
+    page, conn = create_headless_page()
+    router = _router(page)
+    page.add(router)
+
+    router.navigate("home")
+    assert not router.is_built("profile")
+    await _settle()
+
+    assert router.is_built("profile")
+    assert router.current == "home"
+    assert router.view("profile").page is page
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_and_keeps_current_view():
+    """上限を超えると最も使われていない画面が破棄され、表示中の画面は残ること"""
+    page, conn = create_headless_page()
+    router = _router(page, max_cached=2)
+    page.add(router)
+
+    router.navigate("settings")
+    router.navigate("profile")
+    router.navigate("home")
+    await _settle()
+
+    assert router.cached == ["profile", "home"]
+    assert len(router.controls) == 2
+
+    router.navigate("settings")
+    assert router.build_count["settings"] == 2
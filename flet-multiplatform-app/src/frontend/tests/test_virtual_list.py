@@ -0,0 +1,139 @@
+"""仮想化リストのテスト"""
+
+import pytest
+
+from src.components.common.virtual_list import VirtualList
+from src.frontend.utils.headless import create_headless_page
+
+ITEMS = [{"id": i, "title": f"item {i}"} for i in range(10_000)]
+
+
+class FakeAPI:
+    """取得したページの位置を記録するテスト用API"""
+
+    def __init__(self, items=ITEMS):
+        self.items = items
+        self.offsets = []
+
+    async def fetch_page(self, offset, limit):
+        self.offsets.append(offset)
+        return self.items[offset : offset + limit]
+
+
+def _titles(item_list: VirtualList) -> list:
+    titles = []
+    for slot in item_list._slots:
+        row, skeleton = slot.content.controls
+        if slot.visible:
+            titles.append(row.title.value if row.visible else None)
+    return titles
+
+
+@pytest.mark.asyncio
+async def test_builds_only_visible_rows_and_shows_skeletons():
+    """表示範囲の行だけが構築され、未取得の行はスケルトンになること"""
+    page, conn = create_headless_page()
+    api = FakeAPI()
+    item_list = VirtualList(
+        api.fetch_page,
+        item_extent=50,
+        viewport_height=500,
+        overscan=2,
+        total=len(ITEMS),
+    )
+    page.add(item_list)
+
+    assert len(item_list._slots) == 15
+    assert _titles(item_list) == [None] * 15
+    assert item_list._bottom.height == (len(ITEMS) - 15) * 50
+
+    await item_list.load_visible()
+
+    assert api.offsets == [0, 50]
+    assert _titles(item_list)[:2] == ["item 0", "item 1"]
+
+
+@pytest.mark.asyncio
+async def test_scroll_recycles_rows_and_prefetches_ahead():
+    """スクロールで行コントロールが再利用され、先のページが先読みされること"""
+    page, conn = create_headless_page()
+    api = FakeAPI()
+    item_list = VirtualList(
+        api.fetch_page,
+        item_extent=50,
+        viewport_height=500,
+        overscan=2,
+        page_size=20,
+        total=len(ITEMS),
+    )
+    page.add(item_list)
+    await item_list.load_visible()
+    slots = list(item_list._slots)
+    conn.reset()
+
+    item_list.scroll_to_offset(5000 * 50)
+    await item_list.load_visible()
+
+    assert item_list._slots == slots
+    assert _titles(item_list)[0] == "item 4998"
+    assert api.offsets[-2:] == [5000, 5020]
+    # 行の追加はなく、プロパティの変更だけが送信される
+    assert all(name != "add" for m in conn.messages for name in m.names)
+
+
+@pytest.mark.asyncio
+async def test_unknown_total_grows_until_last_page():
+    """総数が不明な場合は最後のページの取得で総数が確定すること"""
+    page, conn = create_headless_page()
+    api = FakeAPI(ITEMS[:30])
+    item_list = VirtualList(
+        api.fetch_page, item_extent=50, viewport_height=500, page_size=20
+    )
+    page.add(item_list)
+
+    await item_list.load_visible()
+
+    assert item_list.total == 30
+    assert item_list.item_count == 30
+    assert None not in _titles(item_list)
+    assert item_list._bottom.height == (30 - len(item_list._slots)) * 50
+
+
+@pytest.mark.asyncio
+async def test_far_pages_are_evicted():
+    """max_pagesを超えると表示範囲から遠いページが破棄されること"""
+    page, conn = create_headless_page()
+    api = FakeAPI()
+    item_list = VirtualList(
+        api.fetch_page,
+        item_extent=50,
+        viewport_height=500,
+        page_size=20,
+        max_pages=3,
+        total=len(ITEMS),
+    )
+    page.add(item_list)
+    await item_list.load_visible()
+
+    item_list.scroll_to_offset(2000 * 50)
+    await item_list.load_visible()
+
+    assert len(item_list.loaded_pages) <= 3
+    assert 0 not in item_list.loaded_pages
+
+
+def test_set_items_keeps_scroll_position_without_fetching():
+    """手元のアイテムを登録すると取得せずに表示し、スクロール位置を維持すること"""
+    api = FakeAPI()
+    item_list = VirtualList(
+        api.fetch_page, item_extent=50, viewport_height=500, overscan=2, page_size=50
+    )
+    item_list.set_items(ITEMS[:200])
+    item_list.scroll_to_offset(2500)
+
+    item_list.set_items([{"id": -1, "title": "new"}, *ITEMS[:200]])
+
+    assert api.offsets == []
+    assert item_list.total == 201
+    assert item_list.first_index == 48
+    assert _titles(item_list)[0] == "item 47"
@@ -1,11 +1,12 @@
 """非同期処理のユーティリティ"""
 
-import asyncio
 import functools
-from typing import Any, Callable, Coroutine, TypeVar, cast
+from typing import Any, Callable, Coroutine, Optional, TypeVar, cast
 
 from flet import Page, ProgressBar, Text
 
+from src.frontend.utils.update_scheduler import schedule_update
+
 T = TypeVar("T")
 
 
@@ -59,7 +60,7 @@ class LoadingManager:
         if self._loading_count == 1:
             self._progress_bar.visible = True
             self._loading_text.visible = True
-            self.page.update()
+            schedule_update(self.page, self._progress_bar, self._loading_text)
 
     def stop_loading(self) -> None:
         """ローディング終了"""
@@ -67,7 +68,7 @@ class LoadingManager:
         if self._loading_count == 0:
             self._progress_bar.visible = False
             self._loading_text.visible = False
-            self.page.update()
+            schedule_update(self.page, self._progress_bar, self._loading_text)
 
     async def with_loading(self, coro: Coroutine[Any, Any, T]) -> T:
         """ローディング状態で非同期処理を実行"""
@@ -0,0 +1,92 @@
+"""画面を表示せずにFletのページを動かすためのユーティリティ
+
+クライアントへ送信されるはずのコマンドを記録する接続を使い、
+1回の操作で送信されるメッセージ数やペイロードのサイズを計測します。
+テストやベンチマーク用で、アプリケーション本体からは使用しません。
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from flet import Page
+from flet.core.connection import Connection
+from flet.core.protocol import (
+    Command,
+    CommandEncoder,
+    PageCommandResponsePayload,
+    PageCommandsBatchResponsePayload,
+)
+
+
+@dataclass
+class SentMessage:
+    """クライアントへ送信された1件のメッセージ"""
+
+    commands: List[Command]
+    size: int
+
+    @property
+    def names(self) -> List[str]:
+        """含まれるコマンド名の一覧"""
+        return [command.name for command in self.commands]
+
+
+@dataclass
+class RecordingConnection(Connection):
+    """送信されたコマンドを記録する接続"""
+
+    messages: List[SentMessage] = field(default_factory=list)
+
+    def __post_init__(self):
+        super().__init__()
+        self._next_id = 0
+
+    def send_command(self, session_id: str, command: Command):
+        self._record([command])
+        return PageCommandResponsePayload(result="", error="")
+
+    def send_commands(self, session_id: str, commands: List[Command]):
+        self._record(commands)
+        # "add" コマンドにはクライアントが採番したIDを返す
+        results = []
+        for command in commands:
+            if command.name == "add":
+                results.append(" ".join(self._new_id() for _ in command.commands))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    @property
+    def total_bytes(self) -> int:
+        """送信したペイロードの合計サイズ"""
+        return sum(message.size for message in self.messages)
+
+    def reset(self) -> None:
+        """記録を消去する"""
+        self.messages.clear()
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return f"_{self._next_id}"
+
+    def _record(self, commands: List[Command]) -> None:
+        payload = json.dumps(commands, cls=CommandEncoder, separators=(",", ":"))
+        self.messages.append(SentMessage(list(commands), len(payload.encode("utf-8"))))
+
+
+def create_headless_page(
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> "tuple[Page, RecordingConnection]":
+    """記録用の接続につながったページを作成する
+
+    Args:
+        loop: ページのイベントループ（省略時は実行中のループか新しいループ）
+    """
+    if loop is None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+    conn = RecordingConnection()
+    page = Page(conn, "headless", loop=loop)
+    return page, conn
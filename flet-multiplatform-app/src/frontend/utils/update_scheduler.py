@@ -0,0 +1,167 @@
+"""page.update() をまとめて送信するスケジューラ
+
+コントロールの update() を直接呼ぶと、その都度差分がクライアントへ送信されます。
+1回の操作で複数の箇所から更新されると同じ差分を何度も送ることになるため、
+更新要求を記録しておき、イベントループの次の周回（またはフレーム間隔の経過後）に
+変更されたコントロールだけを1回の page.update() で送信します。
+
+    scheduler = get_update_scheduler(page)
+    scheduler.request(progress_bar)        # 次の周回でまとめて送信
+
+    with scheduler.batch():                # ブロックを抜けたときに1回だけ送信
+        text.value = "..."
+        scheduler.request(text)
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Set
+
+from flet import Control, Page
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateScheduler:
+    """ページごとの更新要求をまとめるスケジューラ
+
+    Args:
+        page: 対象のページ
+        frame_interval: 送信までに待つ秒数（0の場合はイベントループの次の周回）
+    """
+
+    def __init__(self, page: Page, frame_interval: float = 0.0):
+        self.page = page
+        self.frame_interval = frame_interval
+        self.flush_count = 0
+        self._dirty: List[Control] = []
+        self._dirty_ids: Set[int] = set()
+        self._scheduled = False
+        self._batch_depth = 0
+        self._lock = threading.RLock()
+
+    @property
+    def pending(self) -> int:
+        """送信待ちのコントロール数"""
+        return len(self._dirty)
+
+    def request(self, *controls: Control) -> None:
+        """コントロールの更新を要求する（省略時はページ全体）"""
+        with self._lock:
+            for control in controls or (self.page,):
+                if id(control) not in self._dirty_ids:
+                    self._dirty_ids.add(id(control))
+                    self._dirty.append(control)
+            if self._batch_depth == 0 and not self._scheduled:
+                self._scheduled = True
+                self._schedule()
+
+    @contextmanager
+    def batch(self) -> Iterator["UpdateScheduler"]:
+        """ブロック内の更新要求をまとめ、抜けたときに1回だけ送信する
+
+        入れ子にした場合は一番外側のブロックを抜けたときに送信します。
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self.flush()
+
+    def flush(self) -> None:
+        """送信待ちの更新をすぐに送信する"""
+        with self._lock:
+            self._scheduled = False
+            dirty = self._dirty
+            self._dirty = []
+            self._dirty_ids = set()
+        roots = _roots(self.page, dirty)
+        if not roots:
+            return
+        try:
+            if roots[0] is self.page:
+                self.page.update()
+            else:
+                self.page.update(*roots)
+            self.flush_count += 1
+        except Exception:
+            logger.exception("Failed to send page update")
+
+    def _schedule(self) -> None:
+        loop = self._loop()
+        if loop is None or not loop.is_running():
+            # イベントループが動いていない場合（テストなど）はすぐに送信する
+            self._scheduled = False
+            self.flush()
+            return
+
+        def _later() -> None:
+            if self.frame_interval > 0:
+                loop.call_later(self.frame_interval, self.flush)
+            else:
+                loop.call_soon(self.flush)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            _later()
+        else:
+            # 同期イベントハンドラはスレッドプールで実行される
+            loop.call_soon_threadsafe(_later)
+
+    def _loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return self.page.loop
+        except AttributeError:
+            return None
+
+
+def _roots(page: Page, controls: List[Control]) -> List[Control]:
+    """送信が必要なコントロールを返す
+
+    ページから外れたものと、祖先も更新対象になっているもの（祖先の差分に
+    含まれる）は除きます。
+    """
+    attached = [c for c in controls if c is page or c.page is page]
+    if any(c is page for c in attached):
+        return [page]
+    ids = {id(c) for c in attached}
+    roots = []
+    for control in attached:
+        parent = control.parent
+        while parent is not None and id(parent) not in ids:
+            parent = parent.parent
+        if parent is None:
+            roots.append(control)
+    return roots
+
+
+_schedulers: "weakref.WeakKeyDictionary[Page, UpdateScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+_schedulers_lock = threading.Lock()
+
+
+def get_update_scheduler(page: Page) -> UpdateScheduler:
+    """ページのスケジューラを返す（なければ作成する）"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(page)
+        if scheduler is None:
+            scheduler = UpdateScheduler(page)
+            _schedulers[page] = scheduler
+        return scheduler
+
+
+def schedule_update(page: Page, *controls: Control) -> None:
+    """ページのスケジューラにコントロールの更新を要求する"""
+    get_update_scheduler(page).request(*controls)
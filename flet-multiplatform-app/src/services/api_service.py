@@ -1,38 +1,185 @@
-from typing import Any, Dict
+import asyncio
+import random
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, Optional, TypeVar
 
-import requests
+import httpx
+
+from src.frontend.api.transport import TransportPool, get_transport_pool
+
+T = TypeVar("T")
+
+# Methods that can be safely retried without changing server state twice
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Status codes that indicate a transient server-side failure
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class AsyncAPIService:
+    """Async API client on a pooled, keep-alive HTTP connection.
+
+    Connections come from the process-wide :class:`TransportPool` shared with
+    ``APIClient`` unless another pool is given. Idempotent requests are retried
+    on transport errors and transient status codes using exponential backoff
+    with full jitter. The number of in-flight requests is capped by a semaphore
+    so a burst of UI events cannot exhaust the connection pool.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        max_concurrency: int = 20,
+        pool: Optional[TransportPool] = None,
+    ):
+        self.pool = pool or get_transport_pool()
+        self.base_url = (base_url or self.pool.base_url).rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._closed = False
+        self.pool.acquire()
+
+    def _backoff(self, attempt: int) -> float:
+        """Return the delay before retry number ``attempt`` (full jitter)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Send a request and return the decoded JSON body."""
+        method = method.upper()
+        retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await self.pool.client.request(
+                        method,
+                        f"{self.base_url}/{endpoint.lstrip('/')}",
+                        params=params,
+                        json=data,
+                        timeout=self.timeout,
+                    )
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                    response.raise_for_status()  # Raise an error for bad responses
+                    return response.json() if response.content else None
+            except httpx.TransportError:
+                if attempt >= retries:
+                    raise
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def get(self, endpoint: str, params: Dict[str, Any] = None) -> Any:
+        """Send a GET request to the specified endpoint."""
+        return await self.request("GET", endpoint, params=params)
+
+    async def post(self, endpoint: str, data: Dict[str, Any]) -> Any:
+        """Send a POST request to the specified endpoint."""
+        return await self.request("POST", endpoint, data=data)
+
+    async def put(self, endpoint: str, data: Dict[str, Any]) -> Any:
+        """Send a PUT request to the specified endpoint."""
+        return await self.request("PUT", endpoint, data=data)
+
+    async def delete(self, endpoint: str) -> Any:
+        """Send a DELETE request to the specified endpoint."""
+        return await self.request("DELETE", endpoint)
+
+    async def close(self) -> None:
+        """Release the pool; its connections stay open for other clients."""
+        if not self._closed:
+            self._closed = True
+            self.pool.release()
+
+
+class _LoopThread:
+    """Background event loop used to run async calls from synchronous code.
+
+    httpx connections belong to the event loop that opened them, so the loop
+    keeps one pool, configured like the shared pool, for every APIService.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pool: Optional[TransportPool] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> TransportPool:
+        with self._lock:
+            if self._pool is None:
+                shared = get_transport_pool()
+                self._pool = TransportPool(
+                    base_url=shared.base_url,
+                    max_connections=shared.limits.max_connections,
+                    max_keepalive_connections=shared.limits.max_keepalive_connections,
+                    keepalive_expiry=shared.limits.keepalive_expiry,
+                    http2=shared.http2,
+                    timeout=shared.timeout,
+                )
+            return self._pool
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="api-service-loop", daemon=True
+                ).start()
+        future: Future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result()
+
+
+_loop_thread = _LoopThread()
 
 
 class APIService:
+    """Blocking API client kept for existing callers.
+
+    Every call is delegated to an :class:`AsyncAPIService` running on a shared
+    background event loop, so connections are pooled and kept alive between
+    calls instead of being opened per request.
+    """
+
     BASE_URL = "https://api.example.com"  # Replace with your actual API base URL
 
-    def __init__(self):
-        pass
+    def __init__(self, **kwargs: Any):
+        kwargs.setdefault("base_url", self.BASE_URL)
+        kwargs.setdefault("pool", _loop_thread.pool)
+        self._service = AsyncAPIService(**kwargs)
 
     def get(self, endpoint: str, params: Dict[str, Any] = None) -> Any:
         """Send a GET request to the specified endpoint."""
-        url = f"{self.BASE_URL}/{endpoint}"
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # Raise an error for bad responses
-        return response.json()
+        return _loop_thread.run(self._service.get(endpoint, params=params))
 
     def post(self, endpoint: str, data: Dict[str, Any]) -> Any:
         """Send a POST request to the specified endpoint."""
-        url = f"{self.BASE_URL}/{endpoint}"
-        response = requests.post(url, json=data)
-        response.raise_for_status()  # Raise an error for bad responses
-        return response.json()
+        return _loop_thread.run(self._service.post(endpoint, data))
 
     def put(self, endpoint: str, data: Dict[str, Any]) -> Any:
         """Send a PUT request to the specified endpoint."""
-        url = f"{self.BASE_URL}/{endpoint}"
-        response = requests.put(url, json=data)
-        response.raise_for_status()  # Raise an error for bad responses
-        return response.json()
+        return _loop_thread.run(self._service.put(endpoint, data))
 
     def delete(self, endpoint: str) -> Any:
         """Send a DELETE request to the specified endpoint."""
-        url = f"{self.BASE_URL}/{endpoint}"
-        response = requests.delete(url)
-        response.raise_for_status()  # Raise an error for bad responses
-        return response.json()
+        return _loop_thread.run(self._service.delete(endpoint))
+
+    def close(self) -> None:
+        """Release the pool; its connections stay open for other clients."""
+        _loop_thread.run(self._service.close())
@@ -2,15 +2,24 @@
 
 このモジュールは、画面サイズに応じてレイアウトを動的に調整するための関数を提供します。
 主にモバイル、タブレット、デスクトップの3つのブレークポイントをサポートしています。
+リサイズイベントごとにレイアウトを調整する場合は ResponsiveLayoutManager を使用してください。
 """
 
-from typing import Any, Literal
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List, Literal, Optional, Union
 
 import flet as ft
 
+from src.frontend.utils.update_scheduler import schedule_update
+
 # ブレークポイントの型定義
 BreakpointType = Literal["mobile", "tablet", "desktop"]
 
+# ブレークポイントごとのプロパティ値（値に関数を指定すると画面幅から計算する）
+PropertyValue = Union[Any, Callable[[float], Any]]
+BreakpointRules = Dict[BreakpointType, Dict[str, PropertyValue]]
+
 
 def get_breakpoint(page_width: float) -> BreakpointType:
     """画面の幅に基づいて現在のブレークポイントを返します。
@@ -49,6 +58,10 @@ def adjust_layout_for_responsive_design(page: Any) -> None:
     - タブレット（600px <= 幅 < 960px）: 左揃え、幅70%
     - デスクトップ（幅 >= 960px）: 左揃え、固定幅800px
 
+    リサイズイベントのたびに呼び出すと、ブレークポイントが変わらなくても毎回
+    レイアウトを送信します。on_resized で使う場合は、同じ調整を間引いて行う
+    create_default_layout_manager を使用してください。
+
     Args:
         page: FletのPageオブジェクト
 
@@ -94,4 +107,203 @@ def adjust_layout_for_responsive_design(page: Any) -> None:
         for control in page.controls:
             control.width = 800
 
-    page.update()
+    # 連続するリサイズイベントの更新は1回の送信にまとめる
+    schedule_update(page)
+
+
+class ResponsiveLayoutManager:
+    """リサイズイベントに応じてコントロールのプロパティを調整するクラス。
+
+    リサイズ中は連続してイベントが発生するため、最後のイベントから debounce 秒
+    経過してから1回だけ調整します。ブレークポイントが変わったとき、または画面幅が
+    min_width_delta 以上変わったときだけ再計算し、値が変わったコントロールだけを
+    送信します。
+
+    Attributes:
+        page: FletのPageオブジェクト
+        breakpoint (Optional[BreakpointType]): 最後に適用したブレークポイント
+        width (Optional[float]): 最後に適用した画面幅
+        apply_count (int): レイアウトを再計算した回数
+
+    Example:
+        ```python
+        layout = ResponsiveLayoutManager(page)
+        layout.register(
+            sidebar,
+            {
+                "mobile": {"visible": False},
+                "tablet": {"visible": True, "width": lambda w: w * 0.3},
+                "desktop": {"visible": True, "width": 320},
+            },
+        )
+        layout.attach()  # page.on_resized を設定し、現在の幅で初期レイアウトを適用
+        ```
+    """
+
+    def __init__(
+        self,
+        page: Any,
+        debounce: float = 0.15,
+        min_width_delta: float = 16,
+    ) -> None:
+        """ResponsiveLayoutManager インスタンスを初期化します。
+
+        Args:
+            page: FletのPageオブジェクト
+            debounce: 最後のリサイズイベントから調整までの待ち時間（秒）
+            min_width_delta: 同じブレークポイント内で再計算する画面幅の変化量
+        """
+        self.page = page
+        self.debounce = debounce
+        self.min_width_delta = min_width_delta
+        self.breakpoint: Optional[BreakpointType] = None
+        self.width: Optional[float] = None
+        self.apply_count = 0
+        self._rules: Dict[int, "tuple[Any, BreakpointRules]"] = {}
+        self._pending_width: Optional[float] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = threading.Lock()
+
+    def register(self, control: Any, rules: BreakpointRules) -> None:
+        """コントロールにブレークポイントごとのプロパティを設定する
+
+        Args:
+            control: 対象のコントロール（ページ自体も指定できる）
+            rules: ブレークポイントごとのプロパティ値
+        """
+        self._rules[id(control)] = (control, rules)
+        if self.breakpoint is not None:
+            if self._apply_rules(control, rules, self.breakpoint, self.width, True):
+                self._send([control])
+
+    def unregister(self, control: Any) -> None:
+        """コントロールの設定を削除する"""
+        self._rules.pop(id(control), None)
+
+    def attach(self) -> None:
+        """ページのリサイズイベントを監視し、現在の幅でレイアウトを適用する"""
+        self.page.on_resized = self.handle_resize
+        if self.page.width:
+            self.apply(self.page.width, force=True)
+
+    def handle_resize(self, e: Any = None) -> None:
+        """リサイズイベントを受け取り、調整を遅延実行する"""
+        width = getattr(e, "width", None) or self.page.width
+        with self._lock:
+            self._pending_width = width
+        loop = getattr(self.page, "loop", None)
+        if self.debounce <= 0 or loop is None or not loop.is_running():
+            self._flush()
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._restart_timer(loop)
+        else:
+            # 同期イベントハンドラはスレッドプールで実行される
+            loop.call_soon_threadsafe(self._restart_timer, loop)
+
+    def _restart_timer(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_later(self.debounce, self._flush)
+
+    def _flush(self) -> None:
+        with self._lock:
+            width = self._pending_width
+            self._pending_width = None
+            self._timer = None
+        if width is not None:
+            self.apply(width)
+
+    def apply(self, width: float, force: bool = False) -> bool:
+        """画面幅に合わせてレイアウトを調整する
+
+        Args:
+            width: 画面の幅
+            force: 変化量に関係なく再計算する
+
+        Returns:
+            bool: 再計算したかどうか
+        """
+        breakpoint = get_breakpoint(width)
+        transition = breakpoint != self.breakpoint
+        if not (force or transition):
+            if (
+                self.width is not None
+                and abs(width - self.width) < self.min_width_delta
+            ):
+                return False
+
+        changed: List[Any] = []
+        for control, rules in list(self._rules.values()):
+            # ブレークポイントが同じ場合は画面幅に依存する値だけを再計算する
+            if self._apply_rules(
+                control, rules, breakpoint, width, force or transition
+            ):
+                changed.append(control)
+        self.breakpoint = breakpoint
+        self.width = width
+        self.apply_count += 1
+        if changed:
+            self._send(changed)
+        return True
+
+    @staticmethod
+    def _apply_rules(
+        control: Any,
+        rules: BreakpointRules,
+        breakpoint: BreakpointType,
+        width: Optional[float],
+        all_values: bool,
+    ) -> bool:
+        changed = False
+        for name, value in rules.get(breakpoint, {}).items():
+            if callable(value):
+                value = value(width)
+            elif not all_values:
+                continue
+            if getattr(control, name, None) != value:
+                setattr(control, name, value)
+                changed = True
+        return changed
+
+    def _send(self, controls: List[Any]) -> None:
+        attached = [c for c in controls if c is self.page or c.page is not None]
+        if attached:
+            schedule_update(self.page, *attached)
+
+
+def create_default_layout_manager(page: Any, **kwargs: Any) -> ResponsiveLayoutManager:
+    """adjust_layout_for_responsive_design と同じ調整を行うマネージャーを作成します。
+
+    ページの配置と、その時点の page.controls の幅にルールを設定します。
+
+    Args:
+        page: FletのPageオブジェクト
+        **kwargs: ResponsiveLayoutManager に渡す引数
+
+    Returns:
+        ResponsiveLayoutManager: ルールを設定したマネージャー
+    """
+    manager = ResponsiveLayoutManager(page, **kwargs)
+    manager.register(
+        page,
+        {
+            "mobile": {"horizontal_alignment": ft.CrossAxisAlignment.CENTER},
+            "tablet": {"horizontal_alignment": ft.CrossAxisAlignment.START},
+            "desktop": {"horizontal_alignment": ft.CrossAxisAlignment.START},
+        },
+    )
+    for control in page.controls:
+        manager.register(
+            control,
+            {
+                "mobile": {"width": lambda w: w * 0.9},
+                "tablet": {"width": lambda w: w * 0.7},
+                "desktop": {"width": 800},
+            },
+        )
+    return manager
@@ -0,0 +1,47 @@
+"""APIテスト用のフィクスチャ"""
+
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.api.routes import api_router
+from backend.core.db import Base, get_db
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path) -> AsyncGenerator[async_sessionmaker, None]:
+    """テストごとのSQLiteデータベースに接続するセッションファクトリ"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def api_app(session_factory: async_sessionmaker) -> FastAPI:
+    """APIルーターのみを組み込んだアプリケーション"""
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+@pytest_asyncio.fixture
+async def api_client(api_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    """アプリケーションをプロセス内で呼び出すクライアント"""
+    async with AsyncClient(
+        transport=ASGITransport(app=api_app), base_url="http://testserver"
+    ) as client:
+        yield client
@@ -0,0 +1,45 @@
+"""ユーザー一括取得APIのテスト"""
+
+import pytest
+from fastapi import status
+
+from backend.core.config import settings
+from backend.models.user import User
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _create_users(session_factory, count: int) -> list:
+    async with session_factory() as session:
+        users = [
+            User(
+                email=f"batch{i}@example.com",
+                username=f"batch{i}",
+                hashed_password="x",
+            )
+            for i in range(count)
+        ]
+        session.add_all(users)
+        await session.commit()
+        return [user.id for user in users]
+
+
+async def test_read_users_by_ids(api_client, session_factory) -> None:
+    """指定したIDのユーザーだけがID順に返り、存在しないIDは含まれないこと"""
+    ids = await _create_users(session_factory, 5)
+
+    response = await api_client.get(
+        "/api/v1/users/", params={"ids": [ids[3], ids[0], ids[3], 9999]}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [user["id"] for user in response.json()] == [ids[0], ids[3]]
+
+
+async def test_read_users_by_ids_rejects_too_many_ids(api_client) -> None:
+    """上限を超えるIDの指定は422になること"""
+    ids = list(range(1, settings.BATCH_MAX_IDS + 2))
+
+    response = await api_client.get("/api/v1/users/", params={"ids": ids})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,195 @@
+"""Idempotency-Keyのテスト"""
+
+import asyncio
+import hashlib
+import json
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.api.deps import get_idempotency_store
+from backend.core.idempotency import (
+    IDEMPOTENT_REPLAYED_HEADER,
+    IdempotencyContext,
+    InMemoryIdempotencyStore,
+    SQLIdempotencyStore,
+    fingerprint_request,
+)
+from backend.models.idempotency_key import IdempotencyKey
+from backend.models.item import Item
+
+pytestmark = pytest.mark.asyncio
+
+ITEM = {"title": "テストアイテム", "description": "説明", "owner_id": 1}
+
+
+@pytest.fixture(params=["memory", "sql"])
+def idempotency_client(request, api_app, api_client, session_factory):
+    """冪等性ストアごとにクライアントを用意するフィクスチャ"""
+    if request.param == "sql":
+        store = SQLIdempotencyStore(session_factory)
+    else:
+        store = InMemoryIdempotencyStore()
+    api_app.dependency_overrides[get_idempotency_store] = lambda: store
+    return api_client, session_factory
+
+
+@pytest.fixture(params=["memory", "sql"])
+def idempotency_store(request, session_factory):
+    """冪等性ストアごとのフィクスチャ"""
+    if request.param == "sql":
+        return SQLIdempotencyStore(session_factory)
+    return InMemoryIdempotencyStore()
+
+
+async def _count_items(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(Item))
+
+
+async def test_concurrent_duplicates_insert_once(idempotency_client) -> None:
+    """同じキーの同時リクエストでアイテムが1件だけ作成されること"""
+    client, session_factory = idempotency_client
+    headers = {"Idempotency-Key": "create-item-1"}
+
+    responses = await asyncio.gather(
+        *[client.post("/api/v1/items/", json=ITEM, headers=headers) for _ in range(10)]
+    )
+
+    assert await _count_items(session_factory) == 1
+    codes = [r.status_code for r in responses]
+    assert codes.count(status.HTTP_201_CREATED) >= 1
+    assert set(codes) <= {status.HTTP_201_CREATED, status.HTTP_409_CONFLICT}
+
+    # 完了後の再送は保存済みのレスポンスを返す
+    replay = await client.post("/api/v1/items/", json=ITEM, headers=headers)
+    created = next(r for r in responses if r.status_code == status.HTTP_201_CREATED)
+    assert replay.status_code == status.HTTP_201_CREATED
+    assert replay.headers[IDEMPOTENT_REPLAYED_HEADER] == "true"
+    assert replay.json() == created.json()
+    assert await _count_items(session_factory) == 1
+
+
+async def test_key_reused_with_different_body_is_rejected(idempotency_client) -> None:
+    """同じキーで内容が異なるリクエストは422になること"""
+    client, session_factory = idempotency_client
+    headers = {"Idempotency-Key": "create-item-2"}
+
+    first = await client.post("/api/v1/items/", json=ITEM, headers=headers)
+    second = await client.post(
+        "/api/v1/items/", json={**ITEM, "title": "別のアイテム"}, headers=headers
+    )
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert second.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert await _count_items(session_factory) == 1
+
+
+async def test_requests_without_key_are_not_deduplicated(idempotency_client) -> None:
+    """キーがないリクエストは毎回作成されること"""
+    client, session_factory = idempotency_client
+
+    for _ in range(2):
+        response = await client.post("/api/v1/items/", json=ITEM)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    assert await _count_items(session_factory) == 2
+
+
+async def test_keys_are_scoped_per_caller(idempotency_client) -> None:
+    """別の呼び出し元が同じキーを送っても保存済みのレスポンスは返らないこと"""
+    client, session_factory = idempotency_client
+
+    for token in ("token-a", "token-b"):
+        response = await client.post(
+            "/api/v1/items/",
+            json=ITEM,
+            headers={"Idempotency-Key": "shared", "Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert IDEMPOTENT_REPLAYED_HEADER not in response.headers
+
+    assert await _count_items(session_factory) == 2
+
+
+async def test_stored_key_and_fingerprint_are_keyed_digests() -> None:
+    """キーとフィンガープリントが秘密鍵なしでは再計算できないこと"""
+    store = InMemoryIdempotencyStore()
+    context = IdempotencyContext(
+        store, "abc", "POST", "/api/v1/users/", timedelta(minutes=1), "Bearer t"
+    )
+    payload = {"email": "user@example.com", "password": "secret"}
+    await context.begin(payload)
+
+    [(key, record)] = store._records.items()
+    assert "abc" not in key and "Bearer" not in key
+    body = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    plain = hashlib.sha256(f"POST /api/v1/users/\n{body}".encode()).hexdigest()
+    assert record.fingerprint != plain
+    assert record.fingerprint == fingerprint_request("POST", "/api/v1/users/", payload)
+    assert record.fingerprint != fingerprint_request(
+        "POST", "/api/v1/users/", payload, secret="other"
+    )
+
+
+async def test_unfinished_reservation_expires_after_lease(idempotency_store) -> None:
+    """完了しなかった予約はTTLではなくリースの経過後に再び予約できること"""
+    context = IdempotencyContext(
+        idempotency_store,
+        "crashed",
+        "POST",
+        "/api/v1/items/",
+        ttl=timedelta(days=1),
+        lease=timedelta(milliseconds=50),
+    )
+    assert await context.begin(ITEM) is None
+
+    # 処理中の再送は409になる
+    with pytest.raises(HTTPException) as exc_info:
+        await context.begin(ITEM)
+    assert exc_info.value.status_code == status.HTTP_409_CONFLICT
+
+    # プロセスが停止して完了しなかった予約は、リースの経過後に再送できる
+    await asyncio.sleep(0.1)
+    assert await context.begin(ITEM) is None
+
+
+async def test_completed_response_is_kept_for_ttl(idempotency_store) -> None:
+    """完了したキーの有効期間がリースからTTLに延長されること"""
+    context = IdempotencyContext(
+        idempotency_store,
+        "completed",
+        "POST",
+        "/api/v1/items/",
+        ttl=timedelta(days=1),
+        lease=timedelta(milliseconds=50),
+    )
+    await context.begin(ITEM)
+    await context.complete({"id": 1}, status.HTTP_201_CREATED)
+    await asyncio.sleep(0.1)
+
+    replay = await context.begin(ITEM)
+    assert replay.status_code == status.HTTP_201_CREATED
+    assert json.loads(replay.body) == {"id": 1}
+
+
+async def test_sql_store_purges_expired_keys(session_factory) -> None:
+    """SQLストアが予約の一定回数ごとに期限切れのキーを削除すること"""
+    store = SQLIdempotencyStore(session_factory, purge_interval=3)
+
+    async def count_keys() -> int:
+        async with session_factory() as session:
+            return await session.scalar(
+                select(func.count()).select_from(IdempotencyKey)
+            )
+
+    for key in ("a", "b", "c"):
+        await store.reserve(key, "fingerprint", timedelta(0))
+    assert await count_keys() == 3
+
+    # 4回目の予約の前に期限切れの3件が削除される
+    await store.reserve("d", "fingerprint", timedelta(minutes=1))
+    assert await count_keys() == 1
@@ -0,0 +1,39 @@
+"""アイテム一覧APIのテスト"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import status
+
+from backend.models.item import Item
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_read_items_filters_by_created_at_window(api_client, session_factory):
+    """期間指定で対象のアイテムだけが新しい順に返ること"""
+    async with session_factory() as session:
+        session.add_all(
+            Item(
+                title=f"item {month}",
+                owner_id=1,
+                created_at=datetime(2026, month, 15),
+            )
+            for month in range(1, 7)
+        )
+        await session.commit()
+
+    response = await api_client.get(
+        "/api/v1/items/",
+        params={
+            "created_after": "2026-03-01T00:00:00",
+            "created_before": "2026-06-01T00:00:00",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["title"] for item in response.json()] == [
+        "item 5",
+        "item 4",
+        "item 3",
+    ]
@@ -0,0 +1,125 @@
+"""楽観的排他制御のテスト"""
+
+import pytest
+from fastapi import status
+
+pytestmark = pytest.mark.asyncio
+
+ITEM = {"title": "テストアイテム", "description": "説明", "owner_id": 1}
+
+
+async def _create_item(client) -> dict:
+    response = await client.post("/api/v1/items/", json=ITEM)
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+
+async def test_read_item_returns_etag(api_client) -> None:
+    """アイテム取得時にバージョンがETagとして返ること"""
+    item = await _create_item(api_client)
+
+    response = await api_client.get(f"/api/v1/items/{item['id']}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] == '"1"'
+    assert response.json()["version"] == 1
+
+
+async def test_update_with_matching_version_increments_version(api_client) -> None:
+    """If-Matchが一致する場合は更新され、バージョンが上がること"""
+    item = await _create_item(api_client)
+
+    response = await api_client.put(
+        f"/api/v1/items/{item['id']}",
+        json={"title": "更新後"},
+        headers={"If-Match": '"1"'},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] == '"2"'
+    assert response.json()["title"] == "更新後"
+    assert response.json()["version"] == 2
+
+
+async def test_update_with_stale_version_returns_412(api_client) -> None:
+    """古いバージョンでの更新は412になり、内容が変わらないこと"""
+    item = await _create_item(api_client)
+    url = f"/api/v1/items/{item['id']}"
+
+    first = await api_client.put(url, json={"title": "A"}, headers={"If-Match": '"1"'})
+    second = await api_client.put(url, json={"title": "B"}, headers={"If-Match": '"1"'})
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.status_code == status.HTTP_412_PRECONDITION_FAILED
+    current = await api_client.get(url)
+    assert current.json()["title"] == "A"
+    assert current.json()["version"] == 2
+
+
+async def test_update_missing_item_returns_404(api_client) -> None:
+    """存在しないアイテムの更新は412ではなく404になること"""
+    response = await api_client.put(
+        "/api/v1/items/999", json={"title": "A"}, headers={"If-Match": '"1"'}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_update_without_if_match_is_unconditional(api_client) -> None:
+    """If-Matchがない場合はバージョンに関わらず更新されること"""
+    item = await _create_item(api_client)
+    url = f"/api/v1/items/{item['id']}"
+
+    for title in ("A", "B"):
+        response = await api_client.put(url, json={"title": title})
+        assert response.status_code == status.HTTP_200_OK
+
+    assert response.json()["version"] == 3
+
+
+async def test_malformed_if_match_returns_400(api_client) -> None:
+    """不正なIf-Matchヘッダーは400になること"""
+    item = await _create_item(api_client)
+
+    response = await api_client.put(
+        f"/api/v1/items/{item['id']}",
+        json={"title": "A"},
+        headers={"If-Match": '"abc"'},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_read_item_with_current_etag_returns_304(api_client) -> None:
+    """If-None-Matchが現在のETagと一致する場合は本文なしの304になること"""
+    item = await _create_item(api_client)
+    url = f"/api/v1/items/{item['id']}"
+
+    response = await api_client.get(url, headers={"If-None-Match": '"1"'})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == '"1"'
+    assert response.content == b""
+
+    await api_client.put(url, json={"title": "更新後"})
+    response = await api_client.get(url, headers={"If-None-Match": '"1"'})
+    assert response.status_code == status.HTTP_200_OK
+
+
+async def test_item_list_is_revalidated_with_etag(api_client) -> None:
+    """一覧は再検証用のETagを返し、変更されるまで304になること"""
+    item = await _create_item(api_client)
+
+    response = await api_client.get("/api/v1/items/")
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = await api_client.get("/api/v1/items/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    await api_client.put(f"/api/v1/items/{item['id']}", json={"title": "更新後"})
+    response = await api_client.get("/api/v1/items/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
@@ -1,7 +1,9 @@
 """パフォーマンステストの設定ファイル"""
 
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict
+
+from src.backend.tests.performance.utils.budgets import load_budgets
 
 # ベースディレクトリ
 BASE_DIR = Path(__file__).parent.parent.parent
@@ -98,21 +100,36 @@ API_CONFIG = {
     "headers": {"Content-Type": "application/json", "Accept": "application/json"},
 }
 
-# パフォーマンス閾値
-PERFORMANCE_THRESHOLDS = {
-    "response_time": {
-        "p50": 200,  # ms
-        "p90": 500,  # ms
-        "p95": 1000,  # ms
-        "p99": 2000,  # ms
-        "max": 5000,  # ms
-    },
-    "error_rate": {"warning": 0.01, "critical": 0.05},  # 1%  # 5%
-    "throughput": {
-        "min_rps": 10,  # 1秒あたりの最小リクエスト数
-        "target_rps": 100,  # 1秒あたりの目標リクエスト数
-    },
-}
+
+# パフォーマンス閾値 (予算は config/budgets.json で一元管理する)
+def get_performance_thresholds(scenario: str = "load") -> Dict[str, Any]:
+    """シナリオの予算から従来形式の閾値を取得
+
+    Args:
+        scenario: budgets.json のシナリオ名 (smoke, load, stress など)
+
+    Returns:
+        response_time / error_rate / throughput ごとの閾値
+    """
+    budget = load_budgets().budget_for(scenario)
+    return {
+        "response_time": {
+            "p50": budget.get("p50_ms"),  # ms
+            "p90": budget.get("p90_ms"),  # ms
+            "p95": budget.get("p95_ms"),  # ms
+            "p99": budget.get("p99_ms"),  # ms
+            "max": budget.get("max_ms"),  # ms
+        },
+        "error_rate": {"warning": 0.01, "critical": budget.get("error_rate")},
+        "throughput": {
+            "min_rps": budget.get("min_rps"),  # 1秒あたりの最小リクエスト数
+            "target_rps": 100,  # 1秒あたりの目標リクエスト数
+        },
+    }
+
+
+# Locust の汎用シナリオ (各シナリオの共通値) の閾値
+PERFORMANCE_THRESHOLDS = get_performance_thresholds("locust")
 
 
 def get_test_data_path(data_type: str, data_size: str = "small") -> Path:
@@ -134,7 +151,8 @@ def get_database_connection_string() -> str:
     """データベース接続文字列を取得"""
     return (
         f"postgresql://{DATABASE_CONFIG['user']}:{DATABASE_CONFIG['password']}@"
-        f"{DATABASE_CONFIG['host']}:{DATABASE_CONFIG['port']}/{DATABASE_CONFIG['database']}"
+        f"{DATABASE_CONFIG['host']}:{DATABASE_CONFIG['port']}/"
+        f"{DATABASE_CONFIG['database']}"
     )
 
 
@@ -7,18 +7,24 @@ import os
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict
 
-import numpy as np
 import pandas as pd
 from locust import events
-from locust.runners import MasterRunner, WorkerRunner
+from locust.runners import MasterRunner
+
+from src.backend.tests.performance.utils.budgets import (
+    format_budget_table,
+    load_budgets,
+    locust_actuals,
+    locust_entry_dict,
+)
 
 from .config import (
     LOGS_DIR,
-    PERFORMANCE_THRESHOLDS,
     REPORTS_DIR,
     RESULTS_DIR,
+    get_performance_thresholds,
     get_test_data_path,
 )
 
@@ -143,6 +149,7 @@ class PerformanceTestUtils:
             "max": int(stats.total.max_response_time or 0),
             "avg": int(stats.total.avg_response_time or 0),
             "median": int(stats.total.get_response_time_percentile(0.5) or 0),
+            "p50": int(stats.total.get_response_time_percentile(0.5) or 0),
             "p90": int(stats.total.get_response_time_percentile(0.9) or 0),
             "p95": int(stats.total.get_response_time_percentile(0.95) or 0),
             "p99": int(stats.total.get_response_time_percentile(0.99) or 0),
@@ -157,8 +164,32 @@ class PerformanceTestUtils:
         test_duration = time.time() - environment.runner.stats_start_time
         rps = total_requests / max(1, test_duration)
 
-        # パフォーマンス閾値との比較
-        thresholds = PERFORMANCE_THRESHOLDS
+        # パフォーマンス予算との比較 (全体とエンドポイントごと)
+        scenario = os.getenv("PERF_SCENARIO", "load")
+        budgets = load_budgets()
+        total_actual = locust_actuals(locust_entry_dict(stats.total))
+        total_actual["min_rps"] = rps
+        budget_checks = budgets.check(total_actual, scenario)
+        for entry in stats.entries.values():
+            # スループットはテスト全体でのみ評価する
+            entry_actual = {**locust_actuals(locust_entry_dict(entry)), "min_rps": None}
+            budget_checks.extend(
+                budgets.check(entry_actual, scenario, entry.method, entry.name)
+            )
+        failed_checks = [check for check in budget_checks if not check.passed]
+        logger.info(
+            format_budget_table(budget_checks, f"Performance budgets ({scenario})")
+        )
+        if failed_checks:
+            # 予算超過はテスト失敗として終了コードに反映する
+            logger.error(
+                "Performance budget exceeded:\n"
+                + "\n".join(check.describe() for check in failed_checks)
+            )
+            environment.process_exit_code = 1
+
+        # 従来形式の閾値との比較
+        thresholds = get_performance_thresholds(scenario)
         performance_status = {
             "response_time": {
                 "p50": response_times["p50"] <= thresholds["response_time"]["p50"],
@@ -182,6 +213,9 @@ class PerformanceTestUtils:
             "requests_per_second": round(rps, 2),
             "performance_status": performance_status,
             "thresholds": thresholds,
+            "scenario": scenario,
+            "budget_checks": [check.to_dict() for check in budget_checks],
+            "budget_passed": not failed_checks,
         }
 
         # テスト結果をJSONファイルに保存
@@ -243,7 +277,7 @@ class PerformanceTestUtils:
             output_file: 出力ファイルのパス
         """
         # シンプルなHTMLレポートを生成
-        html = f"""
+        html = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -318,10 +352,11 @@ class PerformanceTestUtils:
 
         # スループットのステータス
         min_rps = test_results["thresholds"]["throughput"]["min_rps"]
+        rps = test_results["requests_per_second"]
         throughput_status = (
-            f"<span class='pass'>PASS</span> ({test_results['requests_per_second']:.2f} RPS >= {min_rps} RPS)"
-            if test_results["requests_per_second"] >= min_rps
-            else f"<span class='fail'>FAIL</span> ({test_results['requests_per_second']:.2f} RPS < {min_rps} RPS)"
+            f"<span class='pass'>PASS</span> ({rps:.2f} RPS >= {min_rps} RPS)"
+            if rps >= min_rps
+            else f"<span class='fail'>FAIL</span> ({rps:.2f} RPS < {min_rps} RPS)"
         )
 
         # HTMLをレンダリング
@@ -0,0 +1,104 @@
+"""APIサービスのテスト"""
+
+import httpx
+import pytest
+
+from src.frontend.api.transport import TransportPool
+from src.services.api_service import APIService, AsyncAPIService
+
+
+def _service(handler, **kwargs) -> AsyncAPIService:
+    pool = TransportPool(
+        "http://testserver", http2=False, transport=httpx.MockTransport(handler)
+    )
+    return AsyncAPIService(backoff_base=0.0, pool=pool, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_idempotent_request_is_retried_on_transient_errors():
+    """GETは一時的なエラーの後に再試行されること"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        if len(calls) == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    service = _service(handler)
+
+    assert await service.get("items") == {"ok": True}
+    assert calls == ["GET", "GET", "GET"]
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried():
+    """非冪等なPOSTは再試行されないこと"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(503)
+
+    service = _service(handler)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.post("items", {"title": "x"})
+    assert calls == ["POST"]
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded():
+    """再試行回数の上限を超えるとエラーになること"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(502)
+
+    service = _service(handler, max_retries=2)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.delete("items/1")
+    assert len(calls) == 3
+
+
+def test_sync_wrapper_delegates_to_async_service():
+    """同期APIが非同期サービスに委譲されること"""
+    service = APIService(base_url="http://testserver")
+    service._service = _service(
+        lambda request: httpx.Response(200, json={"path": request.url.path})
+    )
+
+    assert service.get("users/1") == {"path": "/users/1"}
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_service_uses_shared_transport_pool(monkeypatch):
+    """プール未指定のときは共有プールを使い、base_urlは絶対URLで送ること"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return httpx.Response(200, json={})
+
+    pool = TransportPool(
+        "http://shared", http2=False, transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr("src.services.api_service.get_transport_pool", lambda: pool)
+
+    default = AsyncAPIService()
+    other = AsyncAPIService(base_url="http://other/api/")
+    await default.get("items")
+    await other.get("/items")
+
+    assert default.pool is pool and other.pool is pool
+    assert requests == ["http://shared/items", "http://other/api/items"]
+    assert pool.metrics.active_clients == 2
+    await default.close()
+    await other.close()
+    assert pool.metrics.active_clients == 0
+    assert not pool.client.is_closed
@@ -0,0 +1,74 @@
+"""ロギングパイプラインのテスト"""
+
+import json
+import logging
+from logging.handlers import QueueHandler
+
+from backend.config.logging import (
+    CorrelationIdFilter,
+    DebugSamplingFilter,
+    JsonFormatter,
+    correlation_id,
+    start_queue_logging,
+    stop_queue_logging,
+)
+
+
+def _make_record(level: int = logging.DEBUG, lineno: int = 1) -> logging.LogRecord:
+    return logging.LogRecord("test", level, "test.py", lineno, "message", None, None)
+
+
+def test_debug_sampling_filter_keeps_every_nth_debug_record():
+    """DEBUGログが呼び出し箇所ごとに間引かれること"""
+    sampler = DebugSamplingFilter(sample_rate=0.25)
+    kept = [sampler.filter(_make_record()) for _ in range(8)]
+    assert kept.count(True) == 2
+    # 別の呼び出し箇所は独立してカウントされる
+    assert sampler.filter(_make_record(lineno=2))
+
+
+def test_debug_sampling_filter_never_drops_info_records():
+    """INFO以上のログは間引かれないこと"""
+    sampler = DebugSamplingFilter(sample_rate=0.0)
+    assert not sampler.filter(_make_record())
+    assert sampler.filter(_make_record(logging.INFO))
+
+
+def test_correlation_id_is_attached_and_serialized():
+    """相関IDがレコードに付与され、JSON出力に含まれること"""
+    token = correlation_id.set("abc123")
+    try:
+        record = _make_record(logging.INFO)
+        CorrelationIdFilter().filter(record)
+    finally:
+        correlation_id.reset(token)
+
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["correlation_id"] == "abc123"
+    assert payload["level"] == "INFO"
+    assert payload["message"] == "message"
+
+
+def test_stop_queue_logging_detaches_queue_handler():
+    """停止後にQueueHandlerが外れ、開始前からのハンドラとレベルが残ること"""
+    root_logger = logging.getLogger()
+    existing = logging.NullHandler()
+    root_logger.addHandler(existing)
+    level = root_logger.level
+    records = []
+    target = logging.Handler()
+    target.emit = records.append
+
+    try:
+        start_queue_logging([target], "INFO")
+        assert existing in root_logger.handlers
+        logging.getLogger("test").info("queued")
+        stop_queue_logging()
+
+        assert [record.getMessage() for record in records] == ["queued"]
+        assert not any(isinstance(h, QueueHandler) for h in root_logger.handlers)
+        assert existing in root_logger.handlers
+        assert root_logger.level == level
+    finally:
+        stop_queue_logging()
+        root_logger.removeHandler(existing)
@@ -0,0 +1,50 @@
+"""パーティション管理ユーティリティのテスト"""
+
+from datetime import datetime
+
+from backend.db.partitioning import (
+    Partition,
+    add_months,
+    find_cold_partitions,
+    month_start,
+    partition_name,
+    planned_partitions,
+)
+
+
+def test_add_months_crosses_year_boundaries():
+    """月の加算・減算で年をまたげること"""
+    start = datetime(2026, 11, 1)
+    assert add_months(start, 2) == datetime(2027, 1, 1)
+    assert add_months(start, -11) == datetime(2025, 12, 1)
+
+
+def test_partition_name_uses_month_of_start():
+    """パーティション名が開始月から決まること"""
+    start = month_start(datetime(2026, 3, 17, 12, 30))
+    assert start == datetime(2026, 3, 1)
+    assert partition_name("item", start) == "item_p2026_03"
+
+
+def test_planned_partitions_cover_current_and_future_months():
+    """今月から指定月数先までのパーティションが求められること"""
+    planned = planned_partitions("item", 2, now=datetime(2026, 11, 19, 8, 0))
+
+    assert [p.name for p in planned] == [
+        "item_p2026_11",
+        "item_p2026_12",
+        "item_p2027_01",
+    ]
+    assert planned[-1].end == datetime(2027, 2, 1)
+
+
+def test_find_cold_partitions_keeps_recent_months():
+    """保持期間内のパーティションはアーカイブ対象にならないこと"""
+    partitions = [
+        Partition(partition_name("item", start), start, add_months(start, 1))
+        for start in (add_months(datetime(2026, 1, 1), i) for i in range(10))
+    ]
+
+    cold = find_cold_partitions(partitions, 6, now=datetime(2026, 10, 19))
+
+    assert [p.name for p in cold] == ["item_p2026_01", "item_p2026_02", "item_p2026_03"]
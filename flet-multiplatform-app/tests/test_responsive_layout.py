@@ -0,0 +1,94 @@
+import asyncio
+
+import flet as ft
+import pytest
+
+from src.frontend.utils.headless import create_headless_page
+from src.utils.responsive_utils import (
+    ResponsiveLayoutManager,
+    create_default_layout_manager,
+)
+
+SIDEBAR_RULES = {
+    "mobile": {"visible": False},
+    "tablet": {"visible": True, "width": lambda w: w * 0.3},
+    "desktop": {"visible": True, "width": 320},
+}
+
+
+class ResizeEvent:
+    def __init__(self, width):
+        self.width = width
+
+
+def _manager(debounce=0.0):
+    page, conn = create_headless_page()
+    sidebar, body = ft.Container(), ft.Container()
+    page.add(sidebar, body)
+    manager = ResponsiveLayoutManager(page, debounce=debounce, min_width_delta=16)
+    manager.register(sidebar, SIDEBAR_RULES)
+    manager.register(body, {"desktop": {"expand": True}})
+    return page, conn, manager, sidebar, body
+
+
+@pytest.mark.asyncio
+async def test_resize_storm_is_debounced_into_one_update():
+    page, conn, manager, sidebar, body = _manager(debounce=0.05)
+    conn.reset()
+
+    for width in range(500, 1300, 10):
+        manager.handle_resize(ResizeEvent(width))
+    await asyncio.sleep(0.1)
+
+    assert manager.apply_count == 1
+    assert manager.breakpoint == "desktop"
+    assert sidebar.width == 320
+    assert len(conn.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_small_width_changes_within_breakpoint_are_ignored():
+    page, conn, manager, sidebar, body = _manager()
+    manager.apply(700)
+    await asyncio.sleep(0)
+    conn.reset()
+
+    assert manager.apply(710) is False
+    assert manager.apply(740) is True
+    await asyncio.sleep(0)
+
+    assert sidebar.width == pytest.approx(222)
+    # 画面幅に依存しない値のコントロールは送信されない
+    [message] = conn.messages
+    assert {value for c in message.commands for value in c.values} == {sidebar.uid}
+
+
+@pytest.mark.asyncio
+async def test_breakpoint_transition_updates_only_affected_controls():
+    page, conn, manager, sidebar, body = _manager()
+    manager.apply(1200)
+    await asyncio.sleep(0)
+    conn.reset()
+
+    manager.apply(1400)
+    await asyncio.sleep(0)
+    assert conn.messages == []
+
+    manager.apply(500)
+    await asyncio.sleep(0)
+    assert sidebar.visible is False
+    assert body.expand is True
+    assert len(conn.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_default_manager_matches_adjust_layout():
+    page, conn = create_headless_page()
+    content = ft.Container()
+    page.add(content)
+    manager = create_default_layout_manager(page, debounce=0)
+
+    manager.apply(500)
+
+    assert page.horizontal_alignment == ft.CrossAxisAlignment.CENTER
+    assert content.width == 450
@@ -0,0 +1,53 @@
+"""パスワードのハッシュ化のテスト"""
+
+import threading
+
+import pytest
+
+from backend.core import security
+
+
+@pytest.mark.asyncio
+async def test_async_hashing_runs_off_the_event_loop(monkeypatch):
+    """ハッシュ化と検証がイベントループではなくパスワード用のスレッドで行われること"""
+    threads = []
+
+    def record(name):
+        def wrapper(*args):
+            threads.append(threading.current_thread().name)
+            return name
+
+        return wrapper
+
+    monkeypatch.setattr(security, "get_password_hash", record("hashed"))
+    monkeypatch.setattr(security, "verify_password", record(True))
+
+    assert await security.get_password_hash_async("password") == "hashed"
+    assert await security.verify_password_async("password", "hashed") is True
+
+    assert len(threads) == 2
+    assert all(name.startswith("password-hash") for name in threads)
+
+
+@pytest.mark.asyncio
+async def test_async_hash_can_be_verified():
+    """非同期版で作成したハッシュが検証できること"""
+    hashed = await security.get_password_hash_async("correct horse")
+
+    assert await security.verify_password_async("correct horse", hashed)
+    assert not await security.verify_password_async("wrong horse", hashed)
+
+
+def test_passlib_can_drive_installed_bcrypt():
+    """passlib 1.7.4 が扱える bcrypt（5未満）でハッシュ化と検証ができること"""
+    hashed = security.get_password_hash("password")
+
+    assert hashed.startswith("$2b$")
+    assert security.verify_password("password", hashed)
+
+
+def test_hashes_use_configured_bcrypt_rounds():
+    """設定した bcrypt コストでハッシュ化されること"""
+    hashed = security.get_password_hash("password")
+
+    assert hashed.split("$")[2] == f"{security.settings.BCRYPT_ROUNDS:02d}"
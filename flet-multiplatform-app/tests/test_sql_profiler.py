@@ -0,0 +1,57 @@
+"""SQLプロファイラのテスト"""
+
+from sqlalchemy import create_engine, text
+
+from backend.core.profiling import QueryProfiler, current_route, fingerprint_sql
+
+
+def test_fingerprint_sql_normalizes_literals_and_params():
+    """リテラルとパラメータが同一のフィンガープリントに正規化されること"""
+    a = fingerprint_sql("SELECT * FROM item WHERE id = 1 AND title = 'foo'")
+    b = fingerprint_sql("SELECT *  FROM item\nWHERE id = 42 AND title = 'bar'")
+    c = fingerprint_sql("SELECT * FROM item WHERE id = :id AND title = %(title)s")
+    assert a == b == c == "SELECT * FROM item WHERE id = ? AND title = ?"
+
+
+def test_fingerprint_sql_collapses_in_lists():
+    """IN句のパラメータ数に関わらず同一のフィンガープリントになること"""
+    assert fingerprint_sql("SELECT id FROM user WHERE id IN (?, ?, ?)") == (
+        fingerprint_sql("SELECT id FROM user WHERE id IN (1)")
+    )
+
+
+def test_profiler_aggregates_statements_per_fingerprint(caplog):
+    """ステートメントがフィンガープリント単位で集計され、遅いクエリがログに出ること"""
+    engine = create_engine("sqlite://")
+    profiler = QueryProfiler(slow_query_threshold_ms=0.0)
+    profiler.install(engine)
+
+    token = current_route.set("GET /api/v1/items/")
+    try:
+        with engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text(f"SELECT {i}"))
+    finally:
+        current_route.reset(token)
+        profiler.uninstall()
+
+    stats = profiler.top(10)
+    assert len(stats) == 1
+    assert stats[0]["fingerprint"] == "SELECT ?"
+    assert stats[0]["count"] == 3
+    assert stats[0]["slow_count"] == 3
+    assert stats[0]["last_route"] == "GET /api/v1/items/"
+    assert "route=GET /api/v1/items/" in caplog.text
+
+
+def test_uninstalled_profiler_records_nothing():
+    """リスナー解除後は計測されないこと"""
+    engine = create_engine("sqlite://")
+    profiler = QueryProfiler()
+    profiler.install(engine)
+    profiler.uninstall()
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert profiler.top() == []
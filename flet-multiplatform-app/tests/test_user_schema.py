@@ -0,0 +1,37 @@
+"""ユーザースキーマのテスト"""
+
+from datetime import datetime, timezone
+
+import pydantic.networks
+import pytest
+from pydantic import ValidationError
+
+from backend.schemas.user import UserCreate, UserResponse
+
+
+def test_stored_email_is_not_revalidated_on_output(monkeypatch):
+    """レスポンスの生成時には保存済みのメールアドレスを再検証しないこと"""
+
+    def fail(value):
+        raise AssertionError(f"email_validator called for {value}")
+
+    monkeypatch.setattr(pydantic.networks, "validate_email", fail)
+    now = datetime.now(timezone.utc)
+
+    user = UserResponse(
+        id=1,
+        email="user@example.com",
+        username="user",
+        is_active=True,
+        is_superuser=False,
+        created_at=now,
+        updated_at=now,
+    )
+
+    assert user.email == "user@example.com"
+
+
+def test_email_is_validated_on_input():
+    """作成時のメールアドレスは検証されること"""
+    with pytest.raises(ValidationError):
+        UserCreate(email="not-an-email", username="user", password="password123")